@@ -1,7 +1,4 @@
 import argparse
-import logging
-from logging import FileHandler
-from .app import GenesisModuleApp
 
 def main():
     """Main entry point for the game."""
@@ -10,15 +7,28 @@ def main():
     parser.add_argument("--dev", action="store_true", help="Enable dev mode")
     args = parser.parse_args()
 
+    # In dev mode, time every import on the way to the main menu so the
+    # startup budget report can point at the slow ones.
+    if args.dev:
+        from .common.import_profiler import start_profiling
+        start_profiling()
+
     if args.log:
-        logging.basicConfig(
-            level=logging.INFO,
-            handlers=[
-                FileHandler('game.log', mode='w')
-            ],
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
-    
+        from .common.log_pipeline import setup_logging
+        setup_logging('game.log')
+
+    # The terminal colour system has to be chosen before textual is imported.
+    from .config import load_settings
+    from .common.terminal_output import apply_color_system
+    settings = load_settings()
+    apply_color_system(settings.get("render_output", "truecolor"))
+
+    # Key-up events need the input parser taught before the app starts.
+    if settings.get("key_release_events", True):
+        from .common.key_input import install_release_events
+        install_release_events()
+
+    from .app import GenesisModuleApp
     app = GenesisModuleApp()
     app.dev_mode = args.dev
     app.run()
@@ -11,6 +11,8 @@ crystallises out of the noise, holds, then a new image + pattern is chosen.
 
 import math
 import random
+from array import array
+from functools import lru_cache
 
 # ── Character set ─────────────────────────────────────────────────────────
 # Single-line + double-line box-drawing, block elements, fill patterns,
@@ -191,6 +193,33 @@ PATTERN_NAMES = [
 ]
 
 
+@lru_cache(maxsize=None)
+def _distance_field(name, width, height):
+    """Flat (row-major) distances for a pattern at a given size, plus the max.
+    Cached, so each pattern/size pair is only evaluated once per process."""
+    dist_fn = _make_pattern(name, width, height)
+    field = array("d", (dist_fn(x, y) for y in range(height) for x in range(width)))
+    return field, max(field, default=0.0)
+
+
+@lru_cache(maxsize=None)
+def _image_cells(image_index, width, height):
+    """Flat indices and characters of the non-background cells of an image."""
+    image = REVEAL_IMAGES[image_index]
+    cells = []
+    for y in range(min(height, len(image))):
+        row = image[y]
+        for x in range(min(width, len(row))):
+            if row[x] != " ":
+                cells.append((y * width + x, row[x]))
+    return tuple(cells)
+
+
+# Pre-drawn noise is sliced at a random offset each frame instead of
+# calling random.choice per cell.
+_NOISE_BUFFER_FRAMES = 8
+
+
 # ── RevealAnimation class ─────────────────────────────────────────────────
 
 class RevealAnimation:
@@ -201,27 +230,26 @@ class RevealAnimation:
         self.height = height
         self.chars = ANIMATION_CHARS
         self._char_count = len(self.chars)
+        size = width * height
+        self._noise = "".join(random.choices(self.chars, k=size * _NOISE_BUFFER_FRAMES))
+        self._noise_span = len(self._noise) - size
         self.reset()
 
     def reset(self):
         """Pick a new random image + fan-out pattern and clear all state."""
-        self.target = random.choice(REVEAL_IMAGES)
+        image_index = random.randrange(len(REVEAL_IMAGES))
+        self.target = REVEAL_IMAGES[image_index]
         pattern_name = random.choice(PATTERN_NAMES)
-        self.dist_fn = _make_pattern(pattern_name, self.width, self.height)
-
-        # Pre-compute the maximum distance for this pattern so we know
-        # how fast to grow the reveal radius.
-        max_d = 0.0
-        for y in range(self.height):
-            for x in range(self.width):
-                d = self.dist_fn(x, y)
-                if d > max_d:
-                    max_d = d
+        self.distances, max_d = _distance_field(pattern_name, self.width, self.height)
         # We want the zone to cover everything in ~2.5 seconds (50 ticks).
         self.reveal_speed = max(max_d / 50.0, 0.5)
 
-        self.locked = [[False] * self.width for _ in range(self.height)]
-        self.activation_tick = [[-1] * self.width for _ in range(self.height)]
+        size = self.width * self.height
+        self.locked = bytearray(size)
+        self.activation_tick = array("i", [-1]) * size
+        # Image cells still waiting to lock, and locked cells as (index, char).
+        self._pending = list(_image_cells(image_index, self.width, self.height))
+        self._locked_cells = []
         self.reveal_radius = 0.0
         self.tick_count = 0
         self.phase = "revealing"
@@ -243,51 +271,42 @@ class RevealAnimation:
         self.tick_count += 1
         self.reveal_radius += self.reveal_speed
 
-        all_image_cells_locked = True
-
-        for y in range(self.height):
-            row_target = self.target[y]
-            for x in range(self.width):
-                if self.locked[y][x]:
-                    continue
-
-                target_char = row_target[x] if x < len(row_target) else " "
-
-                # Space cells are background — they never lock.
-                if target_char == " ":
-                    continue
-
-                all_image_cells_locked = False
-
-                dist = self.dist_fn(x, y)
-                if dist > self.reveal_radius:
-                    continue
-
-                # Cell just entered the active zone — record when.
-                if self.activation_tick[y][x] < 0:
-                    self.activation_tick[y][x] = self.tick_count
-
-                # Match probability increases over time so stragglers resolve.
-                ticks_active = self.tick_count - self.activation_tick[y][x]
-                match_chance = (1.0 / self._char_count) + ticks_active * 0.003
-
-                if random.random() < match_chance:
-                    self.locked[y][x] = True
-
-        if all_image_cells_locked:
+        radius = self.reveal_radius
+        tick_count = self.tick_count
+        distances = self.distances
+        activation = self.activation_tick
+        base_chance = 1.0 / self._char_count
+        rand = random.random
+        still_pending = []
+
+        for cell in self._pending:
+            index = cell[0]
+            if distances[index] > radius:
+                still_pending.append(cell)
+                continue
+
+            # Cell just entered the active zone — record when.
+            if activation[index] < 0:
+                activation[index] = tick_count
+
+            # Match probability increases over time so stragglers resolve.
+            match_chance = base_chance + (tick_count - activation[index]) * 0.003
+            if rand() < match_chance:
+                self.locked[index] = 1
+                self._locked_cells.append(cell)
+            else:
+                still_pending.append(cell)
+
+        self._pending = still_pending
+        if not still_pending:
             self.phase = "holding"
             self.hold_ticks = 0
 
     def _render(self) -> str:
         """Build the display string for this frame."""
-        lines = []
-        for y in range(self.height):
-            row_target = self.target[y]
-            line_chars = []
-            for x in range(self.width):
-                if self.locked[y][x]:
-                    line_chars.append(row_target[x])
-                else:
-                    line_chars.append(random.choice(self.chars))
-            lines.append("".join(line_chars))
-        return "\n".join(lines)
+        width = self.width
+        offset = random.randint(0, self._noise_span)
+        frame = list(self._noise[offset:offset + width * self.height])
+        for index, char in self._locked_cells:
+            frame[index] = char
+        return "\n".join("".join(frame[y:y + width]) for y in range(0, len(frame), width))
@@ -2,33 +2,38 @@ from textual.app import App
 from textual.reactive import reactive
 from textual.events import Key
 import logging
-from .screens.world import WorldScreen
 from .screens.main_menu import MainMenuScreen
-from .screens.pause_menu import PauseScreen
-from .screens.inventory import InventoryScreen
-from .screens.shop import ShopScreen
-from .screens.city_hall import CityHallScreen
-from .screens.game_over import GameOverScreen
-from .screens.map import MapScreen
-from .game_state import GameState
-from .world import World
-from .logic.spawning import spawn_enemy, spawn_fauna, spawn_obstacle, spawn_turrets
-from .logic.physics import update_physics_and_collisions
-from .logic.quest_logic import update_quests
-from .logic.trigger_logic import check_triggers
 from .audio.audio import AudioManager
-from .data.game_constants import CUTSCENE_RADIUS, UNTARGET_RADIUS, CITY_SPACING, SHOP_INTERACTION_SPEED_THRESHOLD
-from .widgets.entity_modal import EntityModal
-from .widgets.notifications import Notifications
-from .widgets.fps_counter import FPSCounter
-from .world.generation import get_buildings_in_city, does_city_exist_at
-from .data import factions as faction_data_module
+from .data.game_constants import CUTSCENE_RADIUS, CITY_SPACING, SHOP_INTERACTION_SPEED_THRESHOLD
 from .config import load_settings
+from .common.key_input import InputLatency
 import random
 import math
 import time
 import importlib
-from . import data as game_data
+
+# Quest prefetching and the world tick log here, under a rate limit of their own (see common/log_pipeline.py).
+logger = logging.getLogger(__name__)
+TICK_LOG_SAMPLE = 300  # One world tick in this many is logged (about every 5 s at 60 FPS)
+
+# Everything below is only needed once a game is running. These are imported
+# lazily (on first use, or by the warm-up worker while the main menu is up)
+# so that launching the game only pays for the main menu's dependencies.
+_GAME_MODULES = (
+    "car.game_state",
+    "car.world",
+    "car.screens.world",
+    "car.screens.new_game",
+    "car.screens.load_game",
+    "car.screens.settings",
+    "car.screens.shop",
+    "car.screens.city_hall",
+    "car.screens.game_over",
+    "car.logic.spawning",
+    "car.logic.physics",
+    "car.logic.quest_logic",
+    "car.logic.trigger_logic",
+)
 
 class GenesisModuleApp(App):
     """The main application class for the Genesis Module RPG."""
@@ -48,22 +53,46 @@ class GenesisModuleApp(App):
         self.game_loop = None
         self.settings = load_settings()
         self.dev_mode = self.settings.get("dev_mode", False)
-        self.data = game_data
         self.generation_mode = self.settings.get("generation_mode", "local")
         self.model_size = self.settings.get("model_size", "small")
         self.cli_preset = self.settings.get("cli_preset", "gemini")
         self.custom_cli_command = self.settings.get("custom_cli_command", "")
         self.custom_cli_args = self.settings.get("custom_cli_args", "")
         self.dev_quick_start = self.settings.get("dev_quick_start", False)
+        self.record_llm_responses = self.settings.get("record_llm_responses", False)
+        self.replay_store = self.settings.get("replay_store", "recordings/llm_responses.jsonl")
+        self.replay_latency = self.settings.get("replay_latency", "none")
+        self.render_output = self.settings.get("render_output", "truecolor")
+        self.output_budget_kb = self.settings.get("output_budget_kb", 128)
+        self.record_sessions = self.settings.get("record_sessions", False)
+        self.session_recording_dir = self.settings.get("session_recording_dir", "recordings/sessions")
+        self.session_recorder = None
+        self.key_release_events = self.settings.get("key_release_events", True)
+        self.input_latency = InputLatency()
         self.last_grid_pos = (None, None)
         self.current_save_name = None
+        self.autosave_interval = self.settings.get("autosave_interval", 300)
+        self.autosave_timer = 0.0
+        self.saves_in_progress = 0  # Manual saves and autosaves can overlap
+        self.simulation_process = self.settings.get("simulation_process", False)
+        self.sim_host = None
+        self.quest_prefetches = {}  # city_id -> worker for in-flight quest pre-fetches
+
+    @property
+    def data(self):
+        """The game data package, imported on first use."""
+        from . import data as game_data
+        from .data import factions  # noqa: F401 -- exposes data.factions
+        return game_data
 
     def reload_dynamic_data(self):
         """Forces a reload of the data modules to pick up generated content."""
+        from .logic import data_loader
+        from .logic.prompt_templates import clear_template_cache
         try:
-            # We no longer need to reload the faction module this way
-            # importlib.reload(faction_data_module)
             importlib.reload(self.data)
+            data_loader.reload_data()
+            clear_template_cache()
             logging.info("Dynamic game data reloaded successfully.")
         except Exception as e:
             logging.error(f"Failed to reload dynamic data: {e}", exc_info=True)
@@ -72,6 +101,7 @@ class GenesisModuleApp(App):
         """Stops the game loop timer."""
         if self.game_loop:
             self.game_loop.stop()
+        self.suspend_simulation()
 
     def start_game_loop(self):
         """Starts the game loop timer."""
@@ -95,9 +125,47 @@ class GenesisModuleApp(App):
                 self.stop_game_loop()
                 self.push_screen(BossKeyScreen())
 
+    def on_key_release(self, message) -> None:
+        """Passes a terminal key-up to the screen tracking held keys."""
+        handler = getattr(self.screen, "key_released", None)
+        if handler:
+            handler(message.key)
+
+    def on_app_blur(self) -> None:
+        """Key-ups sent while the terminal is unfocused are lost: let go of every key."""
+        keys = getattr(self.screen, "keys", None)
+        if keys is not None:
+            keys.clear()
+
     def on_mount(self) -> None:
         """Called when the app is first mounted."""
+        if self.key_release_events:
+            from .common.key_input import enable_release_events
+            enable_release_events(self)
         self.push_screen(MainMenuScreen())
+        self.call_after_refresh(self._on_main_menu_shown)
+
+    def _on_main_menu_shown(self) -> None:
+        """Reports the startup budget (dev mode) and starts warming up game modules."""
+        from .common.import_profiler import get_profiler
+        profiler = get_profiler()
+        if profiler:
+            profiler.uninstall()
+            summary = profiler.log_report()
+            if self.dev_mode:
+                self.notify(summary, title="Startup", timeout=6)
+        self.run_worker(self._warm_up_game_modules, thread=True, exclusive=False, name="ModuleWarmup")
+
+    def _warm_up_game_modules(self) -> None:
+        """Imports the in-game modules and generated data in the background."""
+        from .logic import data_loader, entity_loader
+        for module_name in _GAME_MODULES:
+            try:
+                importlib.import_module(module_name)
+            except Exception as e:
+                logging.error(f"Failed to warm up {module_name}: {e}", exc_info=True)
+        entity_loader.ensure_loaded()
+        data_loader.get_faction_data()
 
     def switch_screen(self, screen) -> None:
         """Switch to a new screen."""
@@ -110,7 +178,12 @@ class GenesisModuleApp(App):
 
     def update_game(self) -> None:
         """The main game loop, called by a timer."""
-        if not isinstance(self.screen, WorldScreen):
+        from .screens.world import WorldScreen
+        from .screens.game_over import GameOverScreen
+        from .logic.trigger_logic import check_triggers
+
+        # The HUD presenter is created when the WorldScreen mounts.
+        if not isinstance(self.screen, WorldScreen) or self.screen.hud is None:
             return
 
         # Cache the WorldScreen reference. Physics/triggers may push new screens
@@ -135,83 +208,231 @@ class GenesisModuleApp(App):
                 return
 
             # Process continuous input (held keys) before physics
-            world_screen.process_input(dt)
-
-            notifications = update_physics_and_collisions(gs, self.world, self.audio_manager, dt, self)
-            for notification in notifications:
-                world_screen.query_one("#notifications", Notifications).add_notification(notification)
-
-            # Spawning logic
-            spawn_rate = gs.difficulty_mods.get("spawn_rate_mult", 1.0)
-            gs.enemy_spawn_timer -= dt
-            if gs.enemy_spawn_timer <= 0:
-                spawn_enemy(gs, self.world)
-                gs.enemy_spawn_timer = random.uniform(1.5, 3.5) / spawn_rate
-
-            gs.fauna_spawn_timer -= dt
-            if gs.fauna_spawn_timer <= 0:
-                spawn_fauna(gs, self.world)
-                gs.fauna_spawn_timer = random.uniform(2.0, 4.0)
-
-            gs.obstacle_spawn_timer -= dt
-            if gs.obstacle_spawn_timer <= 0:
-                spawn_obstacle(gs, self.world)
-                gs.obstacle_spawn_timer = random.uniform(1.0, 2.5)
-
-            gs.turret_spawn_timer -= dt
-            if gs.turret_spawn_timer <= 0:
-                spawn_turrets(gs, self.world)
-                gs.turret_spawn_timer = 5.0
-            
-            quest_notifications = update_quests(gs, self.audio_manager, self)
-            for notification in quest_notifications:
-                world_screen.query_one("#notifications", Notifications).add_notification(notification)
-
-            # --- Throttled UI Updates ---
-            # These calculations are expensive, so we only run them a few times per second.
-            if self.frame_count % 8 == 0:
-                gs.closest_entity_info = self.find_closest_entity()
-            
-            if self.frame_count % 12 == 0:
-                self.update_compass_data()
-
-            # --- Proximity Quest Generation ---
-            # Check if we've moved to a new grid cell
-            current_grid_x = round(gs.car_world_x / CITY_SPACING)
-            current_grid_y = round(gs.car_world_y / CITY_SPACING)
-            if (current_grid_x, current_grid_y) != self.last_grid_pos:
-                self.check_and_cache_quests_for_nearby_cities()
-                self.last_grid_pos = (current_grid_x, current_grid_y)
-                # Mark city as visited for fast travel
-                if does_city_exist_at(current_grid_x, current_grid_y, self.world.seed, gs.factions):
-                    gs.visited_cities.add((current_grid_x, current_grid_y))
-            
-            # Fallback timer to retry failed generations or catch edge cases
-            if self.frame_count % 300 == 0: # Every 10 seconds (assuming 30 FPS)
-                self.check_and_cache_quests_for_nearby_cities()
+            input_event_time = world_screen.process_input(dt)
+
+            if self.simulation_process:
+                self.update_simulation_process(world_screen)
+            else:
+                if self.record_sessions:
+                    self.record_session_tick(dt)
+                for notification in self.simulate_world_tick(dt):
+                    world_screen.hud.notifications.add_notification(notification)
+
+            # --- Autosave ---
+            # The snapshot is cheap; serialization and disk I/O run on a worker.
+            if self.autosave_interval:
+                self.autosave_timer += dt
+                if self.autosave_timer >= self.autosave_interval and not self.saves_in_progress:
+                    self.autosave_timer = 0.0
+                    from .logic.save_load import AUTOSAVE_SLOT
+                    self.save_game_in_background(AUTOSAVE_SLOT, autosave=True)
 
             # --- Update UI Widgets ---
             world_screen.update_widgets()
+            if input_event_time is not None and self.dev_mode:
+                self.input_latency.add(time.perf_counter() - input_event_time)
 
-            # Check for building interactions
-            self.check_building_interaction()
-            
-            # Check for world triggers
-            check_triggers(self, gs)
+            # The simulation process runs these checks itself.
+            if not self.simulation_process:
+                # Check for building interactions
+                self.check_building_interaction()
+
+                # Check for world triggers
+                check_triggers(self, gs)
 
         # Update FPS counter
         self.frame_count += 1
         if isinstance(self.screen, WorldScreen):
             # Use a simple moving average for FPS to smooth it out
             # This part of the code is for display only and doesn't affect game logic timing
-            if current_time - world_screen.query_one("#fps_counter").last_fps_update_time >= 1.0:
-                fps = self.frame_count / (current_time - world_screen.query_one("#fps_counter").last_fps_update_time)
-                world_screen.query_one("#fps_counter").fps = fps
-                world_screen.query_one("#fps_counter").last_fps_update_time = current_time
+            fps_counter = world_screen.hud.fps_counter
+            if current_time - fps_counter.last_fps_update_time >= 1.0:
+                fps = self.frame_count / (current_time - fps_counter.last_fps_update_time)
+                fps_counter.fps = fps
+                fps_counter.output = world_screen.hud.game_view.output_summary()
+                fps_counter.input = self.input_latency.summary(world_screen.keys.releases_reported)
+                fps_counter.last_fps_update_time = current_time
                 self.frame_count = 0
 
+    def simulate_world_tick(self, dt):
+        """
+        Advances the world by dt: physics, spawning, quests and the throttled
+        lookups. Returns the notifications raised along the way. The
+        simulation process runs this same method on its own copy of the state.
+        """
+        from .logic.spawning import spawn_enemy, spawn_fauna, spawn_obstacle, spawn_pending_entities, spawn_turrets
+        from .logic.physics import update_physics_and_collisions
+        from .logic.quest_logic import update_quests
+        from .logic.quest_prefetch import PREFETCH_REPLAN_FRAMES
+        from .world.generation import does_city_exist_at
+        gs = self.game_state
+
+        notifications = list(update_physics_and_collisions(gs, self.world, self.audio_manager, dt, self))
+
+        # Spawning logic
+        spawn_pending_entities(gs, self.world)
+        spawn_rate = gs.difficulty_mods.get("spawn_rate_mult", 1.0)
+        gs.enemy_spawn_timer -= dt
+        if gs.enemy_spawn_timer <= 0:
+            spawn_enemy(gs, self.world)
+            gs.enemy_spawn_timer = random.uniform(1.5, 3.5) / spawn_rate
+
+        gs.fauna_spawn_timer -= dt
+        if gs.fauna_spawn_timer <= 0:
+            spawn_fauna(gs, self.world)
+            gs.fauna_spawn_timer = random.uniform(2.0, 4.0)
+
+        gs.obstacle_spawn_timer -= dt
+        if gs.obstacle_spawn_timer <= 0:
+            spawn_obstacle(gs, self.world)
+            gs.obstacle_spawn_timer = random.uniform(1.0, 2.5)
+
+        gs.turret_spawn_timer -= dt
+        if gs.turret_spawn_timer <= 0:
+            spawn_turrets(gs, self.world)
+            gs.turret_spawn_timer = 5.0
+        
+        notifications.extend(update_quests(gs, self.audio_manager, self))
+
+        # --- Throttled UI Updates ---
+        # These calculations are expensive, so we only run them a few times per second.
+        if self.frame_count % 8 == 0:
+            gs.closest_entity_info = self.find_closest_entity()
+        
+        if self.frame_count % 12 == 0:
+            self.update_compass_data()
+
+        # --- Proximity Quest Generation ---
+        # Check if we've moved to a new grid cell
+        current_grid_x = round(gs.car_world_x / CITY_SPACING)
+        current_grid_y = round(gs.car_world_y / CITY_SPACING)
+        if (current_grid_x, current_grid_y) != self.last_grid_pos:
+            self.check_and_cache_quests_for_nearby_cities()
+            self.last_grid_pos = (current_grid_x, current_grid_y)
+            # Mark city as visited for fast travel
+            if does_city_exist_at(current_grid_x, current_grid_y, self.world.seed, gs.factions):
+                gs.visited_cities.add((current_grid_x, current_grid_y))
+        
+        # Re-rank the prefetch plan as the heading and compass target change;
+        # this also retries failed generations.
+        if self.frame_count % PREFETCH_REPLAN_FRAMES == 0:
+            self.check_and_cache_quests_for_nearby_cities()
+
+        logger.info("Tick %d: dt %.1f ms at (%.0f, %.0f), %d enemies, %d fauna, %d obstacles",
+                    self.frame_count, dt * 1000, gs.car_world_x, gs.car_world_y, len(gs.active_enemies),
+                    len(gs.active_fauna), len(gs.active_obstacles), extra={"sample_every": TICK_LOG_SAMPLE})
+        return notifications
+
+    def record_session_tick(self, dt):
+        """Writes this tick to the session recording, starting one for a new world."""
+        from .logic.session_replay import SessionRecorder, recording_path
+        recorder = self.session_recorder
+        if recorder is None or recorder.world_seed != self.world.seed:
+            if recorder is not None:
+                recorder.close()
+            try:
+                recorder = SessionRecorder(recording_path(self.session_recording_dir),
+                                           self.world.seed, self.settings)
+            except OSError as e:
+                logging.error(f"Could not start session recording: {e}")
+                self.record_sessions = False
+                return
+            self.session_recorder = recorder
+        recorder.record_tick(self.game_state, dt, self.frame_count)
+
+    # --- Simulation process (settings: "simulation_process") ---
+
+    def update_simulation_process(self, world_screen):
+        """
+        One UI frame while the simulation runs in its own process: hand it
+        the state if it doesn't have it, send controls, apply its events and
+        mirror its latest snapshot.
+        """
+        from .workers.simulation_process import SimulationHost
+        if self.sim_host is None:
+            self.sim_host = SimulationHost(self.settings)
+        if not self.sim_host.running:
+            self.sim_host.load(self.game_state, self.world.seed)
+        self.sim_host.send_controls(self.game_state)
+        self.handle_simulation_events(world_screen)
+        if self.sim_host and self.sim_host.running:
+            self.sim_host.apply_latest_snapshot(self.game_state)
+
+    def handle_simulation_events(self, world_screen=None):
+        """Applies what the simulation process reported since the last frame."""
+        import pickle
+        if world_screen is None:
+            from .screens.world import WorldScreen
+            world_screen = next((s for s in self.screen_stack if isinstance(s, WorldScreen)), None)
+        host = self.sim_host
+        gs = self.game_state
+        for event in host.poll():
+            kind = event[0]
+            if kind == "notify":
+                if world_screen and world_screen.hud:
+                    world_screen.hud.notifications.add_notification(event[1])
+            elif kind == "sfx":
+                self.audio_manager.play_sfx(event[1])
+            elif kind == "destroyed":
+                gs.destroyed_this_frame.append(event[1])
+            elif kind == "prefetch":
+                self.check_and_cache_quests_for_nearby_cities()
+            elif kind == "info" and host.running:
+                # Stale once the state is back in this process.
+                _, input_seq, info = event
+                gs.active_quests = info["active_quests"]
+                gs.compass_info = {**gs.compass_info, "target_name": info["target_name"]}
+                gs.ammo_counts = info["ammo_counts"]
+                gs.city_damage = pickle.loads(info["city_damage"])
+                if input_seq == host.input_seq:
+                    gs.selected_quest_index = info["selected_quest_index"]
+                    gs.waypoint = info["waypoint"]
+                    gs.weapon_enabled = info["weapon_enabled"]
+            elif kind == "handoff":
+                gs, screens = host.take_handoff(event[1], gs)
+                self.adopt_game_state(gs)
+                for screen in screens:
+                    self.push_screen(screen)
+            elif kind == "crashed":
+                logging.error(f"Simulation process failed ({event[1]}); running the simulation in-process.")
+                self.simulation_process = False
+                recovered = host.adopt(host.loaded_state(), gs, keep_ui_flags=True)
+                host.stop()
+                self.sim_host = None
+                self.adopt_game_state(recovered)
+                return
+
+    def suspend_simulation(self):
+        """Takes the game state back from the simulation process, which pauses."""
+        # Whatever happens next edits the state outside the world loop.
+        if self.session_recorder is not None:
+            self.session_recorder.interrupt()
+        host = self.sim_host
+        if host is None or not host.running:
+            return
+        pulled = host.pull(pause=True)
+        if pulled is not None:
+            self.adopt_game_state(host.adopt(pulled, self.game_state, keep_ui_flags=True))
+        self.handle_simulation_events()
+        if host.running:
+            # No answer: the process is gone. Resume from the last state it was given.
+            host.events.put(("crashed", "no response to a state pull"))
+            self.handle_simulation_events()
+
+    def adopt_game_state(self, game_state):
+        """Replaces the game state everywhere the world screen holds it."""
+        self.game_state = game_state
+        self.world.game_state = game_state
+        for screen in self.screen_stack:
+            hud = getattr(screen, "hud", None)
+            if hud is not None:
+                hud.game_view.game_state = game_state
+
     def check_building_interaction(self):
         """Checks if the player is inside a building and pushes the appropriate screen."""
+        from .screens.shop import ShopScreen
+        from .screens.city_hall import CityHallScreen
+        from .world.generation import get_buildings_in_city
         gs = self.game_state
 
         # Player must be slow enough to enter a building
@@ -223,9 +444,10 @@ class GenesisModuleApp(App):
         grid_x = round(car_cx / CITY_SPACING)
         grid_y = round(car_cy / CITY_SPACING)
         buildings = get_buildings_in_city(grid_x, grid_y)
+        damage = gs.city_damage.get((grid_x, grid_y))
         for idx, building in enumerate(buildings):
             # Skip destroyed buildings
-            if (grid_x, grid_y, idx) in gs.destroyed_buildings:
+            if damage is not None and damage.is_destroyed(idx):
                 continue
             if (building['x'] <= car_cx < building['x'] + building['w'] and
                 building['y'] <= car_cy < building['y'] + building['h']):
@@ -321,17 +543,9 @@ class GenesisModuleApp(App):
 
     def update_compass_data(self):
         """Calculates the compass direction and caches it in the game state."""
-        from .logic.quest_logic import get_quest_target_location
+        from .logic.quest_logic import get_compass_target
         gs = self.game_state
-        target_x, target_y, target_name = None, None, None
-
-        if gs.waypoint:
-            target_x = gs.waypoint["x"]
-            target_y = gs.waypoint["y"]
-            target_name = gs.waypoint.get("name", "Waypoint")
-        elif gs.active_quests:
-            idx = min(gs.selected_quest_index, len(gs.active_quests) - 1)
-            target_x, target_y, target_name = get_quest_target_location(gs.active_quests[idx], gs)
+        target_x, target_y, target_name = get_compass_target(gs)
 
         if target_x is not None:
             # atan2 gives angle in screen coords: 0=east, pi/2=south, -pi/2=north
@@ -345,29 +559,99 @@ class GenesisModuleApp(App):
         else:
             gs.compass_info = {"absolute_bearing": 0, "target_name": ""}
 
+    def save_game_in_background(self, save_name, autosave=False):
+        """Snapshots the game now and writes the save slot on a worker thread."""
+        from .logic.save_load import snapshot_game, write_save
+        from functools import partial
+        game_state = self.game_state
+        if self.sim_host and self.sim_host.running:
+            # Save the simulation's live state, not the UI's mirror of it.
+            game_state = self.sim_host.pull(pause=False)
+            if game_state is None:
+                return
+            game_state = self.sim_host.adopt(game_state, self.game_state, keep_ui_flags=True)
+        self.saves_in_progress += 1
+        try:
+            snapshot = snapshot_game(game_state)
+        except Exception as e:
+            logging.error(f"Could not snapshot the game for '{save_name}': {e}", exc_info=True)
+            self._on_save_finished(save_name, autosave, False)
+            return
+        worker = self.run_worker(
+            partial(write_save, snapshot, save_name),
+            exclusive=False,
+            thread=True,
+            name="SaveGame"
+        )
+        worker.save_name = save_name
+        worker.autosave = autosave
+
+    def _on_save_finished(self, save_name, autosave, success):
+        """Reports a finished (or failed) background save on the WorldScreen, if it's up."""
+        from .screens.world import WorldScreen
+        self.saves_in_progress = max(0, self.saves_in_progress - 1)
+        if autosave and success:
+            message = "Autosaved."
+        elif success:
+            message = f"Game Saved as '{save_name}'!"
+        else:
+            message = f"Save to '{save_name}' failed!"
+        world_screen = next((s for s in self.screen_stack if isinstance(s, WorldScreen)), None)
+        if world_screen:
+            world_screen.query_one("#notifications").add_notification(message)
+
     def on_worker_state_changed(self, event: "Worker.StateChanged") -> None:
-        """Handles completed quest generation workers."""
+        """Handles completed save workers."""
         from textual.worker import WorkerState
-        if event.worker.name.startswith("QuestGenerator"):
+        if event.worker.name == "SaveGame":
             if event.worker.state == WorkerState.SUCCESS:
-                city_id = event.worker.city_id
-                quests = event.worker.result
-                if quests:
-                    self.game_state.quest_cache[city_id] = quests
-                    logging.info(f"Successfully cached {len(quests)} quests for city {city_id}.")
-                else:
-                    self.game_state.quest_cache.pop(city_id, None)
-                    logging.warning(f"Quest generation failed for city {city_id}. No quests cached.")
-
-                from .screens.city_hall import CityHallScreen, QuestsLoaded
-                if isinstance(self.screen, CityHallScreen) and self.screen.current_city_id == city_id:
-                    logging.info(f"Posting QuestsLoaded message to CityHallScreen for city {city_id}")
-                    self.screen.post_message(QuestsLoaded(quests or []))
+                self._on_save_finished(event.worker.save_name, event.worker.autosave, bool(event.worker.result))
             elif event.worker.state == WorkerState.ERROR:
-                city_id = getattr(event.worker, 'city_id', None)
-                if city_id:
-                    self.game_state.quest_cache.pop(city_id, None)
-                    logging.error(f"Quest generation worker failed for city {city_id}: {event.worker.error}")
+                logging.error(f"Save worker failed: {event.worker.error}")
+                self._on_save_finished(event.worker.save_name, event.worker.autosave, False)
+            elif event.worker.state == WorkerState.CANCELLED:
+                self.saves_in_progress = max(0, self.saves_in_progress - 1)
+
+    def store_generated_quests(self, city_id, quests, stamp):
+        """
+        Caches the quests generated for a city (keeping its earlier quests if
+        generation failed) and shows them if the player is in its city hall.
+        """
+        from .logic.content_cache import quest_key, stamp_content
+        if quests:
+            self.game_state.quest_cache[city_id] = quests
+            stamp_content(self.game_state, quest_key(city_id), stamp)
+            logger.info(f"Successfully cached {len(quests)} quests for city {city_id}.")
+        elif self.game_state.quest_cache.get(city_id) == "pending":
+            self.game_state.quest_cache.pop(city_id, None)
+            logger.warning(f"Quest generation failed for city {city_id}. No quests cached.")
+        else:
+            logger.warning(f"Quest refresh failed for city {city_id}. Keeping its earlier quests.")
+
+        from .screens.city_hall import CityHallScreen, QuestsLoaded
+        if isinstance(self.screen, CityHallScreen) and self.screen.current_city_id == city_id:
+            logger.info(f"Posting QuestsLoaded message to CityHallScreen for city {city_id}")
+            cached = self.game_state.quest_cache.get(city_id)
+            self.screen.post_message(QuestsLoaded(cached if isinstance(cached, list) else []))
+
+    async def _prefetch_quests(self, city_id, stamp, **quest_args):
+        """Generates one city's quests ahead of the player, then moves on to the next city in the plan."""
+        from textual.worker import get_current_worker
+        from .workers.quest_generator import generate_quests_worker
+        try:
+            quests = await generate_quests_worker(city_id=city_id, **quest_args)
+        except Exception as e:
+            logger.error(f"Quest generation worker failed for city {city_id}: {e}", exc_info=True)
+            quests = None
+        self.store_generated_quests(city_id, quests, stamp)
+        self._on_quest_prefetch_finished(city_id, get_current_worker())
+
+    def _on_quest_prefetch_finished(self, city_id, worker):
+        """Frees the worker's prefetch slot and starts the next city in the plan."""
+        if self.quest_prefetches.get(city_id) is not worker:
+            return
+        del self.quest_prefetches[city_id]
+        self.check_and_cache_quests_for_nearby_cities()
 
     def trigger_initial_quest_cache(self):
         """Kicks off the quest caching for the player's starting area."""
@@ -375,54 +659,73 @@ class GenesisModuleApp(App):
 
     def check_and_cache_quests_for_nearby_cities(self):
         """
-        Checks for cities near the player and dispatches workers to generate quests
-        for them if they aren't already cached. Prioritizes the current city.
+        Generates quests ahead of the player for the cities the prefetch
+        planner ranks highest (logic/quest_prefetch.py), a few at a time and
+        best first. Cities whose cached quests are stale are regenerated too,
+        keeping the old quests on offer until the new ones arrive. Prefetches
+        for cities that drop out of the plan are cancelled.
         """
-        from .workers.quest_generator import generate_quests_worker
         from .world.generation import get_city_faction
+        from .logic.quest_prefetch import PREFETCH_CONCURRENCY, plan_prefetch
+        from .logic.content_cache import content_stamp, quest_key, quests_need_refresh, stamp_content
         from functools import partial
 
         gs = self.game_state
-        player_grid_x = round(gs.car_world_x / CITY_SPACING)
-        player_grid_y = round(gs.car_world_y / CITY_SPACING)
-
-        # Build list of cities to check, current city first
-        cities_to_check = [(player_grid_x, player_grid_y)]
-        for dx in range(-1, 2):
-            for dy in range(-1, 2):
-                if dx == 0 and dy == 0:
-                    continue
-                cities_to_check.append((player_grid_x + dx, player_grid_y + dy))
-
-        for check_x, check_y in cities_to_check:
-                city_id = f"city_{check_x}_{check_y}"
+        if gs is None or self.world is None:
+            return
+        # Workers from an earlier game, or that finished without a state event
+        for city_id, worker in list(self.quest_prefetches.items()):
+            if worker.is_finished:
+                del self.quest_prefetches[city_id]
 
-                # Don't generate quests for cities that are already cached or pending
-                if city_id in gs.quest_cache:
-                    continue
+        plan = plan_prefetch(gs, self.world.seed)
+        planned_ids = {city_id for city_id, _, _ in plan}
 
+        for city_id, worker in list(self.quest_prefetches.items()):
+            if city_id in planned_ids:
+                continue
+            # A queued request is dropped and a running one stops at its next token.
+            worker.cancel()
+            del self.quest_prefetches[city_id]
+            if gs.quest_cache.get(city_id) == "pending":
+                del gs.quest_cache[city_id]
+            else:
+                # A cancelled refresh; the old quests are stale again.
+                stamp_content(gs, quest_key(city_id), None)
+            logger.info(f"Cancelled quest pre-fetch for {city_id}; it is no longer on the player's path.")
+
+        for city_id, grid_x, grid_y in plan:
+            if len(self.quest_prefetches) >= PREFETCH_CONCURRENCY:
+                break
+            if city_id in self.quest_prefetches:
+                continue
+            city_faction_id = get_city_faction(grid_x * CITY_SPACING, grid_y * CITY_SPACING, gs.factions)
+            if city_id not in gs.quest_cache:
                 # Mark as pending to prevent re-dispatching
                 gs.quest_cache[city_id] = "pending"
+                logger.info(f"No quests cached for nearby city {city_id}. Starting pre-fetch worker.")
+            elif quests_need_refresh(gs, city_id, city_faction_id):
+                # The old quests stay on offer meanwhile. Stamped now so a failed refresh isn't retried
+                # until the faction state moves again.
+                stamp_content(gs, quest_key(city_id), content_stamp(gs, city_faction_id))
+                logger.info(f"Quests cached for {city_id} are stale. Regenerating them in the background.")
+            else:
+                continue
 
-                city_faction_id = get_city_faction(check_x * CITY_SPACING, check_y * CITY_SPACING, gs.factions)
-
-                logging.info(f"No quests cached for nearby city {city_id}. Starting pre-fetch worker.")
-
-                worker_callable = partial(
-                    generate_quests_worker,
-                    app=self,
-                    city_id=city_id,
-                    city_faction_id=city_faction_id,
-                    theme=gs.theme,
-                    faction_data=gs.factions,
-                    story_intro=gs.story_intro
-                )
-
-                worker = self.run_worker(
-                    worker_callable,
-                    exclusive=False, # Allow multiple quest generators to run
-                    thread=True,
-                    name=f"QuestGenerator_{city_id}"
-                )
-                # Pass the city_id to the worker's custom attribute to know where to store the result
-                worker.city_id = city_id
+            worker_callable = partial(
+                self._prefetch_quests,
+                city_id,
+                content_stamp(gs, city_faction_id),
+                app=self,
+                city_faction_id=city_faction_id,
+                theme=gs.theme,
+                faction_data=gs.factions,
+                story_intro=gs.story_intro,
+            )
+
+            worker = self.run_worker(
+                worker_callable,
+                exclusive=False, # Allow multiple quest generators to run
+                name=f"QuestGenerator_{city_id}"
+            )
+            self.quest_prefetches[city_id] = worker
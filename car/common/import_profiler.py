@@ -0,0 +1,113 @@
+import sys
+import time
+import logging
+
+# Target for process start -> main menu mounted, in milliseconds.
+STARTUP_BUDGET_MS = 400
+
+
+class _TimedLoader:
+    """Wraps a module loader so exec_module is timed by the profiler."""
+
+    def __init__(self, loader, profiler):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profiler._enter()
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit(module.__name__, time.perf_counter() - start)
+
+
+class ImportProfiler:
+    """
+    A meta path finder that records how long each module takes to import.
+    Installed by --dev before the app is imported, so the budget report
+    covers everything loaded on the way to the main menu.
+    """
+
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.self_times = {}   # {module_name: seconds, excluding nested imports}
+        self._child_time = []  # stack of accumulated nested import time
+        self._finding = False
+
+    def install(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path=None, target=None):
+        if self._finding:
+            return None
+        self._finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = _TimedLoader(spec.loader, self)
+                    return spec
+            return None
+        finally:
+            self._finding = False
+
+    def _enter(self):
+        self._child_time.append(0.0)
+
+    def _exit(self, name, elapsed):
+        children = self._child_time.pop()
+        self.self_times[name] = self.self_times.get(name, 0.0) + max(0.0, elapsed - children)
+        if self._child_time:
+            self._child_time[-1] += elapsed
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.start_time) * 1000
+
+    def report(self, top=10):
+        """Returns (summary, lines) describing startup time against the budget."""
+        elapsed = self.elapsed_ms()
+        import_ms = sum(self.self_times.values()) * 1000
+        status = "OK" if elapsed <= STARTUP_BUDGET_MS else "OVER BUDGET"
+        summary = (
+            f"Startup {elapsed:.0f}ms / {STARTUP_BUDGET_MS}ms budget ({status}), "
+            f"imports {import_ms:.0f}ms across {len(self.self_times)} modules"
+        )
+        slowest = sorted(self.self_times.items(), key=lambda item: item[1], reverse=True)[:top]
+        lines = [f"{seconds * 1000:8.1f}ms  {name}" for name, seconds in slowest]
+        return summary, lines
+
+    def log_report(self, top=10):
+        summary, lines = self.report(top)
+        logging.info(f"--- IMPORT BUDGET REPORT ---\n{summary}\n" + "\n".join(lines))
+        return summary
+
+
+_profiler = None
+
+
+def start_profiling():
+    """Installs the global import profiler. Safe to call more than once."""
+    global _profiler
+    if _profiler is None:
+        _profiler = ImportProfiler()
+        _profiler.install()
+    return _profiler
+
+
+def get_profiler():
+    return _profiler
@@ -0,0 +1,176 @@
+"""
+Held-key state for gameplay input.
+
+Terminals report a held key in one of two ways:
+
+  key-up     With the kitty keyboard protocol's "report event types" flag,
+             the terminal sends press, repeat and release events, so a
+             key is held exactly from press to release.
+  repeat     Otherwise only presses arrive, repeated at the terminal's
+             key-repeat rate while the key is held, and a key counts as
+             released once `repeat_timeout` passes without a repeat.
+
+Textual turns the kitty protocol on but not its event types, and its
+parser has no notion of a release. install_release_events wraps the
+parser so a release becomes a KeyRelease message (repeats stay ordinary
+key presses), and enable_release_events asks the terminal for them.
+Only keys sent as escape codes carry event types, so arrows report a
+release while plain text keys ("a", "space") may not. KeyStateTable
+infers releases from repeats for each key until that key reports a
+key-up, so terminals without the protocol, and keys it doesn't cover,
+keep working as before.
+
+All times are time.perf_counter() readings.
+"""
+
+import logging
+import re
+
+# A kitty key sequence carrying an event type: CSI code ; mods:type [; text] final
+_KITTY_EVENT = re.compile(r"(\x1b\[[\d:]*;\d*):(\d)((?:;[\d:]*)?[u~ABCDEFHPQRS])")
+_EVENT_RELEASE = "3"
+
+KITTY_REPORT_EVENT_TYPES = 0b10
+
+_installed = False
+
+
+def install_release_events():
+    """
+    Teaches Textual's input parser the kitty protocol's event types. Must
+    run before the app starts. Returns False when this Textual's parser
+    doesn't have the hook it wraps (release events then stay off).
+    """
+    global _installed
+    if _installed:
+        return True
+    try:
+        from textual import constants
+        from textual._xterm_parser import XTermParser
+        original = XTermParser._sequence_to_key_events
+    except (ImportError, AttributeError) as e:
+        logging.warning(f"Key release events unavailable: {e}")
+        return False
+    if constants.DISABLE_KITTY_KEY:
+        return False
+
+    from .messages import KeyRelease
+
+    def sequence_to_key_events(self, sequence, alt=False):
+        match = _KITTY_EVENT.fullmatch(sequence)
+        if match is None:
+            yield from original(self, sequence, alt)
+            return
+        head, event_type, tail = match.groups()
+        # Textual reads the modifiers as a plain number: drop the event type.
+        events = original(self, head + tail, alt)
+        if event_type == _EVENT_RELEASE:
+            for event in events:
+                yield KeyRelease(event.key)
+        else:
+            yield from events
+
+    XTermParser._sequence_to_key_events = sequence_to_key_events
+    _installed = True
+    return True
+
+
+def enable_release_events(app):
+    """Asks the terminal to report key releases, if the parser can read them."""
+    driver = getattr(app, "_driver", None)
+    if not _installed or driver is None:
+        return False
+    # CSI = flags ; 2 u sets these flags on top of the ones Textual pushed.
+    driver.write(f"\x1b[={KITTY_REPORT_EVENT_TYPES};2u")
+    driver.flush()
+    return True
+
+
+class KeyStateTable:
+    """Held state of a fixed set of keys, updated only from key events."""
+
+    def __init__(self, keys, repeat_timeout=0.15):
+        self.keys = tuple(keys)
+        self.repeat_timeout = repeat_timeout
+        self._slot = {key: i for i, key in enumerate(self.keys)}
+        self._down = [False] * len(self.keys)
+        self._key_up = [False] * len(self.keys)  # The key has reported a release: no inference for it
+        self._last_event = [0.0] * len(self.keys)
+        self._unsampled_since = None     # Earliest control event no tick has sampled yet
+
+    def press(self, key, now):
+        """A press or repeat. Returns False for keys the table doesn't track."""
+        slot = self._slot.get(key)
+        if slot is None:
+            return False
+        if not self._down[slot]:
+            self._down[slot] = True
+            self.mark(now)
+        self._last_event[slot] = now
+        return True
+
+    def release(self, key, now):
+        """
+        A key-up. Kitty reports releases with the modifiers held at the time
+        ("shift+a", "ctrl+right"); they release the base key all the same.
+        """
+        slot = self._slot.get(key)
+        if slot is None:
+            slot = self._slot.get(key.rsplit("+", 1)[-1])
+        if slot is None:
+            return
+        self._key_up[slot] = True
+        if self._down[slot]:
+            self._down[slot] = False
+            self.mark(now)
+
+    @property
+    def releases_reported(self):
+        """True once any tracked key has reported a key-up."""
+        return any(self._key_up)
+
+    def mark(self, now):
+        """Notes a control change (press, release, pedal step) for the latency report."""
+        if self._unsampled_since is None:
+            self._unsampled_since = now
+
+    def clear(self):
+        for slot in range(len(self.keys)):
+            self._down[slot] = False
+        self._unsampled_since = None
+
+    def sample(self, now):
+        """
+        Settles the held state for a simulation step. Keys that have never
+        reported a key-up are released here once no repeat arrives inside
+        repeat_timeout. Returns the time of the earliest control event since
+        the last sample, or None.
+        """
+        deadline = now - self.repeat_timeout
+        for slot, down in enumerate(self._down):
+            if down and not self._key_up[slot] and self._last_event[slot] <= deadline:
+                self._down[slot] = False
+        since, self._unsampled_since = self._unsampled_since, None
+        return since
+
+    def held(self, key):
+        return self._down[self._slot[key]]
+
+
+class InputLatency:
+    """Time from a control event to the frame that shows it, summarised per report."""
+
+    def __init__(self):
+        self._samples = []
+
+    def add(self, seconds):
+        self._samples.append(seconds)
+
+    def summary(self, key_up):
+        """e.g. "Input 12ms (max 30ms, key-up)"; resets the samples."""
+        mode = "key-up" if key_up else "repeat"
+        samples, self._samples = self._samples, []
+        if not samples:
+            return f"Input -- ({mode})"
+        mean = 1000 * sum(samples) / len(samples)
+        return f"Input {mean:.0f}ms (max {1000 * max(samples):.0f}ms, {mode})"
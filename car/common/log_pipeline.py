@@ -0,0 +1,259 @@
+"""
+Logging for `--log`, kept off the game's hot paths.
+
+Every thread logs into a queue and a single listener thread does the file
+I/O. Before a record is queued it goes through a per-logger rate limit
+(INFO and below), so code on hot paths logs through a named module logger
+(`logging.getLogger(__name__)`) to get a budget of its own. A per-frame
+call site also asks to be sampled with `extra={"sample_every": n}`, which
+keeps one record in n from that line. Payload records are never limited.
+game.log rotates at LOG_MAX_BYTES.
+
+Prompts and raw LLM responses are too big for the log. `log_payload`
+writes them to a separate gzipped JSON-lines store, rotated by size and
+at the start of each session, and logs one line that refers to the
+payload by ID.
+
+The queue is drained on normal exit and after an uncaught exception, so
+the lines leading up to a crash reach the file.
+"""
+
+import atexit
+import gzip
+import itertools
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 2
+
+PAYLOAD_STORE = "game_payloads.jsonl.gz"
+PAYLOAD_SEGMENT_BYTES = 8 * 1024 * 1024  # Uncompressed bytes per store file
+PAYLOAD_SEGMENTS = 3
+PAYLOAD_PREVIEW = 80
+
+# (messages per second, burst) for INFO and below, per logger name
+DEFAULT_RATE_LIMIT = (50.0, 200)
+RATE_LIMITS = {
+    "car.logic.spawning": (5.0, 20),
+}
+
+_listeners = []
+_handlers = []
+_queue_handlers = []
+_payload_ids = itertools.count(1)
+_session = time.strftime("%Y%m%d-%H%M%S")
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket per logger for INFO and below, plus per-call-site sampling.
+    Payloads (see log_payload) always pass.
+    """
+
+    def __init__(self, limits=None, default=DEFAULT_RATE_LIMIT):
+        super().__init__()
+        self.limits = RATE_LIMITS if limits is None else limits
+        self.default = default
+        self._buckets = {}  # logger name -> [tokens, last time, suppressed]
+        self._sampled = {}  # (path, line) -> records seen
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or hasattr(record, "payload"):
+            return True
+        with self._lock:
+            every = getattr(record, "sample_every", None)
+            if every and every > 1:
+                site = (record.pathname, record.lineno)
+                seen = self._sampled.get(site, 0)
+                self._sampled[site] = seen + 1
+                if seen % every:
+                    return False
+
+            rate, burst = self.limits.get(record.name, self.default)
+            bucket = self._buckets.get(record.name)
+            if bucket is None:
+                bucket = self._buckets[record.name] = [burst, record.created, 0]
+            tokens = min(burst, bucket[0] + (record.created - bucket[1]) * rate)
+            bucket[1] = record.created
+            if tokens < 1:
+                bucket[0] = tokens
+                bucket[2] += 1
+                return False
+            bucket[0] = tokens - 1
+            if bucket[2]:
+                record.msg = f"{record.msg} [{bucket[2]} earlier messages rate-limited]"
+                bucket[2] = 0
+        return True
+
+
+class PayloadStore:
+    """
+    Append-only gzipped JSON lines, rotated once a file reaches segment_bytes
+    of uncompressed text. A store that finds a file left by an earlier
+    session rotates it first, so every session starts a fresh segment.
+    """
+
+    def __init__(self, path=PAYLOAD_STORE, segment_bytes=PAYLOAD_SEGMENT_BYTES, segments=PAYLOAD_SEGMENTS):
+        self.path = path
+        self.segment_bytes = segment_bytes
+        self.segments = segments
+        self._file = None
+        self._written = 0
+
+    def _segment_path(self, n):
+        if n == 0:
+            return self.path
+        base, ext = self.path.split(".", 1) if "." in self.path else (self.path, "")
+        return f"{base}.{n}.{ext}" if ext else f"{base}.{n}"
+
+    def _rotate(self):
+        self.close()
+        for n in range(self.segments - 1, 0, -1):
+            if os.path.exists(self._segment_path(n - 1)):
+                os.replace(self._segment_path(n - 1), self._segment_path(n))
+
+    def write(self, entry):
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+        if self._file is not None and self._written + len(line) > self.segment_bytes:
+            self._rotate()
+        if self._file is None:
+            if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+                self._rotate()
+            self._file = gzip.open(self.path, "ab")
+            self._written = 0
+        self._file.write(line)
+        self._written += len(line)
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class PayloadHandler(logging.Handler):
+    """Writes the payload a record carries (see log_payload) to a PayloadStore."""
+
+    def __init__(self, store):
+        super().__init__()
+        self.store = store
+
+    def emit(self, record):
+        payload = getattr(record, "payload", None)
+        if payload is None:
+            return
+        try:
+            self.store.write({"id": record.payload_id, "kind": record.payload_kind,
+                              "time": record.created, "text": payload})
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        self.store.flush()
+
+    def close(self):
+        self.store.close()
+        super().close()
+
+
+def log_payload(label, text, kind="llm", level=logging.INFO):
+    """
+    Logs a prompt or LLM response: the text goes to the payload store and
+    game.log gets a one-line reference to it. Returns the payload ID, or
+    None if logging at `level` is off.
+    """
+    if text is None or not logging.getLogger().isEnabledFor(level):
+        return None
+    payload_id = f"{_session}-{next(_payload_ids)}"
+    preview = " ".join(text[:PAYLOAD_PREVIEW].split())
+    logging.log(level, f"--- {label} --- [payload {payload_id}, {len(text)} chars] {preview}",
+                extra={"payload": text, "payload_id": payload_id, "payload_kind": kind})
+    return payload_id
+
+
+def setup_logging(path="game.log", level=logging.INFO, payload_path=PAYLOAD_STORE):
+    """Routes the root logger through a queue to game.log and the payload store."""
+    file_handler = RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, delay=True)
+    if os.path.exists(path) and os.path.getsize(path) > 0:
+        file_handler.doRollover()  # Each session starts a fresh game.log
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    _handlers[:] = [file_handler, PayloadHandler(PayloadStore(payload_path))]
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter())
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(queue_handler)
+    _queue_handlers.append(queue_handler)
+    _start_listener(log_queue)
+
+    atexit.register(shutdown_logging)
+    previous_hook = sys.excepthook
+
+    def flush_on_crash(exc_type, exc, tb):
+        logging.critical("Uncaught exception", exc_info=(exc_type, exc, tb))
+        shutdown_logging()
+        previous_hook(exc_type, exc, tb)
+
+    sys.excepthook = flush_on_crash
+    return file_handler.baseFilename
+
+
+def _start_listener(log_queue):
+    listener = QueueListener(log_queue, *_handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+    return listener
+
+
+def forward_queue(context):
+    """
+    A multiprocessing queue another process can log into (see
+    attach_queue), drained by this process's handlers. None when logging
+    isn't set up.
+    """
+    if not _handlers:
+        return None
+    log_queue = context.Queue()
+    _start_listener(log_queue)
+    return log_queue
+
+
+def attach_queue(log_queue, level=logging.INFO):
+    """In a child process: sends the root logger's records to the parent's log."""
+    handler = QueueHandler(log_queue)
+    handler.setFormatter(logging.Formatter("%(processName)s - %(message)s"))
+    handler.addFilter(RateLimitFilter())
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(handler)
+
+
+def shutdown_logging():
+    """Drains every queue into the files and closes them. Safe to call twice."""
+    root = logging.getLogger()
+    while _queue_handlers:
+        root.removeHandler(_queue_handlers.pop())
+    while _listeners:
+        listener = _listeners.pop()
+        try:
+            listener.stop()
+        except Exception:
+            pass
+    for handler in _handlers:
+        handler.flush()
+        handler.close()
+    _handlers.clear()
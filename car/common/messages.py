@@ -18,3 +18,9 @@ class ModelLoadingFailed(Message):
     def __init__(self, error: str) -> None:
         self.error = error
         super().__init__()
+
+class KeyRelease(Message):
+    """Posted when the terminal reports a key going up (kitty keyboard protocol)."""
+    def __init__(self, key: str) -> None:
+        self.key = key
+        super().__init__()
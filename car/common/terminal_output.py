@@ -0,0 +1,248 @@
+"""
+Keeps the game view's terminal output within what the link can carry.
+
+Over SSH or tmux the full-screen redraw every frame is what makes the game
+stutter: every cell run is written with its own truecolor escape. The
+`render_output` setting picks how the game view draws:
+
+  "truecolor"  draw every changed frame in the terminal's full palette
+  "256", "16"  snap colours to that palette, and start the terminal in it
+  "adaptive"   measure the bytes written each second against
+               `output_budget_kb` and step down through coarser palettes
+               (fewer distinct colours, longer runs) and then frame-rate
+               caps while the link is saturated, stepping back up once it
+               has been comfortably under budget for a few seconds
+
+Every mode skips frames identical to the last one drawn.
+"""
+
+import os
+import logging
+
+from rich.color import ColorSystem, ColorType, Color, EIGHT_BIT_PALETTE, STANDARD_PALETTE
+from rich.style import Style
+
+OUTPUT_MODES = ("truecolor", "adaptive", "256", "16")
+
+# The colour system Textual is started with for each mode. Textual reads it
+# once, at import, so it can't follow the adaptive level at runtime.
+TERMINAL_COLOR_SYSTEMS = {"256": "256", "16": "standard"}
+
+PALETTE_FULL = None
+PALETTE_256 = ColorSystem.EIGHT_BIT
+PALETTE_16 = ColorSystem.STANDARD
+
+# Adaptive levels, lightest first: (palette, frame-rate cap)
+ADAPTIVE_LEVELS = (
+    (PALETTE_FULL, None),
+    (PALETTE_256, None),
+    (PALETTE_16, None),
+    (PALETTE_16, 15),
+    (PALETTE_16, 10),
+)
+
+WINDOW_SECONDS = 1.0
+STEP_UP_FRACTION = 0.5  # Under this share of the budget counts as calm
+STEP_UP_WINDOWS = 3     # Calm windows in a row before stepping back up
+
+# Escape bytes around each row besides its runs: the cursor move and newline.
+ROW_OVERHEAD = 8
+
+_PALETTE_LABELS = {PALETTE_FULL: "full", PALETTE_256: "256c", PALETTE_16: "16c"}
+_PALETTE_TRIPLETS = {PALETTE_256: EIGHT_BIT_PALETTE, PALETTE_16: STANDARD_PALETTE}
+
+
+def apply_color_system(mode):
+    """
+    Starts Textual in the colour system of a fixed-palette mode. Must run
+    before textual is imported; an explicit TEXTUAL_COLOR_SYSTEM wins.
+    """
+    color_system = TERMINAL_COLOR_SYSTEMS.get(mode)
+    if color_system:
+        os.environ.setdefault("TEXTUAL_COLOR_SYSTEM", color_system)
+
+
+_snapped = {}
+
+
+def _snap_color(color, palette):
+    if color is None or color.type not in (ColorType.TRUECOLOR, ColorType.EIGHT_BIT):
+        return color
+    number = color.downgrade(palette).number
+    if number is None:
+        return color
+    return Color.from_triplet(_PALETTE_TRIPLETS[palette][number])
+
+
+def quantize(style, palette):
+    """`style` with its colours snapped to `palette`; named colours are kept."""
+    if palette is PALETTE_FULL:
+        return style
+    key = (style, palette)
+    snapped = _snapped.get(key)
+    if snapped is None:
+        snapped = style + Style(color=_snap_color(style.color, palette),
+                                bgcolor=_snap_color(style.bgcolor, palette))
+        _snapped[key] = snapped
+    return snapped
+
+
+_blank_keys = {}
+
+
+def _blank_key(style):
+    """What a space in `style` looks like on screen."""
+    key = _blank_keys.get(style)
+    if key is None:
+        key = (style.bgcolor, style.color if style.reverse else None, style.underline, style.strike)
+        _blank_keys[style] = key
+    return key
+
+
+def canvas_runs(canvas, styles, palette=PALETTE_FULL):
+    """
+    Run-length encodes grids of characters and styles into rows of
+    (text, style) runs, colours snapped to `palette`.
+    """
+    rows = []
+    for y, row in enumerate(canvas):
+        runs = []
+        if row:
+            style_row = styles[y]
+            run = [row[0]]
+            run_style = quantize(style_row[0], palette)
+            run_blank = _blank_key(run_style)
+            for x in range(1, len(row)):
+                char = row[x]
+                style = quantize(style_row[x], palette)
+                # A blank cell only shows its background, so it can join any
+                # run that shares it.
+                if style == run_style or (char == " " and _blank_key(style) == run_blank):
+                    run.append(char)
+                else:
+                    runs.append(("".join(run), run_style))
+                    run = [char]
+                    run_style = style
+                    run_blank = _blank_key(style)
+            runs.append(("".join(run), run_style))
+        rows.append(tuple(runs))
+    return tuple(rows)
+
+
+_escape_lengths = {}
+
+
+def escape_length(style, color_system):
+    """Bytes of escape code written around a run in `style`."""
+    key = (style, color_system)
+    length = _escape_lengths.get(key)
+    if length is None:
+        # Style caches its codes for the first colour system asked, so the
+        # colours are downgraded here.
+        codes = [style.without_color._make_ansi_codes(color_system)] if style.without_color else []
+        if style.color is not None:
+            codes.extend(style.color.downgrade(color_system).get_ansi_codes(foreground=True))
+        if style.bgcolor is not None:
+            codes.extend(style.bgcolor.downgrade(color_system).get_ansi_codes(foreground=False))
+        codes = ";".join(code for code in codes if code)
+        length = len(f"\x1b[{codes}m\x1b[0m") if codes else 0
+        _escape_lengths[key] = length
+    return length
+
+
+def frame_bytes(runs, color_system):
+    """Estimated bytes to draw rows of (text, style) runs."""
+    total = 0
+    for row in runs:
+        total += ROW_OVERHEAD
+        for text, style in row:
+            total += len(text.encode("utf-8")) + escape_length(style, color_system)
+    return total
+
+
+class OutputGovernor:
+    """Decides which frames the game view draws, and in which palette."""
+
+    def __init__(self, mode="truecolor", budget_kb=128):
+        if mode not in OUTPUT_MODES:
+            logging.warning(f"Unknown render_output '{mode}', using truecolor.")
+            mode = "truecolor"
+        self.mode = mode
+        self.budget = max(1, budget_kb) * 1024
+        self.level = 0
+        self._calm_windows = 0
+        self._last_draw = None
+        self._window_start = None
+        self._window_bytes = 0
+        self._window_drawn = 0
+        self._window_skipped = 0
+        self.rate = 0.0
+        self.skip_share = 0.0
+
+    @property
+    def palette(self):
+        if self.mode == "256":
+            return PALETTE_256
+        if self.mode == "16":
+            return PALETTE_16
+        if self.mode == "adaptive":
+            return ADAPTIVE_LEVELS[self.level][0]
+        return PALETTE_FULL
+
+    @property
+    def fps_cap(self):
+        if self.mode == "adaptive":
+            return ADAPTIVE_LEVELS[self.level][1]
+        return None
+
+    def ready(self, now):
+        """False while a frame-rate cap holds the next frame back."""
+        cap = self.fps_cap
+        return cap is None or self._last_draw is None or now - self._last_draw >= 1.0 / cap
+
+    def frame_drawn(self, nbytes, now):
+        self._last_draw = now
+        self._window_bytes += nbytes
+        self._window_drawn += 1
+        self._roll_window(now)
+
+    def frame_skipped(self, now):
+        self._window_skipped += 1
+        self._roll_window(now)
+
+    def _roll_window(self, now):
+        if self._window_start is None:
+            self._window_start = now
+            return
+        elapsed = now - self._window_start
+        if elapsed < WINDOW_SECONDS:
+            return
+        self.rate = self._window_bytes / elapsed
+        frames = self._window_drawn + self._window_skipped
+        self.skip_share = self._window_skipped / frames if frames else 0.0
+        self._window_start = now
+        self._window_bytes = self._window_drawn = self._window_skipped = 0
+        if self.mode == "adaptive":
+            self._adapt()
+
+    def _adapt(self):
+        if self.rate > self.budget:
+            self._calm_windows = 0
+            if self.level < len(ADAPTIVE_LEVELS) - 1:
+                self.level += 1
+                logging.info(f"Terminal output {self.rate / 1024:.0f} KB/s over budget, stepping down to {self.summary()}")
+        elif self.rate < self.budget * STEP_UP_FRACTION:
+            self._calm_windows += 1
+            if self._calm_windows >= STEP_UP_WINDOWS and self.level > 0:
+                self.level -= 1
+                self._calm_windows = 0
+        else:
+            self._calm_windows = 0
+
+    def summary(self):
+        """Short status for the dev FPS counter, e.g. '84 KB/s 16c cap 15 skip 12%'."""
+        parts = [f"{self.rate / 1024:.0f} KB/s", _PALETTE_LABELS[self.palette]]
+        if self.fps_cap:
+            parts.append(f"cap {self.fps_cap}")
+        parts.append(f"skip {self.skip_share:.0%}")
+        return " ".join(parts)
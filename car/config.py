@@ -5,13 +5,23 @@ import logging
 SETTINGS_FILE = "settings.json"
 
 DEFAULT_SETTINGS = {
-    "generation_mode": "local",  # "local" or "gemini_cli"
+    "generation_mode": "local",  # "local", "gemini_cli", or "replay" (recorded responses, see logic/llm_replay.py)
     "model_size": "small",       # "small" (Qwen3-4B) or "large" (Qwen3-8B), used when generation_mode == "local"
     "cli_preset": "gemini",      # "gemini", "claude", or "custom" — which CLI tool to use when generation_mode == "gemini_cli"
     "custom_cli_command": "",    # command name for custom preset (e.g. "ollama")
     "custom_cli_args": "",       # extra args for custom preset (e.g. "run llama3 -p")
     "dev_mode": False,
-    "dev_quick_start": False     # skip LLM generation and use fallback data for instant game start
+    "dev_quick_start": False,    # skip LLM generation and use fallback data for instant game start
+    "autosave_interval": 300,    # seconds between background autosaves; 0 disables autosave
+    "simulation_process": False, # run the world simulation in a separate process (see workers/simulation_process.py)
+    "record_llm_responses": False,  # append every live LLM response to replay_store
+    "replay_store": "recordings/llm_responses.jsonl",
+    "replay_latency": "none",    # "none" or "recorded" — how long replayed responses take
+    "render_output": "truecolor",  # "truecolor", "adaptive", "256" or "16" — see common/terminal_output.py
+    "output_budget_kb": 128,     # terminal output budget in KB/s for render_output == "adaptive"
+    "record_sessions": False,    # write every world tick to a replay file (see logic/session_replay.py)
+    "session_recording_dir": "recordings/sessions",
+    "key_release_events": True   # track held keys by key-up events where the terminal reports them (see common/key_input.py)
 }
 
 def save_settings(settings: dict):
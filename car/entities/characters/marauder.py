@@ -1,6 +1,7 @@
 import random
 from ..character import Character
 from ...logic.ai_behaviors import execute_behavior
+from ...logic.ai_phases import phase_graph
 from ...data.game_constants import GLOBAL_SPEED_MULTIPLIER
 
 class Marauder(Character):
@@ -29,19 +30,20 @@ class Marauder(Character):
         self.current_phase = self.phases[0]
         self.phase_timer = random.uniform(*self.current_phase["duration"])
 
-    def update(self, game_state, world, dt):
+    def think(self, game_state, dt):
         self.ai_state["elapsed"] = self.ai_state.get("elapsed", 0) + dt
         self.phase_timer -= dt
 
         if self.phase_timer <= 0:
-            next_phase_options = list(self.current_phase["next_phases"].keys())
-            next_phase_weights = list(self.current_phase["next_phases"].values())
-            new_phase_name = random.choices(next_phase_options, weights=next_phase_weights, k=1)[0]
-            self.current_phase = next((p for p in self.phases if p["name"] == new_phase_name), self.phases[0])
+            graph = phase_graph(self)
+            index = graph.choose(graph.index_of(self.current_phase))
+            self.current_phase = graph.phases[index] if index is not None else self.phases[0]
             self.phase_timer = random.uniform(*self.current_phase["duration"])
 
-        execute_behavior(self.current_phase["behavior"], self, game_state, self)
+        return self.current_phase["behavior"]
 
+    def update(self, game_state, world, dt):
+        execute_behavior(self.think(game_state, dt), self, game_state, self)
         self._move_with_terrain_check(world, dt)
 
     def draw(self, stdscr, game_state, world_start_x, world_start_y, color_map):
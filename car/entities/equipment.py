@@ -2,6 +2,8 @@ import uuid
 from ..data.equipment import EQUIPMENT_DATA
 
 class Equipment:
+    _bonuses = None  # (modifiers, bonuses) the stat bonuses were resolved from
+
     def __init__(self, equipment_type_id, modifiers=None, instance_id=None, name=None, description=None, rarity=None):
         self.equipment_type_id = equipment_type_id
         self.base_stats = EQUIPMENT_DATA[self.equipment_type_id]
@@ -33,12 +35,19 @@ class Equipment:
 
     @property
     def stat_bonuses(self):
-        """Returns the final stat bonuses dict after applying rarity modifiers."""
+        """
+        Returns the final stat bonuses dict after applying rarity modifiers.
+        Resolved once per `modifiers` dict; callers must not edit it.
+        """
+        cached = self._bonuses
+        if cached is not None and cached[0] is self.modifiers:
+            return cached[1]
         bonuses = dict(self.base_stats.get("bonuses", {}))
         for stat, value in bonuses.items():
             modifier_key = f"{stat}_boost"
             if modifier_key in self.modifiers:
                 bonuses[stat] = round(value * self.modifiers[modifier_key], 3)
+        self._bonuses = (self.modifiers, bonuses)
         return bonuses
 
     @property
@@ -1,7 +1,8 @@
 from .base import Entity
 import random
 import logging
-from ..logic.ai_behaviors import execute_behavior, BEHAVIOR_COSTS
+from ..logic.ai_behaviors import execute_behavior
+from ..logic.ai_phases import phase_graph
 
 CYCLE_LENGTH = 5
 UNIVERSAL_FILLER_PHASES = [
@@ -33,6 +34,10 @@ class Vehicle(Entity):
         self.phase_timer = random.uniform(*self.current_phase["duration"])
         self._reset_budget(None)
 
+    def _phase_graph(self):
+        """This class's phases, compiled once (see logic/ai_phases.py)."""
+        return phase_graph(self, UNIVERSAL_FILLER_PHASES)
+
     def _get_budget(self, game_state):
         """Calculate total budget from difficulty + player level."""
         base = 5
@@ -56,24 +61,13 @@ class Vehicle(Entity):
             if self.cycle_phases_remaining <= 0:
                 self._reset_budget(game_state)
 
-            candidates = []
-            if self.current_phase.get("next_phases"):
-                for phase_name, weight in self.current_phase["next_phases"].items():
-                    phase = next((p for p in self.phases if p["name"] == phase_name), None)
-                    if phase:
-                        cost = BEHAVIOR_COSTS.get(phase["behavior"], 0)
-                        if cost <= self.budget_remaining:
-                            candidates.append((phase, weight))
-
-            if candidates:
-                phases, weights = zip(*candidates)
-                chosen = random.choices(phases, weights=weights, k=1)[0]
-            else:
-                chosen = random.choice(UNIVERSAL_FILLER_PHASES)
-
-            self.budget_remaining -= BEHAVIOR_COSTS.get(chosen["behavior"], 0)
+            graph = self._phase_graph()
+            index = graph.choose(graph.index_of(self.current_phase), self.budget_remaining)
+            chosen = graph.phases[index]
+
+            self.budget_remaining -= graph.costs[index]
             self.current_phase = chosen
-            self.phase_timer = random.uniform(*chosen["duration"])
+            self.phase_timer = random.uniform(*graph.durations[index])
 
             # Clear ram sub-state when leaving a RAM phase
             if chosen["behavior"] != "RAM" and "ram_substate" in self.ai_state:
@@ -127,8 +121,12 @@ class Vehicle(Entity):
         self.vx = 0
         self.vy = 0
 
+    def think(self, game_state, dt):
+        """Advances the AI phase and returns the behavior to steer by this tick."""
+        self._advance_phase(game_state, dt)
+        return self.current_phase["behavior"]
+
     def update(self, game_state, world, dt):
         """Default enemy vehicle update: advance phase, execute, move."""
-        self._advance_phase(game_state, dt)
-        execute_behavior(self.current_phase["behavior"], self, game_state, self)
+        execute_behavior(self.think(game_state, dt), self, game_state, self)
         self._move_with_terrain_check(world, dt)
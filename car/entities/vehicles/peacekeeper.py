@@ -82,9 +82,8 @@ class Peacekeeper(Vehicle):
         self._initialize_ai()
         self.aggro_radius = 25
 
-    def update(self, game_state, world, dt):
+    def think(self, game_state, dt):
         import random
-        from ...logic.ai_behaviors import execute_behavior
 
         dist_to_player = ((self.x - game_state.car_world_x)**2 + (self.y - game_state.car_world_y)**2)**0.5
 
@@ -98,7 +97,7 @@ class Peacekeeper(Vehicle):
             self.ai_state["elapsed"] = self.ai_state.get("elapsed", 0) + dt
             self.phase_timer -= dt
             if dist_to_player <= self.aggro_radius:
-                self.current_phase = next((p for p in self.phases if p["name"] == "Engage"), self.phases[1])
+                self.current_phase = self._phase_graph().phase_named("Engage", self.phases[1])
                 self.phase_timer = random.uniform(*self.current_phase["duration"])
             elif self.phase_timer <= 0:
                 self.phase_timer = random.uniform(*self.current_phase["duration"])
@@ -106,9 +105,7 @@ class Peacekeeper(Vehicle):
             # Combat phases use budget-aware transitions
             self._advance_phase(game_state, dt)
 
-        execute_behavior(self.current_phase["behavior"], self, game_state, self)
-
-        self._move_with_terrain_check(world, dt)
+        return self.current_phase["behavior"]
 
     def draw(self, stdscr, game_state, world_start_x, world_start_y, color_map):
         from ...rendering.draw_utils import draw_sprite
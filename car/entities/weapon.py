@@ -1,7 +1,45 @@
 import uuid
+from typing import NamedTuple
 from ..data.weapons import WEAPONS_DATA
+from ..data.game_constants import GLOBAL_SPEED_MULTIPLIER
+
+
+class WeaponStats(NamedTuple):
+    """A weapon's stats with its modifiers applied, plus what firing derives from them."""
+    modifiers: dict
+    damage: float
+    fire_rate: float
+    range: float
+    pellet_count: int
+    spread_angle: float
+    pellet_offsets: tuple   # Angle of each pellet relative to the aim
+    ammo_type: str
+    projectile_char: str    # The particle, or "*" for explosive rounds
+    projectile_speed: float
+    is_flame: bool
+
+    @classmethod
+    def resolve(cls, weapon_type_id, base_stats, modifiers):
+        damage = base_stats["power"] * modifiers.get("damage_boost", 1)
+        fire_rate = base_stats["fire_rate"] * modifiers.get("fire_rate_boost", 1)
+        weapon_range = base_stats["range"] * modifiers.get("range_boost", 1)
+        pellets = base_stats.get("pellet_count", 1) + modifiers.get("pellet_count_boost", 0)
+        spread = base_stats.get("spread_angle", 0)
+        if pellets > 1:
+            offsets = tuple((i - (pellets - 1) / 2) * spread / (pellets - 1) for i in range(pellets))
+        else:
+            offsets = (0,) * pellets
+        explosive = modifiers.get("special_effect") == "explosive_rounds"
+        return cls(
+            modifiers, damage, fire_rate, weapon_range, pellets, spread, offsets,
+            base_stats["ammo_type"], "*" if explosive else base_stats["particle"],
+            base_stats["speed"] * GLOBAL_SPEED_MULTIPLIER, weapon_type_id == "wep_flamethrower",
+        )
+
 
 class Weapon:
+    _stats = None
+
     def __init__(self, weapon_type_id, modifiers=None, instance_id=None, name=None, description=None, rarity=None):
         self.weapon_type_id = weapon_type_id
         self.base_stats = WEAPONS_DATA[self.weapon_type_id]
@@ -27,37 +65,36 @@ class Weapon:
     def price(self):
         return self.base_stats["price"]
 
+    @property
+    def stats(self):
+        """
+        The resolved WeaponStats, rebuilt when `modifiers` is replaced.
+        Modifiers are never edited in place; assign a new dict instead.
+        """
+        stats = self._stats
+        if stats is None or stats.modifiers is not self.modifiers:
+            stats = self._stats = WeaponStats.resolve(self.weapon_type_id, self.base_stats, self.modifiers)
+        return stats
+
     @property
     def damage(self):
-        base_damage = self.base_stats["power"]
-        if "damage_boost" in self.modifiers:
-            base_damage *= self.modifiers["damage_boost"]
-        return base_damage
+        return self.stats.damage
 
     @property
     def fire_rate(self):
-        base_fire_rate = self.base_stats["fire_rate"]
-        if "fire_rate_boost" in self.modifiers:
-            base_fire_rate *= self.modifiers["fire_rate_boost"]
-        return base_fire_rate
+        return self.stats.fire_rate
 
     @property
     def range(self):
-        base_range = self.base_stats["range"]
-        if "range_boost" in self.modifiers:
-            base_range *= self.modifiers["range_boost"]
-        return base_range
+        return self.stats.range
 
     @property
     def pellet_count(self):
-        base_pellet_count = self.base_stats.get("pellet_count", 1)
-        if "pellet_count_boost" in self.modifiers:
-            base_pellet_count += self.modifiers["pellet_count_boost"]
-        return base_pellet_count
+        return self.stats.pellet_count
 
     @property
     def spread_angle(self):
-        return self.base_stats.get("spread_angle", 0)
+        return self.stats.spread_angle
         
     @property
     def ammo_type(self):
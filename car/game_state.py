@@ -1,11 +1,28 @@
+import logging
 import math
 import random
 import importlib
+from typing import NamedTuple
 from .entities.weapon import Weapon
 from .logic.entity_loader import PLAYER_CARS
 from .data import *
 from .data.game_constants import LEVEL_STAT_BONUS_PER_LEVEL, MAX_LEVEL
 from .data.equipment import EQUIPMENT_SLOTS
+from .world.world_index import WorldIndex
+
+class PlayerStats(NamedTuple):
+    """The player car's effective stats for one level and set of equipment."""
+    key: tuple
+    max_speed: float
+    acceleration_factor: float
+    turn_rate: float
+    braking_power: float
+    weapon_aim_speed: float
+    max_durability: int
+    gas_capacity: int
+    damage_modifier: float
+    gas_consumption_rate: float
+
 
 class GameState:
     def __init__(self, selected_car_index, difficulty, difficulty_mods, car_color_names, factions, theme=None):
@@ -17,6 +34,8 @@ class GameState:
         self.factions = factions
         self.theme = theme if theme is not None else {"name": "Default", "description": "A standard wasteland adventure."}
         self.story_intro = ""
+        self.world_index = WorldIndex()
+        self._world_triggers = []
         self.world_details = {}
         
         # --- Triggers ---
@@ -54,6 +73,7 @@ class GameState:
         self.braking_power = 0
         self.weapon_aim_speed = 0.0
         self.level_damage_modifier = 1.0
+        self.player_stats = None  # PlayerStats the fields above were set from
 
         # --- XP and Level Variables ---
         self.player_level = 1
@@ -119,6 +139,7 @@ class GameState:
         self.gas_consumption_scaler = 0.01
         self.drag_coefficient = 0.03
         self.friction_coefficient = 0.08
+        self.base_gas_consumption_rate = 0.01
         self.gas_consumption_rate = 0.01
 
         # --- World and Entity State ---
@@ -136,6 +157,7 @@ class GameState:
         self.enemy_spawn_timer = 0
         self.active_turrets = []
         self.turret_spawn_timer = 0
+        self.initial_spawns_remaining = 0  # Initial population still to place, a few per frame
         
         # --- Quest State ---
         self.active_quests = []         # List of Quest objects, max 3
@@ -150,6 +172,10 @@ class GameState:
         self.quest_cache = {}
         self.quests_completed = 0
 
+        # --- Generated Content (logic/content_cache.py) ---
+        self.dialog_cache = {}    # content key -> shop dialog dict or city-hall dialog text
+        self.content_stamps = {}  # content key -> faction state the content was generated against
+
         # --- Story / Journal ---
         self.story_events = []  # List of {"text": str, "event_type": str}
 
@@ -157,9 +183,7 @@ class GameState:
         self.visited_cities = {(0, 0)}  # Set of (grid_x, grid_y) tuples; start city is always visited
 
         # --- Building Destruction State ---
-        self.damaged_buildings = {}      # {(gx,gy,idx): current_hp}
-        self.destroyed_buildings = set() # {(gx,gy,idx)}
-        self.buildings_destroyed_per_city = {}  # {(gx,gy): count}
+        self.city_damage = {}  # {(gx,gy): CityDamage} for every city that has taken damage
 
         # --- UI and Game Flow State ---
         self.shop_cooldown = 0
@@ -190,6 +214,26 @@ class GameState:
 
         self.apply_level_bonuses()
 
+    @property
+    def world_details(self):
+        return self._world_details
+
+    @world_details.setter
+    def world_details(self, value):
+        """Stores the world details and rebuilds the landmark/city lookups."""
+        self._world_details = value if value is not None else {}
+        self.world_index.set_world_details(self._world_details)
+
+    @property
+    def world_triggers(self):
+        return self._world_triggers
+
+    @world_triggers.setter
+    def world_triggers(self, value):
+        """Stores the world triggers and rebuilds the spatial trigger buckets."""
+        self._world_triggers = value if value is not None else []
+        self.world_index.set_triggers(self._world_triggers)
+
     @property
     def all_entities(self):
         """Returns a combined list of all active entities."""
@@ -213,72 +257,73 @@ class GameState:
                 break
 
     def apply_level_bonuses(self):
-        level_bonus_multiplier = 1.0 + (self.player_level - 1) * LEVEL_STAT_BONUS_PER_LEVEL
-
-        self.max_speed = self.base_max_speed * level_bonus_multiplier * GLOBAL_SPEED_MULTIPLIER
-        self.acceleration_factor = self.base_acceleration_factor * level_bonus_multiplier
-        self.turn_rate = self.base_turn_rate * level_bonus_multiplier
-        self.braking_power = self.base_braking_power * level_bonus_multiplier
-        self.weapon_aim_speed = self.base_weapon_aim_speed * level_bonus_multiplier
-
-        new_max_durability = int(self.base_max_durability * level_bonus_multiplier)
-        durability_increase = new_max_durability - self.max_durability
-        self.max_durability = new_max_durability
+        """
+        Brings the effective stats in line with the level and equipment.
+        Everything is resolved from the base stats in one pass, so repeated
+        calls agree; when neither changed this does nothing.
+        """
+        key = (self.player_level,) + tuple(
+            (equipment.instance_id, id(equipment.stat_bonuses)) if equipment else None
+            for equipment in self.equipped_equipment.values()
+        )
+        if self.player_stats is not None and self.player_stats.key == key:
+            return
+        stats = self._resolve_player_stats(key)
+        self.player_stats = stats
+
+        self.max_speed = stats.max_speed
+        self.acceleration_factor = stats.acceleration_factor
+        self.turn_rate = stats.turn_rate
+        self.braking_power = stats.braking_power
+        self.weapon_aim_speed = stats.weapon_aim_speed
+        self.level_damage_modifier = stats.damage_modifier
+        self.gas_consumption_rate = stats.gas_consumption_rate
+
+        durability_increase = stats.max_durability - self.max_durability
+        self.max_durability = stats.max_durability
         self.current_durability = min(self.max_durability, self.current_durability + durability_increase)
-        if self.player_level == 1:
-            self.current_durability = self.max_durability
-
-        new_gas_capacity = int(self.base_gas_capacity * level_bonus_multiplier)
-        gas_increase = new_gas_capacity - self.gas_capacity
-        self.gas_capacity = new_gas_capacity
+        gas_increase = stats.gas_capacity - self.gas_capacity
+        self.gas_capacity = stats.gas_capacity
         self.current_gas = min(self.gas_capacity, self.current_gas + gas_increase)
         if self.player_level == 1:
+            self.current_durability = self.max_durability
             self.current_gas = self.gas_capacity
 
-        self.level_damage_modifier = level_bonus_multiplier
-
-        self.apply_equipment_bonuses()
-
-    def apply_equipment_bonuses(self):
-        """Applies stat modifiers from all equipped equipment."""
+    def _resolve_player_stats(self, key):
+        """Level bonuses, then the combined multipliers of all equipped equipment."""
+        level_bonus_multiplier = 1.0 + (self.player_level - 1) * LEVEL_STAT_BONUS_PER_LEVEL
         combined = {}
-        for slot_name, equipment in self.equipped_equipment.items():
+        for equipment in self.equipped_equipment.values():
             if equipment:
                 for stat, multiplier in equipment.stat_bonuses.items():
-                    if stat in combined:
-                        combined[stat] = combined[stat] * multiplier
-                    else:
-                        combined[stat] = multiplier
-
-        if "speed" in combined:
-            self.max_speed *= combined["speed"]
-        if "acceleration" in combined:
-            self.acceleration_factor *= combined["acceleration"]
-        if "handling" in combined:
-            self.turn_rate *= combined["handling"]
-        if "braking" in combined:
-            self.braking_power *= combined["braking"]
-        if "weapon_aim_speed" in combined:
-            self.weapon_aim_speed *= combined["weapon_aim_speed"]
-        if "damage" in combined:
-            self.level_damage_modifier *= combined["damage"]
-        if "fire_rate" in combined:
-            self.level_damage_modifier *= combined["fire_rate"]
+                    combined[stat] = combined[stat] * multiplier if stat in combined else multiplier
+
+        max_durability = int(self.base_max_durability * level_bonus_multiplier)
         if "durability" in combined:
-            new_max = int(self.max_durability * combined["durability"])
-            increase = new_max - self.max_durability
-            self.max_durability = new_max
-            self.current_durability = min(self.max_durability, self.current_durability + increase)
+            max_durability = int(max_durability * combined["durability"])
+        gas_capacity = int(self.base_gas_capacity * level_bonus_multiplier)
         if "fuel_capacity" in combined:
-            new_cap = int(self.gas_capacity * combined["fuel_capacity"])
-            increase = new_cap - self.gas_capacity
-            self.gas_capacity = new_cap
-            self.current_gas = min(self.gas_capacity, self.current_gas + increase)
-        if "fuel_efficiency" in combined:
-            self.gas_consumption_rate *= (2.0 - combined["fuel_efficiency"])
+            gas_capacity = int(gas_capacity * combined["fuel_capacity"])
+
+        return PlayerStats(
+            key=key,
+            max_speed=self.base_max_speed * level_bonus_multiplier * GLOBAL_SPEED_MULTIPLIER * combined.get("speed", 1),
+            acceleration_factor=self.base_acceleration_factor * level_bonus_multiplier * combined.get("acceleration", 1),
+            turn_rate=self.base_turn_rate * level_bonus_multiplier * combined.get("handling", 1),
+            braking_power=self.base_braking_power * level_bonus_multiplier * combined.get("braking", 1),
+            weapon_aim_speed=self.base_weapon_aim_speed * level_bonus_multiplier * combined.get("weapon_aim_speed", 1),
+            max_durability=max_durability,
+            gas_capacity=gas_capacity,
+            damage_modifier=level_bonus_multiplier * combined.get("damage", 1) * combined.get("fire_rate", 1),
+            gas_consumption_rate=self.base_gas_consumption_rate * (2.0 - combined.get("fuel_efficiency", 1.0)),
+        )
 
     def to_dict(self):
-        """Serializes the game state to a dictionary."""
+        """
+        Serializes the game state to a dictionary.
+        Mutable containers are copied, so the result is a snapshot that can be
+        written out on another thread while the game keeps running.
+        """
         inventory_dict = [item.to_dict() for item in self.player_inventory]
         mounted_weapons_dict = {
             mount: weapon.to_dict() if weapon else None
@@ -289,7 +334,7 @@ class GameState:
             # Game Config
             "selected_car_index": self.selected_car_index,
             "difficulty": self.difficulty,
-            "car_color_names": self.car_color_names,
+            "car_color_names": list(self.car_color_names),
             "theme": self.theme,
             "story_intro": self.story_intro,
             "world_details": self.world_details,
@@ -311,8 +356,8 @@ class GameState:
             # Inventory & Weapons
             "player_inventory": inventory_dict,
             "mounted_weapons": mounted_weapons_dict,
-            "ammo_counts": self.ammo_counts,
-            "weapon_enabled": self.weapon_enabled,
+            "ammo_counts": dict(self.ammo_counts),
+            "weapon_enabled": dict(self.weapon_enabled),
             "equipped_equipment": {
                 slot: equip.to_dict() if equip else None
                 for slot, equip in self.equipped_equipment.items()
@@ -320,21 +365,27 @@ class GameState:
             "player_scrap": self.player_scrap,
             
             # Quest & Faction State
-            "faction_reputation": self.faction_reputation,
-            "faction_control": self.faction_control,
+            "faction_reputation": dict(self.faction_reputation),
+            "faction_control": dict(self.faction_control),
             "defeated_bosses": list(self.defeated_bosses), # Convert set to list
             "activated_triggers": list(self.activated_triggers),
             "active_quests": [q.to_dict() for q in self.active_quests],
             "selected_quest_index": self.selected_quest_index,
             "quests_completed": self.quests_completed,
             "karma": self.karma,
-            "story_events": self.story_events,
+            "story_events": list(self.story_events),
             "visited_cities": [list(c) for c in self.visited_cities],
 
             # Building Destruction
-            "damaged_buildings": {f"{k[0]},{k[1]},{k[2]}": v for k, v in self.damaged_buildings.items()},
-            "destroyed_buildings": [f"{k[0]},{k[1]},{k[2]}" for k in self.destroyed_buildings],
-            "buildings_destroyed_per_city": {f"{k[0]},{k[1]}": v for k, v in self.buildings_destroyed_per_city.items()},
+            "city_damage": [damage.to_dict(city_key) for city_key, damage in self.city_damage.items()],
+
+            # Generated Content ("pending" entries are still being generated and are left out)
+            "quest_cache": {
+                city_id: [q.to_dict() for q in quests]
+                for city_id, quests in self.quest_cache.items() if isinstance(quests, list)
+            },
+            "dialog_cache": dict(self.dialog_cache),
+            "content_stamps": {key: list(stamp) for key, stamp in self.content_stamps.items()},
         }
 
     @classmethod
@@ -344,7 +395,7 @@ class GameState:
         difficulty_mods = DIFFICULTY_MODIFIERS.get(difficulty, DIFFICULTY_MODIFIERS["Normal"])
         
         # The data_loader ensures the correct faction data is loaded from temp/
-        from .logic.data_loader import FACTION_DATA, WORLD_DETAILS_DATA, TRIGGERS_DATA
+        from .logic import data_loader
         
         gs = cls(
             selected_car_index=data.get("selected_car_index", 0),
@@ -352,12 +403,12 @@ class GameState:
             difficulty_mods=difficulty_mods,
             car_color_names=data.get("car_color_names", ["CAR_RED"]),
             theme=data.get("theme", {"name": "Default", "description": "A standard wasteland adventure."}),
-            factions=FACTION_DATA,
+            factions=data_loader.get_faction_data(),
         )
         
         gs.story_intro = data.get("story_intro", "The wasteland awaits.")
-        gs.world_details = WORLD_DETAILS_DATA
-        gs.active_triggers = TRIGGERS_DATA
+        gs.world_details = data_loader.get_world_details_data()
+        gs.active_triggers = data_loader.get_triggers_data()
         
         # --- Restore Player State ---
         gs.player_cash = data.get("player_cash", 100)
@@ -413,12 +464,17 @@ class GameState:
         gs.visited_cities = {tuple(c) for c in data.get("visited_cities", [(0, 0)])}
 
         # --- Restore Building Destruction State ---
-        raw_damaged = data.get("damaged_buildings", {})
-        gs.damaged_buildings = {tuple(int(x) for x in k.split(",")): v for k, v in raw_damaged.items()}
-        raw_destroyed = data.get("destroyed_buildings", [])
-        gs.destroyed_buildings = {tuple(int(x) for x in k.split(",")) for k in raw_destroyed}
-        raw_per_city = data.get("buildings_destroyed_per_city", {})
-        gs.buildings_destroyed_per_city = {tuple(int(x) for x in k.split(",")): v for k, v in raw_per_city.items()}
+        from .logic.building_damage import get_city_damage
+        records = {tuple(r["city"]): r for r in data.get("city_damage", [])}
+        # Saves from before per-city records keep "gx,gy,idx" keys
+        for key, hp in data.get("damaged_buildings", {}).items():
+            gx, gy, idx = (int(x) for x in key.split(","))
+            records.setdefault((gx, gy), {"destroyed": 0, "hp": []})["hp"].append([idx, hp])
+        for key in data.get("destroyed_buildings", []):
+            gx, gy, idx = (int(x) for x in key.split(","))
+            records.setdefault((gx, gy), {"destroyed": 0, "hp": []})["destroyed"] |= 1 << idx
+        for city_key, record in records.items():
+            get_city_damage(gs, city_key).load(record)
         
         # Multi-quest deserialization with backward compat
         from .data.quests import Quest
@@ -426,5 +482,14 @@ class GameState:
         if not gs.active_quests and data.get("current_quest"):
             gs.active_quests = [Quest.from_dict(data["current_quest"])]
         gs.selected_quest_index = data.get("selected_quest_index", 0)
-        
+
+        # --- Restore Generated Content ---
+        for city_id, quest_dicts in data.get("quest_cache", {}).items():
+            try:
+                gs.quest_cache[city_id] = [Quest.from_dict(qd) for qd in quest_dicts]
+            except (KeyError, TypeError, ValueError) as e:
+                logging.error(f"Dropping saved quests for {city_id}; they will be regenerated: {e}")
+        gs.dialog_cache = dict(data.get("dialog_cache", {}))
+        gs.content_stamps = {key: tuple(stamp) for key, stamp in data.get("content_stamps", {}).items()}
+
         return gs
\ No newline at end of file
@@ -27,46 +27,82 @@ def _are_factions_hostile(faction_a, faction_b, game_state):
     return relationships.get(faction_b, "Neutral") == "Hostile"
 
 
-def _get_target_position(enemy, game_state):
-    """Determine the best target for this enemy.
-    Scans for nearby hostile-faction enemies and targets the closest one.
-    Falls back to the player position."""
-    enemy_faction = getattr(enemy, 'faction_id', None)
-    best_target = None
-    best_dist_sq = 80 * 80  # 80 unit detection range
-
-    if enemy_faction:
-        for other in game_state.active_enemies:
-            if other is enemy:
-                continue
-            other_faction = getattr(other, 'faction_id', None)
-            if not _are_factions_hostile(enemy_faction, other_faction, game_state):
-                continue
-            dx = other.x - enemy.x
-            dy = other.y - enemy.y
-            dist_sq = dx * dx + dy * dy
-            if dist_sq < best_dist_sq:
-                best_dist_sq = dist_sq
-                best_target = other
-
-        # Also check turrets from rival factions
-        for turret in game_state.active_turrets:
-            turret_faction = getattr(turret, 'faction_id', None)
-            if not _are_factions_hostile(enemy_faction, turret_faction, game_state):
-                continue
-            dx = turret.x - enemy.x
-            dy = turret.y - enemy.y
-            dist_sq = dx * dx + dy * dy
-            if dist_sq < best_dist_sq:
-                best_dist_sq = dist_sq
-                best_target = turret
-
-    if best_target:
+TARGET_RANGE = 80  # Hostile-faction detection range
+
+
+class _TickTargets:
+    """
+    Enemy targets, resolved at most once per enemy per AI tick. Enemies and
+    turrets are bucketed by faction and by TARGET_RANGE-sized cell up front,
+    so finding the closest hostile only looks at the cells around the enemy,
+    for factions hostile to its own.
+    """
+
+    def __init__(self, game_state):
+        self.game_state = game_state
+        self.player = (game_state.car_world_x, game_state.car_world_y)
+        self.jitter = _get_movement_jitter(game_state)
+        self._cells = {}  # faction -> {(cell_x, cell_y): [entity, ...]}
+        for entity in list(game_state.active_enemies) + list(game_state.active_turrets):
+            faction = getattr(entity, 'faction_id', None)
+            if faction:
+                cell = (int(entity.x // TARGET_RANGE), int(entity.y // TARGET_RANGE))
+                self._cells.setdefault(faction, {}).setdefault(cell, []).append(entity)
+        self._rivals = {}
+        self._targets = {}
+
+    def rivals_of(self, faction):
+        """The cell maps of the factions hostile to `faction`."""
+        rivals = self._rivals.get(faction)
+        if rivals is None:
+            rivals = [cells for other, cells in self._cells.items()
+                      if _are_factions_hostile(faction, other, self.game_state)]
+            self._rivals[faction] = rivals
+        return rivals
+
+    def target_of(self, enemy):
+        key = id(enemy)
+        target = self._targets.get(key)
+        if target is None:
+            target = self._targets[key] = self._resolve(enemy)
+        return target
+
+    def _resolve(self, enemy):
+        enemy_faction = getattr(enemy, 'faction_id', None)
+        best_target = None
+        best_dist_sq = TARGET_RANGE * TARGET_RANGE
+
+        if enemy_faction:
+            x, y = enemy.x, enemy.y
+            cell_x, cell_y = int(x // TARGET_RANGE), int(y // TARGET_RANGE)
+            for cells in self.rivals_of(enemy_faction):
+                for cx in (cell_x - 1, cell_x, cell_x + 1):
+                    for cy in (cell_y - 1, cell_y, cell_y + 1):
+                        for other in cells.get((cx, cy), ()):
+                            dx = other.x - x
+                            dy = other.y - y
+                            dist_sq = dx * dx + dy * dy
+                            if dist_sq < best_dist_sq:
+                                best_dist_sq = dist_sq
+                                best_target = other
+
         enemy.ai_state["target_entity"] = best_target
-        return best_target.x, best_target.y
+        if best_target:
+            return best_target.x, best_target.y
+        return self.player
+
 
-    enemy.ai_state["target_entity"] = None
-    return game_state.car_world_x, game_state.car_world_y
+_tick_targets = None  # Set while run_enemy_ai runs
+
+
+def _get_target_position(enemy, game_state):
+    """Determine the best target for this enemy.
+    Scans for nearby hostile-faction enemies and turrets and targets the
+    closest one. Falls back to the player position."""
+    targets = _tick_targets
+    if targets is None or targets.game_state is not game_state:
+        targets = _TickTargets(game_state)
+    return targets.target_of(enemy)
 
 
 def _get_aim_spread(game_state):
@@ -365,3 +401,110 @@ def execute_behavior(behavior_name, enemy, game_state, edata):
     fn = BEHAVIOR_MAP.get(behavior_name)
     if fn:
         fn(enemy, game_state, edata)
+
+
+# --- Batched steering ---
+# The movement-only behaviors, run over every enemy in them at once. Each
+# matches its _execute_*_behavior above, for enemies that are their own edata.
+
+def _steer_chase(enemies, targets):
+    jitter = targets.jitter
+    uniform = random.uniform
+    for enemy in enemies:
+        tx, ty = targets.target_of(enemy)
+        dx = tx - enemy.x
+        dy = ty - enemy.y
+        dist = math.sqrt(dx*dx + dy*dy)
+        if dist > 0:
+            speed = enemy.speed
+            enemy.vx = (dx / dist + uniform(-jitter, jitter)) * speed
+            enemy.vy = (dy / dist + uniform(-jitter, jitter)) * speed
+
+
+def _steer_evade(enemies, targets):
+    jitter = targets.jitter
+    uniform = random.uniform
+    for enemy in enemies:
+        tx, ty = targets.target_of(enemy)
+        dx = tx - enemy.x
+        dy = ty - enemy.y
+        dist = math.sqrt(dx*dx + dy*dy)
+        if dist > 0:
+            speed = enemy.speed
+            enemy.vx = -(dx / dist + uniform(-jitter, jitter)) * speed
+            enemy.vy = -(dy / dist + uniform(-jitter, jitter)) * speed
+
+
+def _steer_strafe(enemies, targets):
+    for enemy in enemies:
+        tx, ty = targets.target_of(enemy)
+        dx = tx - enemy.x
+        dy = ty - enemy.y
+        dist = math.sqrt(dx*dx + dy*dy)
+        if dist > 0:
+            speed = enemy.speed
+            enemy.vx = -dy / dist * speed
+            enemy.vy = dx / dist * speed
+
+
+def _steer_patrol(enemies, targets):
+    uniform = random.uniform
+    for enemy in enemies:
+        x, y = enemy.x, enemy.y
+        if enemy.patrol_target_x is None:
+            enemy.patrol_target_x = x + uniform(-100, 100)
+            enemy.patrol_target_y = y + uniform(-100, 100)
+        if (x - enemy.patrol_target_x)**2 + (y - enemy.patrol_target_y)**2 < 25:
+            enemy.patrol_target_x = x + uniform(-100, 100)
+            enemy.patrol_target_y = y + uniform(-100, 100)
+        dx = enemy.patrol_target_x - x
+        dy = enemy.patrol_target_y - y
+        dist = math.sqrt(dx*dx + dy*dy)
+        if dist > 0:
+            speed = enemy.speed * 0.5
+            enemy.vx = (dx / dist) * speed
+            enemy.vy = (dy / dist) * speed
+
+
+BATCHED_BEHAVIORS = {
+    "CHASE": _steer_chase,
+    "EVADE": _steer_evade,
+    "STRAFE": _steer_strafe,
+    "PATROL": _steer_patrol,
+}
+
+
+def run_enemy_ai(game_state, world, dt):
+    """
+    One AI pass over the active enemies. Every enemy first picks its
+    behavior for the tick (think), enemies are then steered a behavior at a
+    time against targets resolved once per tick, and finally all of them
+    move. Enemies without a think() step run their own update().
+    """
+    global _tick_targets
+    targets = _tick_targets = _TickTargets(game_state)
+    try:
+        groups = {}
+        thinkers = []
+        for enemy in game_state.active_enemies:
+            think = getattr(enemy, "think", None)
+            if think is None:
+                enemy.update(game_state, world, dt)
+                continue
+            groups.setdefault(think(game_state, dt), []).append(enemy)
+            thinkers.append(enemy)
+
+        for behavior, enemies in groups.items():
+            steer = BATCHED_BEHAVIORS.get(behavior)
+            if steer:
+                steer(enemies, targets)
+                continue
+            fn = BEHAVIOR_MAP.get(behavior)
+            if fn:
+                for enemy in enemies:
+                    fn(enemy, game_state, enemy)
+
+        for enemy in thinkers:
+            enemy._move_with_terrain_check(world, dt)
+    finally:
+        _tick_targets = None
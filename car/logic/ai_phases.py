@@ -0,0 +1,90 @@
+"""
+Enemy phase definitions compiled into index-based transition tables.
+
+Each enemy class lists its AI phases as dicts with `next_phases` weights by
+name. A PhaseGraph is built once per class: phases are numbered, and for
+every phase and every budget level the transitions the budget can afford
+are kept with their cumulative weights, so a transition is one table
+lookup and a bisect instead of name scans and a fresh `random.choices`.
+"""
+
+import random
+from bisect import bisect
+
+from .ai_behaviors import BEHAVIOR_COSTS
+
+
+class PhaseGraph:
+    """The compiled phases of one enemy class, plus any filler phases."""
+
+    def __init__(self, phases, fillers=()):
+        self.source = phases
+        self.phases = tuple(phases) + tuple(fillers)
+        self.filler_indices = tuple(range(len(phases), len(self.phases)))
+        self.index = {}
+        for i, phase in enumerate(self.phases):
+            self.index.setdefault(phase["name"], i)
+        self.behaviors = tuple(phase["behavior"] for phase in self.phases)
+        self.costs = tuple(BEHAVIOR_COSTS.get(behavior, 0) for behavior in self.behaviors)
+        self.durations = tuple(phase["duration"] for phase in self.phases)
+        self.max_cost = max(self.costs, default=0)
+
+        # transitions[i][level]: (targets, cumulative weights) affordable
+        # with a budget of `level`; the last level affords everything.
+        self.transitions = []
+        for phase in self.phases:
+            edges = [(self.index[name], weight) for name, weight in phase.get("next_phases", {}).items()
+                     if name in self.index]
+            by_level = []
+            for level in range(self.max_cost + 1):
+                targets, cumulative, total = [], [], 0.0
+                for target, weight in edges:
+                    if self.costs[target] <= level:
+                        total += weight
+                        targets.append(target)
+                        cumulative.append(total)
+                by_level.append((tuple(targets), tuple(cumulative)))
+            self.transitions.append(tuple(by_level))
+        self.transitions = tuple(self.transitions)
+
+    def index_of(self, phase, default=0):
+        return self.index.get(phase["name"], default)
+
+    def phase_named(self, name, default=None):
+        i = self.index.get(name)
+        return self.phases[i] if i is not None else default
+
+    def choose(self, current, budget=None):
+        """
+        Index of the phase to follow phase `current`, weighted by
+        `next_phases` among those `budget` can afford (None: all of them).
+        Falls back to a random filler phase, or None without fillers.
+        """
+        if budget is None or budget >= self.max_cost:
+            level = self.max_cost
+        elif budget < 0:
+            level = None
+        else:
+            level = int(budget)
+        if level is not None:
+            targets, cumulative = self.transitions[current][level]
+            if targets:
+                return targets[bisect(cumulative, random.random() * cumulative[-1], 0, len(targets) - 1)]
+        if self.filler_indices:
+            return random.choice(self.filler_indices)
+        return None
+
+
+_graphs = {}
+
+
+def phase_graph(entity, fillers=()):
+    """The compiled graph for `entity`'s phases, shared by its class."""
+    graph = _graphs.get(type(entity))
+    phases = entity.phases
+    if graph is not None and (phases is graph.source or phases == graph.source):
+        return graph
+    graph = PhaseGraph(phases, fillers)
+    # An instance whose phases differ from its class's gets its own graph.
+    _graphs.setdefault(type(entity), graph)
+    return graph
@@ -1,6 +1,5 @@
 import random
 from ..entities.vehicle import Vehicle
-from ..logic.data_loader import FACTION_DATA
 from ..logic.entity_loader import PLAYER_CARS
 from ..data.quests import Quest, KillBossObjective
 from ..logic.quest_logic import check_for_faction_takeover
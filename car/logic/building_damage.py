@@ -7,6 +7,7 @@ from ..data.game_constants import (
 from ..data.buildings import BUILDING_DATA
 from ..data.pickups import PICKUP_DATA, PICKUP_CASH
 from ..world.generation import get_buildings_in_city
+from ..world.city_damage import CityDamage
 
 
 def find_building_at(x, y):
@@ -30,23 +31,33 @@ def get_building_max_durability(building):
     return building_info.get("base_durability", GENERIC_BUILDING_DURABILITY)
 
 
+def get_city_damage(game_state, city_key):
+    """The city's CityDamage record, created to fit its layout the first time it's needed."""
+    city_xy = (city_key[0], city_key[1])
+    damage = game_state.city_damage.get(city_xy)
+    if damage is None:
+        buildings = get_buildings_in_city(*city_xy)
+        damage = CityDamage([get_building_max_durability(b) for b in buildings])
+        game_state.city_damage[city_xy] = damage
+    return damage
+
+
 def is_building_destroyed(game_state, city_key, idx):
     """Check if a specific building has been destroyed."""
-    return (city_key[0], city_key[1], idx) in game_state.destroyed_buildings
+    damage = game_state.city_damage.get((city_key[0], city_key[1]))
+    return damage is not None and damage.is_destroyed(idx)
 
 
 def damage_building(game_state, city_key, idx, building, damage):
     """Apply damage to a building. Returns a list of notification strings."""
     notifications = []
-    key = (city_key[0], city_key[1], idx)
+    city_damage = get_city_damage(game_state, city_key)
 
-    if key in game_state.destroyed_buildings:
+    if city_damage.is_destroyed(idx):
         return notifications
 
-    max_hp = get_building_max_durability(building)
-    current_hp = game_state.damaged_buildings.get(key, max_hp)
-    current_hp -= damage
-    game_state.damaged_buildings[key] = current_hp
+    max_hp = city_damage.max_hp[idx]
+    current_hp = city_damage.damage(idx, damage)
 
     building_type = building.get("type", "GENERIC")
     building_info = BUILDING_DATA.get(building_type, {})
@@ -54,11 +65,6 @@ def damage_building(game_state, city_key, idx, building, damage):
 
     if current_hp <= 0:
         # Building destroyed
-        game_state.destroyed_buildings.add(key)
-        city_xy = (city_key[0], city_key[1])
-        count = game_state.buildings_destroyed_per_city.get(city_xy, 0) + 1
-        game_state.buildings_destroyed_per_city[city_xy] = count
-
         # Drop loot
         cash_value = random.randint(20, 80)
         pickup_id = game_state.next_pickup_id
@@ -73,7 +79,7 @@ def damage_building(game_state, city_key, idx, building, damage):
         }
 
         # Give XP
-        xp_value = max_hp // 10
+        xp_value = int(max_hp) // 10
         game_state.gain_xp(xp_value)
 
         notifications.append(f"Destroyed {building_name}! (+{xp_value} XP, loot dropped)")
@@ -95,8 +101,7 @@ def damage_building(game_state, city_key, idx, building, damage):
 def _apply_faction_consequences(game_state, city_key):
     """Apply faction reputation loss and escalation for building destruction."""
     notifications = []
-    city_xy = (city_key[0], city_key[1])
-    count = game_state.buildings_destroyed_per_city.get(city_xy, 0)
+    count = get_city_damage(game_state, city_key).destroyed_count
 
     # Find the faction that controls this city
     from ..world.generation import get_city_faction
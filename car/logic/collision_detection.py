@@ -2,6 +2,7 @@ import random
 import math
 from .loot_generation import handle_enemy_loot_drop
 from .building_damage import find_building_at, damage_building
+from .swept_collision import first_terrain_hit, first_entity_hit
 from ..world.generation import get_buildings_in_city
 from ..data.game_constants import CITY_SPACING
 from ..data.quests import KillCountObjective, WaveSpawnObjective
@@ -214,9 +215,11 @@ def _update_kill_objectives(game_state, enemy):
                     objective.wave_enemies_remaining -= 1
 
 
-def handle_collisions(game_state, world, audio_manager, app):
+def handle_collisions(game_state, world, audio_manager, app, projectile_starts=None):
     """
     Handles all collision detection and resolution.
+    projectile_starts holds each active projectile's (x, y) before this tick's
+    move; without it projectiles are tested as points.
     Returns a list of notification messages.
     """
     notifications = []
@@ -226,32 +229,30 @@ def handle_collisions(game_state, world, audio_manager, app):
         game_state.collision_iframes -= 1
 
     # --- Projectile Collisions ---
+    # Each projectile is swept along the segment it travelled this tick, so
+    # fast shots can't tunnel through thin walls or small targets. Whatever
+    # the segment reaches first (terrain or an entity) takes the hit.
     projectiles_to_remove = set()
 
     for i, p_state in enumerate(game_state.active_particles):
         if i in projectiles_to_remove:
             continue
         p_x, p_y = p_state[0], p_state[1]
+        s_x, s_y = projectile_starts[i] if projectile_starts else (p_x, p_y)
         p_power = p_state[4]
         p_owner_type, p_owner_faction = _parse_projectile_owner(p_state)
 
-        # Check for collisions with terrain
-        p_terrain = world.get_terrain_at(p_x, p_y)
-        if not p_terrain.get("passable", True):
-            # Check if this is a building and apply damage
-            if "building" in p_terrain:
-                city_key, b_idx, b_data = find_building_at(p_x, p_y)
-                if city_key is not None:
-                    bld_notifications = damage_building(game_state, city_key, b_idx, b_data, p_power)
-                    notifications.extend(bld_notifications)
-            projectiles_to_remove.add(i)
-            continue
+        # Entities are only hit if they come before any wall on the path.
+        terrain_hit = first_terrain_hit(world, s_x, s_y, p_x, p_y)
+        limit = terrain_hit[0] if terrain_hit else 1.0
+
+        def sweep(entities, skip=None):
+            hit = first_entity_hit(s_x, s_y, p_x, p_y, entities, limit, skip)
+            return hit[1] if hit else None
 
         # Enemy projectiles hit the player
         if p_owner_type == "enemy":
-            player = game_state.player_car
-            if (player.x <= p_x < player.x + player.width and
-                player.y <= p_y < player.y + player.height):
+            if sweep([game_state.player_car]):
                 if game_state.collision_iframes <= 0 and not game_state.god_mode:
                     game_state.current_durability -= p_power
                     game_state.collision_iframes = 8  # Brief i-frames for projectile hits
@@ -260,57 +261,16 @@ def handle_collisions(game_state, world, audio_manager, app):
                 projectiles_to_remove.add(i)
                 continue
 
-            # Enemy projectiles hit rival-faction enemies
+            # Enemy projectiles hit rival-faction enemies and turrets.
+            # Friendlies and factionless targets are skipped.
             if p_owner_faction:
-                hit_rival = False
-                for enemy in game_state.active_enemies:
-                    enemy_faction = getattr(enemy, 'faction_id', None)
-                    if enemy_faction == p_owner_faction:
-                        continue  # Don't hit friendlies
-                    if not enemy_faction:
-                        continue  # Skip factionless enemies
-                    if (enemy.x <= p_x < enemy.x + enemy.width and
-                            enemy.y <= p_y < enemy.y + enemy.height):
-                        enemy.durability -= p_power
-                        projectiles_to_remove.add(i)
-                        if enemy.durability <= 0:
-                            game_state.destroyed_this_frame.append(enemy)
-                            handle_enemy_loot_drop(game_state, enemy, app)
-                            xp = getattr(enemy, 'xp_value', 5)
-                            game_state.gain_xp(xp)
-                            _update_kill_objectives(game_state, enemy)
-                            game_state.active_enemies.remove(enemy)
-                        hit_rival = True
-                        break
-                if hit_rival:
-                    continue
-
-                # Enemy projectiles hit rival-faction turrets
-                for turret in getattr(game_state, 'active_turrets', []):
-                    turret_faction = getattr(turret, 'faction_id', None)
-                    if turret_faction == p_owner_faction:
-                        continue
-                    if not turret_faction:
-                        continue
-                    if (turret.x <= p_x < turret.x + turret.width and
-                            turret.y <= p_y < turret.y + turret.height):
-                        turret.durability -= p_power
-                        projectiles_to_remove.add(i)
-                        if turret.durability <= 0:
-                            game_state.destroyed_this_frame.append(turret)
-                            xp = getattr(turret, 'xp_value', 10)
-                            game_state.gain_xp(xp)
-                            game_state.active_turrets.remove(turret)
-                        break
+                def not_rival(entity):
+                    entity_faction = getattr(entity, 'faction_id', None)
+                    return not entity_faction or entity_faction == p_owner_faction
 
-        # Player projectiles hit enemies
-        if p_owner_type == "player":
-            hit = False
-            for enemy in game_state.active_enemies:
-                if (enemy.x <= p_x < enemy.x + enemy.width and
-                    enemy.y <= p_y < enemy.y + enemy.height):
+                enemy = sweep(game_state.active_enemies, not_rival)
+                if enemy:
                     enemy.durability -= p_power
-                    audio_manager.play_sfx("enemy_hit")
                     projectiles_to_remove.add(i)
                     if enemy.durability <= 0:
                         game_state.destroyed_this_frame.append(enemy)
@@ -318,66 +278,94 @@ def handle_collisions(game_state, world, audio_manager, app):
                         xp = getattr(enemy, 'xp_value', 5)
                         game_state.gain_xp(xp)
                         _update_kill_objectives(game_state, enemy)
-                        notifications.append(f"Destroyed {enemy.__class__.__name__}! (+{xp} XP)")
                         game_state.active_enemies.remove(enemy)
-                    hit = True
-                    break
-            if hit:
-                continue
+                    continue
 
-            # Player projectiles hit turrets
-            for turret in getattr(game_state, 'active_turrets', []):
-                if (turret.x <= p_x < turret.x + turret.width and
-                        turret.y <= p_y < turret.y + turret.height):
+                turret = sweep(getattr(game_state, 'active_turrets', []), not_rival)
+                if turret:
                     turret.durability -= p_power
-                    audio_manager.play_sfx("enemy_hit")
                     projectiles_to_remove.add(i)
                     if turret.durability <= 0:
                         game_state.destroyed_this_frame.append(turret)
                         xp = getattr(turret, 'xp_value', 10)
                         game_state.gain_xp(xp)
-                        notifications.append(f"Destroyed turret! (+{xp} XP)")
                         game_state.active_turrets.remove(turret)
-                    hit = True
-                    break
-            if hit:
+                    continue
+
+        # Player projectiles hit enemies
+        if p_owner_type == "player":
+            enemy = sweep(game_state.active_enemies)
+            if enemy:
+                enemy.durability -= p_power
+                audio_manager.play_sfx("enemy_hit")
+                projectiles_to_remove.add(i)
+                if enemy.durability <= 0:
+                    game_state.destroyed_this_frame.append(enemy)
+                    handle_enemy_loot_drop(game_state, enemy, app)
+                    xp = getattr(enemy, 'xp_value', 5)
+                    game_state.gain_xp(xp)
+                    _update_kill_objectives(game_state, enemy)
+                    notifications.append(f"Destroyed {enemy.__class__.__name__}! (+{xp} XP)")
+                    game_state.active_enemies.remove(enemy)
+                continue
+
+            # Player projectiles hit turrets
+            turret = sweep(getattr(game_state, 'active_turrets', []))
+            if turret:
+                turret.durability -= p_power
+                audio_manager.play_sfx("enemy_hit")
+                projectiles_to_remove.add(i)
+                if turret.durability <= 0:
+                    game_state.destroyed_this_frame.append(turret)
+                    xp = getattr(turret, 'xp_value', 10)
+                    game_state.gain_xp(xp)
+                    notifications.append(f"Destroyed turret! (+{xp} XP)")
+                    game_state.active_turrets.remove(turret)
                 continue
 
             # Check for collisions with obstacles
-            for obstacle in game_state.active_obstacles[:]:
-                if (obstacle.x <= p_x < obstacle.x + obstacle.width and
-                    obstacle.y <= p_y < obstacle.y + obstacle.height):
-                    obstacle.durability -= p_power
-                    audio_manager.play_sfx("enemy_hit")
-                    projectiles_to_remove.add(i)
-                    if obstacle.durability <= 0:
-                        game_state.destroyed_this_frame.append(obstacle)
-                        game_state.active_obstacles.remove(obstacle)
-                        game_state.gain_xp(obstacle.xp_value)
-                        notifications.append(f"Destroyed {obstacle.__class__.__name__}!")
-                        if obstacle.cash_value > 0:
-                            game_state.player_cash += obstacle.cash_value
-                    hit = True
-                    break
-            if hit:
+            obstacle = sweep(game_state.active_obstacles)
+            if obstacle:
+                obstacle.durability -= p_power
+                audio_manager.play_sfx("enemy_hit")
+                projectiles_to_remove.add(i)
+                if obstacle.durability <= 0:
+                    game_state.destroyed_this_frame.append(obstacle)
+                    game_state.active_obstacles.remove(obstacle)
+                    game_state.gain_xp(obstacle.xp_value)
+                    notifications.append(f"Destroyed {obstacle.__class__.__name__}!")
+                    if obstacle.cash_value > 0:
+                        game_state.player_cash += obstacle.cash_value
                 continue
 
             # Check for collisions with fauna
-            for fauna in game_state.active_fauna[:]:
-                if (fauna.x <= p_x < fauna.x + fauna.width and
-                    fauna.y <= p_y < fauna.y + fauna.height):
-                    fauna.durability -= p_power
-                    audio_manager.play_sfx("enemy_hit")
-                    projectiles_to_remove.add(i)
-                    if fauna.durability <= 0:
-                        game_state.active_fauna.remove(fauna)
-                        xp = getattr(fauna, 'xp_value', 1)
-                        game_state.gain_xp(xp)
-                        game_state.karma -= 1  # Negative karma for killing fauna
-                        _drop_meat(game_state, fauna.x, fauna.y)
-                        notifications.append(f"Killed {fauna.__class__.__name__}! (-1 Karma)")
-                    hit = True
-                    break
+            fauna = sweep(game_state.active_fauna)
+            if fauna:
+                fauna.durability -= p_power
+                audio_manager.play_sfx("enemy_hit")
+                projectiles_to_remove.add(i)
+                if fauna.durability <= 0:
+                    game_state.active_fauna.remove(fauna)
+                    xp = getattr(fauna, 'xp_value', 1)
+                    game_state.gain_xp(xp)
+                    game_state.karma -= 1  # Negative karma for killing fauna
+                    _drop_meat(game_state, fauna.x, fauna.y)
+                    notifications.append(f"Killed {fauna.__class__.__name__}! (-1 Karma)")
+                continue
+
+        # Nothing was hit before the wall: the terrain takes it
+        if terrain_hit:
+            p_terrain = terrain_hit[3]
+            # Check if this is a building and apply damage
+            if "building" in p_terrain:
+                # The impact point sits on the wall's edge, so locate the
+                # building by its own centre.
+                bld = p_terrain["building"]
+                city_key, b_idx, b_data = find_building_at(bld['x'] + bld['w'] / 2, bld['y'] + bld['h'] / 2)
+                if city_key is not None:
+                    bld_notifications = damage_building(game_state, city_key, b_idx, b_data, p_power)
+                    notifications.extend(bld_notifications)
+            projectiles_to_remove.add(i)
 
     # Remove projectiles that have collided
     if projectiles_to_remove:
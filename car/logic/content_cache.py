@@ -0,0 +1,71 @@
+"""
+Generated content kept with the save: pre-generated quests per city, and
+shop and city-hall dialog.
+
+Every entry is stamped with the state of the city's faction it was generated
+against, its control and the player's reputation with it, coarsely
+bucketed. An entry whose stamp no longer matches is stale: it is still
+served, so a visit never waits on the model, and is regenerated in the
+background for next time.
+"""
+
+STAMP_BUCKET = 25  # Control and reputation changes smaller than this keep content fresh
+
+
+def content_stamp(game_state, faction_id):
+    """The faction state content for a city of `faction_id` is generated against."""
+    control = game_state.faction_control.get(faction_id, 50)
+    reputation = game_state.faction_reputation.get(faction_id, 0)
+    return (faction_id, int(control // STAMP_BUCKET), int(reputation // STAMP_BUCKET))
+
+
+def quest_key(city_id):
+    return f"quests:{city_id}"
+
+
+def shop_dialog_key(city_id, shop_type):
+    return f"shop_dialog:{city_id}:{shop_type}"
+
+
+def city_hall_dialog_key(city_id):
+    return f"city_hall_dialog:{city_id}"
+
+
+def is_fresh(game_state, key, faction_id):
+    """True if the entry under `key` was generated against the faction's current state."""
+    stamp = game_state.content_stamps.get(key)
+    return stamp is not None and stamp == content_stamp(game_state, faction_id)
+
+
+def stamp_content(game_state, key, stamp):
+    if stamp is None:
+        game_state.content_stamps.pop(key, None)
+    else:
+        game_state.content_stamps[key] = tuple(stamp)
+
+
+def cached_dialog(game_state, key, faction_id):
+    """Returns (dialog, fresh); dialog is None if nothing is cached."""
+    dialog = game_state.dialog_cache.get(key)
+    if dialog is None:
+        return None, False
+    return dialog, is_fresh(game_state, key, faction_id)
+
+
+def store_dialog(game_state, key, stamp, dialog):
+    if not dialog:
+        return
+    game_state.dialog_cache[key] = dialog
+    stamp_content(game_state, key, stamp)
+
+
+def quests_need_refresh(game_state, city_id, faction_id):
+    """
+    True if the city has quests cached that were generated against a faction
+    state that has since changed. An emptied list is left alone: the city
+    only offers new quests once its last ones are done.
+    """
+    cached = game_state.quest_cache.get(city_id)
+    if not isinstance(cached, list) or not cached:
+        return False
+    return not is_fresh(game_state, quest_key(city_id), faction_id)
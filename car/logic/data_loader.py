@@ -1,13 +1,25 @@
-import importlib.util
-import sys
-import json
+import copy
+import logging
 import os
+from .session_store import SessionStore, SESSION_STORE_FILE, migrate_legacy_files
 
 # --- Constants for File Paths ---
-DEFAULT_FACTIONS_PATH = "car/data/factions.py"
-TEMP_FACTIONS_PATH = "temp/factions.py"
-TEMP_WORLD_DETAILS_PATH = "temp/world_details.json"
-TEMP_TRIGGERS_PATH = "temp/triggers.json"
+TEMP_DIR = "temp"
+TEMP_SESSION_STORE_PATH = os.path.join(TEMP_DIR, SESSION_STORE_FILE)
+TEMP_LEGACY_FACTIONS_PATH = os.path.join(TEMP_DIR, "factions.py")
+
+_session_store = SessionStore(TEMP_SESSION_STORE_PATH)
+
+
+def get_session_store():
+    """Returns the store holding the current session's generated data."""
+    return _session_store
+
+
+def _migrate_legacy_temp_files():
+    """Converts a pre-store temp/ session (factions.py etc.) into the store."""
+    if not _session_store.exists() and os.path.exists(TEMP_LEGACY_FACTIONS_PATH):
+        migrate_legacy_files(TEMP_DIR, _session_store)
 
 
 def _normalize_hub_coordinates(faction_data):
@@ -27,52 +39,90 @@ def _normalize_hub_coordinates(faction_data):
 
 def load_faction_data():
     """
-    Dynamically loads the FACTION_DATA dictionary.
-    Checks for a session-specific 'factions.py' in 'temp/' and falls back
-    to the default if not found.
+    Loads the FACTION_DATA dictionary from the session store, falling back
+    to the built-in defaults if no session factions have been generated.
     """
-    path_to_load = DEFAULT_FACTIONS_PATH
-    if os.path.exists(TEMP_FACTIONS_PATH):
-        # Check if the file is not empty
-        if os.path.getsize(TEMP_FACTIONS_PATH) > 0:
-            path_to_load = TEMP_FACTIONS_PATH
-
-    spec = importlib.util.spec_from_file_location("factions_data", path_to_load)
-    factions_module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(factions_module)
-    
-    return factions_module.FACTION_DATA
+    _migrate_legacy_temp_files()
+    if _session_store.has_factions():
+        return _session_store.get_factions()
+
+    from ..data.factions import FACTION_DATA as DEFAULT_FACTION_DATA
+    return copy.deepcopy(DEFAULT_FACTION_DATA)
 
 def load_world_details_data():
     """
-    Loads the world_details.json from the temp/ directory if it exists.
-    Returns an empty dictionary if the file is not found.
+    Loads the world details from the session store.
+    Returns an empty dictionary if none have been stored.
     """
-    if os.path.exists(TEMP_WORLD_DETAILS_PATH):
-        try:
-            with open(TEMP_WORLD_DETAILS_PATH, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            # If the file is corrupted or can't be read, return empty
-            return {}
-    return {}
+    _migrate_legacy_temp_files()
+    return _session_store.get_world_details()
 
 def load_triggers_data():
     """
-    Loads the triggers.json from the temp/ directory if it exists.
-    Returns an empty list if the file is not found.
+    Loads the world triggers from the session store.
+    Returns an empty list if none have been stored.
+    """
+    _migrate_legacy_temp_files()
+    return _session_store.get_triggers()
+
+
+# --- Lazily loaded session data ---
+# The generated data is only read when first asked for, so importing this
+# module (e.g. while the main menu loads) doesn't touch temp/. Call
+# reload_data() after temp/ is replaced so the next access reads it again.
+_cache = {}
+
+
+def get_faction_data():
+    if "FACTION_DATA" not in _cache:
+        faction_data = load_faction_data()
+        _normalize_hub_coordinates(faction_data)
+        _cache["FACTION_DATA"] = faction_data
+    return _cache["FACTION_DATA"]
+
+
+def get_world_details_data():
+    if "WORLD_DETAILS_DATA" not in _cache:
+        _cache["WORLD_DETAILS_DATA"] = load_world_details_data()
+    return _cache["WORLD_DETAILS_DATA"]
+
+
+def get_triggers_data():
+    if "TRIGGERS_DATA" not in _cache:
+        _cache["TRIGGERS_DATA"] = load_triggers_data()
+    return _cache["TRIGGERS_DATA"]
+
+
+def reload_data():
+    """Drops the cached session data so it is re-read from temp/ on next use."""
+    _cache.clear()
+    _session_store.clear_cache()
+
+
+def save_session_data(factions, world_details, triggers=None) -> bool:
+    """
+    Writes freshly generated session data to the store and refreshes the
+    cache. Returns False if any record failed validation and wasn't written.
     """
-    if os.path.exists(TEMP_TRIGGERS_PATH):
-        try:
-            with open(TEMP_TRIGGERS_PATH, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return []
-    return []
-
-
-# Load the data once on startup
-FACTION_DATA = load_faction_data()
-_normalize_hub_coordinates(FACTION_DATA)
-WORLD_DETAILS_DATA = load_world_details_data()
-TRIGGERS_DATA = load_triggers_data()
+    saved = _session_store.set_factions(factions)
+    saved = _session_store.set_world_details(world_details) and saved
+    if triggers is not None:
+        saved = _session_store.set_triggers(triggers) and saved
+    if not saved:
+        logging.error("Session data failed validation; the session store is incomplete.")
+    reload_data()
+    return saved
+
+
+_LAZY_ATTRIBUTES = {
+    "FACTION_DATA": get_faction_data,
+    "WORLD_DETAILS_DATA": get_world_details_data,
+    "TRIGGERS_DATA": get_triggers_data,
+}
+
+
+def __getattr__(name):
+    # Keeps `from ..logic.data_loader import FACTION_DATA` working.
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
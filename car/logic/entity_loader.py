@@ -1,63 +1,88 @@
 import os
 import importlib
+import threading
 
 ENTITY_BASE_PATH = "car.entities"
 VEHICLE_PATH = "vehicles"
 CHARACTER_PATH = "characters"
 OBSTACLE_PATH = "obstacles"
 
-from ..entities.vehicles.hatchback import Hatchback
-from ..entities.vehicles.sports_car import SportsCar
-from ..entities.vehicles.sedan import Sedan
-from ..entities.vehicles.muscle_car import MuscleCar
-from ..entities.vehicles.truck import Truck
-from ..entities.vehicles.van import Van
-from ..entities.vehicles.hotrod import Hotrod
-from ..entities.vehicles.panel_wagon import PanelWagon
-from ..entities.vehicles.rusty_sedan import RustySedan
-from ..entities.vehicles.raider_buggy import RaiderBuggy
-from ..entities.vehicles.technical import Technical
-from ..entities.vehicles.war_rig import WarRig
-from ..entities.vehicles.miner import Miner
-from ..entities.characters.bandit import Bandit
-from ..entities.characters.marauder import Marauder
-from ..entities.characters.cat import Cat
-from ..entities.characters.dog import Dog
-from ..entities.characters.cow import Cow
-from ..entities.obstacles.rock import Rock
-from ..entities.obstacles.tire_pile import TirePile
-from ..entities.obstacles.scrap_barricade import ScrapBarricade
-from ..entities.obstacles.wrecked_husk import WreckedHusk
-from ..entities.obstacles.oil_barrel import OilBarrel
-
-PLAYER_CARS = [
-    Hatchback, SportsCar, Sedan, Truck, Van, Hotrod, PanelWagon
-]
-
-ENEMY_VEHICLES = [
-    RustySedan, RaiderBuggy, Technical, WarRig, Miner
-]
-
-ENEMY_CHARACTERS = [
-    Bandit, Marauder
-]
-
-FAUNA = [
-    Cat, Dog, Cow
-]
-
-OBSTACLES = [
-    Rock, TirePile, ScrapBarricade, WreckedHusk, OilBarrel
-]
-
-ALL_VEHICLES = PLAYER_CARS + ENEMY_VEHICLES
-
-
-def _populate_entities():
+# The registries below are filled on first access (see __getattr__), so
+# importing this module doesn't import every entity class up front.
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def _load_registries():
+    """Imports the built-in entity classes and builds the registries."""
+    from ..entities.vehicles.hatchback import Hatchback
+    from ..entities.vehicles.sports_car import SportsCar
+    from ..entities.vehicles.sedan import Sedan
+    from ..entities.vehicles.truck import Truck
+    from ..entities.vehicles.van import Van
+    from ..entities.vehicles.hotrod import Hotrod
+    from ..entities.vehicles.panel_wagon import PanelWagon
+    from ..entities.vehicles.rusty_sedan import RustySedan
+    from ..entities.vehicles.raider_buggy import RaiderBuggy
+    from ..entities.vehicles.technical import Technical
+    from ..entities.vehicles.war_rig import WarRig
+    from ..entities.vehicles.miner import Miner
+    from ..entities.characters.bandit import Bandit
+    from ..entities.characters.marauder import Marauder
+    from ..entities.characters.cat import Cat
+    from ..entities.characters.dog import Dog
+    from ..entities.characters.cow import Cow
+    from ..entities.obstacles.rock import Rock
+    from ..entities.obstacles.tire_pile import TirePile
+    from ..entities.obstacles.scrap_barricade import ScrapBarricade
+    from ..entities.obstacles.wrecked_husk import WreckedHusk
+    from ..entities.obstacles.oil_barrel import OilBarrel
+
+    player_cars = [
+        Hatchback, SportsCar, Sedan, Truck, Van, Hotrod, PanelWagon
+    ]
+    enemy_vehicles = [
+        RustySedan, RaiderBuggy, Technical, WarRig, Miner
+    ]
+    registries = {
+        "PLAYER_CARS": player_cars,
+        "ENEMY_VEHICLES": enemy_vehicles,
+        "ENEMY_CHARACTERS": [Bandit, Marauder],
+        "FAUNA": [Cat, Dog, Cow],
+        "OBSTACLES": [Rock, TirePile, ScrapBarricade, WreckedHusk, OilBarrel],
+        "ALL_VEHICLES": player_cars + enemy_vehicles,
+    }
+    _populate_entities(registries)
+    return registries
+
+
+def ensure_loaded():
+    """Builds the entity registries if they haven't been built yet."""
+    if not _registries:
+        with _registries_lock:
+            if not _registries:
+                _registries.update(_load_registries())
+    return _registries
+
+
+def __getattr__(name):
+    # Keeps `from ..logic.entity_loader import PLAYER_CARS` working.
+    if name in ("PLAYER_CARS", "ENEMY_VEHICLES", "ENEMY_CHARACTERS", "FAUNA", "OBSTACLES", "ALL_VEHICLES"):
+        return ensure_loaded()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _populate_entities(registries):
     """
     Dynamically discovers and loads all entities from the file system,
     populating the lists of player cars, enemies, and fauna.
     """
+    PLAYER_CARS = registries["PLAYER_CARS"]
+    ENEMY_VEHICLES = registries["ENEMY_VEHICLES"]
+    ENEMY_CHARACTERS = registries["ENEMY_CHARACTERS"]
+    FAUNA = registries["FAUNA"]
+    OBSTACLES = registries["OBSTACLES"]
+
     # Player Cars
     player_car_names = [
         "sports_car", "sedan", "van", "truck", "panel_wagon", 
@@ -107,17 +132,15 @@ def _load_entity(entity_type_path, name, entity_list):
         # This should not happen if the file structure is correct
         print(f"Warning: Could not load entity '{name}': {e}")
 
-# Initial population of the entity lists
-_populate_entities()
-
 def get_enemy_vehicle_list():
     """Returns a simple list of enemy vehicle names."""
-    return [v.__name__ for v in ENEMY_VEHICLES]
+    return [v.__name__ for v in ensure_loaded()["ENEMY_VEHICLES"]]
 
 def get_character_list():
     """Returns a simple list of character names."""
-    return [c.__name__ for c in ENEMY_CHARACTERS + FAUNA]
+    registries = ensure_loaded()
+    return [c.__name__ for c in registries["ENEMY_CHARACTERS"] + registries["FAUNA"]]
 
 def get_obstacle_list():
     """Returns a simple list of obstacle names."""
-    return [o.__name__ for o in OBSTACLES]
+    return [o.__name__ for o in ensure_loaded()["OBSTACLES"]]
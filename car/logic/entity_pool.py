@@ -0,0 +1,94 @@
+"""
+Pools of the entities the spawner places around the player (enemies, fauna,
+obstacles, turrets), one per class.
+
+Building an entity from scratch runs its class's __init__: the sprite
+literals, the art-dimension parsing in Vehicle, and the AI setup. A pool
+keeps a pristine copy of a class's attributes from the first instance it
+builds and stamps later entities out of that copy, and entities that
+despawn are reset and reused instead of being left to the garbage collector.
+"""
+
+from ..entities.base import Entity
+
+MAX_FREE_PER_CLASS = 32
+
+# Read-only per class, so shared by every instance rather than copied.
+SHARED_ATTRS = frozenset({"art", "phases", "current_phase"})
+
+
+def _fresh(name, value):
+    if name not in SHARED_ATTRS and isinstance(value, (dict, list, set)):
+        return value.copy()
+    return value
+
+
+class EntityPool:
+    """Per-class free lists of entities, reset on reuse."""
+
+    def __init__(self, max_free_per_class=MAX_FREE_PER_CLASS):
+        self.max_free_per_class = max_free_per_class
+        self._prototypes = {}  # class -> attributes of a freshly built instance
+        self._free = {}        # class -> [entity, ...]
+        self.built = 0
+        self.reused = 0
+
+    def acquire(self, cls, x, y):
+        """An entity of `cls` at (x, y), as if just constructed."""
+        prototype = self._prototypes.get(cls)
+        if prototype is None:
+            entity = cls(x, y)
+            self._prototypes[cls] = {name: _fresh(name, value) for name, value in entity.__dict__.items()}
+            self.built += 1
+        else:
+            free = self._free.get(cls)
+            if free:
+                entity = free.pop()
+                self.reused += 1
+            else:
+                entity = cls.__new__(cls)
+                self.built += 1
+            self._reset(entity, prototype, x, y)
+        entity.from_pool = True
+        return entity
+
+    @staticmethod
+    def _reset(entity, prototype, x, y):
+        state = entity.__dict__
+        state.clear()
+        for name, value in prototype.items():
+            state[name] = _fresh(name, value)
+        Entity._next_id += 1
+        entity.entity_id = Entity._next_id
+        entity.x = x
+        entity.y = y
+        if hasattr(entity, "_initialize_ai"):
+            entity._initialize_ai()
+
+    def release(self, entity):
+        """Takes back an entity that has left the world. Only pooled entities are kept."""
+        if not getattr(entity, "from_pool", False):
+            return
+        entity.from_pool = False
+        free = self._free.setdefault(type(entity), [])
+        if len(free) < self.max_free_per_class:
+            free.append(entity)
+
+
+_pool = EntityPool()
+
+
+def acquire_entity(cls, x, y):
+    return _pool.acquire(cls, x, y)
+
+
+def release_entity(game_state, entity):
+    """
+    Returns a despawned entity to the pool, unless something may still hold
+    on to it: bosses, the combat opponent, or the tracked entity.
+    """
+    if getattr(entity, "is_major_enemy", False) or getattr(entity, "is_faction_boss", False):
+        return
+    if entity is game_state.combat_enemy or entity is game_state.tracked_entity:
+        return
+    _pool.release(entity)
@@ -1,12 +1,12 @@
 import json
-from ..logic.data_loader import FACTION_DATA
+from . import data_loader
 from ..data.quests import Quest, KillBossObjective
 
 CONQUEST_THRESHOLD = 20
 
 def initialize_faction_control(game_state):
     """Sets the initial control values for all factions at the start of a new game."""
-    for faction_id, faction_data in FACTION_DATA.items():
+    for faction_id, faction_data in data_loader.get_faction_data().items():
         game_state.faction_control[faction_id] = faction_data.get("control", 50)
 
 def increase_control(game_state, faction_id, amount):
@@ -69,6 +69,13 @@ def get_conquest_quest(game_state):
         is_conquest_quest=True
     )
 
+def persist_factions(game_state, faction_ids):
+    """Writes the given factions back to the session store, one record each."""
+    store = data_loader.get_session_store()
+    for faction_id in faction_ids:
+        if faction_id in game_state.factions:
+            store.put_faction(faction_id, game_state.factions[faction_id])
+
 def handle_faction_takeover(game_state, winning_faction_id, losing_faction_id):
     """
     Handles the permanent world state changes after a successful conquest.
@@ -100,6 +107,9 @@ def handle_faction_takeover(game_state, winning_faction_id, losing_faction_id):
     # 3. The loser's relationships are now null and void
     loser["relationships"] = {fid: "Defeated" for fid in factions if fid != losing_faction_id}
 
+    # Persist the changed factions so the takeover survives save/load
+    persist_factions(game_state, factions)
+
     # 4. Remove the defeated faction from active reputation and control tracking
     if losing_faction_id in game_state.faction_reputation:
         del game_state.faction_reputation[losing_faction_id]
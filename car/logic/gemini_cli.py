@@ -5,10 +5,15 @@ output on stdout. Pre-configured for Gemini CLI and Claude CLI, but any tool
 can be used via the "custom" preset or by editing settings.json.
 """
 
+import asyncio
+import codecs
 import subprocess
 import logging
 import json
 import shutil
+import tempfile
+
+from ..common.log_pipeline import log_payload
 
 # Pre-configured CLI tool presets.
 # Each preset defines the command and argument pattern.
@@ -68,60 +73,122 @@ def _build_command(prompt: str, cli_preset: str = "gemini",
     return [preset["command"]] + preset["args"] + [prompt]
 
 
-def generate_with_cli(prompt: str, parse_json: bool = True, timeout: int = 120,
-                      cli_preset: str = "gemini", custom_command: str = None,
-                      custom_args: str = None) -> dict | str:
-    """
-    Calls the configured CLI LLM tool with the given prompt.
-    If parse_json is True, returns the parsed JSON output.
-    Otherwise, returns the raw string output.
-    """
-    # Check if the tool is installed
+class CLIError(Exception):
+    """A CLI tool that is missing, failed or timed out."""
+
+    def __init__(self, error: str, details: str = None):
+        super().__init__(error)
+        self.error = error
+        self.details = details or error
+
+
+def _resolve_tool(prompt: str, cli_preset: str, custom_command: str,
+                  custom_args: str) -> tuple:
+    """The command list and display name of the configured tool. Raises CLIError if it isn't installed."""
     if cli_preset == "custom":
         tool_name = custom_command or "unknown"
         if not custom_command or not is_cli_tool_installed(custom_command.split()[0]):
             logging.error(f"CLI tool '{tool_name}' not found.")
-            return {"error": f"CLI tool '{tool_name}' not found."}
+            raise CLIError(f"CLI tool '{tool_name}' not found.")
     else:
         preset = CLI_PRESETS.get(cli_preset)
         if not preset:
-            return {"error": f"Unknown CLI preset: {cli_preset}"}
+            raise CLIError(f"Unknown CLI preset: {cli_preset}")
         tool_name = preset["description"]
         if not is_cli_tool_installed(preset["command"]):
             logging.error(f"{tool_name} not found. Please install it to use this feature.")
-            return {"error": f"{tool_name} not found."}
+            raise CLIError(f"{tool_name} not found.")
+    return _build_command(prompt, cli_preset, custom_command, custom_args), tool_name
+
+
+def parse_cli_json(raw_output: str, tool_name: str = "CLI tool"):
+    """Parses a CLI tool's JSON output, tolerating fencing and surrounding text. Returns None on failure."""
+    cleaned_json = raw_output.strip().replace("```json", "").replace("```", "")
+    try:
+        return json.loads(cleaned_json)
+    except json.JSONDecodeError:
+        # Try to extract JSON object/array from surrounding text
+        # (Claude may wrap JSON with explanatory text)
+        import re
+        json_match = re.search(r'(\{[\s\S]*\}|\[[\s\S]*\])', cleaned_json)
+        if json_match:
+            try:
+                return json.loads(json_match.group(1))
+            except json.JSONDecodeError:
+                pass
+        logging.error(f"Failed to parse JSON from {tool_name} output. Raw: {raw_output[:500]}")
+        return None
+
+
+async def stream_with_cli(prompt: str, timeout: int = 120, cli_preset: str = "gemini",
+                          custom_command: str = None, custom_args: str = None):
+    """
+    Runs the configured CLI LLM tool as an asyncio subprocess and yields its
+    output as it arrives. Raises CLIError if the tool is missing, exits with
+    an error or runs past the timeout. Cancelling the caller kills the tool.
+    """
+    command, tool_name = _resolve_tool(prompt, cli_preset, custom_command, custom_args)
+    logging.info(f"Calling {tool_name} (timeout={timeout}s)...")
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    # Run from /tmp, as generate_with_cli does.
+    process = await asyncio.create_subprocess_exec(
+        *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        cwd=tempfile.gettempdir())
+    stderr = asyncio.ensure_future(process.stderr.read())
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    try:
+        while True:
+            data = await asyncio.wait_for(process.stdout.read(4096), max(deadline - loop.time(), 0.0))
+            if not data:
+                break
+            text = decoder.decode(data)
+            if text:
+                yield text
+        returncode = await asyncio.wait_for(process.wait(), max(deadline - loop.time(), 0.0))
+        if returncode != 0:
+            logging.error(f"{tool_name} call failed with exit code {returncode}.")
+            details = (await stderr).decode(errors="replace")
+            logging.error(f"Stderr: {details}")
+            raise CLIError(f"{tool_name} call failed.", details)
+    except asyncio.TimeoutError:
+        logging.error(f"{tool_name} call timed out after {timeout} seconds.")
+        raise CLIError("Timeout", f"{tool_name} timed out after {timeout} seconds.")
+    finally:
+        stderr.cancel()
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
 
-    command = _build_command(prompt, cli_preset, custom_command, custom_args)
+
+def generate_with_cli(prompt: str, parse_json: bool = True, timeout: int = 120,
+                      cli_preset: str = "gemini", custom_command: str = None,
+                      custom_args: str = None) -> dict | str:
+    """
+    Calls the configured CLI LLM tool with the given prompt, blocking until it
+    exits. If parse_json is True, returns the parsed JSON output.
+    Otherwise, returns the raw string output.
+    """
+    try:
+        command, tool_name = _resolve_tool(prompt, cli_preset, custom_command, custom_args)
+    except CLIError as e:
+        return {"error": e.error}
 
     try:
         logging.info(f"Calling {tool_name} (timeout={timeout}s)...")
         # Run from /tmp to avoid directory-level security prompts (e.g. Claude's
         # --internet mode flag) that block subprocess execution in the game dir.
-        import tempfile
         result = subprocess.run(command, capture_output=True, text=True, check=True,
                                 timeout=timeout, cwd=tempfile.gettempdir())
 
         raw_output = result.stdout
-        logging.info(f"--- RAW CLI LLM RESPONSE ---\n{raw_output}\n-----------------------------")
+        log_payload("RAW CLI LLM RESPONSE", raw_output, "llm_response")
 
         if not parse_json:
             return raw_output
 
-        cleaned_json = raw_output.strip().replace("```json", "").replace("```", "")
-        try:
-            return json.loads(cleaned_json)
-        except json.JSONDecodeError:
-            # Try to extract JSON object/array from surrounding text
-            # (Claude may wrap JSON with explanatory text)
-            import re
-            json_match = re.search(r'(\{[\s\S]*\}|\[[\s\S]*\])', cleaned_json)
-            if json_match:
-                try:
-                    return json.loads(json_match.group(1))
-                except json.JSONDecodeError:
-                    pass
-            logging.error(f"Failed to parse JSON from {tool_name} output. Raw: {raw_output[:500]}")
-            return raw_output
+        parsed = parse_cli_json(raw_output, tool_name)
+        return raw_output if parsed is None else parsed
 
     except subprocess.TimeoutExpired:
         logging.error(f"{tool_name} call timed out after {timeout} seconds.")
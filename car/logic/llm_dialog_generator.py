@@ -1,23 +1,23 @@
-import logging
-from .llm_inference import generate_text
+from ..common.log_pipeline import log_payload
+from .llm_inference import agenerate_text
+from .prompt_templates import get_template
 
-def generate_shop_dialog_from_llm(app, theme: dict, shop_type: str, faction_name: str, faction_vibe: str, player_reputation: int) -> dict:
+async def generate_shop_dialog_from_llm(app, theme: dict, shop_type: str, faction_name: str, faction_vibe: str, player_reputation: int) -> dict:
     """
     Generates a short, thematic greeting and a 'can't afford' quip from a shopkeeper.
     Returns a dict with 'greeting' and 'no_cash' keys.
     """
-    with open("prompts/shop_dialog_prompt.txt", "r") as f:
-        prompt = f.read()
+    prompt = get_template("shop_dialog_prompt.txt").render({
+        "theme": f"'{theme['name']}': {theme['description']}",
+        "shop_type": shop_type,
+        "faction_name": faction_name,
+        "faction_vibe": faction_vibe,
+        "player_reputation": player_reputation,
+    })
 
-    prompt = prompt.replace("{{ theme }}", f"'{theme['name']}': {theme['description']}")
-    prompt = prompt.replace("{{ shop_type }}", shop_type)
-    prompt = prompt.replace("{{ faction_name }}", faction_name)
-    prompt = prompt.replace("{{ faction_vibe }}", faction_vibe)
-    prompt = prompt.replace("{{ player_reputation }}", str(player_reputation))
+    log_payload("BUILDING SHOP DIALOG PROMPT", prompt, "prompt")
 
-    logging.info(f"--- BUILDING SHOP DIALOG PROMPT ---\n{prompt}\n---------------------------------")
-
-    response = generate_text(app, prompt, max_tokens=256, temperature=0.8)
+    response = await agenerate_text(app, prompt, max_tokens=256, temperature=0.8)
     if response is None:
         return _get_fallback_dialog(player_reputation)
     return _parse_dialog_response(response, player_reputation)
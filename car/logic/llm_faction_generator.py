@@ -1,17 +1,17 @@
 import logging
 from typing import Dict, Tuple
 from .prompt_builder import build_faction_prompt
-from .llm_inference import generate_json
+from .llm_inference import agenerate_json
 from .llm_schemas import FACTION_SCHEMA
 
-def generate_factions_from_llm(app, theme: dict) -> Tuple[Dict, bool]:
+async def generate_factions_from_llm(app, theme: dict) -> Tuple[Dict, bool]:
     """
     Generates a new set of factions by calling the language model, guided by a theme.
     Returns (factions_dict, is_fallback) where is_fallback=True if LLM generation failed.
     """
     prompt = build_faction_prompt(theme)
 
-    faction_data = generate_json(app, prompt, json_schema=FACTION_SCHEMA, max_tokens=2048, temperature=0.8)
+    faction_data = await agenerate_json(app, prompt, json_schema=FACTION_SCHEMA, max_tokens=2048, temperature=0.8)
 
     if faction_data is None:
         logging.warning("Faction generation returned None — using fallback factions.")
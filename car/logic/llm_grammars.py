@@ -0,0 +1,101 @@
+"""
+Compiled llama.cpp grammars for the JSON schemas in llm_schemas.py.
+
+Given a schema in response_format, llama-cpp-python converts it to a GBNF
+grammar and parses that grammar on every call. Here each schema is converted
+once: the GBNF text is kept on disk next to the model (models/grammars/),
+and the parsed grammar is kept in memory for the life of the process.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+GRAMMAR_DIR_NAME = "grammars"
+
+# id(schema) -> (schema, grammar). Holding the schema keeps its id from being reused.
+_grammars = {}
+_lock = threading.Lock()
+_grammar_dir = None
+
+
+def schema_digest(json_schema) -> str:
+    return hashlib.sha256(json.dumps(json_schema, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def _converter_tag() -> str:
+    """First line of every cached grammar; a new converter invalidates the cache."""
+    import llama_cpp
+    return f"# json_schema_to_gbnf from llama-cpp-python {getattr(llama_cpp, '__version__', 'unknown')}"
+
+
+def _read_gbnf(path, tag):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if f.readline().rstrip("\n") != tag:
+                return None
+            return f.read()
+    except OSError:
+        return None
+
+
+def _write_gbnf(path, tag, gbnf):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(f"{tag}\n{gbnf}")
+        os.replace(temp_path, path)
+    except OSError as e:
+        logging.warning(f"Could not cache grammar at {path}: {e}")
+
+
+def _build_grammar(json_schema):
+    from llama_cpp import LlamaGrammar
+    from llama_cpp.llama_grammar import json_schema_to_gbnf
+
+    tag = _converter_tag()
+    path = os.path.join(_grammar_dir, f"{schema_digest(json_schema)}.gbnf") if _grammar_dir else None
+    gbnf = _read_gbnf(path, tag) if path else None
+    if gbnf is None:
+        gbnf = json_schema_to_gbnf(json.dumps(json_schema))
+        if path:
+            _write_gbnf(path, tag, gbnf)
+    return LlamaGrammar.from_string(gbnf, verbose=False)
+
+
+def get_grammar(json_schema):
+    """
+    Returns (grammar, build_ms) for a schema. build_ms is 0 once the grammar
+    has been compiled. The grammar is None if it could not be built, in
+    which case the caller should fall back to response_format.
+    """
+    with _lock:
+        entry = _grammars.get(id(json_schema))
+        if entry is not None:
+            return entry[1], 0.0
+        start = time.perf_counter()
+        try:
+            grammar = _build_grammar(json_schema)
+        except Exception as e:
+            logging.error(f"Failed to build grammar for schema {schema_digest(json_schema)}: {e}", exc_info=True)
+            grammar = None
+        _grammars[id(json_schema)] = (json_schema, grammar)
+        return grammar, (time.perf_counter() - start) * 1000
+
+
+def precompile_grammars(directory, schemas=None) -> float:
+    """
+    Compiles the grammar for every schema, reading and writing GBNF text in
+    `directory`. Called once the model has loaded. Returns the time taken in ms.
+    """
+    global _grammar_dir
+    from .llm_schemas import ALL_SCHEMAS
+
+    _grammar_dir = directory
+    total_ms = sum(get_grammar(schema)[1] for schema in (schemas or ALL_SCHEMAS))
+    logging.info(f"Compiled {len(_grammars)} JSON-schema grammars in {total_ms:.1f} ms ({directory}).")
+    return total_ms
@@ -1,16 +1,85 @@
 """
 Unified LLM inference interface.
-Routes generation requests to either the local llama.cpp model
-or the Gemini CLI, depending on app.generation_mode.
+Routes generation requests to the local llama.cpp model, a CLI tool, or
+recorded responses ("replay"), depending on app.generation_mode.
+
+Generation is asyncio-native. Each mode has a backend whose stream()
+yields the response text as it is produced:
+
+  local       llama.cpp runs on one dedicated inference thread. Requests
+              wait in its queue and stream tokens back to the event loop
+              that asked for them.
+  gemini_cli  The CLI tool runs under asyncio.create_subprocess_exec.
+  replay      Recorded responses (llm_replay.py), delayed per the latency
+              model. Responses recorded from the local model wait in the
+              inference thread's queue, as the model would.
+
+Screens await agenerate_json / agenerate_text / stream_text from async
+workers, so leaving a screen cancels what it was waiting for: a queued
+request is dropped, a running local one stops at its next token and a CLI
+tool is killed. generate_json / generate_text block until the response
+is ready, for worker threads and scripts.
 """
 
+import asyncio
+import contextlib
+from abc import ABC, abstractmethod
 import json
 import logging
+import queue
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ..common.log_pipeline import log_payload
+from .gemini_cli import CLIError, parse_cli_json, stream_with_cli
+from .llm_grammars import get_grammar
+from .prompt_templates import estimate_tokens
+from .llm_replay import (
+    DEFAULT_STORE_PATH, LATENCY_NONE, REPLAY_HIT, REPLAY_SAME_SCHEMA, REPLAY_SYNTHESIZED,
+    get_replay_store, prompt_key, schema_key, synthesize_response,
+)
+
+_call_observers = []
+
+
+def add_call_observer(observer):
+    """
+    Registers observer(stats), called after every generation call with a dict
+    of kind, mode, prompt_tokens, grammar_ms (building a JSON grammar),
+    wait_ms (queued behind other calls), model_ms, parse_ms, ok and replay
+    (the lookup result in replay mode). Observers run on the
+    calling thread.
+    """
+    _call_observers.append(observer)
+
+
+def remove_call_observer(observer):
+    _call_observers.remove(observer)
+
+
+def _report(kind, mode, prompt_tokens, wait_ms, model_ms, parse_ms, ok, replay=None, grammar_ms=0.0):
+    if not _call_observers:
+        return
+    stats = {
+        "kind": kind, "mode": mode, "prompt_tokens": prompt_tokens,
+        "grammar_ms": grammar_ms, "wait_ms": wait_ms, "model_ms": model_ms,
+        "parse_ms": parse_ms, "ok": ok, "replay": replay,
+    }
+    for observer in list(_call_observers):
+        observer(stats)
+
+
+def _record(app, kind, prompt, json_schema, raw, elapsed_ms):
+    """Saves a live response for replay mode, if recording is switched on."""
+    if not getattr(app, 'record_llm_responses', False):
+        return
+    store = get_replay_store(getattr(app, 'replay_store', DEFAULT_STORE_PATH))
+    store.record(kind, prompt, json_schema, raw, app.generation_mode, elapsed_ms)
 
-from .gemini_cli import generate_with_cli
 
-_inference_lock = threading.Lock()
+def _ms_since(start: float) -> float:
+    return (time.perf_counter() - start) * 1000
 
 
 def _prepare_prompt_for_local(prompt: str) -> str:
@@ -18,130 +87,369 @@ def _prepare_prompt_for_local(prompt: str) -> str:
     return prompt + "\n/no_think"
 
 
-def generate_json(app, prompt: str, json_schema: dict = None,
-                  max_tokens: int = 1024, temperature: float = 0.8) -> dict | None:
+def _parse_json_text(text: str, source: str) -> dict | None:
+    """Parses a model's JSON output, tolerating markdown fencing."""
+    cleaned = text.strip()
+    if cleaned.startswith("```"):
+        cleaned = cleaned.replace("```json", "").replace("```", "").strip()
+    try:
+        return json.loads(cleaned)
+    except json.JSONDecodeError as e:
+        logging.error(f"Failed to parse JSON from {source}: {e}")
+        return None
+
+
+class LLMJob:
+    """One generation request, and the stats its backend fills in."""
+
+    def __init__(self, kind: str, prompt: str, json_schema: dict = None,
+                 max_tokens: int = 512, temperature: float = 0.8):
+        self.kind = kind                  # "json" or "text"
+        self.prompt = prompt
+        self.json_schema = json_schema
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.prompt_tokens = estimate_tokens(prompt)  # The backend's own count replaces this when it has one
+        self.grammar_ms = 0.0
+        self.wait_ms = 0.0
+        self.model_ms = 0.0
+        self.ok = True
+        self.replay = None
+
+
+# --- The inference thread ---
+
+class _QueuedRun:
+    """
+    A run of produce(cancelled) on the inference thread, streamed back to the
+    event loop that queued it as ("start" | "text" | "error" | "end", value).
+    """
+
+    def __init__(self, produce):
+        self.produce = produce
+        self.cancelled = threading.Event()
+        self.queued_at = time.perf_counter()
+        self.events = asyncio.Queue()
+        self._loop = asyncio.get_running_loop()
+
+    def _send(self, event, value=None):
+        try:
+            self._loop.call_soon_threadsafe(self.events.put_nowait, (event, value))
+        except RuntimeError:  # The caller's loop has closed
+            self.cancelled.set()
+
+    def run(self):
+        self._send("start", time.perf_counter())
+        try:
+            with contextlib.closing(self.produce(self.cancelled)) as texts:
+                for text in texts:
+                    if self.cancelled.is_set():
+                        break
+                    self._send("text", text)
+        except Exception as e:
+            logging.error(f"Local LLM inference error: {e}", exc_info=True)
+            self._send("error")
+        self._send("end", time.perf_counter())
+
+
+class _InferenceThread:
+    """The one thread that runs the local model, taking queued runs in order."""
+
+    def __init__(self):
+        self._runs = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, run):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._serve, name="llm-inference", daemon=True)
+                self._thread.start()
+        self._runs.put(run)
+
+    def _serve(self):
+        while True:
+            run = self._runs.get()
+            if not run.cancelled.is_set():  # Dropped while it waited
+                run.run()
+
+
+_inference_thread = _InferenceThread()
+
+
+async def _run_on_inference_thread(job, produce):
+    """Queues produce on the inference thread and yields its text, filling in the job's timings."""
+    run = _QueuedRun(produce)
+    _inference_thread.submit(run)
+    started = run.queued_at
+    try:
+        while True:
+            event, value = await run.events.get()
+            if event == "text":
+                yield value
+            elif event == "start":
+                started = value
+                job.wait_ms = (value - run.queued_at) * 1000
+            elif event == "error":
+                job.ok = False
+            else:
+                job.model_ms = max(0.0, (value - started) * 1000 - job.grammar_ms)
+                return
+    finally:
+        run.cancelled.set()
+
+
+# --- Backends ---
+
+class LLMBackend(ABC):
+    """
+    A generation backend. stream(app, job) is an async iterator over the
+    response text that fills in the job's stats; a backend that fails logs
+    why, sets job.ok to False and stops.
+    """
+
+    mode = None
+    log_label = None    # Raw responses are logged under this label, when set
+    records = True      # Live responses can be recorded for replay
+
+    @abstractmethod
+    def stream(self, app, job):
+        pass
+
+    def parse_json(self, text: str):
+        return _parse_json_text(text, f"{self.mode} response")
+
+    def recording(self, job, text, result):
+        """The raw response to record for replay."""
+        return text
+
+
+class LocalBackend(LLMBackend):
+    """llama.cpp on the inference thread, streaming tokens."""
+
+    mode = "local"
+    log_label = "LOCAL LLM"
+
+    async def stream(self, app, job):
+        pipeline = app.llm_pipeline
+        if pipeline is None:
+            logging.warning("Local LLM pipeline not loaded. Cannot generate.")
+            job.ok = False
+            return
+        local_prompt = _prepare_prompt_for_local(job.prompt)
+        job.prompt_tokens = estimate_tokens(local_prompt)  # Until the model reports its usage
+        messages = [{"role": "user", "content": local_prompt}]
+
+        def produce(cancelled):
+            # Grammar-constrained generation, with the grammar compiled once per schema.
+            # If it cannot be built, llama-cpp-python builds one from response_format.
+            grammar, job.grammar_ms = get_grammar(job.json_schema) if job.json_schema else (None, 0.0)
+            response_format = None
+            if job.json_schema and grammar is None:
+                response_format = {"type": "json_object", "schema": job.json_schema}
+            chunks = pipeline.create_chat_completion(
+                messages=messages,
+                max_tokens=job.max_tokens,
+                temperature=job.temperature,
+                response_format=response_format,
+                grammar=grammar,
+                stream=True,
+            )
+            with contextlib.closing(chunks):
+                for chunk in chunks:
+                    # The last chunk may carry the model's usage report, with no choices.
+                    usage = chunk.get("usage")
+                    if usage and usage.get("prompt_tokens"):
+                        job.prompt_tokens = usage["prompt_tokens"]
+                    choices = chunk.get("choices")
+                    text = choices[0].get("delta", {}).get("content") if choices else None
+                    if text:
+                        yield text
+
+        async for text in _run_on_inference_thread(job, produce):
+            yield text
+
+    def parse_json(self, text):
+        return _parse_json_text(text, "local LLM")
+
+
+class CLIBackend(LLMBackend):
+    """The configured CLI tool, run as an asyncio subprocess."""
+
+    mode = "gemini_cli"
+    log_label = "CLI LLM"
+
+    async def stream(self, app, job):
+        start = time.perf_counter()
+        try:
+            async for text in stream_with_cli(
+                job.prompt,
+                cli_preset=getattr(app, 'cli_preset', 'gemini'),
+                custom_command=getattr(app, 'custom_cli_command', None) or None,
+                custom_args=getattr(app, 'custom_cli_args', None) or None,
+            ):
+                yield text
+        except CLIError as e:
+            logging.error(f"CLI LLM returned error: {e.details}")
+            job.ok = False
+        job.model_ms = _ms_since(start)
+
+    def parse_json(self, text):
+        result = parse_cli_json(text)
+        return result if isinstance(result, dict) else None
+
+    def recording(self, job, text, result):
+        return json.dumps(result) if job.kind == "json" else text
+
+
+class ReplayBackend(LLMBackend):
+    """
+    Serves a recorded response (see llm_replay.py). Responses recorded from
+    the local model queue on the inference thread as the model does, and the
+    latency model decides how long each one takes.
+    """
+
+    mode = "replay"
+    records = False
+
+    async def stream(self, app, job):
+        store = get_replay_store(getattr(app, 'replay_store', DEFAULT_STORE_PATH))
+        entry = store.lookup(prompt_key(job.kind, job.prompt, job.json_schema))
+        job.replay = REPLAY_HIT
+        if entry is None:
+            entry = store.latest_for_schema(schema_key(job.kind, job.json_schema))
+            job.replay = REPLAY_SAME_SCHEMA
+        if entry is not None:
+            raw = entry["raw"]
+            delay_ms = entry.get("elapsed_ms", 0.0)
+            queued = entry.get("backend", "local") == "local"
+        else:
+            raw = synthesize_response(job.kind, job.prompt, job.json_schema)
+            delay_ms = 0.0
+            queued = True
+            job.replay = REPLAY_SYNTHESIZED
+        if getattr(app, 'replay_latency', LATENCY_NONE) == LATENCY_NONE:
+            delay_ms = 0.0
+
+        if queued:
+            def produce(cancelled):
+                if delay_ms:
+                    cancelled.wait(delay_ms / 1000)
+                yield raw
+
+            async for text in _run_on_inference_thread(job, produce):
+                yield text
+            return
+        start = time.perf_counter()
+        if delay_ms:
+            await asyncio.sleep(delay_ms / 1000)
+        job.model_ms = _ms_since(start)
+        yield raw
+
+    def parse_json(self, text):
+        return _parse_json_text(text, "replayed response")
+
+
+_BACKENDS = {
+    "local": LocalBackend(),
+    "gemini_cli": CLIBackend(),
+    "replay": ReplayBackend(),
+}
+
+
+def get_backend(app) -> LLMBackend:
+    """The backend for app.generation_mode; anything unknown runs locally."""
+    return _BACKENDS.get(app.generation_mode, _BACKENDS["local"])
+
+
+# --- Generation ---
+
+def _finish(app, backend, job, text):
+    """Logs, parses, records and reports a finished response. Returns the result or None."""
+    if backend.log_label and job.ok:
+        log_payload(f"RAW {backend.log_label} RESPONSE", text, "llm_response")
+    result = None
+    parse_ms = 0.0
+    if job.ok:
+        if job.kind == "json":
+            parse_start = time.perf_counter()
+            result = backend.parse_json(text)
+            parse_ms = _ms_since(parse_start)
+        else:
+            result = text.strip()
+        if backend.records and result is not None:
+            _record(app, job.kind, job.prompt, job.json_schema, backend.recording(job, text, result), job.model_ms)
+    _report(job.kind, backend.mode, job.prompt_tokens, job.wait_ms, job.model_ms, parse_ms,
+            result is not None, job.replay, grammar_ms=job.grammar_ms)
+    return result
+
+
+async def _generate(app, job):
+    backend = get_backend(app)
+    chunks = []
+    async for text in backend.stream(app, job):
+        chunks.append(text)
+    return _finish(app, backend, job, "".join(chunks))
+
+
+async def agenerate_json(app, prompt: str, json_schema: dict = None,
+                         max_tokens: int = 1024, temperature: float = 0.8) -> dict | None:
     """
     Generate a JSON response from the LLM.
 
-    Routes to gemini_cli or local llama.cpp based on app.generation_mode.
     When json_schema is provided and using local mode, grammar-constrained
     generation ensures the output is valid JSON matching the schema.
 
     Returns parsed dict on success, None on failure.
     """
-    if app.generation_mode == "gemini_cli":
-        return _generate_cli_json(app, prompt)
+    return await _generate(app, LLMJob("json", prompt, json_schema, max_tokens, temperature))
 
-    return _generate_local_json(app, prompt, json_schema, max_tokens, temperature)
 
-
-def generate_text(app, prompt: str, max_tokens: int = 512,
-                  temperature: float = 0.8) -> str | None:
+async def agenerate_text(app, prompt: str, max_tokens: int = 512,
+                         temperature: float = 0.8) -> str | None:
     """
     Generate a plain-text response from the LLM.
-
-    Routes to gemini_cli or local llama.cpp based on app.generation_mode.
     Returns string on success, None on failure.
     """
-    if app.generation_mode == "gemini_cli":
-        return _generate_cli_text(app, prompt)
-
-    return _generate_local_text(app, prompt, max_tokens, temperature)
-
-
-def _generate_cli_json(app, prompt: str) -> dict | None:
-    """Generate JSON via the configured CLI LLM tool."""
-    response = generate_with_cli(
-        prompt, parse_json=True,
-        cli_preset=getattr(app, 'cli_preset', 'gemini'),
-        custom_command=getattr(app, 'custom_cli_command', None) or None,
-        custom_args=getattr(app, 'custom_cli_args', None) or None,
-    )
-    if isinstance(response, dict) and "error" not in response:
-        return response
-    if isinstance(response, dict):
-        logging.error(f"CLI LLM returned error: {response.get('details', response)}")
-    return None
-
-
-def _generate_cli_text(app, prompt: str) -> str | None:
-    """Generate plain text via the configured CLI LLM tool."""
-    response = generate_with_cli(
-        prompt, parse_json=False,
-        cli_preset=getattr(app, 'cli_preset', 'gemini'),
-        custom_command=getattr(app, 'custom_cli_command', None) or None,
-        custom_args=getattr(app, 'custom_cli_args', None) or None,
-    )
-    if isinstance(response, str):
-        return response
-    if isinstance(response, dict) and "error" in response:
-        logging.error(f"CLI LLM returned error: {response.get('details', response)}")
-    return None
-
-
-def _generate_local_json(app, prompt: str, json_schema: dict | None,
-                         max_tokens: int, temperature: float) -> dict | None:
-    """Generate JSON via local llama.cpp model with optional schema constraint."""
-    if app.llm_pipeline is None:
-        logging.warning("Local LLM pipeline not loaded. Cannot generate.")
-        return None
+    return await _generate(app, LLMJob("text", prompt, None, max_tokens, temperature))
 
-    local_prompt = _prepare_prompt_for_local(prompt)
-    messages = [{"role": "user", "content": local_prompt}]
 
-    # Build response_format for grammar-constrained generation
-    response_format = None
-    if json_schema:
-        response_format = {
-            "type": "json_object",
-            "schema": json_schema
-        }
+async def stream_text(app, prompt: str, max_tokens: int = 512, temperature: float = 0.8):
+    """
+    Yields a plain-text response as it is generated. A failed call may stop
+    after some text; it is reported to the call observers as failed.
+    """
+    job = LLMJob("text", prompt, None, max_tokens, temperature)
+    backend = get_backend(app)
+    chunks = []
+    async for text in backend.stream(app, job):
+        chunks.append(text)
+        yield text
+    _finish(app, backend, job, "".join(chunks))
 
-    with _inference_lock:
-        try:
-            response = app.llm_pipeline.create_chat_completion(
-                messages=messages,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                response_format=response_format,
-            )
-            text = response["choices"][0]["message"]["content"]
-            logging.info(f"--- RAW LOCAL LLM RESPONSE ---\n{text}\n-----------------------------")
-
-            # Clean any markdown fencing the model might still produce
-            cleaned = text.strip()
-            if cleaned.startswith("```"):
-                cleaned = cleaned.replace("```json", "").replace("```", "").strip()
-
-            return json.loads(cleaned)
-        except json.JSONDecodeError as e:
-            logging.error(f"Failed to parse JSON from local LLM: {e}")
-            return None
-        except Exception as e:
-            logging.error(f"Local LLM inference error: {e}", exc_info=True)
-            return None
 
+# Runs generation for synchronous callers that are on an event loop's thread.
+_blocking_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="llm-blocking")
 
-def _generate_local_text(app, prompt: str, max_tokens: int,
-                         temperature: float) -> str | None:
-    """Generate plain text via local llama.cpp model."""
-    if app.llm_pipeline is None:
-        logging.warning("Local LLM pipeline not loaded. Cannot generate.")
-        return None
 
-    local_prompt = _prepare_prompt_for_local(prompt)
-    messages = [{"role": "user", "content": local_prompt}]
+def _run_blocking(generate, *args):
+    """Runs a generation coroutine to completion from synchronous code."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(generate(*args))
+    # Called on an event loop's thread (a loot drop during the world tick):
+    # run it on a helper thread and block this one until it is done.
+    return _blocking_pool.submit(lambda: asyncio.run(generate(*args))).result()
 
-    with _inference_lock:
-        try:
-            response = app.llm_pipeline.create_chat_completion(
-                messages=messages,
-                max_tokens=max_tokens,
-                temperature=temperature,
-            )
-            text = response["choices"][0]["message"]["content"]
-            logging.info(f"--- RAW LOCAL LLM RESPONSE ---\n{text}\n-----------------------------")
-            return text.strip()
-        except Exception as e:
-            logging.error(f"Local LLM inference error: {e}", exc_info=True)
-            return None
+
+def generate_json(app, prompt: str, json_schema: dict = None,
+                  max_tokens: int = 1024, temperature: float = 0.8) -> dict | None:
+    """agenerate_json for synchronous code: blocks until the response is ready."""
+    return _run_blocking(agenerate_json, app, prompt, json_schema, max_tokens, temperature)
+
+
+def generate_text(app, prompt: str, max_tokens: int = 512,
+                  temperature: float = 0.8) -> str | None:
+    """agenerate_text for synchronous code: blocks until the response is ready."""
+    return _run_blocking(agenerate_text, app, prompt, max_tokens, temperature)
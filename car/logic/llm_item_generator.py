@@ -3,6 +3,7 @@ import json
 from typing import Any, Dict, Optional
 from .llm_inference import generate_json
 from .llm_schemas import ITEM_SCHEMA
+from .prompt_templates import cached_section, get_template
 from ..data.cosmetics import COSMETIC_TAGS
 from ..data.weapons import WEAPONS_DATA
 
@@ -61,15 +62,18 @@ def generate_item_from_llm(app: Any, theme: Dict, player_level: int, base_item_i
     base_item_template["id"] = base_item_id
 
     try:
-        with open("prompts/item_generator_prompt.txt", "r") as f:
-            prompt_template = f.read()
-
         # Build game summary for context
         game_summary = "A post-apocalyptic automotive RPG where players survive and upgrade their vehicles."
 
-        prompt = prompt_template.replace("{{ game_summary }}", game_summary)
-        prompt = prompt.replace("{{ theme }}", f"'{theme['name']}': {theme['description']}")
-        prompt = prompt.replace("{{ base_item_data }}", json.dumps(base_item_template, indent=2))
+        prompt = get_template("item_generator_prompt.txt").render({
+            "game_summary": game_summary,
+            "theme": f"'{theme['name']}': {theme['description']}",
+            # Base item stats are static, so each one is only formatted once.
+            "base_item_data": lambda: cached_section(
+                "base_item_data", (base_item_template,), base_item_id,
+                lambda: json.dumps(base_item_template, indent=2),
+            ),
+        })
 
         response = generate_json(app, prompt, json_schema=ITEM_SCHEMA, max_tokens=512, temperature=0.8)
         if response and isinstance(response, dict):
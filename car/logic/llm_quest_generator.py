@@ -7,7 +7,7 @@ from ..data.quests import (
     SurvivalObjective, DeliverPackageObjective, DefendLocationObjective,
     WaveSpawnObjective
 )
-from .llm_inference import generate_json
+from .llm_inference import agenerate_json
 from .llm_schemas import QUEST_SCHEMA
 from ..data.game_constants import CITY_SPACING
 
@@ -123,14 +123,14 @@ def _instantiate_objectives(raw_objectives):
         objectives.append(KillCountObjective(3))
     return objectives
 
-def generate_quest_from_llm(game_state, quest_giver_faction_id, app, faction_data=None):
+async def generate_quest_from_llm(game_state, quest_giver_faction_id, app, faction_data=None):
     """
     Generates a new quest by calling the language model.
     Can be passed faction_data directly to override the global data, useful for workers.
     """
     prompt = build_quest_prompt(game_state, quest_giver_faction_id, faction_data)
 
-    quest_data = generate_json(app, prompt, json_schema=QUEST_SCHEMA, max_tokens=1024, temperature=0.8)
+    quest_data = await agenerate_json(app, prompt, json_schema=QUEST_SCHEMA, max_tokens=1024, temperature=0.8)
 
     if quest_data is None:
         return _get_fallback_quest(quest_giver_faction_id)
@@ -0,0 +1,212 @@
+"""
+Recorded LLM responses, for the "replay" generation mode.
+
+Responses from the local model or a CLI tool can be recorded (settings.json:
+"record_llm_responses") into a JSON-lines store keyed by a hash of the prompt.
+In replay mode a recorded response is served back for the same prompt. A
+prompt that was never recorded gets the most recent response recorded for
+the same schema, and failing that a minimal response synthesized from the
+schema, so the whole generation pipeline can run with no model installed.
+Schemas whose generators validate more than the schema says (items, quests)
+have replay hints here, schema fragments by property name that the
+synthesized response follows so it passes that validation.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+
+DEFAULT_STORE_PATH = os.path.join("recordings", "llm_responses.jsonl")
+
+# Latency models for replayed responses.
+LATENCY_NONE = "none"          # respond instantly
+LATENCY_RECORDED = "recorded"  # sleep as long as the recorded call took
+LATENCY_MODELS = (LATENCY_NONE, LATENCY_RECORDED)
+
+# Results of a lookup, reported with each replayed call.
+REPLAY_HIT = "hit"
+REPLAY_SAME_SCHEMA = "same_schema"
+REPLAY_SYNTHESIZED = "synthesized"
+
+# How many entries an object with only "additionalProperties" is given.
+_SYNTHESIZED_MAP_SIZE = 3
+
+
+def schema_key(kind, json_schema=None) -> str:
+    """Identifies the shape of a response: the call kind plus its schema."""
+    schema_text = json.dumps(json_schema, sort_keys=True) if json_schema else ""
+    return hashlib.sha256(f"{kind}\n{schema_text}".encode("utf-8")).hexdigest()[:16]
+
+
+def prompt_key(kind, prompt, json_schema=None) -> str:
+    """Identifies one exact request."""
+    text = f"{schema_key(kind, json_schema)}\n{prompt}"
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ReplayStore:
+    """An append-only JSON-lines file of recorded responses, indexed in memory."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._by_prompt = {}
+        self._by_schema = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    self._index(json.loads(line))
+                except (json.JSONDecodeError, KeyError) as e:
+                    logging.error(f"Skipping bad recording at {self.path}:{line_number}: {e}")
+
+    def _index(self, entry):
+        self._by_prompt[entry["prompt_key"]] = entry
+        self._by_schema.setdefault(entry["schema_key"], []).append(entry)
+
+    def __len__(self):
+        return len(self._by_prompt)
+
+    def lookup(self, prompt_key_value):
+        """The response recorded for exactly this prompt, or None."""
+        return self._by_prompt.get(prompt_key_value)
+
+    def latest_for_schema(self, schema_key_value):
+        """The most recently recorded response with the same shape, or None."""
+        entries = self._by_schema.get(schema_key_value)
+        return entries[-1] if entries else None
+
+    def record(self, kind, prompt, json_schema, raw, backend, elapsed_ms):
+        """Appends one response. `raw` is the model's text before parsing."""
+        entry = {
+            "prompt_key": prompt_key(kind, prompt, json_schema),
+            "schema_key": schema_key(kind, json_schema),
+            "kind": kind,
+            "backend": backend,
+            "elapsed_ms": round(elapsed_ms, 1),
+            "raw": raw,
+        }
+        with self._lock:
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry) + "\n")
+            except OSError as e:
+                logging.error(f"Failed to record LLM response to {self.path}: {e}")
+                return
+            self._index(entry)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_replay_store(path=DEFAULT_STORE_PATH) -> ReplayStore:
+    """The shared store for a path, loaded on first use."""
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = ReplayStore(path)
+        return store
+
+
+def synthesize_from_schema(json_schema, rng, name="value"):
+    """
+    Builds the smallest value that satisfies a JSON schema, with placeholder
+    strings named after their property. Integers take their minimum (or 0),
+    so synthesized coordinates land on the origin.
+    """
+    if not json_schema:
+        return None
+    if "enum" in json_schema:
+        return json_schema["enum"][0]
+    schema_type = json_schema.get("type")
+    if schema_type == "object":
+        properties = json_schema.get("properties", {})
+        if properties:
+            return {key: synthesize_from_schema(sub, rng, key) for key, sub in properties.items()}
+        extra = json_schema.get("additionalProperties")
+        if isinstance(extra, dict):
+            return {
+                f"{name}_{index}": synthesize_from_schema(extra, rng, f"{name}_{index}")
+                for index in range(1, _SYNTHESIZED_MAP_SIZE + 1)
+            }
+        return {}
+    if schema_type == "array":
+        items = json_schema.get("items", {})
+        if isinstance(items, list):  # A tuple: one schema per position
+            return [synthesize_from_schema(sub, rng, f"{name}_{index}") for index, sub in enumerate(items, start=1)]
+        count = json_schema.get("minItems", 1)
+        return [synthesize_from_schema(items, rng, f"{name}_{index}") for index in range(1, count + 1)]
+    if schema_type == "string":
+        return f"{name.replace('_', ' ').title()} {rng.randint(1, 99)}"
+    if schema_type == "integer":
+        return json_schema.get("minimum", 0)
+    if schema_type == "number":
+        return float(json_schema.get("minimum", 1.0))
+    if schema_type == "boolean":
+        return False
+    return None
+
+
+def _item_hints(prompt):
+    """Keeps the base item named in the prompt and adds no modifiers or tags."""
+    from ..data.item_modifiers import RARITY_LEVELS
+    base_item = re.search(r'"id":\s*"([^"]+)"', prompt)
+    return {
+        "base_item_id": {"enum": [base_item.group(1) if base_item else "unknown"]},
+        "rarity": {"enum": list(RARITY_LEVELS)},
+        "stat_modifiers": {"type": "object"},
+        "cosmetic_tags": {"type": "array", "minItems": 0},
+    }
+
+
+def _quest_hints(prompt):
+    """Asks for one kill-count objective: [class, [count]]."""
+    return {
+        "objectives": {
+            "type": "array",
+            "items": {
+                "type": "array",
+                "items": [
+                    {"enum": ["KillCountObjective"]},
+                    {"type": "array", "items": [{"type": "integer", "minimum": 3}]},
+                ],
+            },
+        },
+    }
+
+
+def _replay_hints(json_schema, prompt):
+    """Schema fragments by property name for a synthesized response, or None."""
+    from .llm_schemas import ITEM_SCHEMA, QUEST_SCHEMA
+    hints_for = {schema_key("json", ITEM_SCHEMA): _item_hints, schema_key("json", QUEST_SCHEMA): _quest_hints}
+    make_hints = hints_for.get(schema_key("json", json_schema))
+    return make_hints(prompt) if make_hints else None
+
+
+def synthesize_response(kind, prompt, json_schema=None) -> str:
+    """
+    Raw response text for a prompt nothing was recorded for. Deterministic
+    per prompt. Replay hints for the schema replace its properties of the same name.
+    """
+    rng = random.Random(prompt_key(kind, prompt, json_schema))
+    if kind == "json":
+        hints = _replay_hints(json_schema, prompt)
+        if hints and json_schema:
+            json_schema = dict(json_schema, properties={**json_schema.get("properties", {}), **hints})
+        return json.dumps(synthesize_from_schema(json_schema, rng, "key"))
+    return "The road ahead is long and the wasteland is quiet, for now."
@@ -1,6 +1,6 @@
 """
 JSON schemas for grammar-constrained LLM generation.
-These schemas are used by llama-cpp-python's response_format parameter
+These schemas are compiled into llama.cpp grammars (see llm_grammars.py)
 to force the model to produce valid, parseable JSON output.
 """
 
@@ -149,3 +149,9 @@ ITEM_SCHEMA = {
     },
     "required": ["name", "base_item_id", "description", "rarity", "stat_modifiers", "cosmetic_tags"]
 }
+
+# Every schema above, compiled into a grammar when the local model loads.
+ALL_SCHEMAS = (
+    THEME_SCHEMA, QUEST_SCHEMA, FACTION_SCHEMA, WORLD_DETAILS_SCHEMA,
+    VEHICLE_NAMES_SCHEMA, ITEM_SCHEMA,
+)
@@ -1,19 +1,20 @@
 import logging
 from typing import List, Dict, Tuple
-from .llm_inference import generate_json
+from ..common.log_pipeline import log_payload
+from .llm_inference import agenerate_json
+from .prompt_templates import get_template
 from .llm_schemas import THEME_SCHEMA
 
-def generate_themes_from_llm(app) -> Tuple[List[Dict[str, str]], bool]:
+async def generate_themes_from_llm(app) -> Tuple[List[Dict[str, str]], bool]:
     """
     Generates a list of three distinct themes for the game.
     Returns (themes, is_fallback) where is_fallback=True if LLM generation failed.
     """
-    with open("prompts/theme_generation_prompt.txt", "r") as f:
-        prompt = f.read()
+    prompt = get_template("theme_generation_prompt.txt").render({})
 
-    logging.info(f"--- BUILDING THEME PROMPT ---\n{prompt}\n---------------------------")
+    log_payload("BUILDING THEME PROMPT", prompt, "prompt")
 
-    theme_data = generate_json(app, prompt, json_schema=THEME_SCHEMA, max_tokens=512, temperature=0.9)
+    theme_data = await agenerate_json(app, prompt, json_schema=THEME_SCHEMA, max_tokens=512, temperature=0.9)
 
     if theme_data is None:
         logging.warning("Theme generation returned None — using fallback themes.")
@@ -1,6 +1,7 @@
 import logging
 from typing import Any, Dict
-from .llm_inference import generate_json
+from .llm_inference import agenerate_json
+from .prompt_templates import get_template
 from .llm_schemas import VEHICLE_NAMES_SCHEMA
 
 # Base vehicle descriptions for prompt context
@@ -20,7 +21,7 @@ _VEHICLE_ROLES = {
 }
 
 
-def generate_vehicle_names(app: Any, theme: Dict, faction_id: str, faction_info: Dict) -> Dict:
+async def generate_vehicle_names(app: Any, theme: Dict, faction_id: str, faction_info: Dict) -> Dict:
     """
     Generates thematic names and descriptions for a faction's vehicle units.
     Returns a dict of {unit_id: {"name": str, "description": str}} or {} on failure.
@@ -34,9 +35,6 @@ def generate_vehicle_names(app: Any, theme: Dict, faction_id: str, faction_info:
 
     logging.info(f"Generating vehicle names for faction '{faction_name}' ({len(units)} units)...")
 
-    with open("prompts/vehicle_names_prompt.txt", "r") as f:
-        prompt = f.read()
-
     # Build the vehicle list with role hints
     vehicle_lines = []
     for unit_id in units:
@@ -44,12 +42,14 @@ def generate_vehicle_names(app: Any, theme: Dict, faction_id: str, faction_info:
         vehicle_lines.append(f"- **{unit_id}**: {role}")
     vehicle_list_str = "\n".join(vehicle_lines)
 
-    prompt = prompt.replace("{{ theme }}", f"'{theme['name']}': {theme['description']}")
-    prompt = prompt.replace("{{ faction_name }}", faction_name)
-    prompt = prompt.replace("{{ faction_description }}", faction_desc)
-    prompt = prompt.replace("{{ vehicle_list }}", vehicle_list_str)
+    prompt = get_template("vehicle_names_prompt.txt").render({
+        "theme": f"'{theme['name']}': {theme['description']}",
+        "faction_name": faction_name,
+        "faction_description": faction_desc,
+        "vehicle_list": vehicle_list_str,
+    })
 
-    response = generate_json(app, prompt, json_schema=VEHICLE_NAMES_SCHEMA, max_tokens=512, temperature=0.8)
+    response = await agenerate_json(app, prompt, json_schema=VEHICLE_NAMES_SCHEMA, max_tokens=512, temperature=0.8)
 
     if response is None:
         logging.warning(f"Vehicle naming failed for faction '{faction_name}', using defaults.")
@@ -1,23 +1,22 @@
 import logging
 import json
 from typing import Any, Dict
-from .llm_inference import generate_json
+from .llm_inference import agenerate_json
+from .prompt_templates import get_template
 from .llm_schemas import WORLD_DETAILS_SCHEMA
 
-def generate_world_details_from_llm(app: Any, theme: Dict, factions: Dict) -> Dict:
+async def generate_world_details_from_llm(app: Any, theme: Dict, factions: Dict) -> Dict:
     """
     Generates world details (city names, landmarks, etc.) using the LLM.
     """
     logging.info("Generating world details from LLM...")
 
-    with open("prompts/world_details_prompt.txt", "r") as f:
-        prompt = f.read()
+    prompt = get_template("world_details_prompt.txt").render({
+        "theme": f"'{theme['name']}': {theme['description']}",
+        "factions": lambda: json.dumps(factions, indent=2),
+    })
 
-    # The prompt uses {{ theme }} and {{ factions }} placeholders
-    prompt = prompt.replace("{{ theme }}", f"'{theme['name']}': {theme['description']}")
-    prompt = prompt.replace("{{ factions }}", json.dumps(factions, indent=2))
-
-    response = generate_json(app, prompt, json_schema=WORLD_DETAILS_SCHEMA, max_tokens=1024, temperature=0.7)
+    response = await agenerate_json(app, prompt, json_schema=WORLD_DETAILS_SCHEMA, max_tokens=1024, temperature=0.7)
 
     if response is not None:
         # Ensure city_name_parts exists even if LLM omitted it
@@ -1,6 +1,8 @@
 from .vehicle_movement import update_vehicle_movement
 from .weapon_systems import update_weapon_systems
 from .collision_detection import handle_collisions
+from .spawning import despawn_distant_entities
+from .ai_behaviors import run_enemy_ai
 import math
 
 def update_physics_and_collisions(game_state, world, audio_manager, dt, app):
@@ -15,10 +17,16 @@ def update_physics_and_collisions(game_state, world, audio_manager, dt, app):
     # 2. Handle weapon firing and projectile updates
     update_weapon_systems(game_state, audio_manager)
 
-    # 3. Update projectile positions and check ranges
-    particles_to_keep = []
+    # 3. Update projectile positions and check ranges.
+    # Remember where each projectile started this tick so collisions can be
+    # swept along the whole segment. A projectile that runs out of range is
+    # clamped to its range limit, still gets this tick's collision check, and
+    # is dropped afterwards.
+    projectile_starts = []
+    expired = set()
     for p_state in game_state.active_particles:
         p_x, p_y, p_angle, p_speed, p_power, max_range, p_char, origin_x, origin_y = p_state[:9]
+        projectile_starts.append((p_x, p_y))
 
         # Move projectile
         p_dist = p_speed * dt
@@ -28,19 +36,22 @@ def update_physics_and_collisions(game_state, world, audio_manager, dt, app):
         # Check range
         distance_traveled = math.sqrt((p_x - origin_x)**2 + (p_y - origin_y)**2)
 
-        if distance_traveled < max_range:
-            p_state[0], p_state[1] = p_x, p_y
-            particles_to_keep.append(p_state)
-    game_state.active_particles = particles_to_keep
+        if distance_traveled >= max_range:
+            overshoot = min(p_dist, distance_traveled - max_range)
+            p_x -= overshoot * math.cos(p_angle)
+            p_y -= overshoot * math.sin(p_angle)
+            expired.add(id(p_state))
+        p_state[0], p_state[1] = p_x, p_y
 
     # 4. Process all collisions and their effects
-    notifications = handle_collisions(game_state, world, audio_manager, app)
+    notifications = handle_collisions(game_state, world, audio_manager, app, projectile_starts)
     notifications.extend(movement_notifications)
+    if expired:
+        game_state.active_particles = [p for p in game_state.active_particles if id(p) not in expired]
 
     # 5. Update AI and movement for all non-player entities
+    run_enemy_ai(game_state, world, dt)
     for enemy in game_state.active_enemies:
-        enemy.update(game_state, world, dt)
-        
         # Check for combat trigger
         if getattr(enemy, "is_major_enemy", False):
             dist_sq = (enemy.x - game_state.car_world_x)**2 + (enemy.y - game_state.car_world_y)**2
@@ -65,13 +76,9 @@ def update_physics_and_collisions(game_state, world, audio_manager, dt, app):
     for turret in game_state.active_turrets:
         turret.update(game_state, world, dt)
         
-    # 6. Despawn entities that are too far away
-    despawn_radius_sq = game_state.despawn_radius**2
-    game_state.active_enemies = [e for e in game_state.active_enemies if (e.x - game_state.car_world_x)**2 + (e.y - game_state.car_world_y)**2 < despawn_radius_sq]
-    game_state.active_fauna = [f for f in game_state.active_fauna if (f.x - game_state.car_world_x)**2 + (f.y - game_state.car_world_y)**2 < despawn_radius_sq]
-    game_state.active_obstacles = [o for o in game_state.active_obstacles if (o.x - game_state.car_world_x)**2 + (o.y - game_state.car_world_y)**2 < despawn_radius_sq]
-    game_state.active_turrets = [t for t in game_state.active_turrets if (t.x - game_state.car_world_x)**2 + (t.y - game_state.car_world_y)**2 < despawn_radius_sq]
-    
+    # 6. Despawn entities that are too far away, a few per tick
+    despawn_distant_entities(game_state)
+
     # 7. Check for game over condition
     if game_state.current_durability <= 0:
         game_state.game_over = True
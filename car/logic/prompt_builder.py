@@ -1,8 +1,8 @@
-import json
-import os
 import logging
-from ..logic.data_loader import FACTION_DATA as GLOBAL_FACTION_DATA
-from ..logic.entity_loader import ALL_VEHICLES, get_enemy_vehicle_list, get_character_list, get_obstacle_list
+from ..logic import entity_loader, data_loader
+from ..logic.entity_loader import get_enemy_vehicle_list, get_character_list, get_obstacle_list
+from ..logic.prompt_templates import cached_section, estimate_tokens, get_template
+from ..logic.session_store import SECTION_FACTIONS, SECTION_QUEST_LOG, SECTION_WORLD
 
 def _format_player_state(game_state):
     """Formats the player's current status into a string for the LLM."""
@@ -48,13 +48,9 @@ def _format_narrative_history(game_state):
     """Formats the completed quest log into a string for the LLM."""
     quest_log = getattr(game_state, 'quest_log', [])
     
-    # In a live game, the quest log might be empty, so we load from file.
-    if not quest_log and os.path.exists("temp/quest_log.json"):
-        with open("temp/quest_log.json", "r") as f:
-            try:
-                quest_log = json.load(f)
-            except (json.JSONDecodeError, IndexError):
-                quest_log = []
+    # In a live game, the quest log might be empty, so we load from the session store.
+    if not quest_log:
+        quest_log = data_loader.get_session_store().get_quest_log()
 
     if not quest_log:
         return "Player has not completed any quests yet."
@@ -131,16 +127,56 @@ def _format_world_details(world_details, player_grid_x=None, player_grid_y=None,
 
 def _get_vehicle_list():
     """Returns a formatted string of available vehicles for prompts."""
-    return ", ".join([vehicle.__name__ for vehicle in ALL_VEHICLES])
+    return ", ".join([vehicle.__name__ for vehicle in entity_loader.ALL_VEHICLES])
+
+def _entity_lists():
+    """The entity-list placeholders shared by several templates."""
+    return {
+        "enemy_vehicle_list": lambda: ", ".join(get_enemy_vehicle_list()),
+        "character_list": lambda: ", ".join(get_character_list()),
+        "obstacle_list": lambda: ", ".join(get_obstacle_list()),
+    }
+
+def _game_context():
+    """prompts/game_context.txt with its entity lists filled in. Fixed for the process."""
+    return cached_section("game_context", (), None, lambda: get_template("game_context.txt").render(_entity_lists()))
+
+def _world_state_section(faction_data, game_state):
+    """_format_world_state, reused until the factions or their control values change."""
+    store = data_loader.get_session_store()
+    control = tuple(getattr(game_state, 'faction_control', {}).items())
+    return cached_section(
+        "world_state", (faction_data, store), (store.version(SECTION_FACTIONS), control),
+        lambda: _format_world_state(faction_data, game_state),
+    )
+
+def _narrative_history_section(game_state):
+    """_format_narrative_history, reused until the stored quest log changes."""
+    if getattr(game_state, 'quest_log', []):
+        return _format_narrative_history(game_state)
+    store = data_loader.get_session_store()
+    return cached_section(
+        "narrative_history", (store,), store.version(SECTION_QUEST_LOG),
+        lambda: _format_narrative_history(game_state),
+    )
+
+def _world_details_section(world_details, player_grid_x, player_grid_y):
+    """_format_world_details, reused per player grid cell until the world details change."""
+    store = data_loader.get_session_store()
+    return cached_section(
+        "world_details", (world_details, store), (store.version(SECTION_WORLD), player_grid_x, player_grid_y),
+        lambda: _format_world_details(world_details, player_grid_x=player_grid_x, player_grid_y=player_grid_y),
+    )
 
 def build_quest_prompt(game_state, quest_giver_faction_id, faction_data_override=None):
     """
     Builds the complete, dynamic prompt for quest generation.
     Uses faction_data_override if provided, otherwise falls back to the game_state.
+    Sections are only built if the template uses them.
     """
     faction_data = faction_data_override if faction_data_override is not None else game_state.factions
     theme = getattr(game_state, 'theme', {'name': 'Default', 'description': 'A standard wasteland adventure.'})
-    
+
     # --- Build Quest Context ---
     quest_giver_faction = faction_data[quest_giver_faction_id]
     quest_context = (
@@ -149,81 +185,49 @@ def build_quest_prompt(game_state, quest_giver_faction_id, faction_data_override
         f"Their vibe is: {quest_giver_faction.get('description', 'N/A')}"
     )
 
-    with open("prompts/game_context.txt", "r") as f:
-        game_summary = f.read()
-        # Replace placeholders within game_summary itself
-        game_summary = game_summary.replace("{{ enemy_vehicle_list }}", ", ".join(get_enemy_vehicle_list()))
-        game_summary = game_summary.replace("{{ character_list }}", ", ".join(get_character_list()))
-        game_summary = game_summary.replace("{{ obstacle_list }}", ", ".join(get_obstacle_list()))
-        
-    player_state = _format_player_state(game_state)
-    world_state = _format_world_state(faction_data, game_state)
-    narrative_history = _format_narrative_history(game_state)
-
     # Compute player grid position for nearby filtering
     from ..data.game_constants import CITY_SPACING
     player_grid_x = round(getattr(game_state, 'car_world_x', 0) / CITY_SPACING)
     player_grid_y = round(getattr(game_state, 'car_world_y', 0) / CITY_SPACING)
-    world_details_str = _format_world_details(
-        getattr(game_state, 'world_details', {}),
-        player_grid_x=player_grid_x,
-        player_grid_y=player_grid_y,
-    )
-    theme_str = f"The current theme is '{theme['name']}': {theme['description']}"
-    
-    with open("prompts/quest_prompt.txt", "r") as f:
-        prompt_template = f.read()
-        
-    prompt = prompt_template.replace("{{ game_summary }}", game_summary)
-    prompt = prompt.replace("{{ story_intro }}", game_state.story_intro)
-    prompt = prompt.replace("{{ player_state }}", player_state)
-    prompt = prompt.replace("{{ world_state }}", world_state)
-    prompt = prompt.replace("{{ world_details }}", world_details_str)
-    prompt = prompt.replace("{{ narrative_history }}", narrative_history)
-    prompt = prompt.replace("{{ theme }}", theme_str)
-    prompt = prompt.replace("{{ quest_context }}", quest_context)
-    # These are now handled within game_summary, but we keep them for safety if quest_prompt.txt uses them directly
-    prompt = prompt.replace("{{ enemy_vehicle_list }}", ", ".join(get_enemy_vehicle_list()))
-    prompt = prompt.replace("{{ character_list }}", ", ".join(get_character_list()))
-    prompt = prompt.replace("{{ obstacle_list }}", ", ".join(get_obstacle_list()))
-    
-    logging.info(f"--- BUILT QUEST PROMPT FOR {quest_giver_faction['name']} ---")
+
+    values = _entity_lists()
+    values.update({
+        "game_summary": _game_context,
+        "story_intro": game_state.story_intro,
+        "player_state": lambda: _format_player_state(game_state),
+        "world_state": lambda: _world_state_section(faction_data, game_state),
+        "world_details": lambda: _world_details_section(
+            getattr(game_state, 'world_details', {}), player_grid_x, player_grid_y),
+        "narrative_history": lambda: _narrative_history_section(game_state),
+        "theme": f"The current theme is '{theme['name']}': {theme['description']}",
+        "quest_context": quest_context,
+    })
+    prompt = get_template("quest_prompt.txt").render(values)
+
+    logging.info(f"--- BUILT QUEST PROMPT FOR {quest_giver_faction['name']} (~{estimate_tokens(prompt)} tokens) ---")
     return prompt
 
 def build_faction_prompt(theme: dict):
     """Builds the complete, dynamic prompt for faction generation."""
-    with open("prompts/game_context.txt", "r") as f:
-        game_context = f.read()
-        # Replace placeholders within game_context itself
-        game_context = game_context.replace("{{ enemy_vehicle_list }}", ", ".join(get_enemy_vehicle_list()))
-        game_context = game_context.replace("{{ character_list }}", ", ".join(get_character_list()))
-        game_context = game_context.replace("{{ obstacle_list }}", ", ".join(get_obstacle_list()))
-
-    with open("prompts/faction_generation_prompt.txt", "r") as f:
-        prompt_template = f.read()
-        
-    theme_str = f"The chosen theme for this world is '{theme['name']}': {theme['description']}"
-    prompt = prompt_template.replace("{{ game_context }}", game_context)
-    prompt = prompt.replace("{{ vehicle_list }}", _get_vehicle_list())
-    prompt = prompt.replace("{{ theme }}", theme_str)
-    # These are now handled within game_context, but we keep them for safety if faction_generation_prompt.txt uses them directly
-    prompt = prompt.replace("{{ enemy_vehicle_list }}", ", ".join(get_enemy_vehicle_list()))
-    prompt = prompt.replace("{{ character_list }}", ", ".join(get_character_list()))
-    prompt = prompt.replace("{{ obstacle_list }}", ", ".join(get_obstacle_list()))
-
-    logging.info(f"--- BUILT FACTION PROMPT FOR THEME {theme['name']} ---")
+    values = _entity_lists()
+    values.update({
+        "game_context": _game_context,
+        "vehicle_list": _get_vehicle_list,
+        "theme": f"The chosen theme for this world is '{theme['name']}': {theme['description']}",
+    })
+    prompt = get_template("faction_generation_prompt.txt").render(values)
+
+    logging.info(f"--- BUILT FACTION PROMPT FOR THEME {theme['name']} (~{estimate_tokens(prompt)} tokens) ---")
     return prompt
 
 def build_city_hall_dialog_prompt(theme: dict, faction_name: str, faction_vibe: str, player_reputation: int):
     """Builds the prompt for generating city hall dialog."""
-    with open("prompts/city_hall_dialog_prompt.txt", "r") as f:
-        prompt_template = f.read()
-    
-    theme_str = f"The chosen theme for this world is '{theme['name']}': {theme['description']}"
-    prompt = prompt_template.replace("{{ theme }}", theme_str)
-    prompt = prompt.replace("{{ faction_name }}", faction_name)
-    prompt = prompt.replace("{{ faction_vibe }}", faction_vibe)
-    prompt = prompt.replace("{{ player_reputation }}", str(player_reputation))
-    
-    logging.info(f"--- BUILT CITY HALL DIALOG PROMPT FOR {faction_name} ---")
+    prompt = get_template("city_hall_dialog_prompt.txt").render({
+        "theme": f"The chosen theme for this world is '{theme['name']}': {theme['description']}",
+        "faction_name": faction_name,
+        "faction_vibe": faction_vibe,
+        "player_reputation": player_reputation,
+    })
+
+    logging.info(f"--- BUILT CITY HALL DIALOG PROMPT FOR {faction_name} (~{estimate_tokens(prompt)} tokens) ---")
     return prompt
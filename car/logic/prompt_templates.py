@@ -0,0 +1,129 @@
+"""
+Prompt templates from prompts/, loaded and compiled once per process.
+
+A template is split at its {{ placeholder }} markers when it is first loaded,
+so rendering is a single join instead of a chain of str.replace calls, and a
+builder can tell which placeholders a template actually uses. Sections that
+are expensive to format (faction reports, world details, quest history) are
+kept in a SectionCache against the version of the state they were built from.
+"""
+
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+
+PROMPTS_DIR = "prompts"
+
+_PLACEHOLDER = re.compile(r"(\{\{\s*(\w+)\s*\}\})")
+
+# Rough size of a token for English prompt text, used when no tokenizer is at hand.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of a prompt."""
+    if not text:
+        return 0
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+class PromptTemplate:
+    """A prompt split into literal text and named placeholders."""
+
+    def __init__(self, text: str, name: str = "<string>"):
+        self.name = name
+        # split() yields literal, marker, field, literal, marker, field, ..., literal
+        pieces = _PLACEHOLDER.split(text)
+        self._literals = pieces[0::3]
+        self._markers = pieces[1::3]
+        self._fields = pieces[2::3]
+        self.fields = frozenset(self._fields)
+
+    def uses(self, field: str) -> bool:
+        return field in self.fields
+
+    def render(self, values: dict) -> str:
+        """
+        Fills in the placeholders. A value may be a callable, which is only
+        called if the template uses that placeholder. Placeholders with no
+        value are left as written.
+        """
+        rendered = {}
+        parts = [self._literals[0]]
+        for marker, field, literal in zip(self._markers, self._fields, self._literals[1:]):
+            if field not in rendered:
+                value = values.get(field)
+                if callable(value):
+                    value = value()
+                rendered[field] = marker if value is None else str(value)
+            parts.append(rendered[field])
+            parts.append(literal)
+        return "".join(parts)
+
+
+_templates = {}
+_templates_lock = threading.Lock()
+
+
+def get_template(filename: str) -> PromptTemplate:
+    """The compiled template for prompts/<filename>, read from disk on first use."""
+    with _templates_lock:
+        template = _templates.get(filename)
+        if template is None:
+            with open(os.path.join(PROMPTS_DIR, filename), "r") as f:
+                template = _templates[filename] = PromptTemplate(f.read(), filename)
+            logging.info(f"Compiled prompt template {filename} ({len(template.fields)} placeholders).")
+        return template
+
+
+def clear_template_cache():
+    """Forgets compiled templates, e.g. after editing prompts/ in a running game."""
+    with _templates_lock:
+        _templates.clear()
+    _sections.clear()
+
+
+class SectionCache:
+    """
+    A small LRU of rendered prompt sections. Entries are keyed by section
+    name, the identity of the objects the section was built from, and a
+    version of their contents; the cache holds on to those objects so their
+    ids are never reused while an entry refers to them.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name, sources, version, build):
+        key = (name, tuple(id(source) for source in sources), version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        text = build()
+        with self._lock:
+            self._entries[key] = (tuple(sources), text)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return text
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_sections = SectionCache()
+
+
+def cached_section(name, sources, version, build):
+    """Returns build() for this section, reusing the last result while sources and version match."""
+    return _sections.get(name, sources, version, build)
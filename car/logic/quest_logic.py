@@ -4,8 +4,7 @@ from ..logic.entity_loader import PLAYER_CARS, ENEMY_VEHICLES
 from ..entities.base import Entity
 from ..data.game_constants import CITY_SPACING
 from ..world.generation import get_buildings_in_city, get_city_faction
-from ..logic.data_loader import FACTION_DATA
-from . import faction_logic
+from . import faction_logic, data_loader
 from .scaling import get_enemy_scaling
 
 # Radius within which quest location objectives are active
@@ -40,22 +39,17 @@ def get_quest_target_location(quest, game_state):
 
         if isinstance(objective, DeliverPackageObjective):
             # Resolve destination city name to world coordinates
-            cities = game_state.world_details.get("cities", {})
-            for key, name in cities.items():
-                if name == objective.destination:
-                    try:
-                        gx_str, gy_str = key.split(",")
-                        x = int(gx_str) * CITY_SPACING
-                        y = int(gy_str) * CITY_SPACING
-                        return x, y, f"Deliver to {objective.destination}"
-                    except ValueError:
-                        pass
+            city_grid = game_state.world_index.get_city_grid(objective.destination)
+            if city_grid:
+                x = city_grid[0] * CITY_SPACING
+                y = city_grid[1] * CITY_SPACING
+                return x, y, f"Deliver to {objective.destination}"
 
         elif isinstance(objective, DefendLocationObjective):
             # Resolve landmark name to world coordinates
-            for landmark in game_state.world_details.get("landmarks", []):
-                if landmark.get("name") == objective.location:
-                    return landmark["x"], landmark["y"], f"Defend {objective.location}"
+            location_coords = game_state.world_index.get_landmark_coords(objective.location)
+            if location_coords:
+                return location_coords[0], location_coords[1], f"Defend {objective.location}"
 
         elif isinstance(objective, KillBossObjective):
             # Boss not spawned yet — point to quest area
@@ -98,6 +92,19 @@ def get_quest_target_location(quest, game_state):
     return None, None, None
 
 
+def get_compass_target(game_state):
+    """
+    Returns (world_x, world_y, label) for what the compass points at: the
+    waypoint if one is set, else the tracked quest's target.
+    """
+    if game_state.waypoint:
+        waypoint = game_state.waypoint
+        return waypoint["x"], waypoint["y"], waypoint.get("name", "Waypoint")
+    if game_state.active_quests:
+        idx = min(game_state.selected_quest_index, len(game_state.active_quests) - 1)
+        return get_quest_target_location(game_state.active_quests[idx], game_state)
+    return None, None, None
+
 def get_available_quests(game_state):
     """Generates a list of available quests for the current city."""
     quests = []
@@ -300,11 +307,7 @@ def update_quests(game_state, audio_manager, app):
 
             # --- Handle Defend Location Objective ---
             elif isinstance(objective, DefendLocationObjective):
-                location_coords = None
-                for landmark in game_state.world_details.get("landmarks", []):
-                    if landmark["name"] == objective.location:
-                        location_coords = (landmark["x"], landmark["y"])
-                        break
+                location_coords = game_state.world_index.get_landmark_coords(objective.location)
 
                 if location_coords:
                     player_x = game_state.car_world_x
@@ -454,7 +457,8 @@ def check_for_faction_takeover(game_state):
             for f_id in game_state.factions:
                 if f_id != faction_id:
                     game_state.factions[f_id]["relationships"][faction_id] = "Defeated"
-            
+
+            faction_logic.persist_factions(game_state, game_state.factions)
             del game_state.faction_reputation[faction_id]
     return notifications
 
@@ -495,9 +499,6 @@ def generate_quest(game_state, quest_id):
         next_quest_id=quest_template.get("next_quest_id")
     )
 
-import json
-import os
-
 def complete_quest(game_state, app, quest=None):
     """
     Handles the logic for completing a quest.
@@ -510,16 +511,7 @@ def complete_quest(game_state, app, quest=None):
         quest = game_state.active_quests[0]
 
     # --- Log the completed quest for the narrative engine ---
-    quest_log_path = "temp/quest_log.json"
-    try:
-        with open(quest_log_path, "r+") as f:
-            log = json.load(f)
-            log.append(quest.to_dict())
-            f.seek(0)
-            json.dump(log, f, indent=4)
-    except (FileNotFoundError, json.JSONDecodeError):
-        with open(quest_log_path, "w") as f:
-            json.dump([quest.to_dict()], f, indent=4)
+    data_loader.get_session_store().append_quest_log(quest.to_dict())
 
     # --- Handle Conquest ---
     if quest.is_conquest_quest:
@@ -0,0 +1,102 @@
+"""
+Chooses which cities to generate quests for ahead of the player.
+
+LLM time is the scarcest resource, so rather than the whole 3x3 neighbourhood
+the planner ranks the cities that actually exist around the player: nearest
+first, favouring the way the car is heading, the compass target and the
+route to it, and cities already visited (fast-travel destinations). The app
+keeps only the top few in flight and cancels prefetches that fall out.
+"""
+
+import math
+
+from ..data.game_constants import CITY_SPACING
+from ..world.generation import does_city_exist_at
+
+PREFETCH_LIMIT = 4          # Cities kept in the prefetch set
+PREFETCH_CONCURRENCY = 2    # Prefetch workers running at once, best first
+PREFETCH_RADIUS = 2         # Grid cells searched around the player
+PREFETCH_REPLAN_FRAMES = 90 # Re-rank this often even without a grid change
+
+MIN_HEADING_SPEED = 0.5     # Below this the car's heading says little
+
+HEADING_WEIGHT = 1.5
+TARGET_WEIGHT = 2.0
+ROUTE_WEIGHT = 1.0
+VISITED_WEIGHT = 0.5
+
+
+def city_id_for(grid_x, grid_y):
+    return f"city_{grid_x}_{grid_y}"
+
+
+def _unit(dx, dy):
+    length = math.hypot(dx, dy)
+    if length < 1e-9:
+        return None
+    return dx / length, dy / length
+
+
+def _distance_to_segment(px, py, ax, ay, bx, by):
+    abx, aby = bx - ax, by - ay
+    length_sq = abx * abx + aby * aby
+    t = 0.0 if length_sq == 0 else max(0.0, min(1.0, ((px - ax) * abx + (py - ay) * aby) / length_sq))
+    return math.hypot(px - (ax + t * abx), py - (ay + t * aby))
+
+
+def score_city(grid_x, grid_y, player, heading, target, visited):
+    """
+    Ranks one city; higher is sooner. Positions are in grid units. heading
+    and target may be None.
+    """
+    dx, dy = grid_x - player[0], grid_y - player[1]
+    distance = math.hypot(dx, dy)
+    score = -distance
+    direction = _unit(dx, dy)
+    if direction:
+        if heading:
+            score += HEADING_WEIGHT * (direction[0] * heading[0] + direction[1] * heading[1])
+        if target:
+            to_target = _unit(target[0] - player[0], target[1] - player[1])
+            if to_target:
+                score += TARGET_WEIGHT * (direction[0] * to_target[0] + direction[1] * to_target[1])
+            if _distance_to_segment(grid_x, grid_y, player[0], player[1], target[0], target[1]) <= 1.0:
+                score += ROUTE_WEIGHT
+    if (grid_x, grid_y) in visited:
+        score += VISITED_WEIGHT
+    return score
+
+
+def plan_prefetch(game_state, seed, limit=PREFETCH_LIMIT, radius=PREFETCH_RADIUS):
+    """
+    Returns up to `limit` (city_id, grid_x, grid_y) to have quests ready for,
+    best first. The city the player is in always comes first.
+    """
+    from .quest_logic import get_compass_target
+
+    gs = game_state
+    player = (gs.car_world_x / CITY_SPACING, gs.car_world_y / CITY_SPACING)
+    current = (round(player[0]), round(player[1]))
+
+    heading = None
+    if abs(gs.car_speed) >= MIN_HEADING_SPEED:
+        sign = 1 if gs.car_speed > 0 else -1
+        heading = (sign * math.cos(gs.car_angle), sign * math.sin(gs.car_angle))
+
+    target = None
+    target_x, target_y, _ = get_compass_target(gs)
+    if target_x is not None:
+        target = (target_x / CITY_SPACING, target_y / CITY_SPACING)
+
+    ranked = []
+    for grid_x in range(current[0] - radius, current[0] + radius + 1):
+        for grid_y in range(current[1] - radius, current[1] + radius + 1):
+            if not does_city_exist_at(grid_x, grid_y, seed, gs.factions):
+                continue
+            if (grid_x, grid_y) == current:
+                score = math.inf
+            else:
+                score = score_city(grid_x, grid_y, player, heading, target, gs.visited_cities)
+            ranked.append((score, grid_x, grid_y))
+    ranked.sort(key=lambda entry: entry[0], reverse=True)
+    return [(city_id_for(grid_x, grid_y), grid_x, grid_y) for _, grid_x, grid_y in ranked[:limit]]
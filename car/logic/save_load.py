@@ -1,110 +1,282 @@
 import os
 import shutil
 import json
+import gzip
+import hashlib
 import logging
-from ..game_state import GameState
+import sqlite3
+import tempfile
+import threading
+import time
+from . import data_loader
+from .session_store import SESSION_STORE_FILE, migrate_legacy_files
 
 SAVES_DIR = "saves"
 TEMP_DIR = "temp"
 GAME_STATE_FILE = "game_state.json"
-FACTIONS_FILE = "factions.py"
-QUEST_LOG_FILE = "quest_log.json"
-WORLD_DETAILS_FILE = "world_details.json"
-TRIGGERS_FILE = "triggers.json"
+GAME_STATE_FILE_GZ = "game_state.json.gz"
+MANIFEST_FILE = "manifest.json"
+SAVE_FORMAT_VERSION = 2
+AUTOSAVE_SLOT = "autosave"
+
+# Files copied from temp/ into a slot. They're deduped by content hash, so
+# an unchanged file is hard-linked from the previous save instead of copied.
+GENERATED_FILES = [SESSION_STORE_FILE]
+
+# Only one save may be written at a time (manual saves and autosave share it).
+_save_lock = threading.Lock()
+
+
+def _staging_dir(save_name):
+    return os.path.join(SAVES_DIR, f".{save_name}.tmp")
+
+
+def _backup_dir(save_name):
+    return os.path.join(SAVES_DIR, f".{save_name}.old")
+
+
+def _recover_interrupted_save(save_name):
+    """If a crash happened between the two renames of a save, restore the old slot."""
+    slot_dir = os.path.join(SAVES_DIR, save_name)
+    backup_dir = _backup_dir(save_name)
+    if os.path.isdir(backup_dir):
+        if os.path.isdir(slot_dir):
+            shutil.rmtree(backup_dir, ignore_errors=True)
+        else:
+            os.rename(backup_dir, slot_dir)
+            logging.warning(f"Recovered save slot '{save_name}' from an interrupted save.")
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_manifest(slot_dir):
+    path = os.path.join(slot_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return {}
+
 
 def get_save_slots():
     """Returns a list of available save slot names (which are directories)."""
     if not os.path.exists(SAVES_DIR):
         os.makedirs(SAVES_DIR)
         return []
-    return sorted([d for d in os.listdir(SAVES_DIR) if os.path.isdir(os.path.join(SAVES_DIR, d))])
+    for entry in os.listdir(SAVES_DIR):
+        if entry.startswith(".") and entry.endswith(".old"):
+            _recover_interrupted_save(entry[1:-len(".old")])
+    return sorted([
+        d for d in os.listdir(SAVES_DIR)
+        if os.path.isdir(os.path.join(SAVES_DIR, d)) and not d.startswith(".")
+    ])
 
-def save_game(game_state, save_name):
+
+def snapshot_game(game_state):
     """
-    Saves the current game session to a named save slot directory.
-    This copies all critical session files from temp/ into the save slot.
+    Captures everything a save needs. Runs on the main thread, so it only
+    builds the state dict and copies the session store; serialization,
+    compression and file I/O happen later in write_save().
+    """
+    return {
+        "game_state": game_state.to_dict(),
+        "generated_files": _snapshot_generated_files(),
+    }
+
+
+def _snapshot_generated_files():
+    """Takes consistent copies of the generated files, to be moved into the slot."""
+    os.makedirs(SAVES_DIR, exist_ok=True)
+    snapshot_dir = tempfile.mkdtemp(prefix=".snapshot_", dir=SAVES_DIR)
+    files = {}
+    for filename in GENERATED_FILES:
+        source_path = os.path.join(TEMP_DIR, filename)
+        if not os.path.exists(source_path):
+            logging.warning(f"Could not find {filename} in temp/ to save.")
+            continue
+        dest_path = os.path.join(snapshot_dir, filename)
+        if filename == SESSION_STORE_FILE:
+            # The backup API gives a consistent copy even mid-write.
+            source = sqlite3.connect(source_path)
+            dest = sqlite3.connect(dest_path)
+            try:
+                source.backup(dest)
+            finally:
+                dest.close()
+                source.close()
+        else:
+            shutil.copy2(source_path, dest_path)
+        files[filename] = dest_path
+    return {"dir": snapshot_dir, "files": files}
+
+
+def write_save(snapshot, save_name):
+    """
+    Writes a snapshot to a save slot. Safe to run on a worker thread.
+    The slot is built in a staging directory and swapped in with renames,
+    so a crash mid-save leaves the previous save intact.
+    Returns True on success.
     """
     if not save_name or not save_name.strip():
         logging.error("Save failed: Save name cannot be empty.")
-        return
-        
-    logging.info(f"Attempting to save game to slot: {save_name}")
-    save_slot_dir = os.path.join(SAVES_DIR, save_name)
-    
-    # Create the save slot directory, overwriting if it exists
-    if os.path.exists(save_slot_dir):
-        shutil.rmtree(save_slot_dir)
-    os.makedirs(save_slot_dir)
-
-    # --- 1. Save the core GameState object ---
-    game_state_dict = game_state.to_dict()
-    with open(os.path.join(save_slot_dir, GAME_STATE_FILE), "w") as f:
-        json.dump(game_state_dict, f, indent=4)
-    logging.info(f"Saved game_state.json to {save_slot_dir}")
-
-    # --- 2. Copy dynamic world files from temp to the save slot ---
-    files_to_copy = [FACTIONS_FILE, QUEST_LOG_FILE, WORLD_DETAILS_FILE]
-    for filename in files_to_copy:
-        temp_path = os.path.join(TEMP_DIR, filename)
-        if os.path.exists(temp_path):
-            shutil.copy(temp_path, save_slot_dir)
-            logging.info(f"Copied {filename} to {save_slot_dir}")
-        else:
-            logging.warning(f"Could not find {filename} in temp/ to save.")
+        return False
+
+    with _save_lock:
+        start_time = time.perf_counter()
+        logging.info(f"Attempting to save game to slot: {save_name}")
+        os.makedirs(SAVES_DIR, exist_ok=True)
+        _recover_interrupted_save(save_name)
+        slot_dir = os.path.join(SAVES_DIR, save_name)
+        staging_dir = _staging_dir(save_name)
+        backup_dir = _backup_dir(save_name)
+        previous_hashes = _read_manifest(slot_dir).get("files", {})
+
+        try:
+            if os.path.exists(staging_dir):
+                shutil.rmtree(staging_dir)
+            os.makedirs(staging_dir)
+
+            # --- 1. Serialize and compress the core GameState ---
+            payload = json.dumps(snapshot["game_state"], separators=(",", ":")).encode("utf-8")
+            with gzip.open(os.path.join(staging_dir, GAME_STATE_FILE_GZ), "wb", compresslevel=6) as f:
+                f.write(payload)
+
+            # --- 2. Move in generated files, reusing unchanged ones by hash ---
+            file_hashes = {}
+            for filename, snapshot_path in snapshot["generated_files"]["files"].items():
+                file_hash = _file_hash(snapshot_path)
+                file_hashes[filename] = file_hash
+                dest_path = os.path.join(staging_dir, filename)
+                previous_path = os.path.join(slot_dir, filename)
+                if previous_hashes.get(filename) == file_hash and os.path.exists(previous_path):
+                    try:
+                        os.link(previous_path, dest_path)
+                        continue
+                    except OSError:
+                        pass
+                shutil.move(snapshot_path, dest_path)
+
+            with open(os.path.join(staging_dir, MANIFEST_FILE), "w") as f:
+                json.dump({
+                    "version": SAVE_FORMAT_VERSION,
+                    "saved_at": time.time(),
+                    "files": file_hashes,
+                }, f)
+
+            # --- 3. Swap the staging directory in ---
+            if os.path.exists(slot_dir):
+                os.rename(slot_dir, backup_dir)
+            os.rename(staging_dir, slot_dir)
+            shutil.rmtree(backup_dir, ignore_errors=True)
+        except OSError as e:
+            logging.error(f"Save to slot '{save_name}' failed: {e}", exc_info=True)
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            _recover_interrupted_save(save_name)
+            return False
+        finally:
+            shutil.rmtree(snapshot["generated_files"]["dir"], ignore_errors=True)
+
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        logging.info(f"Saved slot '{save_name}' in {elapsed_ms:.1f}ms ({len(payload)} bytes of state before compression).")
+        return True
+
+
+def save_game(game_state, save_name):
+    """
+    Saves the current game session to a named save slot directory.
+    Blocks until written; the app uses snapshot_game()/write_save() to do
+    the writing on a worker thread instead.
+    """
+    return write_save(snapshot_game(game_state), save_name)
+
+
+def _read_game_state_dict(directory):
+    """Reads the compressed (or legacy plain) game state from a directory."""
+    gz_path = os.path.join(directory, GAME_STATE_FILE_GZ)
+    if os.path.exists(gz_path):
+        with gzip.open(gz_path, "rb") as f:
+            return json.loads(f.read().decode("utf-8"))
+    plain_path = os.path.join(directory, GAME_STATE_FILE)
+    if os.path.exists(plain_path):
+        with open(plain_path, "r") as f:
+            return json.load(f)
+    return None
+
 
 def load_game(save_name):
     """
     Loads a game session from a named save slot.
-    This clears the temp/ directory and copies all files from the save slot into it.
+    The slot's files are staged next to temp/ first and swapped in once
+    complete, so a failed load doesn't leave temp/ half-populated.
     """
     logging.info(f"Attempting to load game from slot: {save_name}")
+    _recover_interrupted_save(save_name)
     save_slot_dir = os.path.join(SAVES_DIR, save_name)
     if not os.path.exists(save_slot_dir):
         logging.error(f"Save slot not found: {save_slot_dir}")
         return None
 
-    # --- 1. Clear the temp directory ---
-    if os.path.exists(TEMP_DIR):
-        shutil.rmtree(TEMP_DIR)
-    os.makedirs(TEMP_DIR)
-    logging.info(f"Cleared and recreated {TEMP_DIR}")
+    manifest_hashes = _read_manifest(save_slot_dir).get("files", {})
 
-    # --- 2. Copy all files from the save slot to temp ---
+    # --- 1. Stage the slot's files ---
+    staging_dir = f"{TEMP_DIR}.loading"
+    if os.path.exists(staging_dir):
+        shutil.rmtree(staging_dir)
+    os.makedirs(staging_dir)
     for item in os.listdir(save_slot_dir):
         source_path = os.path.join(save_slot_dir, item)
-        dest_path = os.path.join(TEMP_DIR, item)
-        if os.path.isfile(source_path):
-            shutil.copy2(source_path, dest_path)
-    logging.info(f"Copied all files from {save_slot_dir} to {TEMP_DIR}")
-            
-    # --- 3. Load the GameState object from the new temp file ---
-    game_state_path = os.path.join(TEMP_DIR, GAME_STATE_FILE)
-    if not os.path.exists(game_state_path):
+        if os.path.isfile(source_path) and item != MANIFEST_FILE:
+            shutil.copy2(source_path, os.path.join(staging_dir, item))
+            expected_hash = manifest_hashes.get(item)
+            if expected_hash and _file_hash(source_path) != expected_hash:
+                logging.warning(f"{item} in save slot '{save_name}' does not match its manifest hash.")
+
+    # Slots saved before the session store hold factions.py and loose JSON
+    # files instead; convert them (without executing anything).
+    if not os.path.exists(os.path.join(staging_dir, SESSION_STORE_FILE)):
+        migrate_legacy_files(staging_dir)
+
+    # --- 2. Load the GameState dict before touching temp/ ---
+    try:
+        game_state_dict = _read_game_state_dict(staging_dir)
+    except (OSError, json.JSONDecodeError) as e:
+        logging.error(f"Could not read game state in save slot {save_name}: {e}")
+        game_state_dict = None
+    if game_state_dict is None:
         logging.error(f"game_state.json not found in save slot: {save_name}")
+        shutil.rmtree(staging_dir, ignore_errors=True)
         return None
-        
-    with open(game_state_path, "r") as f:
-        game_state_dict = json.load(f)
-    
+
+    # --- 3. Swap the staged files in as temp/ ---
+    if os.path.exists(TEMP_DIR):
+        shutil.rmtree(TEMP_DIR)
+    os.rename(staging_dir, TEMP_DIR)
+    logging.info(f"Copied all files from {save_slot_dir} to {TEMP_DIR}")
+
     # The GameState's from_dict method will handle loading the factions
     # via the data_loader, which now correctly points to temp/
+    from ..game_state import GameState
     logging.info("Loading GameState from dictionary...")
+    data_loader.reload_data()
     game_state = GameState.from_dict(game_state_dict)
     if game_state:
         load_triggers(game_state)
     return game_state
 
 def load_triggers(game_state):
-    """Loads world triggers from the temp file into the game state."""
-    triggers_path = os.path.join(TEMP_DIR, TRIGGERS_FILE)
-    if os.path.exists(triggers_path):
-        try:
-            with open(triggers_path, 'r') as f:
-                game_state.world_triggers = json.load(f)
-            logging.info(f"Loaded {len(game_state.world_triggers)} world triggers.")
-        except (json.JSONDecodeError, IOError) as e:
-            logging.error(f"Failed to load or parse {TRIGGERS_FILE}: {e}")
-            game_state.world_triggers = []
+    """Loads world triggers from the session store into the game state."""
+    store = data_loader.get_session_store()
+    if store.has_triggers():
+        game_state.world_triggers = store.get_triggers()
+        logging.info(f"Loaded {len(game_state.world_triggers)} world triggers.")
     else:
-        logging.info(f"{TRIGGERS_FILE} not found in temp directory. No triggers loaded.")
+        logging.info("No world triggers in the session store. No triggers loaded.")
         game_state.world_triggers = []
@@ -0,0 +1,252 @@
+"""
+Recording a play session and re-driving it through the game loop.
+
+With "record_sessions" on, every world tick the UI simulates is written to
+a replay file: the time step, the frame counter the throttled lookups key
+on, and whichever player controls changed since the previous tick. The
+controls are the ones process_input settles on (see player_controls), so
+key-repeat timing doesn't matter on replay.
+
+Ticks come in segments. A segment starts with a pickled GameState and a
+fresh seed for the global `random` stream, which the recorder reseeds it
+with. Anything that edits the state outside the world loop (a screen over
+the world, the debug console, loading a game) ends the segment, and the
+next tick starts a new one, so each segment replays on its own from its
+checkpoint. Every CHECK_EVERY ticks the recorder also stores a fingerprint
+of the state, which the replay compares to spot a divergence.
+
+replay_session runs a file through HeadlessApp (the simulation process's
+stand-in for the app) with or without drawing the game view, and times
+every tick. See scripts/replay_session.py.
+"""
+
+import atexit
+import gzip
+import logging
+import os
+import pickle
+import random
+import time
+
+from ..workers.simulation_process import apply_controls, player_controls
+
+REPLAY_VERSION = 1
+DEFAULT_RECORDING_DIR = "recordings/sessions"
+TICK_CHUNK = 300        # Ticks per record; a chunk is flushed to disk when full
+CHECK_EVERY = 30        # Ticks between state fingerprints
+
+
+def _fingerprint(gs):
+    """A few numbers that drift apart quickly once a replay diverges."""
+    return (
+        round(gs.car_world_x, 3), round(gs.car_world_y, 3), round(gs.current_durability, 3),
+        gs.player_cash, len(gs.active_enemies), len(gs.active_particles), len(gs.active_obstacles),
+    )
+
+
+def recording_path(directory=DEFAULT_RECORDING_DIR):
+    """A new timestamped file name for a session recording."""
+    return os.path.join(directory, time.strftime("session-%Y%m%d-%H%M%S.replay.gz"))
+
+
+class SessionRecorder:
+    """Writes the ticks of a session to a replay file (gzipped pickle records)."""
+
+    def __init__(self, path, world_seed, settings=None):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.world_seed = world_seed
+        self._file = gzip.open(path, "wb")
+        self._game_state = None
+        self._controls = None
+        self._ticks = []
+        self._count = 0
+        self._write(("session", {
+            "version": REPLAY_VERSION, "world_seed": world_seed, "started": time.time(),
+            "settings": dict(settings or {}),
+        }))
+        atexit.register(self.close)
+
+    def _write(self, record):
+        pickle.dump(record, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _flush_ticks(self):
+        if self._ticks:
+            self._write(("ticks", self._ticks))
+            self._ticks = []
+            self._file.flush()
+
+    def interrupt(self):
+        """The state is about to change outside the world loop: the next tick starts a segment."""
+        if self._file is None:
+            return
+        self._flush_ticks()
+        self._game_state = None
+
+    def record_tick(self, gs, dt, frame_count):
+        """Records one tick, just before the world is simulated with these controls."""
+        if self._file is None:
+            return
+        if gs is not self._game_state:
+            self._flush_ticks()
+            seed = random.randrange(1 << 32)
+            random.seed(seed)
+            self._write(("segment", seed, pickle.dumps(gs, protocol=pickle.HIGHEST_PROTOCOL)))
+            self._game_state = gs
+            self._controls = {}
+            self._count = 0
+        controls = player_controls(gs)
+        changes = {k: v for k, v in controls.items() if self._controls.get(k) != v} or None
+        self._controls = controls
+        check = _fingerprint(gs) if self._count % CHECK_EVERY == 0 else None
+        self._ticks.append((dt, frame_count, changes, check))
+        self._count += 1
+        if len(self._ticks) >= TICK_CHUNK:
+            self._flush_ticks()
+
+    def close(self):
+        if self._file is None:
+            return
+        try:
+            self._flush_ticks()
+            self._file.close()
+        except OSError as e:
+            logging.error(f"Could not finish session recording {self.path}: {e}")
+        self._file = None
+
+
+def read_replay(path):
+    """
+    Reads a replay file: (header, segments), each segment a (rng_seed,
+    state_blob, ticks) tuple. A file cut short by a crash reads up to its
+    last complete chunk.
+    """
+    header, segments = None, []
+    with gzip.open(path, "rb") as f:
+        while True:
+            try:
+                record = pickle.load(f)
+            except (EOFError, pickle.UnpicklingError):
+                break
+            kind = record[0]
+            if kind == "session":
+                header = record[1]
+            elif kind == "segment":
+                segments.append((record[1], record[2], []))
+            elif kind == "ticks" and segments:
+                segments[-1][2].extend(record[1])
+    if header is None or header.get("version") != REPLAY_VERSION:
+        raise ValueError(f"{path} is not a version {REPLAY_VERSION} session replay.")
+    return header, segments
+
+
+class _Discard:
+    """Event sink for HeadlessApp: a replay has no UI to report to."""
+
+    def put(self, event):
+        pass
+
+
+class ReplayReport:
+    """Per-tick timings of a replay, in milliseconds."""
+
+    def __init__(self, header):
+        self.header = header
+        self.sim_ms = []
+        self.render_ms = []
+        self.segments = 0
+        self.divergence = None  # (segment, tick) of the first fingerprint mismatch
+
+    @property
+    def ticks(self):
+        return len(self.sim_ms)
+
+    def tick_ms(self, i):
+        return self.sim_ms[i] + (self.render_ms[i] if self.render_ms else 0.0)
+
+    def summary(self):
+        """Mean, percentiles and worst case of the whole tick, and the slowest ticks."""
+        totals = sorted(self.tick_ms(i) for i in range(self.ticks))
+        if not totals:
+            return {"ticks": 0}
+
+        def pct(p):
+            return round(totals[min(len(totals) - 1, int(p / 100 * len(totals)))], 3)
+
+        slowest = sorted(range(self.ticks), key=self.tick_ms, reverse=True)[:5]
+        return {
+            "ticks": self.ticks, "segments": self.segments,
+            "mean_ms": round(sum(totals) / len(totals), 3),
+            "p50_ms": pct(50), "p95_ms": pct(95), "p99_ms": pct(99), "max_ms": round(totals[-1], 3),
+            "sim_mean_ms": round(sum(self.sim_ms) / self.ticks, 3),
+            "render_mean_ms": round(sum(self.render_ms) / self.ticks, 3) if self.render_ms else None,
+            "slowest_ticks": [(i, round(self.tick_ms(i), 3)) for i in slowest],
+            "divergence": self.divergence,
+        }
+
+
+def _replay_view(width, height):
+    """A GameView that draws at a fixed size without a running app."""
+    from textual.geometry import Size
+    from ..widgets.game_view import GameView
+
+    class ReplayView(GameView):
+        @property
+        def size(self):
+            return Size(width, height)
+
+    return ReplayView(None, None)
+
+
+def replay_session(path, render_size=None, settings=None):
+    """
+    Re-drives a recorded session through the game loop and times each tick.
+    With render_size (width, height), every tick also draws the game view.
+    LLM calls made on the way (loot) use stock fallbacks, as no model is loaded.
+    """
+    from ..world import World
+    from .trigger_logic import check_triggers
+    from .vfx import spawn_explosion
+    from ..workers.simulation_process import headless_app_class
+
+    header, segments = read_replay(path)
+    if settings is None:
+        settings = dict(header["settings"], generation_mode="local")
+    app_class = headless_app_class()
+    view = _replay_view(*render_size) if render_size else None
+    report = ReplayReport(header)
+
+    for segment_index, (rng_seed, blob, ticks) in enumerate(segments):
+        gs = pickle.loads(blob)
+        world = World(seed=header["world_seed"])
+        world.game_state = gs
+        sim = app_class(gs, world, settings, _Discard())
+        random.seed(rng_seed)
+        report.segments += 1
+        if view is not None:
+            view.game_state, view.world = gs, world
+
+        for tick_index, (dt, frame_count, changes, check) in enumerate(ticks):
+            if check is not None and report.divergence is None and _fingerprint(gs) != check:
+                report.divergence = (segment_index, tick_index)
+                logging.warning(f"Replay diverged from the recording at segment {segment_index}, "
+                                f"tick {tick_index}.")
+            if changes:
+                apply_controls(gs, changes)
+            sim.frame_count = frame_count
+
+            start = time.perf_counter()
+            sim.simulate_world_tick(dt)
+            sim.check_building_interaction()
+            check_triggers(sim, gs)
+            report.sim_ms.append((time.perf_counter() - start) * 1000)
+
+            if view is not None:
+                start = time.perf_counter()
+                for destroyed in gs.destroyed_this_frame:
+                    spawn_explosion(gs, destroyed)
+                view.build_frame()
+                report.render_ms.append((time.perf_counter() - start) * 1000)
+            gs.destroyed_this_frame.clear()
+            sim.pushed_screens.clear()
+    return report
@@ -0,0 +1,305 @@
+import ast
+import copy
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+# Bump when the record layout changes, and add a step to _MIGRATIONS.
+SCHEMA_VERSION = 1
+
+SESSION_STORE_FILE = "session.db"
+
+# Legacy per-session files that predate the store. They are only ever read
+# (and never executed) when migrating an old save slot.
+LEGACY_FACTIONS_FILE = "factions.py"
+LEGACY_WORLD_DETAILS_FILE = "world_details.json"
+LEGACY_TRIGGERS_FILE = "triggers.json"
+LEGACY_QUEST_LOG_FILE = "quest_log.json"
+
+SECTION_FACTIONS = "factions"
+SECTION_WORLD = "world"
+SECTION_QUEST_LOG = "quest_log"
+
+_REQUIRED_FACTION_KEYS = ["name", "hub_city_coordinates", "relationships", "units"]
+
+
+def validate_faction(faction_id, faction_data) -> bool:
+    """Checks that a faction record has the keys and types the game relies on."""
+    if not isinstance(faction_id, str) or not faction_id:
+        logging.error(f"Faction id must be a non-empty string: {faction_id!r}")
+        return False
+    if not isinstance(faction_data, dict):
+        logging.error(f"Faction '{faction_id}' must be a dictionary.")
+        return False
+    for key in _REQUIRED_FACTION_KEYS:
+        if key not in faction_data:
+            logging.error(f"Faction '{faction_id}' missing required key: {key}")
+            return False
+    if not isinstance(faction_data["name"], str):
+        logging.error(f"Faction '{faction_id}' 'name' must be a string.")
+        return False
+    coords = faction_data["hub_city_coordinates"]
+    if not isinstance(coords, (list, tuple)) or len(coords) != 2 or not all(isinstance(c, (int, float)) for c in coords):
+        logging.error(f"Faction '{faction_id}' has invalid hub_city_coordinates: {coords}")
+        return False
+    if not isinstance(faction_data["relationships"], dict):
+        logging.error(f"Faction '{faction_id}' 'relationships' must be a dictionary.")
+        return False
+    if not isinstance(faction_data["units"], list):
+        logging.error(f"Faction '{faction_id}' 'units' must be a list.")
+        return False
+    return True
+
+
+def validate_world_details(world_details) -> bool:
+    """Checks the top-level shape of a world details record."""
+    if not isinstance(world_details, dict):
+        logging.error("World details must be a dictionary.")
+        return False
+    expected_types = {"cities": dict, "roads": list, "landmarks": list, "city_name_parts": dict}
+    for key, expected in expected_types.items():
+        if key in world_details and not isinstance(world_details[key], expected):
+            logging.error(f"World details '{key}' must be a {expected.__name__}.")
+            return False
+    for landmark in world_details.get("landmarks", []):
+        if not isinstance(landmark, dict) or not {"name", "x", "y"} <= landmark.keys():
+            logging.error(f"World details has an invalid landmark: {landmark}")
+            return False
+    return True
+
+
+def validate_triggers(triggers) -> bool:
+    """Checks that every trigger has an id, a position and a radius."""
+    if not isinstance(triggers, list):
+        logging.error("Triggers must be a list.")
+        return False
+    for trigger in triggers:
+        if not isinstance(trigger, dict) or not {"id", "x", "y", "radius", "type"} <= trigger.keys():
+            logging.error(f"Invalid trigger: {trigger}")
+            return False
+    return True
+
+
+class SessionStore:
+    """
+    Versioned SQLite store for generated session data (factions, world
+    details, triggers and the quest log).
+
+    Every record is a JSON document in its own row, so a single faction can
+    be rewritten atomically without touching the rest. Reads are cached in
+    memory; writes go through to disk and update the cache. Each section has
+    a version that changes on every write, so anything derived from it (such
+    as rendered prompt sections) can tell when it is stale.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self._versions = {}
+
+    # --- Connection / schema ---
+
+    def _connect(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS records ("
+            "section TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+            "PRIMARY KEY (section, key))"
+        )
+        row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        version = int(row[0]) if row else 0
+        if version < SCHEMA_VERSION:
+            with conn:
+                for step in range(version, SCHEMA_VERSION):
+                    _MIGRATIONS[step](conn)
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+                    (str(SCHEMA_VERSION),),
+                )
+        elif version > SCHEMA_VERSION:
+            logging.warning(f"Session store {self.path} has newer schema {version} (expected {SCHEMA_VERSION}).")
+        return conn
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def clear_cache(self):
+        """Forgets cached reads, e.g. after the file was replaced on disk."""
+        with self._lock:
+            self._cache.clear()
+            self._epoch += 1
+
+    def version(self, section):
+        """A value that changes whenever the section may have changed."""
+        return (self._epoch, self._versions.get(section, 0))
+
+    # --- Generic section access ---
+
+    def _read_section(self, section):
+        with self._lock:
+            if section in self._cache:
+                return self._cache[section]
+            records = {}
+            if self.exists():
+                conn = self._connect()
+                try:
+                    for key, value in conn.execute(
+                        "SELECT key, value FROM records WHERE section = ? ORDER BY rowid", (section,)
+                    ):
+                        records[key] = json.loads(value)
+                finally:
+                    conn.close()
+            self._cache[section] = records
+            return records
+
+    def _write_records(self, section, records, replace=False):
+        """Writes {key: value} rows in one transaction, optionally replacing the section."""
+        rows = [(section, key, json.dumps(value)) for key, value in records.items()]
+        with self._lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    if replace:
+                        conn.execute("DELETE FROM records WHERE section = ?", (section,))
+                    # Upsert keeps the row's rowid, so records stay in insertion order.
+                    conn.executemany(
+                        "INSERT INTO records (section, key, value) VALUES (?, ?, ?) "
+                        "ON CONFLICT (section, key) DO UPDATE SET value = excluded.value",
+                        rows,
+                    )
+            finally:
+                conn.close()
+            self._versions[section] = self._versions.get(section, 0) + 1
+            if not replace and section not in self._cache:
+                # Never read, so the cache would be partial; read from disk next time.
+                return
+            cached = {} if replace else dict(self._cache[section])
+            for key, value in records.items():
+                cached[key] = json.loads(json.dumps(value))
+            self._cache[section] = cached
+
+    # --- Factions ---
+
+    def get_factions(self):
+        """Returns a fresh copy of the stored factions ({} if none)."""
+        return copy.deepcopy(self._read_section(SECTION_FACTIONS))
+
+    def has_factions(self):
+        return bool(self._read_section(SECTION_FACTIONS))
+
+    def set_factions(self, factions) -> bool:
+        """Replaces every faction. Nothing is written if any record is invalid."""
+        if not all(validate_faction(fid, data) for fid, data in factions.items()):
+            return False
+        self._write_records(SECTION_FACTIONS, factions, replace=True)
+        return True
+
+    def put_faction(self, faction_id, faction_data) -> bool:
+        """Writes a single faction, leaving the others untouched."""
+        if not validate_faction(faction_id, faction_data):
+            return False
+        self._write_records(SECTION_FACTIONS, {faction_id: faction_data})
+        return True
+
+    # --- World details / triggers ---
+
+    def get_world_details(self):
+        return copy.deepcopy(self._read_section(SECTION_WORLD).get("world_details", {}))
+
+    def set_world_details(self, world_details) -> bool:
+        if not validate_world_details(world_details):
+            return False
+        self._write_records(SECTION_WORLD, {"world_details": world_details})
+        return True
+
+    def get_triggers(self):
+        return copy.deepcopy(self._read_section(SECTION_WORLD).get("triggers", []))
+
+    def has_triggers(self):
+        return "triggers" in self._read_section(SECTION_WORLD)
+
+    def set_triggers(self, triggers) -> bool:
+        if not validate_triggers(triggers):
+            return False
+        self._write_records(SECTION_WORLD, {"triggers": triggers})
+        return True
+
+    # --- Quest log ---
+
+    def get_quest_log(self):
+        return list(self._read_section(SECTION_QUEST_LOG).values())
+
+    def append_quest_log(self, entry):
+        """Appends one completed-quest record without rewriting the log."""
+        index = len(self._read_section(SECTION_QUEST_LOG))
+        self._write_records(SECTION_QUEST_LOG, {f"{index:08d}": entry})
+
+    def set_quest_log(self, entries):
+        self._write_records(SECTION_QUEST_LOG, {f"{i:08d}": e for i, e in enumerate(entries)}, replace=True)
+
+
+def _migrate_v0_to_v1(conn):
+    """v1 introduced the meta/records tables, created in _connect."""
+
+
+_MIGRATIONS = [_migrate_v0_to_v1]
+
+
+def read_legacy_factions(path):
+    """
+    Reads a legacy `FACTION_DATA = {...}` module as a literal.
+    The file is parsed, never executed, so a corrupted or hostile file
+    can't run code.
+    """
+    with open(path, "r") as f:
+        tree = ast.parse(f.read(), filename=path)
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == "FACTION_DATA" for target in node.targets
+        ):
+            return ast.literal_eval(node.value)
+    raise ValueError(f"No FACTION_DATA literal found in {path}")
+
+
+def migrate_legacy_files(directory, store=None) -> bool:
+    """
+    Builds a session store from the pre-store files in a session or save
+    slot directory (factions.py, world_details.json, triggers.json,
+    quest_log.json). Returns True if anything was migrated.
+    """
+    store = store or SessionStore(os.path.join(directory, SESSION_STORE_FILE))
+    migrated = False
+
+    factions_path = os.path.join(directory, LEGACY_FACTIONS_FILE)
+    if os.path.exists(factions_path) and os.path.getsize(factions_path) > 0:
+        try:
+            migrated |= store.set_factions(read_legacy_factions(factions_path))
+        except (SyntaxError, ValueError) as e:
+            logging.error(f"Could not migrate {factions_path}: {e}")
+
+    json_sections = [
+        (LEGACY_WORLD_DETAILS_FILE, store.set_world_details),
+        (LEGACY_TRIGGERS_FILE, store.set_triggers),
+        (LEGACY_QUEST_LOG_FILE, lambda entries: store.set_quest_log(entries) or True),
+    ]
+    for filename, setter in json_sections:
+        path = os.path.join(directory, filename)
+        if not os.path.exists(path):
+            continue
+        try:
+            with open(path, "r") as f:
+                migrated |= bool(setter(json.load(f)))
+        except (json.JSONDecodeError, IOError) as e:
+            logging.error(f"Could not migrate {path}: {e}")
+
+    if migrated:
+        logging.info(f"Migrated legacy session files in {directory} to {SESSION_STORE_FILE}.")
+    return migrated
@@ -1,11 +1,27 @@
+import logging
 import random
 import math
+from collections import OrderedDict
 from .entity_loader import ENEMY_VEHICLES, ENEMY_CHARACTERS, FAUNA, OBSTACLES
-from ..data.game_constants import CITY_SPACING, CITY_SIZE, SAFE_ZONE_RADIUS, DESPAWN_RADIUS, MAX_FAUNA, MAX_OBSTACLES
-from ..logic.data_loader import FACTION_DATA
-from ..world.generation import get_city_faction
+from .entity_pool import acquire_entity, release_entity
+from ..data.game_constants import (
+    CITY_SPACING, CITY_SIZE, ROAD_WIDTH, SAFE_ZONE_RADIUS, DESPAWN_RADIUS, MAX_FAUNA, MAX_OBSTACLES
+)
+from ..world.generation import get_city_faction, get_buildings_in_city
 from .scaling import get_enemy_scaling
 
+INITIAL_SPAWN_ATTEMPTS = 200  # Obstacles and fauna, alternately, placed when entering the world
+SPAWN_BUDGET = 10             # Initial-population spawns per frame
+DESPAWN_BUDGET = 8            # Entities despawned per frame; the rest go on later frames
+
+SPAWN_TILE_SIZE = 100  # World units per tile of precomputed spawn cells
+SPAWN_CELL_SIZE = 10   # World units per spawn cell
+MAX_SPAWN_TILES = 128
+SPAWN_LOG_SAMPLE = 10    # One spawn in this many is logged, per kind of spawn
+SPAWN_SAMPLE_TRIES = 16  # Draws before a spawn pick gives up on finding a cell inside the ring
+
+logger = logging.getLogger(__name__)
+
 def _apply_faction_name(entity, unit_id, faction_id, game_state):
     """Apply LLM-generated faction name and description to a spawned entity."""
     unit_names = game_state.factions.get(faction_id, {}).get("unit_names", {})
@@ -23,27 +39,346 @@ def _get_distance_to_nearest_city_center(x, y):
     return math.sqrt((x - city_center_x)**2 + (y - city_center_y)**2)
 
 def spawn_initial_entities(game_state, world):
-    """Spawns an initial dense field of entities around the player."""
-    # Spawn a larger number of obstacles and fauna in a wider radius
-    for _ in range(100): # More entities for the initial spawn
-        spawn_obstacle(game_state, world, is_initial_spawn=True)
-        spawn_fauna(game_state, world, is_initial_spawn=True)
+    """
+    Queues an initial dense field of obstacles and fauna around the player.
+    spawn_pending_entities places them over the next frames, so entering the
+    world doesn't stall on a burst of spawns.
+    """
+    game_state.initial_spawns_remaining = INITIAL_SPAWN_ATTEMPTS
+
+def spawn_pending_entities(game_state, world, budget=SPAWN_BUDGET):
+    """Places up to `budget` of the queued initial population."""
+    while game_state.initial_spawns_remaining > 0 and budget > 0:
+        if game_state.initial_spawns_remaining % 2:
+            spawn_fauna(game_state, world, is_initial_spawn=True)
+        else:
+            spawn_obstacle(game_state, world, is_initial_spawn=True)
+        game_state.initial_spawns_remaining -= 1
+        budget -= 1
+
+class AliasTable:
+    """Walker's alias method: a weighted choice among len(weights) outcomes in O(1)."""
+
+    __slots__ = ("prob", "alias")
+
+    def __init__(self, weights):
+        n = len(weights)
+        total = sum(weights)
+        scaled = [w * n / total for w in weights]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] += scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+
+    def sample(self):
+        i = random.randrange(len(self.prob))
+        return i if random.random() < self.prob[i] else self.alias[i]
+
+
+def _destroyed(game_state, city_key):
+    """The destroyed-building bitset of a city, 0 if it is undamaged."""
+    damage = game_state.city_damage.get(city_key) if game_state else None
+    return damage.destroyed if damage is not None else 0
 
-def _get_spawn_coordinates(game_state):
+
+class SpawnCells:
     """
-    Finds a random (x, y) coordinate that is outside the safe zone
-    but inside the despawn radius, ensuring a sparse distribution.
+    The spawn cells of each world tile, found on first use and kept in a
+    small LRU. Only standing buildings block, and they stand inside cities,
+    so tiles clear of every city are open throughout and need no work at
+    all. In a city tile, a cell clear of buildings takes a spawn anywhere
+    in it; a cell whose centre is clear but which touches a building takes
+    one only at its centre.
     """
-    for _ in range(30): # 30 attempts to find a valid spot
-        # Pick a random point in a square around the player
-        dx = random.uniform(-DESPAWN_RADIUS, DESPAWN_RADIUS)
-        dy = random.uniform(-DESPAWN_RADIUS, DESPAWN_RADIUS)
-        
-        # Check if the point is outside the safe zone
-        if dx**2 + dy**2 > SAFE_ZONE_RADIUS**2:
-            return game_state.car_world_x + dx, game_state.car_world_y + dy
-            
-    return None, None # Failed to find a spot
+
+    def __init__(self, tile_size=SPAWN_TILE_SIZE, cell_size=SPAWN_CELL_SIZE, max_tiles=MAX_SPAWN_TILES):
+        self.tile_size = tile_size
+        self.cell_size = cell_size
+        self.max_tiles = max_tiles
+        self._world = None
+        self._tiles = OrderedDict()  # (tile_x, tile_y) -> (destroyed bitset, cells)
+
+    def is_open(self, tile_x, tile_y):
+        """True if the tile doesn't overlap a city, so all of it is passable."""
+        x0, y0 = tile_x * self.tile_size, tile_y * self.tile_size
+        x1, y1 = x0 + self.tile_size, y0 + self.tile_size
+        half_city = CITY_SIZE / 2
+        for grid_x in range(math.floor((x0 - half_city) / CITY_SPACING), math.floor((x1 + half_city) / CITY_SPACING) + 1):
+            center_x = grid_x * CITY_SPACING
+            if x1 <= center_x - half_city or x0 >= center_x + half_city:
+                continue
+            for grid_y in range(math.floor((y0 - half_city) / CITY_SPACING), math.floor((y1 + half_city) / CITY_SPACING) + 1):
+                center_y = grid_y * CITY_SPACING
+                if y0 < center_y + half_city and y1 > center_y - half_city:
+                    return False
+        return True
+
+    def city_key(self, tile_x, tile_y):
+        """The grid cell of the city a tile overlaps, if it overlaps one."""
+        size = self.tile_size
+        return (round((tile_x + 0.5) * size / CITY_SPACING), round((tile_y + 0.5) * size / CITY_SPACING))
+
+    def cells(self, world, tile_x, tile_y):
+        """
+        {(i, j): jitter} for the passable cells of a tile that overlaps a
+        city: how far from the cell's centre a spawn may land (half a cell,
+        or 0). Rebuilt when one of the city's buildings is destroyed.
+        """
+        if world is not self._world:
+            self._world = world
+            self._tiles.clear()
+        size, cell = self.tile_size, self.cell_size
+        x0, y0 = tile_x * size, tile_y * size
+        city_key = self.city_key(tile_x, tile_y)
+        destroyed = _destroyed(world.game_state, city_key)
+
+        key = (tile_x, tile_y)
+        cached = self._tiles.get(key)
+        if cached is not None and cached[0] == destroyed:
+            self._tiles.move_to_end(key)
+            return cached[1]
+
+        blocks = [
+            (b['x'], b['y'], b['x'] + b['w'], b['y'] + b['h'])
+            for idx, b in enumerate(get_buildings_in_city(*city_key))
+            if not (destroyed >> idx) & 1
+            and b['x'] < x0 + size and b['x'] + b['w'] > x0 and b['y'] < y0 + size and b['y'] + b['h'] > y0
+        ]
+        cells = {}
+        half = cell / 2
+        per_side = size // cell
+        for i in range(per_side):
+            cx0 = x0 + i * cell
+            for j in range(per_side):
+                cy0 = y0 + j * cell
+                touching = [r for r in blocks if r[0] < cx0 + cell and r[2] > cx0 and r[1] < cy0 + cell and r[3] > cy0]
+                if not touching:
+                    cells[(i, j)] = half
+                elif not any(r[0] <= cx0 + half < r[2] and r[1] <= cy0 + half < r[3] for r in touching):
+                    cells[(i, j)] = 0.0
+        self._tiles[key] = (destroyed, cells)
+        while len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+        return cells
+
+    def point_at(self, world, x, y):
+        """
+        A spawn point for (x, y): the point itself if it can take one, the
+        centre of its cell if only that is clear, or None inside a building.
+        """
+        size, cell = self.tile_size, self.cell_size
+        tile_x, tile_y = math.floor(x / size), math.floor(y / size)
+        if self.is_open(tile_x, tile_y):
+            return x, y
+        i = min(int((x - tile_x * size) // cell), size // cell - 1)
+        j = min(int((y - tile_y * size) // cell), size // cell - 1)
+        jitter = self.cells(world, tile_x, tile_y).get((i, j))
+        if jitter is None:
+            return None
+        if jitter:
+            return x, y
+        return tile_x * size + (i + 0.5) * cell, tile_y * size + (j + 0.5) * cell
+
+_spawn_cells = SpawnCells()
+
+
+def _terrain_class(x, y):
+    """The ground a spawn cell is on ("city", "road" or "wild"), by the rules of World.get_terrain_at."""
+    grid_x, grid_y = round(x / CITY_SPACING), round(y / CITY_SPACING)
+    if abs(x - grid_x * CITY_SPACING) < CITY_SIZE / 2 and abs(y - grid_y * CITY_SPACING) < CITY_SIZE / 2:
+        return "city"
+    if abs(x % CITY_SPACING) < ROAD_WIDTH / 2 or abs(y % CITY_SPACING) < ROAD_WIDTH / 2:
+        return "road"
+    return "wild"
+
+
+class SpawnRegion:
+    """
+    The spawn cells around the player, partitioned per world tile by
+    terrain class and faction territory. The region holds every tile that
+    can reach into the ring between SAFE_ZONE_RADIUS and DESPAWN_RADIUS
+    from somewhere in the player's tile. When the player crosses into
+    another tile, only the tiles entering and leaving that set are built
+    or dropped. A tile in a city is rebuilt when one of the city's
+    buildings is destroyed. Picking a spawn point is an alias draw over
+    the partitions and a list index; a pick outside the ring around the
+    player's exact position is drawn again.
+    """
+
+    def __init__(self, cells=None, tries=SPAWN_SAMPLE_TRIES):
+        self.spawn_cells = cells or SpawnCells()
+        self.tries = tries
+        self.tile = None        # The player's tile at the last update
+        self._position = (0.0, 0.0)
+        self._source = None     # (world, factions) the tiles were built for
+        self._tiles = {}        # (tile_x, tile_y) -> {(terrain_class, faction_id): [(x, y, jitter)]}
+        self._cities = {}       # city (grid_x, grid_y) -> (destroyed bitset, [tiles in the region])
+        self._samplers = {}     # (terrain_class, faction_id), None = any -> (AliasTable, [partition lists]) or None
+        self._factions = {}     # (grid_x, grid_y) -> faction_id
+        self._faction_source = None
+
+    def faction_at(self, game_state, x, y):
+        """get_city_faction for (x, y), remembered per city grid cell."""
+        if self._faction_source is not game_state.factions:
+            self._factions.clear()
+            self._faction_source = game_state.factions
+        grid = (round(x / CITY_SPACING), round(y / CITY_SPACING))
+        faction_id = self._factions.get(grid, _MISSING)
+        if faction_id is _MISSING:
+            faction_id = self._factions[grid] = get_city_faction(x, y, game_state.factions)
+        return faction_id
+
+    def update(self, game_state, world):
+        """Brings the region's tiles up to date with the player's tile and the city damage."""
+        px, py = game_state.car_world_x, game_state.car_world_y
+        self._position = (px, py)
+        size = self.spawn_cells.tile_size
+        tile = (math.floor(px / size), math.floor(py / size))
+        source = self._source
+        if source is None or source[0] is not world or source[1] is not game_state.factions:
+            self._tiles.clear()
+            self._cities.clear()
+            self._source = (world, game_state.factions)
+            self.tile = None
+        if tile != self.tile:
+            self._move_to(game_state, world, tile)
+        for city_key, (destroyed, tiles) in self._cities.items():
+            current = _destroyed(game_state, city_key)
+            if current != destroyed:
+                for key in tiles:
+                    self._tiles[key] = self._build_tile(game_state, world, *key)
+                self._cities[city_key] = (current, tiles)
+                self._samplers = {}
+        return self
+
+    def _move_to(self, game_state, world, tile):
+        """Builds the tiles that come into reach of `tile` and drops the ones that leave it."""
+        self.tile = tile
+        size = self.spawn_cells.tile_size
+        reach = math.ceil(DESPAWN_RADIUS / size)
+        wanted = set()
+        for dx in range(-reach, reach + 1):
+            for dy in range(-reach, reach + 1):
+                # Nearest and farthest any point of this tile can be from a point in the player's tile.
+                near = math.hypot(max(0, abs(dx) - 1), max(0, abs(dy) - 1)) * size
+                far = math.hypot(abs(dx) + 1, abs(dy) + 1) * size
+                if near < DESPAWN_RADIUS and far > SAFE_ZONE_RADIUS:
+                    wanted.add((tile[0] + dx, tile[1] + dy))
+        for key in [key for key in self._tiles if key not in wanted]:
+            del self._tiles[key]
+        for key in wanted:
+            if key not in self._tiles:
+                self._tiles[key] = self._build_tile(game_state, world, *key)
+        self._cities = {}
+        for key in self._tiles:
+            if not self.spawn_cells.is_open(*key):
+                city_key = self.spawn_cells.city_key(*key)
+                entry = self._cities.get(city_key)
+                if entry is None:
+                    entry = self._cities[city_key] = (_destroyed(game_state, city_key), [])
+                entry[1].append(key)
+        self._samplers = {}
+
+    def _build_tile(self, game_state, world, tile_x, tile_y):
+        """The passable cells of one tile, partitioned by terrain class and faction."""
+        cells = self.spawn_cells
+        size, cell = cells.tile_size, cells.cell_size
+        half = cell / 2
+        x0, y0 = tile_x * size, tile_y * size
+        tile_cells = None if cells.is_open(tile_x, tile_y) else cells.cells(world, tile_x, tile_y)
+        faction_id = self.faction_at(game_state, x0 + size / 2, y0 + size / 2)
+        partitions = {}
+        for i in range(size // cell):
+            cx = x0 + i * cell + half
+            for j in range(size // cell):
+                cy = y0 + j * cell + half
+                if tile_cells is None:
+                    jitter = half
+                else:
+                    jitter = tile_cells.get((i, j))
+                    if jitter is None:
+                        continue
+                key = (_terrain_class(cx, cy), faction_id)
+                partition = partitions.get(key)
+                if partition is None:
+                    partition = partitions[key] = []
+                partition.append((cx, cy, jitter))
+        return partitions
+
+    def _sampler(self, terrain_class, faction_id):
+        key = (terrain_class, faction_id)
+        if key not in self._samplers:
+            # Tiles in sorted order: the draws for a seed mustn't depend on the
+            # order the player reached them in, or session replays diverge.
+            lists = [cells for tile in sorted(self._tiles)
+                     for (cls, fid), cells in self._tiles[tile].items()
+                     if (terrain_class is None or cls == terrain_class)
+                     and (faction_id is None or fid == faction_id)]
+            self._samplers[key] = (AliasTable([len(c) for c in lists]), lists) if lists else None
+        return self._samplers[key]
+
+    def sample(self, terrain_class=None, faction_id=None):
+        """
+        A random spawn point, uniform over the cells of that class and
+        faction (None matches any) in the ring around the player, or
+        (None, None) if `tries` draws all land outside it.
+        """
+        sampler = self._sampler(terrain_class, faction_id)
+        if sampler is None:
+            return None, None
+        table, lists = sampler
+        px, py = self._position
+        inner_sq, outer_sq = SAFE_ZONE_RADIUS**2, DESPAWN_RADIUS**2
+        for _ in range(self.tries):
+            x, y, jitter = random.choice(lists[table.sample()])
+            if jitter:
+                x, y = x + random.uniform(-jitter, jitter), y + random.uniform(-jitter, jitter)
+            if inner_sq < (x - px)**2 + (y - py)**2 < outer_sq:
+                return x, y
+        return None, None
+
+_MISSING = object()
+_spawn_region = SpawnRegion(_spawn_cells)
+
+def _get_spawn_coordinates(game_state, world, terrain_class=None, faction_id=None):
+    """
+    Picks a random (x, y) on passable ground that is outside the safe zone
+    but inside the despawn radius, from the cells of that terrain class and
+    faction territory (None for any). Returns (None, None) when the area
+    around the player has no such cell, or its draws all missed the ring.
+    """
+    return _spawn_region.update(game_state, world).sample(terrain_class, faction_id)
+
+def despawn_distant_entities(game_state, budget=DESPAWN_BUDGET):
+    """
+    Removes entities beyond the despawn radius, at most `budget` per call,
+    in place, and hands them back to the entity pool.
+    """
+    px, py = game_state.car_world_x, game_state.car_world_y
+    despawn_radius_sq = game_state.despawn_radius**2
+    for entities in (game_state.active_enemies, game_state.active_fauna,
+                     game_state.active_obstacles, game_state.active_turrets):
+        for index in range(len(entities) - 1, -1, -1):
+            if budget <= 0:
+                return
+            entity = entities[index]
+            if (entity.x - px)**2 + (entity.y - py)**2 >= despawn_radius_sq:
+                del entities[index]
+                release_entity(game_state, entity)
+                budget -= 1
+
+def despawn_all(game_state):
+    """Removes every spawned entity, e.g. when fast travelling away."""
+    for entities in (game_state.active_enemies, game_state.active_fauna, game_state.active_obstacles):
+        for entity in entities:
+            release_entity(game_state, entity)
+        entities.clear()
 
 def spawn_enemy(game_state, world):
     """Spawns a new enemy."""
@@ -57,7 +392,7 @@ def spawn_enemy(game_state, world):
         return
 
     # Determine current faction territory and player's reputation
-    current_faction_id = get_city_faction(game_state.car_world_x, game_state.car_world_y, game_state.factions)
+    current_faction_id = _spawn_region.faction_at(game_state, game_state.car_world_x, game_state.car_world_y)
     player_rep = game_state.faction_reputation.get(current_faction_id, 0)
     faction_control = game_state.faction_control.get(current_faction_id, 50)
 
@@ -105,89 +440,98 @@ def spawn_enemy(game_state, world):
     if not enemy_class:
         return
 
-    sx, sy = _get_spawn_coordinates(game_state)
+    # Enemies come from the territory they belong to, where it's in reach
+    sx, sy = _get_spawn_coordinates(game_state, world, faction_id=current_faction_id)
+    if sx is None:
+        sx, sy = _get_spawn_coordinates(game_state, world)
     if sx is None: return # Could not find a valid spawn point
 
-    if world.get_terrain_at(sx, sy).get("passable", True):
-        new_enemy = enemy_class(sx, sy)
-        new_enemy.faction_id = current_faction_id
-        hp_mult = game_state.difficulty_mods.get("enemy_hp_mult", 1.0)
-        dmg_mult = game_state.difficulty_mods.get("enemy_dmg_mult", 1.0)
-        # Apply progression scaling on top of difficulty
-        prog_hp, prog_dmg, prog_reward = get_enemy_scaling(game_state)
-        hp_mult *= prog_hp
-        dmg_mult *= prog_dmg
-        new_enemy.durability = int(new_enemy.durability * hp_mult)
-        new_enemy.max_durability = new_enemy.durability
-        if hasattr(new_enemy, 'collision_damage'):
-            new_enemy.collision_damage = int(new_enemy.collision_damage * dmg_mult)
-        else:
-            new_enemy.collision_damage = int(5 * dmg_mult)
-        if hasattr(new_enemy, 'shoot_damage'):
-            new_enemy.shoot_damage = int(new_enemy.shoot_damage * dmg_mult)
-        new_enemy.xp_value = int(new_enemy.xp_value * prog_reward)
-        new_enemy.cash_value = int(new_enemy.cash_value * prog_reward)
-        # Apply faction-specific vehicle names
-        _apply_faction_name(new_enemy, enemy_name, current_faction_id, game_state)
-        new_enemy.patrol_target_x = sx + random.uniform(-100, 100)
-        new_enemy.patrol_target_y = sy + random.uniform(-100, 100)
-        game_state.active_enemies.append(new_enemy)
-
-        # Group spawning: chance to spawn additional enemies of the same type
-        max_enemies = game_state.difficulty_mods.get("max_enemies", 12)
-        roll = random.random()
-        extra_count = 0
-        if roll < 0.05:
-            extra_count = 2  # 5% chance for a trio
-        elif roll < 0.20:
-            extra_count = 1  # 15% chance for a pair
-
-        for _ in range(extra_count):
-            if len(game_state.active_enemies) >= max_enemies:
-                break
-            offset_x = sx + random.uniform(-15, 15)
-            offset_y = sy + random.uniform(-15, 15)
-            if world.get_terrain_at(offset_x, offset_y).get("passable", True):
-                extra = enemy_class(offset_x, offset_y)
-                extra.faction_id = current_faction_id
-                extra.durability = int(extra.durability * hp_mult)
-                extra.max_durability = extra.durability
-                if hasattr(extra, 'collision_damage'):
-                    extra.collision_damage = int(extra.collision_damage * dmg_mult)
-                else:
-                    extra.collision_damage = int(5 * dmg_mult)
-                if hasattr(extra, 'shoot_damage'):
-                    extra.shoot_damage = int(extra.shoot_damage * dmg_mult)
-                extra.xp_value = int(extra.xp_value * prog_reward)
-                extra.cash_value = int(extra.cash_value * prog_reward)
-                _apply_faction_name(extra, enemy_name, current_faction_id, game_state)
-                extra.patrol_target_x = offset_x + random.uniform(-100, 100)
-                extra.patrol_target_y = offset_y + random.uniform(-100, 100)
-                game_state.active_enemies.append(extra)
+    new_enemy = acquire_entity(enemy_class, sx, sy)
+    new_enemy.faction_id = current_faction_id
+    hp_mult = game_state.difficulty_mods.get("enemy_hp_mult", 1.0)
+    dmg_mult = game_state.difficulty_mods.get("enemy_dmg_mult", 1.0)
+    # Apply progression scaling on top of difficulty
+    prog_hp, prog_dmg, prog_reward = get_enemy_scaling(game_state)
+    hp_mult *= prog_hp
+    dmg_mult *= prog_dmg
+    new_enemy.durability = int(new_enemy.durability * hp_mult)
+    new_enemy.max_durability = new_enemy.durability
+    if hasattr(new_enemy, 'collision_damage'):
+        new_enemy.collision_damage = int(new_enemy.collision_damage * dmg_mult)
+    else:
+        new_enemy.collision_damage = int(5 * dmg_mult)
+    if hasattr(new_enemy, 'shoot_damage'):
+        new_enemy.shoot_damage = int(new_enemy.shoot_damage * dmg_mult)
+    new_enemy.xp_value = int(new_enemy.xp_value * prog_reward)
+    new_enemy.cash_value = int(new_enemy.cash_value * prog_reward)
+    # Apply faction-specific vehicle names
+    _apply_faction_name(new_enemy, enemy_name, current_faction_id, game_state)
+    new_enemy.patrol_target_x = sx + random.uniform(-100, 100)
+    new_enemy.patrol_target_y = sy + random.uniform(-100, 100)
+    game_state.active_enemies.append(new_enemy)
+    logger.info("Spawned %s (%s) at (%.0f, %.0f)", enemy_name, current_faction_id, sx, sy,
+                extra={"sample_every": SPAWN_LOG_SAMPLE})
+
+    # Group spawning: chance to spawn additional enemies of the same type
+    max_enemies = game_state.difficulty_mods.get("max_enemies", 12)
+    roll = random.random()
+    extra_count = 0
+    if roll < 0.05:
+        extra_count = 2  # 5% chance for a trio
+    elif roll < 0.20:
+        extra_count = 1  # 15% chance for a pair
+
+    for _ in range(extra_count):
+        if len(game_state.active_enemies) >= max_enemies:
+            break
+        point = _spawn_cells.point_at(world, sx + random.uniform(-15, 15), sy + random.uniform(-15, 15))
+        if point is not None:
+            offset_x, offset_y = point
+            extra = acquire_entity(enemy_class, offset_x, offset_y)
+            extra.faction_id = current_faction_id
+            extra.durability = int(extra.durability * hp_mult)
+            extra.max_durability = extra.durability
+            if hasattr(extra, 'collision_damage'):
+                extra.collision_damage = int(extra.collision_damage * dmg_mult)
+            else:
+                extra.collision_damage = int(5 * dmg_mult)
+            if hasattr(extra, 'shoot_damage'):
+                extra.shoot_damage = int(extra.shoot_damage * dmg_mult)
+            extra.xp_value = int(extra.xp_value * prog_reward)
+            extra.cash_value = int(extra.cash_value * prog_reward)
+            _apply_faction_name(extra, enemy_name, current_faction_id, game_state)
+            extra.patrol_target_x = offset_x + random.uniform(-100, 100)
+            extra.patrol_target_y = offset_y + random.uniform(-100, 100)
+            game_state.active_enemies.append(extra)
 
 def spawn_fauna(game_state, world, is_initial_spawn=False):
     """Spawns a new fauna."""
     if not is_initial_spawn and len(game_state.active_fauna) >= MAX_FAUNA:
         return
     fauna_class = random.choice(FAUNA)
-    sx, sy = _get_spawn_coordinates(game_state)
+    # Animals keep to the wilds, when there are any in reach
+    sx, sy = _get_spawn_coordinates(game_state, world, terrain_class="wild")
+    if sx is None:
+        sx, sy = _get_spawn_coordinates(game_state, world)
     if sx is None: return
 
-    if world.get_terrain_at(sx, sy).get("passable", True):
-        new_fauna = fauna_class(sx, sy)
-        game_state.active_fauna.append(new_fauna)
+    new_fauna = acquire_entity(fauna_class, sx, sy)
+    game_state.active_fauna.append(new_fauna)
+    logger.info("Spawned fauna %s at (%.0f, %.0f)", fauna_class.__name__, sx, sy,
+                extra={"sample_every": SPAWN_LOG_SAMPLE})
 
 def spawn_obstacle(game_state, world, is_initial_spawn=False):
     """Spawns a new obstacle."""
     if not is_initial_spawn and len(game_state.active_obstacles) >= MAX_OBSTACLES:
         return
     obstacle_class = random.choice(OBSTACLES)
-    sx, sy = _get_spawn_coordinates(game_state)
+    sx, sy = _get_spawn_coordinates(game_state, world)
     if sx is None: return
 
-    if world.get_terrain_at(sx, sy).get("passable", True):
-        new_obstacle = obstacle_class(sx, sy)
-        game_state.active_obstacles.append(new_obstacle)
+    new_obstacle = acquire_entity(obstacle_class, sx, sy)
+    game_state.active_obstacles.append(new_obstacle)
+    logger.info("Spawned obstacle %s at (%.0f, %.0f)", obstacle_class.__name__, sx, sy,
+                extra={"sample_every": SPAWN_LOG_SAMPLE})
 
 
 MAX_TURRETS_PER_CITY = 6
@@ -200,7 +544,7 @@ def spawn_turrets(game_state, world):
     if dist_to_city > CITY_SIZE:
         return  # Not inside a city
 
-    faction_id = get_city_faction(game_state.car_world_x, game_state.car_world_y, game_state.factions)
+    faction_id = _spawn_region.faction_at(game_state, game_state.car_world_x, game_state.car_world_y)
     if not faction_id:
         return
 
@@ -226,9 +570,8 @@ def spawn_turrets(game_state, world):
     for i in range(count):
         angle = (2 * math.pi * i) / count + random.uniform(-0.3, 0.3)
         dist = CITY_SIZE * 0.7 + random.uniform(-5, 5)
-        tx = center_x + dist * math.cos(angle)
-        ty = center_y + dist * math.sin(angle)
-        if world.get_terrain_at(tx, ty).get("passable", True):
-            turret = Turret(tx, ty)
+        point = _spawn_cells.point_at(world, center_x + dist * math.cos(angle), center_y + dist * math.sin(angle))
+        if point is not None:
+            turret = acquire_entity(Turret, *point)
             turret.faction_id = faction_id
             game_state.active_turrets.append(turret)
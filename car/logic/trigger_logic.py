@@ -1,8 +1,12 @@
 from ..widgets.notifications import Notifications
 
 def check_triggers(app, game_state):
-    """Checks if the player has entered a world trigger zone."""
-    for trigger in game_state.world_triggers:
+    """Checks if the player has entered a world trigger zone.
+
+    Only triggers bucketed near the player are tested (see WorldIndex).
+    """
+    nearby = game_state.world_index.triggers_near(game_state.car_world_x, game_state.car_world_y)
+    for trigger in nearby:
         trigger_id = trigger.get("id")
         if trigger_id in game_state.triggered_triggers and trigger.get("one_shot", False):
             continue
@@ -1,5 +1,6 @@
 import math
 from .building_damage import find_building_at, damage_building
+from .swept_collision import box_terrain, sweep_box
 from ..data.game_constants import BUILDING_RAM_DAMAGE
 
 def _is_terrain_enterable(terrain):
@@ -9,24 +10,24 @@ def _is_terrain_enterable(terrain):
     building = terrain.get("building", {})
     return building.get("enterable", False)
 
+def _blocks_vehicle(terrain):
+    return not _is_terrain_enterable(terrain)
+
 def _check_bbox_terrain(world, cx, cy, w, h):
-    """Check terrain at the vehicle's bounding box corners.
+    """Check terrain under the vehicle's bounding box edges.
     cx, cy is the CENTER of the vehicle (matches rendering).
     Returns the first impassable terrain found, or the center terrain if all clear.
-    This prevents vehicles from visually clipping into buildings."""
-    half_w = w / 2
-    half_h = h / 2
-    corners = [
-        (cx - half_w, cy - half_h),  # top-left
-        (cx + half_w, cy - half_h),  # top-right
-        (cx - half_w, cy + half_h),  # bottom-left
-        (cx + half_w, cy + half_h),  # bottom-right
-    ]
-    for x, y in corners:
-        terrain = world.get_terrain_at(x, y)
-        if not _is_terrain_enterable(terrain):
-            return terrain
-    return world.get_terrain_at(cx, cy)
+    Every cell along the edges is sampled, not just the corners, so walls
+    thinner than the car can't slip between them."""
+    return box_terrain(world, cx, cy, w, h, _blocks_vehicle)
+
+def _sweep_bbox_terrain(world, x0, y0, x1, y1, w, h):
+    """Sweep the vehicle's bounding box from (x0, y0) toward (x1, y1).
+    Returns (reached, x, y, terrain): whether the full move is clear, the last
+    clear position along the way (the point of impact when blocked), and the
+    blocking terrain or the destination terrain."""
+    t, x, y, terrain = sweep_box(world, x0, y0, x1, y1, w, h, _blocks_vehicle)
+    return t >= 1.0, x, y, terrain
 
 def _is_enterable_building(terrain):
     """Check if terrain is specifically an enterable building (not just passable ground)."""
@@ -132,38 +133,40 @@ def update_vehicle_movement(game_state, world, audio_manager, dt):
             game_state.deflection_vx = 0.0
             game_state.deflection_vy = 0.0
     
-    next_terrain = _check_bbox_terrain(world, next_world_x, next_world_y,
-                                        game_state.player_car.width, game_state.player_car.height)
+    car_w, car_h = game_state.player_car.width, game_state.player_car.height
+    reached, contact_x, contact_y, next_terrain = _sweep_bbox_terrain(
+        world, game_state.car_world_x, game_state.car_world_y, next_world_x, next_world_y, car_w, car_h)
 
-    if _is_terrain_enterable(next_terrain):
+    if reached:
         game_state.car_world_x = next_world_x
         game_state.car_world_y = next_world_y
         # Auto-stop when entering a building (non-passable but enterable)
         if _is_enterable_building(next_terrain):
             _stop_car(game_state)
     else:
-        # Wall-sliding: try each axis independently so the player slides along walls
-        # instead of getting stuck when hitting buildings at an angle.
-        dx = next_world_x - game_state.car_world_x
-        dy = next_world_y - game_state.car_world_y
+        # Advance up to the point of impact, then wall-slide: try each axis
+        # independently so the player slides along walls instead of getting
+        # stuck when hitting buildings at an angle.
+        dx = next_world_x - contact_x
+        dy = next_world_y - contact_y
+        game_state.car_world_x = contact_x
+        game_state.car_world_y = contact_y
         moved = False
 
         # Try moving in X only
-        test_x = game_state.car_world_x + dx
-        terrain_x = _check_bbox_terrain(world, test_x, game_state.car_world_y,
-                                        game_state.player_car.width, game_state.player_car.height)
-        if _is_terrain_enterable(terrain_x):
-            game_state.car_world_x = test_x
+        reached_x, slide_x, _, terrain_x = _sweep_bbox_terrain(
+            world, contact_x, contact_y, contact_x + dx, contact_y, car_w, car_h)
+        game_state.car_world_x = slide_x
+        if reached_x:
             moved = True
             if _is_enterable_building(terrain_x):
                 _stop_car(game_state)
 
         # Try moving in Y only
-        test_y = game_state.car_world_y + dy
-        terrain_y = _check_bbox_terrain(world, game_state.car_world_x, test_y,
-                                        game_state.player_car.width, game_state.player_car.height)
-        if _is_terrain_enterable(terrain_y):
-            game_state.car_world_y = test_y
+        reached_y, _, slide_y, terrain_y = _sweep_bbox_terrain(
+            world, game_state.car_world_x, contact_y, game_state.car_world_x, contact_y + dy, car_w, car_h)
+        game_state.car_world_y = slide_y
+        if reached_y:
             moved = True
             if _is_enterable_building(terrain_y):
                 _stop_car(game_state)
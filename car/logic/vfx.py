@@ -0,0 +1,162 @@
+"""
+Explosion effects, drawn by the game view in a single pass.
+
+An explosion burns a destroyed entity's sprite into fire and then smoke.
+The frames depend only on the sprite's shape, so a few variants of the
+whole sequence are precomputed per shape, with interned styles, and shared
+by every explosion of that shape. An effect in flight is only a position,
+a frame sequence and a start time, and comes from a pool.
+
+Under load the cost stays flat: past LOD_THRESHOLD live effects, new ones
+use a light sequence (every other cell, fewer frames), and past
+MAX_EFFECTS the oldest effect makes way for the newest. A chain of
+barrels, mines or a whole convoy going up draws about as many cells as a
+handful of explosions.
+"""
+
+import random
+import time
+
+from rich.style import Style
+
+FRAME_SECONDS = 0.05
+TOTAL_STEPS = 10
+LIGHT_STEPS = 6
+VARIANTS = 4            # Precomputed sequences per sprite shape
+MAX_EFFECTS = 24
+LOD_THRESHOLD = 8
+MAX_CACHED_SHAPES = 64
+
+# Terminal-safe characters, no emojis. Each (char, style) is built once.
+FIRE = (
+    ("*", Style(color="red", bold=True)),
+    ("#", Style(color="rgb(255,100,0)", bold=True)),
+    ("~", Style(color="rgb(255,165,0)")),
+    ("+", Style(color="yellow", bold=True)),
+    (".", Style(color="rgb(200,80,0)")),
+)
+SMOKE = (
+    (".", Style(color="rgb(100,100,100)")),
+    (":", Style(color="rgb(80,80,80)")),
+)
+_FIRE_AND_SMOKE = FIRE + SMOKE
+_FADE = SMOKE + ((" ", Style()),)
+_PLAIN = Style()
+
+# Effects are cosmetic, so they draw on their own generator and leave the
+# gameplay random stream alone.
+_rng = random.Random()
+
+
+def _cells_for(progress):
+    if progress < 0.6:
+        return FIRE
+    if progress < 0.85:
+        return _FIRE_AND_SMOKE
+    return _FADE
+
+
+class Sequence:
+    """The frames of one explosion: per frame, the (row, col, char, style) to draw."""
+
+    __slots__ = ("frames", "half_w", "half_h")
+
+    def __init__(self, art, light=False):
+        steps = LIGHT_STEPS if light else TOTAL_STEPS
+        cells = [(r, c, char) for r, row in enumerate(art) for c, char in enumerate(row)
+                 if char != " " and (not light or (r + c) % 2 == 0)]
+        current = [(char, _PLAIN) for _, _, char in cells]
+        frames = [self._frame(cells, current)]
+        for step in range(1, steps + 1):
+            progress = step / steps
+            choices = _cells_for(progress)
+            for i in range(len(current)):
+                if _rng.random() < progress:
+                    current[i] = _rng.choice(choices)
+            frames.append(self._frame(cells, current))
+        self.frames = tuple(frames)
+        self.half_w = (max(len(row) for row in art) if art else 0) / 2
+        self.half_h = len(art) / 2
+
+    @staticmethod
+    def _frame(cells, current):
+        return tuple((r, c, char, style) for (r, c, _), (char, style) in zip(cells, current) if char != " ")
+
+
+_sequences = {}  # (rows, light) -> [Sequence, ...]
+
+
+def explosion_sequence(art, light=False):
+    """One of the precomputed sequences for a sprite of this shape."""
+    key = (tuple("".join(row) for row in art), light)
+    variants = _sequences.get(key)
+    if variants is None:
+        if len(_sequences) >= MAX_CACHED_SHAPES:
+            _sequences.pop(next(iter(_sequences)))
+        variants = _sequences[key] = [Sequence(key[0], light) for _ in range(VARIANTS)]
+    return _rng.choice(variants)
+
+
+class Effect:
+    __slots__ = ("x", "y", "sequence", "started")
+
+
+class EffectPool:
+    """Free list of effect instances."""
+
+    def __init__(self, max_free=MAX_EFFECTS):
+        self.max_free = max_free
+        self._free = []
+
+    def acquire(self, x, y, sequence, started):
+        effect = self._free.pop() if self._free else Effect()
+        effect.x = x
+        effect.y = y
+        effect.sequence = sequence
+        effect.started = started
+        return effect
+
+    def release(self, effect):
+        effect.sequence = None
+        if len(self._free) < self.max_free:
+            self._free.append(effect)
+
+
+_pool = EffectPool()
+
+
+def spawn_explosion(game_state, entity, now=None):
+    """Starts an explosion over a destroyed entity's sprite."""
+    effects = game_state.active_explosions
+    if len(effects) >= MAX_EFFECTS:
+        _pool.release(effects.pop(0))
+    sequence = explosion_sequence(entity.get_static_art(), light=len(effects) >= LOD_THRESHOLD)
+    effects.append(_pool.acquire(entity.x, entity.y, sequence, time.time() if now is None else now))
+
+
+def draw_effects(effects, canvas, styles, world_start_x, world_start_y, w, h, now):
+    """Draws every live effect onto the canvas and retires finished ones, in place."""
+    finished = False
+    for effect in effects:
+        sequence = effect.sequence
+        step = int((now - effect.started) / FRAME_SECONDS)
+        if step >= len(sequence.frames):
+            finished = True
+            continue
+        ex = int(effect.x - world_start_x - sequence.half_w)
+        ey = int(effect.y - world_start_y - sequence.half_h)
+        if ex >= w or ey >= h or ex + 2 * sequence.half_w < 0 or ey + 2 * sequence.half_h < 0:
+            continue
+        for r, c, char, style in sequence.frames[step]:
+            dy, dx = ey + r, ex + c
+            if 0 <= dy < h and 0 <= dx < w:
+                canvas[dy][dx] = char
+                styles[dy][dx] = style
+    if finished:
+        live = []
+        for effect in effects:
+            if int((now - effect.started) / FRAME_SECONDS) >= len(effect.sequence.frames):
+                _pool.release(effect)
+            else:
+                live.append(effect)
+        effects[:] = live
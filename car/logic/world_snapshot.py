@@ -0,0 +1,298 @@
+import pickle
+import struct
+import weakref
+from multiprocessing import shared_memory
+
+# A compact per-frame picture of the running world, written by the
+# simulation process into shared memory and read by the UI process. Only what
+# the world screen draws every frame lives here; anything that changes rarely
+# (sprite art, quest names, ammo) travels as events alongside it.
+
+MAX_ENTITIES = 512
+MAX_PARTICLES = 1024
+MAX_PICKUPS = 256
+
+# Entity kinds, in GameState.all_entities order.
+KIND_PLAYER, KIND_OBSTACLE, KIND_FAUNA, KIND_ENEMY, KIND_TURRET = range(5)
+_KIND_LISTS = (
+    (KIND_OBSTACLE, "active_obstacles"),
+    (KIND_FAUNA, "active_fauna"),
+    (KIND_ENEMY, "active_enemies"),
+    (KIND_TURRET, "active_turrets"),
+)
+
+PICKUP_TYPES = ("cash", "weapon", "equipment", "narrative", "other")
+
+# Bumped by the writer before and after every frame (a seqlock): an odd value
+# means a write is in progress, and a value that changed during a read means
+# the read was torn and must be retried.
+_SEQ = struct.Struct("<Q")
+_HEADER = struct.Struct(
+    "<I"     # frame
+    "I"      # input_seq: last control update applied by the simulation
+    "HHH"    # entity, particle and pickup counts
+    "dd"     # car_world_x, car_world_y
+    "ddd"    # car_angle, weapon_angle_offset, pedal_position
+    "dddd"   # car_speed, current_gas, gas_capacity, current_durability
+    "d"      # max_durability
+    "qiii"   # player_cash, player_level, current_xp, xp_to_next_level
+    "d"      # compass bearing
+    "i"      # index of the closest entity in the entity table, -1 for none
+)
+_ENTITY = struct.Struct("<BIddfhhii")  # kind, sprite, x, y, angle, w, h, hp, max hp
+_PARTICLE = struct.Struct("<ddI")      # x, y, char code point
+_PICKUP = struct.Struct("<ddIB")       # x, y, text id, type index
+
+_HEADER_OFFSET = _SEQ.size
+_ENTITY_OFFSET = _HEADER_OFFSET + _HEADER.size
+_PARTICLE_OFFSET = _ENTITY_OFFSET + MAX_ENTITIES * _ENTITY.size
+_PICKUP_OFFSET = _PARTICLE_OFFSET + MAX_PARTICLES * _PARTICLE.size
+SNAPSHOT_SIZE = _PICKUP_OFFSET + MAX_PICKUPS * _PICKUP.size
+
+
+class SpriteRegistry:
+    """
+    Hands out small integer ids for entity art and pickup text so the
+    snapshot only carries numbers. The first time an id is handed out, its
+    payload is returned as well so it can be sent to the reader once.
+    An entity's sprite is remembered for its entity_id, which the entity
+    pool renews when it hands the same object out again.
+    """
+
+    def __init__(self):
+        self._entity_ids = weakref.WeakKeyDictionary()  # entity -> (entity_id, sprite_id)
+        self._payload_ids = {}
+        self._text_ids = {}
+
+    def entity_sprite(self, entity):
+        """Returns (sprite_id, payload), where payload is None if already sent."""
+        cached = self._entity_ids.get(entity)
+        entity_id = getattr(entity, "entity_id", None)
+        if cached is not None and cached[0] == entity_id:
+            return cached[1], None
+        payload = {
+            "art": entity.art,
+            "static_art": entity.get_static_art() if hasattr(entity, "get_static_art") else [],
+            "name": getattr(entity, "name", entity.__class__.__name__.replace("_", " ").title()),
+            "description": getattr(entity, "description", ""),
+        }
+        key = pickle.dumps(payload)
+        sprite_id = self._payload_ids.get(key)
+        is_new = sprite_id is None
+        if is_new:
+            sprite_id = self._payload_ids[key] = len(self._payload_ids)
+        self._entity_ids[entity] = (entity_id, sprite_id)
+        return sprite_id, (payload if is_new else None)
+
+    def text(self, value):
+        """Returns (text_id, is_new) for a short string such as pickup art."""
+        text_id = self._text_ids.get(value)
+        if text_id is not None:
+            return text_id, False
+        text_id = self._text_ids[value] = len(self._text_ids)
+        return text_id, True
+
+
+def create_snapshot_block():
+    """Allocates a zeroed shared memory block for one snapshot. The caller owns it."""
+    return shared_memory.SharedMemory(create=True, size=SNAPSHOT_SIZE)
+
+
+def entity_row(kind, sprite_id, entity):
+    """The snapshot record for one entity."""
+    return (
+        kind, sprite_id, entity.x, entity.y, entity.angle,
+        entity.width, entity.height,
+        int(getattr(entity, "durability", 0)), int(getattr(entity, "max_durability", 0)),
+    )
+
+
+class SnapshotWriter:
+    """Attaches to a snapshot block by name and publishes one frame at a time."""
+
+    def __init__(self, name):
+        self.shm = shared_memory.SharedMemory(name=name)
+        self._seq = 0
+
+    def publish(self, gs, frame, input_seq, registry, on_new_sprite, on_new_text):
+        """
+        Writes the world as seen from game state `gs`. New sprite and text
+        payloads are passed to the callbacks before the frame that uses them.
+        Returns the entities in snapshot order (index 0 is the player).
+        """
+        buf = self.shm.buf
+        entities = [(KIND_PLAYER, gs.player_car)]
+        for kind, attr in _KIND_LISTS:
+            entities.extend((kind, entity) for entity in getattr(gs, attr))
+        entities = entities[:MAX_ENTITIES]
+
+        entity_rows = []
+        for kind, entity in entities:
+            sprite_id, payload = registry.entity_sprite(entity)
+            if payload is not None:
+                on_new_sprite(sprite_id, payload)
+            entity_rows.append(entity_row(kind, sprite_id, entity))
+
+        pickup_rows = []
+        for pickup in list(gs.active_pickups.values())[:MAX_PICKUPS]:
+            text = pickup.get("char", "$")
+            text_id, is_new = registry.text(text)
+            if is_new:
+                on_new_text(text_id, text)
+            pickup_type = pickup.get("type", "other")
+            type_index = PICKUP_TYPES.index(pickup_type) if pickup_type in PICKUP_TYPES else len(PICKUP_TYPES) - 1
+            pickup_rows.append((pickup["x"], pickup["y"], text_id, type_index))
+
+        particles = gs.active_particles[:MAX_PARTICLES]
+        closest = gs.closest_entity_info
+        closest_index = -1
+        if closest:
+            for index, (_, entity) in enumerate(entities):
+                if entity.x == closest["x"] and entity.y == closest["y"]:
+                    closest_index = index
+                    break
+
+        self._seq += 1
+        _SEQ.pack_into(buf, 0, self._seq)
+        _HEADER.pack_into(
+            buf, _HEADER_OFFSET,
+            frame, input_seq, len(entity_rows), len(particles), len(pickup_rows),
+            gs.car_world_x, gs.car_world_y,
+            gs.car_angle, gs.weapon_angle_offset, gs.pedal_position,
+            gs.car_speed, gs.current_gas, gs.gas_capacity, gs.current_durability,
+            gs.max_durability,
+            int(gs.player_cash), int(gs.player_level), int(gs.current_xp), int(gs.xp_to_next_level),
+            gs.compass_info["absolute_bearing"],
+            closest_index,
+        )
+        for index, row in enumerate(entity_rows):
+            _ENTITY.pack_into(buf, _ENTITY_OFFSET + index * _ENTITY.size, *row)
+        for index, p_state in enumerate(particles):
+            _PARTICLE.pack_into(buf, _PARTICLE_OFFSET + index * _PARTICLE.size,
+                                p_state[0], p_state[1], ord(str(p_state[6])[:1] or " "))
+        for index, row in enumerate(pickup_rows):
+            _PICKUP.pack_into(buf, _PICKUP_OFFSET + index * _PICKUP.size, *row)
+        self._seq += 1
+        _SEQ.pack_into(buf, 0, self._seq)
+        return entities
+
+    def close(self):
+        self.shm.close()
+
+
+class WorldSnapshot:
+    """One decoded frame. Field names match the GameState attributes they mirror."""
+
+    __slots__ = (
+        "frame", "input_seq",
+        "car_world_x", "car_world_y", "car_angle", "weapon_angle_offset", "pedal_position",
+        "car_speed", "current_gas", "gas_capacity", "current_durability", "max_durability",
+        "player_cash", "player_level", "current_xp", "xp_to_next_level",
+        "compass_bearing", "closest_index",
+        "entities", "particles", "pickups",
+    )
+
+
+class SnapshotReader:
+    """Decodes the latest complete frame from a snapshot block."""
+
+    def __init__(self, shm):
+        self.shm = shm
+        self._last_seq = 0  # A fresh block has seq 0: nothing published yet
+
+    def read(self, retries=5):
+        """Returns the newest complete frame, or None if nothing new was published."""
+        buf = self.shm.buf
+        for _ in range(retries):
+            seq = _SEQ.unpack_from(buf, 0)[0]
+            if seq == self._last_seq:
+                return None
+            if seq % 2:
+                continue  # Mid-write
+            data = bytes(buf)
+            if _SEQ.unpack_from(buf, 0)[0] != seq:
+                continue  # Torn read
+            self._last_seq = seq
+            return _decode(data)
+        return None
+
+
+def _decode(data):
+    header = _HEADER.unpack_from(data, _HEADER_OFFSET)
+    snapshot = WorldSnapshot()
+    (snapshot.frame, snapshot.input_seq, n_entities, n_particles, n_pickups,
+     snapshot.car_world_x, snapshot.car_world_y,
+     snapshot.car_angle, snapshot.weapon_angle_offset, snapshot.pedal_position,
+     snapshot.car_speed, snapshot.current_gas, snapshot.gas_capacity, snapshot.current_durability,
+     snapshot.max_durability,
+     snapshot.player_cash, snapshot.player_level, snapshot.current_xp, snapshot.xp_to_next_level,
+     snapshot.compass_bearing, snapshot.closest_index) = header
+    snapshot.entities = list(_ENTITY.iter_unpack(
+        data[_ENTITY_OFFSET:_ENTITY_OFFSET + n_entities * _ENTITY.size]))
+    snapshot.particles = list(_PARTICLE.iter_unpack(
+        data[_PARTICLE_OFFSET:_PARTICLE_OFFSET + n_particles * _PARTICLE.size]))
+    snapshot.pickups = list(_PICKUP.iter_unpack(
+        data[_PICKUP_OFFSET:_PICKUP_OFFSET + n_pickups * _PICKUP.size]))
+    return snapshot
+
+
+class EntityView:
+    """A read-only stand-in for an entity, built from a snapshot row and its sprite."""
+
+    __slots__ = ("x", "y", "angle", "width", "height", "durability", "max_durability",
+                 "art", "name", "description", "_static_art")
+
+    def __init__(self, row, sprite):
+        _, _, self.x, self.y, self.angle, self.width, self.height, self.durability, self.max_durability = row
+        self.art = sprite["art"]
+        self.name = sprite["name"]
+        self.description = sprite["description"]
+        self._static_art = sprite["static_art"]
+
+    def get_static_art(self):
+        return self._static_art
+
+
+def apply_snapshot(gs, snapshot, sprites, texts, adopt_controls):
+    """
+    Mirrors a snapshot onto the UI's copy of the game state so the HUD and
+    GameView can keep reading GameState attributes. Controls (pedal and aim)
+    are only taken from the snapshot once it reflects the UI's latest input.
+    """
+    for attr in ("car_world_x", "car_world_y", "car_angle", "car_speed", "current_gas",
+                 "gas_capacity", "current_durability", "max_durability", "player_cash",
+                 "player_level", "current_xp", "xp_to_next_level"):
+        setattr(gs, attr, getattr(snapshot, attr))
+    if adopt_controls:
+        gs.pedal_position = snapshot.pedal_position
+        gs.weapon_angle_offset = snapshot.weapon_angle_offset
+    gs.compass_info = {**gs.compass_info, "absolute_bearing": snapshot.compass_bearing}
+
+    player = gs.player_car
+    player.x, player.y, player.angle = snapshot.car_world_x, snapshot.car_world_y, snapshot.car_angle
+
+    lists = {attr: [] for _, attr in _KIND_LISTS}
+    kind_attr = dict(_KIND_LISTS)
+    closest_view = None
+    for index, row in enumerate(snapshot.entities):
+        kind, sprite_id = row[0], row[1]
+        if kind == KIND_PLAYER or sprite_id not in sprites:
+            continue
+        view = EntityView(row, sprites[sprite_id])
+        lists[kind_attr[kind]].append(view)
+        if index == snapshot.closest_index:
+            closest_view = view
+    for attr, views in lists.items():
+        setattr(gs, attr, views)
+
+    gs.closest_entity_info = None if closest_view is None else {
+        "name": closest_view.name, "hp": closest_view.durability, "max_hp": closest_view.max_durability,
+        "art": closest_view.get_static_art(), "x": closest_view.x, "y": closest_view.y,
+        "description": closest_view.description,
+    }
+
+    gs.active_particles = [[x, y, 0, 0, 0, 0, chr(code)] for x, y, code in snapshot.particles]
+    gs.active_pickups = {
+        index: {"x": x, "y": y, "char": texts.get(text_id, "$"), "type": PICKUP_TYPES[type_index]}
+        for index, (x, y, text_id, type_index) in enumerate(snapshot.pickups)
+    }
@@ -1,3 +1,4 @@
+import asyncio
 import math
 import logging
 from functools import partial
@@ -8,14 +9,15 @@ from textual.binding import Binding
 from textual.message import Message
 from ..widgets.dialog import Dialog
 from ..logic.quest_logic import handle_quest_acceptance, complete_quest
-from ..logic.llm_quest_generator import generate_quest_from_llm
 from ..logic.faction_logic import get_conquest_quest
 from ..logic.boss import check_challenge_conditions, spawn_faction_boss
 from ..data.game_constants import CITY_SPACING
 from ..world.generation import get_city_faction, get_buildings_in_city, find_safe_spawn_point
 from ..workers.city_hall_dialog_generator import generate_dialog_worker
 from ..workers.quest_generator import generate_quests_worker
-from textual.worker import Worker, WorkerState
+from ..logic.content_cache import (
+    cached_dialog, city_hall_dialog_key, content_stamp, quests_need_refresh, store_dialog,
+)
 
 # Atmospheric loading messages shown while quests generate
 _MAYOR_MESSAGES = [
@@ -90,6 +92,9 @@ class CityHallScreen(ModalScreen):
             else:
                 logging.info(f"Found {len(cached_quests)} quests in cache.")
                 self.available_quests = cached_quests
+                if quests_need_refresh(gs, self.current_city_id, self.current_city_faction):
+                    # Offer these now; fresh ones replace them when the prefetcher has them.
+                    self.app.check_and_cache_quests_for_nearby_cities()
 
         self.can_challenge = check_challenge_conditions(gs, self.current_city_faction, gs.factions)
 
@@ -103,7 +108,8 @@ class CityHallScreen(ModalScreen):
         gs.quest_cache[self.current_city_id] = "pending"
 
         worker_callable = partial(
-            generate_quests_worker,
+            self._load_quests,
+            content_stamp(gs, self.current_city_faction),
             app=self.app,
             city_id=self.current_city_id,
             city_faction_id=self.current_city_faction,
@@ -112,14 +118,30 @@ class CityHallScreen(ModalScreen):
             story_intro=gs.story_intro,
         )
 
-        worker = self.run_worker(
+        self.run_worker(
             worker_callable,
             exclusive=False,
-            thread=True,
             name=f"QuestGenerator_{self.current_city_id}",
             group="quest_generation",
         )
-        worker.city_id = self.current_city_id
+
+    async def _load_quests(self, stamp, **quest_args):
+        """
+        Generates this city's quests and hands them to the app to cache and
+        show. Leaving the city hall cancels generation; the city is then
+        generated again on the next visit or by the prefetcher.
+        """
+        city_id = quest_args["city_id"]
+        try:
+            quests = await generate_quests_worker(**quest_args)
+        except asyncio.CancelledError:
+            if self.app.game_state.quest_cache.get(city_id) == "pending":
+                del self.app.game_state.quest_cache[city_id]
+            raise
+        except Exception as e:
+            logging.error(f"QuestGenerator worker failed: {e}", exc_info=True)
+            quests = None
+        self.app.store_generated_quests(city_id, quests, stamp)
 
     def _cycle_loading_message(self) -> None:
         """Cycle through atmospheric loading messages while quests generate."""
@@ -135,15 +157,26 @@ class CityHallScreen(ModalScreen):
         self.update_quest_display()
 
     def generate_dialog(self):
-        """Starts a worker to generate shopkeeper dialog."""
+        """
+        Shows the mayor's dialog from this save's cache, and starts a worker
+        to generate it if there is none or it is stale.
+        """
         gs = self.app.game_state
+        dialog_key = city_hall_dialog_key(self.current_city_id)
+        dialog, fresh = cached_dialog(gs, dialog_key, self.current_city_faction)
+        if dialog:
+            self.query_one(Dialog).update(dialog)
+            if fresh:
+                return
         faction_info = gs.factions.get(self.current_city_faction, {})
         faction_name = faction_info.get("name", "The Wasteland")
         faction_vibe = faction_info.get("description", "A desolate, lawless place.")
         player_rep = gs.faction_reputation.get(self.current_city_faction, 0)
 
         worker_callable = partial(
-            generate_dialog_worker,
+            self._load_dialog,
+            dialog_key,
+            content_stamp(gs, self.current_city_faction),
             app=self.app,
             theme=gs.theme,
             faction_name=faction_name,
@@ -151,27 +184,14 @@ class CityHallScreen(ModalScreen):
             player_reputation=player_rep
         )
         self.run_worker(worker_callable, exclusive=True, name="CityHallDialogGenerator",
-                        thread=True, group="dialog_generation")
-
-    def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
-        """Handle completed dialog worker."""
-        logging.info(f"Worker {event.worker.name} changed state to {event.worker.state}")
-        if event.worker.name == "CityHallDialogGenerator":
-            if event.worker.state == WorkerState.SUCCESS:
-                dialog = event.worker.result
-                self.query_one(Dialog).update(dialog)
-            elif event.worker.state == WorkerState.ERROR:
-                logging.error(f"CityHallDialogGenerator worker failed: {event.worker.error}")
-        elif event.worker.name.startswith("QuestGenerator"):
-            if event.worker.state == WorkerState.SUCCESS:
-                quests = event.worker.result
-                logging.info(f"QuestGenerator worker succeeded with result: {quests}")
-                self.app.game_state.quest_cache[self.current_city_id] = quests or []
-                self.post_message(QuestsLoaded(quests or []))
-            else:
-                logging.error(f"QuestGenerator worker failed with state: {event.worker.state}")
-                self.app.game_state.quest_cache.pop(self.current_city_id, None)
-                self.post_message(QuestsLoaded([]))
+                        group="dialog_generation")
+
+    async def _load_dialog(self, dialog_key, stamp, **dialog_args):
+        """Streams the mayor's dialog in as it is written, then caches it."""
+        dialog_widget = self.query_one(Dialog)
+        dialog = await generate_dialog_worker(on_text=dialog_widget.update, **dialog_args)
+        dialog_widget.update(dialog)
+        store_dialog(self.app.game_state, dialog_key, stamp, dialog)
 
     def on_unmount(self) -> None:
         """Called when the screen is unmounted."""
@@ -7,9 +7,6 @@ from textual.widgets import Button, Header, Footer, ProgressBar, Static
 from textual.binding import Binding
 from textual.worker import Worker, WorkerState
 
-from .new_game import NewGameScreen
-from .load_game import LoadGameScreen
-from .settings import SettingsScreen
 from ..workers.model_loader import load_pipeline
 
 class MainMenuScreen(Screen):
@@ -60,6 +57,12 @@ class MainMenuScreen(Screen):
             self.query_one(ProgressBar).display = False
             self.query_one("#new_game").disabled = False
             self.query_one("#load_game").disabled = False
+        elif self.app.generation_mode == "replay":
+            logging.info("Replay mode is active. Skipping local model load.")
+            self.query_one("#model_status", Static).update("Ready (Replaying Recorded Responses)")
+            self.query_one(ProgressBar).display = False
+            self.query_one("#new_game").disabled = False
+            self.query_one("#load_game").disabled = False
         else:
             # Local mode, check if model is already loaded or loading
             if self.app.llm_pipeline is None:
@@ -116,11 +119,15 @@ class MainMenuScreen(Screen):
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button press events."""
+        # Imported here so launching the game only loads the main menu.
         if event.button.id == "new_game":
+            from .new_game import NewGameScreen
             self.app.push_screen(NewGameScreen())
         elif event.button.id == "load_game":
+            from .load_game import LoadGameScreen
             self.app.push_screen(LoadGameScreen())
         elif event.button.id == "settings":
+            from .settings import SettingsScreen
             self.app.push_screen(SettingsScreen())
         elif event.button.id == "quit":
             self.app.exit()
@@ -246,8 +246,6 @@ class NewGameScreen(Screen):
         import time
         import os
         import shutil
-        import pprint
-        import json
         import logging
 
         from ..game_state import GameState
@@ -256,7 +254,9 @@ class NewGameScreen(Screen):
         from ..logic.llm_faction_generator import _get_fallback_factions
         from ..logic.llm_quest_generator import _get_fallback_quest
         from ..logic.save_load import load_triggers
-        from ..world.generation import get_buildings_in_city, find_safe_spawn_point
+        from ..logic.data_loader import save_session_data
+        from ..world.generation import get_buildings_in_city, find_safe_spawn_point, get_city_faction
+        from ..logic.content_cache import content_stamp, quest_key, stamp_content
 
         logging.info("Dev Quick Start: skipping LLM generation, using fallback data.")
 
@@ -297,11 +297,9 @@ class NewGameScreen(Screen):
         if os.path.exists("temp"):
             shutil.rmtree("temp")
         os.makedirs("temp")
-        with open("temp/factions.py", "w") as f:
-            f.write("FACTION_DATA = ")
-            pprint.pprint(factions, stream=f, indent=4)
-        with open("temp/world_details.json", "w") as f:
-            json.dump(world_details, f, indent=4)
+        if not save_session_data(factions, world_details):
+            self.notify("Could not save the fallback world data.", severity="error")
+            return
 
         self.app.reload_dynamic_data()
 
@@ -317,6 +315,7 @@ class NewGameScreen(Screen):
         game_state.world_details = world_details
         game_state.story_intro = story_intro
         game_state.quest_cache[f"city_0_0"] = quests
+        stamp_content(game_state, quest_key("city_0_0"), content_stamp(game_state, get_city_faction(0, 0, factions)))
 
         load_triggers(game_state)
 
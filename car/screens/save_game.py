@@ -2,7 +2,6 @@ from textual.screen import ModalScreen
 from textual.widgets import Header, Footer, Static, Button, Input, Footer
 from textual.containers import Vertical
 from textual.binding import Binding
-from ..logic.save_load import save_game
 
 class SaveGameScreen(ModalScreen):
     """A modal screen for naming and saving the game."""
@@ -34,16 +33,10 @@ class SaveGameScreen(ModalScreen):
         if not save_name:
             return
 
-        gs = self.app.game_state
-        save_game(gs, save_name)
+        # Writes on a worker; the app posts "Game Saved" when it's done.
+        self.app.save_game_in_background(save_name)
         self.app.current_save_name = save_name
 
-        # Find the WorldScreen to post the notification
-        from .world import WorldScreen
-        world_screen = next((s for s in self.app.screen_stack if isinstance(s, WorldScreen)), None)
-        if world_screen:
-            world_screen.query_one("#notifications").add_notification(f"Game Saved as '{save_name}'!")
-
         self.app.pop_screen()  # Pop the save screen
         self.app.pop_screen()  # Pop the pause screen
 
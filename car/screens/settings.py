@@ -77,12 +77,15 @@ class SettingsScreen(Screen):
 
     def _mode_label(self) -> str:
         mode = self.settings.get("generation_mode", "local")
-        return "Engine: Local (On-Device)" if mode == "local" else "Engine: Command Line"
+        labels = {"local": "Engine: Local (On-Device)", "replay": "Engine: Replay (Recorded)"}
+        return labels.get(mode, "Engine: Command Line")
 
     def _sub_option_label_text(self) -> str:
         mode = self.settings.get("generation_mode", "local")
         if mode == "local":
             return "Model Size"
+        if mode == "replay":
+            return "Replay Latency"
         return "CLI Provider"
 
     def _sub_option_button_label(self) -> str:
@@ -91,6 +94,9 @@ class SettingsScreen(Screen):
             size = self.settings.get("model_size", "small")
             names = {"small": "Small (Qwen3-4B)", "large": "Large (Qwen3-8B)"}
             return names.get(size, size)
+        elif mode == "replay":
+            latency = self.settings.get("replay_latency", "none")
+            return {"none": "Instant", "recorded": "As Recorded"}.get(latency, latency)
         else:
             preset = self.settings.get("cli_preset", "gemini")
             labels = {"gemini": "Google Gemini", "claude": "Anthropic Claude"}
@@ -115,7 +121,8 @@ class SettingsScreen(Screen):
         """Handle button presses."""
         if event.button.id == "toggle_mode":
             current_mode = self.settings.get("generation_mode", "local")
-            new_mode = "gemini_cli" if current_mode == "local" else "local"
+            mode_cycle = {"local": "gemini_cli", "gemini_cli": "replay", "replay": "local"}
+            new_mode = mode_cycle.get(current_mode, "local")
 
             if new_mode == "gemini_cli":
                 preset = self.settings.get("cli_preset", "gemini")
@@ -141,6 +148,12 @@ class SettingsScreen(Screen):
                 self.app.model_size = new_size
                 self.app.llm_pipeline = None
                 self.notify("Model size changed. Will reload on return to main menu.", severity="information", timeout=3.0)
+            elif mode == "replay":
+                current = self.settings.get("replay_latency", "none")
+                new_latency = "recorded" if current == "none" else "none"
+                self.settings["replay_latency"] = new_latency
+                save_settings(self.settings)
+                self.app.replay_latency = new_latency
             else:
                 # Toggle between gemini and claude
                 current = self.settings.get("cli_preset", "gemini")
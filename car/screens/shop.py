@@ -4,7 +4,6 @@ from textual.screen import Screen
 from textual.widgets import Header, Footer, Static, Button
 from textual.containers import Vertical, Horizontal
 from textual.binding import Binding
-from textual.worker import Worker, WorkerState
 
 from ..widgets.item_list import ItemListWidget
 from ..widgets.item_info import ItemInfoWidget
@@ -13,6 +12,7 @@ from ..logic.shop_logic import get_shop_inventory, purchase_item, calculate_sell
 from ..world.generation import get_city_faction, get_buildings_in_city, find_safe_spawn_point
 from ..data.game_constants import CITY_SPACING
 from ..workers.dialog_generator import generate_dialog_worker
+from ..logic.content_cache import cached_dialog, content_stamp, shop_dialog_key, store_dialog
 
 class ShopScreen(Screen):
     """The shop screen."""
@@ -51,17 +51,29 @@ class ShopScreen(Screen):
         self.generate_dialog()
 
     def generate_dialog(self):
-        """Starts a worker to generate shopkeeper dialog."""
+        """
+        Shows the shopkeeper's dialog from this save's cache, and starts a
+        worker to generate it if there is none or it is stale.
+        """
         gs = self.app.game_state
-        
+
         city_faction_id = get_city_faction(gs.car_world_x, gs.car_world_y, gs.factions)
+        city_id = f"city_{round(gs.car_world_x / CITY_SPACING)}_{round(gs.car_world_y / CITY_SPACING)}"
+        dialog_key = shop_dialog_key(city_id, self.shop_type)
+        dialog, fresh = cached_dialog(gs, dialog_key, city_faction_id)
+        if dialog:
+            self.show_dialog(dialog)
+            if fresh:
+                return
         faction_info = gs.factions.get(city_faction_id, {})
         faction_name = faction_info.get("name", "The Wasteland")
         faction_vibe = faction_info.get("description", "A desolate, lawless place.")
         player_rep = gs.faction_reputation.get(city_faction_id, 0)
 
         worker_callable = partial(
-            generate_dialog_worker,
+            self._load_dialog,
+            dialog_key,
+            content_stamp(gs, city_faction_id),
             app=self.app,
             theme=gs.theme,
             shop_type=self.shop_type,
@@ -69,17 +81,20 @@ class ShopScreen(Screen):
             faction_vibe=faction_vibe,
             player_reputation=player_rep
         )
-        self.run_worker(worker_callable, exclusive=True, name="DialogGenerator", thread=True)
+        self.run_worker(worker_callable, exclusive=True, name="DialogGenerator")
 
-    def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
-        """Handle completed dialog worker."""
-        if event.worker.name == "DialogGenerator" and event.worker.state == WorkerState.SUCCESS:
-            dialog = event.worker.result
-            if isinstance(dialog, dict):
-                self.query_one("#shop_dialog", Static).update(dialog.get("greeting", "..."))
-                self.no_cash_dialog = dialog.get("no_cash", "Not enough cash!")
-            else:
-                self.query_one("#shop_dialog", Static).update(str(dialog))
+    async def _load_dialog(self, dialog_key, stamp, **dialog_args):
+        """Generates, shows and caches the shopkeeper's dialog. Leaving the shop cancels it."""
+        dialog = await generate_dialog_worker(**dialog_args)
+        self.show_dialog(dialog)
+        store_dialog(self.app.game_state, dialog_key, stamp, dialog)
+
+    def show_dialog(self, dialog):
+        if isinstance(dialog, dict):
+            self.query_one("#shop_dialog", Static).update(dialog.get("greeting", "..."))
+            self.no_cash_dialog = dialog.get("no_cash", "Not enough cash!")
+        else:
+            self.query_one("#shop_dialog", Static).update(str(dialog))
 
     def on_unmount(self) -> None:
         """Called when the screen is unmounted."""
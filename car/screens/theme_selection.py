@@ -1,12 +1,10 @@
 import logging
 import random
-from functools import partial
 from textual.app import ComposeResult
 from textual.containers import Vertical, Center
 from textual.screen import Screen
 from textual.widgets import Button, Static, Header, Footer, ProgressBar
 from textual.binding import Binding
-from textual.worker import Worker, WorkerState
 
 from .world_building import WorldBuildingScreen
 from ..logic.llm_theme_generator import generate_themes_from_llm
@@ -73,9 +71,8 @@ class ThemeSelectionScreen(Screen):
         self.animation_phase = 0
 
         self.run_worker(
-            partial(generate_themes_from_llm, self.app),
+            self._load_themes,
             exclusive=True,
-            thread=True,
             name="ThemeGenerator"
         )
 
@@ -135,51 +132,50 @@ class ThemeSelectionScreen(Screen):
 
         widget.update("\n".join(lines))
 
-    def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
-        """Called when the theme generator worker state changes."""
-        if event.worker.name == "ThemeGenerator":
-            progress_bar = self.query_one("#theme_progress", ProgressBar)
-            buttons_container = self.query_one("#theme-buttons-container")
-            reincarnate_button = self.query_one("#reincarnate", Button)
-
-            if event.worker.state == WorkerState.SUCCESS:
-                progress_bar.display = False
-                self.query_one("#animation_display").display = False
-                reincarnate_button.disabled = False
-                result = event.worker.result
-                if result:
-                    themes, is_fallback = result
-                    if is_fallback:
-                        cli_hint = self._get_cli_test_hint()
-                        self.query_one("#subtitle").update(
-                            "[bold yellow]LLM unavailable — showing default themes.[/bold yellow]\n"
-                            f"Check Settings > Generation Mode and ensure your LLM is configured.{cli_hint}\n"
-                            "Press 'Reincarnate' to retry."
-                        )
-                    else:
-                        self.query_one("#subtitle").update("Choose your world's theme.")
-                    for i, theme in enumerate(themes):
-                        button = Button(f"{theme['name']}\n\n[italic]{theme['description']}[/italic]", id=f"theme_{i}", variant="primary")
-                        button.theme_data = theme
-                        buttons_container.mount(button)
-                    self._refresh_focusable_widgets()
-                else:
-                    cli_hint = self._get_cli_test_hint()
-                    self.query_one("#subtitle").update(
-                        "[bold red]Error: Could not generate themes.[/bold red]"
-                        f"{cli_hint}"
-                    )
-                    self._refresh_focusable_widgets()
-            elif event.worker.state == WorkerState.ERROR:
-                progress_bar.display = False
-                self.query_one("#animation_display").display = False
-                reincarnate_button.disabled = False
+    async def _load_themes(self) -> None:
+        """Generates the themes and offers them. Leaving the screen cancels generation."""
+        failed = False
+        try:
+            result = await generate_themes_from_llm(self.app)
+        except Exception as e:
+            logging.error(f"Theme worker failed: {e}", exc_info=True)
+            result, failed = None, True
+
+        progress_bar = self.query_one("#theme_progress", ProgressBar)
+        buttons_container = self.query_one("#theme-buttons-container")
+        reincarnate_button = self.query_one("#reincarnate", Button)
+        progress_bar.display = False
+        self.query_one("#animation_display").display = False
+        reincarnate_button.disabled = False
+
+        if failed:
+            cli_hint = self._get_cli_test_hint()
+            self.query_one("#subtitle").update(
+                "[bold red]Error: Theme worker failed.[/bold red]"
+                f"{cli_hint}"
+            )
+        elif result:
+            themes, is_fallback = result
+            if is_fallback:
                 cli_hint = self._get_cli_test_hint()
                 self.query_one("#subtitle").update(
-                    "[bold red]Error: Theme worker failed.[/bold red]"
-                    f"{cli_hint}"
+                    "[bold yellow]LLM unavailable — showing default themes.[/bold yellow]\n"
+                    f"Check Settings > Generation Mode and ensure your LLM is configured.{cli_hint}\n"
+                    "Press 'Reincarnate' to retry."
                 )
-                self._refresh_focusable_widgets()
+            else:
+                self.query_one("#subtitle").update("Choose your world's theme.")
+            for i, theme in enumerate(themes):
+                button = Button(f"{theme['name']}\n\n[italic]{theme['description']}[/italic]", id=f"theme_{i}", variant="primary")
+                button.theme_data = theme
+                buttons_container.mount(button)
+        else:
+            cli_hint = self._get_cli_test_hint()
+            self.query_one("#subtitle").update(
+                "[bold red]Error: Could not generate themes.[/bold red]"
+                f"{cli_hint}"
+            )
+        self._refresh_focusable_widgets()
 
     def _refresh_focusable_widgets(self) -> None:
         """Rebuild the focusable widget list after buttons change."""
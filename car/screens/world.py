@@ -1,26 +1,25 @@
-import math
 import logging
 import time
 
-from rich.style import Style
 from textual.screen import Screen
 from textual.widgets import Static, Footer
 from textual.containers import Horizontal, Vertical, Container
 
-from ..data.game_constants import CITY_SPACING, CITY_SIZE
 from ..widgets.entity_modal import EntityModal
 from ..widgets.hud_stats import StatsHUD
 from ..widgets.hud_location import HudLocation
 from ..widgets.hud_compass import CompassHUD
 from ..widgets.hud_quest import QuestHUD
 from ..widgets.hud_weapons import WeaponHUD
+from ..widgets.hud_presenter import HUDPresenter
 from ..widgets.game_view import GameView
 from ..widgets.notifications import Notifications
 from ..widgets.fps_counter import FPSCounter
-from ..world.generation import get_city_name, does_city_exist_at
 from ..logic.spawning import spawn_initial_entities
+from ..logic.vfx import spawn_explosion
 from ..logic.debug_commands import execute_command
 from ..widgets.debug_console import DebugConsole
+from ..common.key_input import KeyStateTable
 from .inventory import InventoryScreen
 from .pause_menu import PauseScreen
 from .map import MapScreen
@@ -33,11 +32,11 @@ from textual.binding import Binding
 
 # --- Input Constants ---
 # Keys that are tracked for continuous (hold-to-act) input.
-# These are handled via on_key + staleness expiry, NOT Textual bindings,
-# so that multiple gameplay keys can be held simultaneously.
-GAMEPLAY_KEYS = {"a", "d", "space", "left", "right"}  # continuous keys (binary hold)
+# These are tracked in a KeyStateTable (see common/key_input.py), NOT Textual
+# bindings, so that multiple gameplay keys can be held simultaneously.
+GAMEPLAY_KEYS = ("a", "d", "space", "left", "right")  # continuous keys (binary hold)
 PEDAL_KEYS = {"w", "s"}  # pedal keys (event-driven steps, not per-frame ramp)
-KEY_STALE_THRESHOLD = 0.15  # seconds — if no repeat event arrives within this window, the key is considered released
+KEY_STALE_THRESHOLD = 0.15  # seconds — without key-up events, a key with no repeat within this window is released
 PEDAL_STEP = 0.10           # pedal change per key event (terminal repeat provides hold behavior)
 
 # One-shot keys for menu/UI actions.
@@ -58,7 +57,8 @@ ONE_SHOT_ACTIONS = {
 class WorldScreen(Screen):
     """The default screen for the game."""
 
-    _pressed_keys: dict = {}  # key_name -> last_event_timestamp (reset in on_mount)
+    keys = None  # KeyStateTable for GAMEPLAY_KEYS, created in on_mount
+    hud = None  # HUDPresenter, created in on_mount
 
     # Only one-shot menu/UI keys use Textual bindings for footer display.
     # Gameplay keys (WASD, space, arrows) are handled by on_key + process_input.
@@ -86,9 +86,10 @@ class WorldScreen(Screen):
 
     def on_mount(self) -> None:
         """Called when the screen is mounted."""
-        self._pressed_keys = {}  # key_name -> last_event_timestamp (gameplay)
+        self.keys = KeyStateTable(GAMEPLAY_KEYS, repeat_timeout=KEY_STALE_THRESHOLD)
         self._oneshot_active = {}  # key_name -> last_event_timestamp (menu keys, for debounce)
         self._last_location_name = None  # Track city transitions for entrance banner
+        self.hud = HUDPresenter(self)
         self.focus()
         gs = self.app.game_state
 
@@ -105,16 +106,18 @@ class WorldScreen(Screen):
 
     def on_screen_resume(self) -> None:
         """Called when the screen is resumed."""
-        self._pressed_keys = {}  # Clear stale keys from before the menu
+        self.keys.clear()  # Clear stale keys from before the menu
         # Seed one-shot debounce with current time so lingering key repeats
         # (e.g. Escape still held from closing the pause menu) are ignored.
-        now = time.time()
+        now = time.perf_counter()
         self._oneshot_active = {k: now for k in ONE_SHOT_ACTIONS}
         for d in "123456789":
             self._oneshot_active[d] = now
         self.app.game_state.pause_menu_open = False
         self.app.game_state.menu_open = False
         self.focus()
+        if self.hud:
+            self.hud.invalidate()
         self.app.start_game_loop()
 
         # Update FPS counter visibility in case Dev Mode changed
@@ -122,15 +125,21 @@ class WorldScreen(Screen):
         if fps_counter:
             fps_counter.display = self.app.dev_mode
 
+    def on_screen_suspend(self) -> None:
+        """Called when another screen is pushed on top of this one."""
+        # Screens over the world edit the game state, so take it back from
+        # the simulation process (if one is running it).
+        self.app.suspend_simulation()
+
     def on_key(self, event: Key) -> None:
         """Handle all gameplay input directly for reliability.
 
-        Continuous keys (arrows, space) are tracked by timestamp for
+        Continuous keys (arrows, space) go into the key-state table for
         hold-to-act behavior. Pedal keys (W/S) apply a fixed step per
         event — terminal key repeat provides natural hold-to-ramp.
         One-shot keys (menus, toggles) are debounced.
         """
-        now = time.time()
+        now = time.perf_counter()
 
         if event.key in PEDAL_KEYS:
             gs = self.app.game_state
@@ -138,8 +147,9 @@ class WorldScreen(Screen):
                 gs.pedal_position = min(1.0, gs.pedal_position + PEDAL_STEP)
             elif event.key == "s":
                 gs.pedal_position = max(-1.0, gs.pedal_position - PEDAL_STEP)
-        elif event.key in GAMEPLAY_KEYS:
-            self._pressed_keys[event.key] = now
+            self.keys.mark(now)
+        elif self.keys.press(event.key, now):
+            pass
         elif event.key in ONE_SHOT_ACTIONS:
             # Debounce: only fire if this key wasn't already held
             last = self._oneshot_active.get(event.key, 0)
@@ -155,35 +165,37 @@ class WorldScreen(Screen):
             self._oneshot_active[event.key] = now
             event.prevent_default()
 
-    def process_input(self, dt: float) -> None:
+    def key_released(self, key: str) -> None:
+        """A key-up reported by the terminal (see common/key_input.py)."""
+        self.keys.release(key, time.perf_counter())
+
+    def process_input(self, dt: float):
         """Called each game tick to translate held keys into game actions.
 
         This replaces the old per-key Textual binding actions for gameplay keys.
-        All gameplay keys can now be held simultaneously.
+        All gameplay keys can now be held simultaneously. Returns the time
+        of the earliest control event this tick picked up (or None), for
+        the dev-mode input latency readout.
         """
         gs = self.app.game_state
-        now = time.time()
-
-        # Expire stale keys (no repeat event within threshold = key released)
-        self._pressed_keys = {
-            k: t for k, t in self._pressed_keys.items()
-            if now - t < KEY_STALE_THRESHOLD
-        }
+        keys = self.keys
+        event_time = keys.sample(time.perf_counter())
 
         # --- Turning (continuous, dt-scaled via vehicle_movement.py) ---
-        gs.actions["turn_left"] = "a" in self._pressed_keys
-        gs.actions["turn_right"] = "d" in self._pressed_keys
+        gs.actions["turn_left"] = keys.held("a")
+        gs.actions["turn_right"] = keys.held("d")
 
         # --- Pedal is set directly by on_key events (no per-frame ramp) ---
 
         # --- Firing (continuous while held, gated by weapon cooldowns) ---
-        gs.actions["fire"] = "space" in self._pressed_keys
+        gs.actions["fire"] = keys.held("space")
 
         # --- Weapon Aiming (continuous swivel, stat-based) ---
-        if "left" in self._pressed_keys:
+        if keys.held("left"):
             gs.weapon_angle_offset -= gs.weapon_aim_speed * dt
-        if "right" in self._pressed_keys:
+        if keys.held("right"):
             gs.weapon_angle_offset += gs.weapon_aim_speed * dt
+        return event_time
 
     # --- One-shot menu actions (still use Textual bindings) ---
 
@@ -276,6 +288,8 @@ class WorldScreen(Screen):
 
     def on_debug_console_command_submitted(self, event: DebugConsole.CommandSubmitted) -> None:
         """Handle a submitted debug command."""
+        # Commands edit the real state; the next tick hands it back.
+        self.app.suspend_simulation()
         result = execute_command(self.app.game_state, self.app.world, event.command)
         notifications = self.query_one("#notifications", Notifications)
         for line in result.split("\n"):
@@ -304,126 +318,23 @@ class WorldScreen(Screen):
 
     def update_widgets(self):
         """Update the screen widgets."""
-        game_view = self.query_one("#game_view", GameView)
-        game_view.refresh()
+        self.hud.game_view.tick()
 
         gs = self.app.game_state
-
-        stats_hud = self.query_one("#stats_hud", StatsHUD)
-        stats_hud.cash = gs.player_cash
-        stats_hud.durability = int(gs.current_durability)
-        stats_hud.max_durability = int(gs.max_durability)
-        stats_hud.gas = gs.current_gas
-        stats_hud.gas_capacity = int(gs.gas_capacity)
-        stats_hud.speed = gs.car_speed
-        stats_hud.level = gs.player_level
-        stats_hud.xp = gs.current_xp
-        stats_hud.xp_to_next_level = gs.xp_to_next_level
-        stats_hud.pedal_position = gs.pedal_position
-
-        # Update Weapon HUD
-        weapon_hud = self.query_one("#weapon_hud", WeaponHUD)
-        weapons_info = []
-        for slot_idx, (point_name, weapon) in enumerate(gs.mounted_weapons.items(), start=1):
-            point_data = gs.attachment_points.get(point_name, {})
-            mount_label = point_data.get("name", point_name)
-            enabled = gs.weapon_enabled.get(point_name, True)
-            if weapon:
-                weapons_info.append({
-                    "mount_name": mount_label,
-                    "weapon_name": weapon.name,
-                    "ammo_type": weapon.ammo_type,
-                    "ammo": gs.ammo_counts.get(weapon.ammo_type, 0),
-                    "empty": False,
-                    "enabled": enabled,
-                    "slot": slot_idx,
-                })
-            else:
-                weapons_info.append({
-                    "mount_name": mount_label,
-                    "weapon_name": "",
-                    "ammo_type": "",
-                    "ammo": 0,
-                    "empty": True,
-                    "enabled": enabled,
-                    "slot": slot_idx,
-                })
-        weapon_hud.weapons_data = weapons_info
-
-        quest_hud = self.query_one("#quest_hud", QuestHUD)
-        quest_hud.quest_names = [q.name for q in gs.active_quests]
-        quest_hud.selected_index = gs.selected_quest_index
-
-        # Update Location HUD with proper city detection
-        location = self.query_one("#location_hud", HudLocation)
-        grid_x = round(gs.car_world_x / CITY_SPACING)
-        grid_y = round(gs.car_world_y / CITY_SPACING)
-        city_center_x = grid_x * CITY_SPACING
-        city_center_y = grid_y * CITY_SPACING
-        half_city = CITY_SIZE / 2
-
-        # Check if player is actually inside a city
-        in_city = (does_city_exist_at(grid_x, grid_y, self.app.world.seed, gs.factions)
-                   and abs(gs.car_world_x - city_center_x) < half_city
-                   and abs(gs.car_world_y - city_center_y) < half_city)
-
-        if in_city:
-            location_name = get_city_name(grid_x, grid_y, gs.factions, gs.world_details)
-        else:
-            from ..world.generation import get_city_faction
-            faction_id = get_city_faction(gs.car_world_x, gs.car_world_y, gs.factions)
-            location_name = gs.factions.get(faction_id, {}).get("name", "The Wasteland")
-
-        location.update_location(location_name, int(gs.car_world_x), int(gs.car_world_y))
+        location_name, in_city = self.hud.update(gs, self.app.world.seed)
 
         # City entrance banner
         if location_name != self._last_location_name:
             if in_city and self._last_location_name is not None:
-                notifications = self.query_one("#notifications", Notifications)
-                notifications.add_notification(
+                self.hud.notifications.add_notification(
                     f"── Entering {location_name} ──", duration=4
                 )
             self._last_location_name = location_name
 
-        compass = self.query_one("#compass_hud", CompassHUD)
-        compass.absolute_bearing = gs.compass_info["absolute_bearing"]
-        compass.target_name = gs.compass_info["target_name"]
-
-        # Update Entity Modal (always visible)
-        entity_modal = self.query_one("#entity_modal", EntityModal)
-        closest_entity = gs.closest_entity_info
-        if closest_entity:
-            entity_modal.entity_name = closest_entity["name"]
-            entity_modal.hp = closest_entity["hp"]
-            entity_modal.max_hp = closest_entity["max_hp"]
-            entity_modal.art = closest_entity["art"]
-            entity_modal.description = closest_entity.get("description", "")
-            # Compute bearing from player to target entity
-            dx = closest_entity["x"] - gs.car_world_x
-            dy = closest_entity["y"] - gs.car_world_y
-            angle = math.atan2(dy, dx)
-            entity_modal.bearing = (math.degrees(angle) + 90) % 360
-        else:
-            entity_modal.entity_name = "No Target"
-            entity_modal.hp = 0
-            entity_modal.max_hp = 0
-            entity_modal.art = []
-            entity_modal.bearing = -1.0
-            entity_modal.description = ""
-
+        entity_modal = self.hud.entity_modal
         # Handle explosions — add to game_state for canvas-based rendering
         for destroyed in gs.destroyed_this_frame:
-            art = destroyed.get_static_art()
-            gs.active_explosions.append({
-                "x": destroyed.x,
-                "y": destroyed.y,
-                "art": [list(row) for row in art],
-                "original_art": [list(row) for row in art],
-                "styles": [[Style() for _ in row] for row in art],
-                "step": 0,
-                "total_steps": 10,
-                "last_update": time.time(),
-            })
+            spawn_explosion(gs, destroyed)
             # Show destruction feedback in entity modal
             entity_modal.destroyed_name = getattr(destroyed, "name", destroyed.__class__.__name__.replace("_", " ").title())
             entity_modal.destroyed_timer = time.time()
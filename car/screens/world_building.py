@@ -1,13 +1,11 @@
 import logging
 import time
 import random
-from functools import partial
 from textual.app import ComposeResult
 from textual.containers import Vertical
 from textual.screen import Screen
 from textual.widgets import Button, Static, Header, Footer, ProgressBar
 from textual.binding import Binding
-from textual.worker import Worker, WorkerState
 
 from ..game_state import GameState
 from ..world import World
@@ -70,9 +68,8 @@ class WorldBuildingScreen(Screen):
 
         # Start the world generation worker
         self.run_worker(
-            partial(generate_initial_world_worker, self.app, self.new_game_settings),
+            self._build_world,
             exclusive=True,
-            thread=True,
             name="WorldGenerator"
         )
 
@@ -107,65 +104,65 @@ class WorldBuildingScreen(Screen):
             self._animation_timer.stop()
             self._animation_timer = None
 
-    def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
-        """Called when the worker state changes."""
-        if event.worker.name == "WorldGenerator":
-            if event.worker.state in (WorkerState.SUCCESS, WorkerState.ERROR):
-                self._stop_timers()
-            if event.worker.state == WorkerState.SUCCESS:
-                self.world_data = event.worker.result
-                if self.world_data:
-                    if self.world_data.get("error"):
-                        error_detail = self.world_data["error"]
-                        logging.error(f"World generation returned error: {error_detail}")
-                        cli_hint = self._get_cli_test_hint()
-                        self.query_one("#status_message").update(
-                            f"[bold red]Error: {error_detail}[/bold red]\n"
-                            f"Check Settings > Generation Mode and ensure your LLM is configured.{cli_hint}"
-                        )
-                        self.query_one(ProgressBar).display = False
-                        self.query_one("#world-building-container").mount(Button("Retry", id="retry", variant="error"))
-                        self._refresh_focusable_widgets()
-                    elif self.world_data.get("used_fallback"):
-                        logging.warning("World generation used fallback data — LLM was unavailable.")
-                        cli_hint = self._get_cli_test_hint()
-                        self.query_one("#status_message").update(
-                            "[bold yellow]Warning: LLM unavailable — using default world data.[/bold yellow]\n"
-                            f"Check Settings > Generation Mode and ensure your LLM is configured.{cli_hint}\n"
-                            "Press Retry to try again, or Continue to play with defaults."
-                        )
-                        self.query_one(ProgressBar).display = False
-                        self.query_one("#world-building-container").mount(
-                            Button("Continue Anyway", id="continue_fallback", variant="warning")
-                        )
-                        self.query_one("#world-building-container").mount(
-                            Button("Retry", id="retry", variant="error")
-                        )
-                        self._refresh_focusable_widgets()
-                    else:
-                        logging.info("World generation successful. Starting game.")
-                        self.start_game()
-                else:
-                    logging.error("World generation failed: No data returned.")
-                    cli_hint = self._get_cli_test_hint()
-                    self.query_one("#status_message").update(
-                        "[bold red]Error: LLM returned no data.[/bold red]\n"
-                        f"Check Settings > Generation Mode and ensure your LLM is configured.{cli_hint}"
-                    )
-                    self.query_one(ProgressBar).display = False
-                    self.query_one("#world-building-container").mount(Button("Retry", id="retry", variant="error"))
-                    self._refresh_focusable_widgets()
-            elif event.worker.state == WorkerState.ERROR:
-                error_message = str(event.worker.error)
-                logging.error(f"World generator worker failed: {error_message}")
+    async def _build_world(self) -> None:
+        """Generates the world, then starts the game or explains what went wrong. Leaving the screen cancels it."""
+        try:
+            self.world_data = await generate_initial_world_worker(self.app, self.new_game_settings)
+        except Exception as e:
+            self._stop_timers()
+            error_message = str(e)
+            logging.error(f"World generator worker failed: {error_message}")
+            cli_hint = self._get_cli_test_hint()
+            self.query_one("#status_message").update(
+                f"[bold red]Error: {error_message}[/bold red]\n"
+                f"Check Settings > Generation Mode and ensure your LLM is configured.{cli_hint}"
+            )
+            self.query_one(ProgressBar).display = False
+            self.query_one("#world-building-container").mount(Button("Retry", id="retry", variant="error"))
+            self._refresh_focusable_widgets()
+            return
+        self._stop_timers()
+        if self.world_data:
+            if self.world_data.get("error"):
+                error_detail = self.world_data["error"]
+                logging.error(f"World generation returned error: {error_detail}")
                 cli_hint = self._get_cli_test_hint()
                 self.query_one("#status_message").update(
-                    f"[bold red]Error: {error_message}[/bold red]\n"
+                    f"[bold red]Error: {error_detail}[/bold red]\n"
                     f"Check Settings > Generation Mode and ensure your LLM is configured.{cli_hint}"
                 )
                 self.query_one(ProgressBar).display = False
                 self.query_one("#world-building-container").mount(Button("Retry", id="retry", variant="error"))
                 self._refresh_focusable_widgets()
+            elif self.world_data.get("used_fallback"):
+                logging.warning("World generation used fallback data — LLM was unavailable.")
+                cli_hint = self._get_cli_test_hint()
+                self.query_one("#status_message").update(
+                    "[bold yellow]Warning: LLM unavailable — using default world data.[/bold yellow]\n"
+                    f"Check Settings > Generation Mode and ensure your LLM is configured.{cli_hint}\n"
+                    "Press Retry to try again, or Continue to play with defaults."
+                )
+                self.query_one(ProgressBar).display = False
+                self.query_one("#world-building-container").mount(
+                    Button("Continue Anyway", id="continue_fallback", variant="warning")
+                )
+                self.query_one("#world-building-container").mount(
+                    Button("Retry", id="retry", variant="error")
+                )
+                self._refresh_focusable_widgets()
+            else:
+                logging.info("World generation successful. Starting game.")
+                self.start_game()
+        else:
+            logging.error("World generation failed: No data returned.")
+            cli_hint = self._get_cli_test_hint()
+            self.query_one("#status_message").update(
+                "[bold red]Error: LLM returned no data.[/bold red]\n"
+                f"Check Settings > Generation Mode and ensure your LLM is configured.{cli_hint}"
+            )
+            self.query_one(ProgressBar).display = False
+            self.query_one("#world-building-container").mount(Button("Retry", id="retry", variant="error"))
+            self._refresh_focusable_widgets()
 
     def _refresh_focusable_widgets(self) -> None:
         """Rebuild the focusable widget list after buttons change."""
@@ -219,10 +216,9 @@ class WorldBuildingScreen(Screen):
         """Finalizes game state and switches to the intro cutscene."""
         from .intro_cutscene import IntroCutsceneScreen
         from ..logic.save_load import load_triggers
+        from ..logic.data_loader import save_session_data
         import os
         import shutil
-        import pprint
-        import json
 
         # Save the new faction data (convert world coords to grid coords)
         if os.path.exists("temp"):
@@ -238,13 +234,18 @@ class WorldBuildingScreen(Screen):
                     fdata["hub_city_coordinates"] = (round(x / CITY_SPACING), round(y / CITY_SPACING))
                 else:
                     fdata["hub_city_coordinates"] = (x, y)
-        with open("temp/factions.py", "w") as f:
-            f.write("FACTION_DATA = ")
-            pprint.pprint(factions_to_save, stream=f, indent=4)
-            
-        # Save the new world details
-        with open("temp/world_details.json", "w") as f:
-            json.dump(self.world_data["world_details"], f, indent=4)
+        # Save the new factions and world details to the session store
+        if not save_session_data(factions_to_save, self.world_data["world_details"]):
+            for btn in self.query("#retry, #continue_fallback"):
+                btn.remove()
+            self.query_one("#status_message").update(
+                "[bold red]Error: The generated world data is invalid and could not be saved.[/bold red]\n"
+                "Press Retry to generate it again."
+            )
+            self.query_one(ProgressBar).display = False
+            self.query_one("#world-building-container").mount(Button("Retry", id="retry", variant="error"))
+            self._refresh_focusable_widgets()
+            return
 
         # CRITICAL: Reload the data modules to load the new factions
         self.app.reload_dynamic_data()
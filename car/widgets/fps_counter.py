@@ -4,9 +4,11 @@ import time
 
 class FPSCounter(Static):
     can_focus = False
-    """A widget to display the current FPS."""
-    
+    """A widget to display the current FPS, the game view's terminal output and input latency."""
+
     fps = reactive(0.0)
+    output = reactive("")
+    input = reactive("")
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -14,5 +16,19 @@ class FPSCounter(Static):
 
     def watch_fps(self, new_fps: float) -> None:
         """Called when the fps reactive attribute changes."""
-        self.update(f"FPS: {new_fps:.2f}")
+        self._show()
+
+    def watch_output(self, new_output: str) -> None:
+        self._show()
+
+    def watch_input(self, new_input: str) -> None:
+        self._show()
+
+    def _show(self) -> None:
+        label = f"FPS: {self.fps:.2f}"
+        if self.output:
+            label += f" | {self.output}"
+        if self.input:
+            label += f" | {self.input}"
+        self.update(label)
 
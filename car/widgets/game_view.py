@@ -1,27 +1,15 @@
 import time
 import math
-import random
 from textual.widget import Widget
 from ..common.utils import angle_to_direction
+from ..common.terminal_output import OutputGovernor, canvas_runs, frame_bytes
+from ..logic.vfx import draw_effects
 from ..data.colors import ATTACHMENT_COLOR_MAP
 from ..data.game_constants import CITY_SPACING
 from ..world.generation import get_buildings_in_city
 from rich.text import Text
 from rich.style import Style
 
-# Explosion characters for canvas-based rendering (terminal-safe, no emojis)
-_EXPLOSION_FIRE = [
-    ("*", Style(color="red", bold=True)),
-    ("#", Style(color="rgb(255,100,0)", bold=True)),
-    ("~", Style(color="rgb(255,165,0)")),
-    ("+", Style(color="yellow", bold=True)),
-    (".", Style(color="rgb(200,80,0)")),
-]
-_EXPLOSION_SMOKE = [
-    (".", Style(color="rgb(100,100,100)")),
-    (":", Style(color="rgb(80,80,80)")),
-]
-
 class GameView(Widget):
     """A widget to display the game world."""
     
@@ -29,13 +17,72 @@ class GameView(Widget):
         super().__init__(*args, **kwargs)
         self.game_state = game_state
         self.world = world
+        self._governor = None
+        self._color_system = None
+        self._rows = None       # Runs of the frame on screen: rows of (text, style)
+        self._rows_size = None
+        self._text = None
+
+    @property
+    def output_governor(self):
+        if self._governor is None:
+            from rich.color import ColorSystem
+            from rich.console import COLOR_SYSTEMS
+            self._governor = OutputGovernor(getattr(self.app, "render_output", "truecolor"),
+                                            getattr(self.app, "output_budget_kb", 128))
+            self._color_system = COLOR_SYSTEMS.get(self.app.console.color_system, ColorSystem.TRUECOLOR)
+        return self._governor
+
+    def output_summary(self):
+        return self.output_governor.summary()
+
+    def tick(self):
+        """
+        Called every game frame: draws the world and refreshes the widget,
+        unless the frame matches the one on screen or the output governor
+        is holding frames back.
+        """
+        if not self.game_state:
+            return
+        governor = self.output_governor
+        now = time.monotonic()
+        if not governor.ready(now):
+            return
+        rows = self.build_frame(governor.palette)
+        if rows == self._rows and self._rows_size == self.size:
+            governor.frame_skipped(now)
+            return
+        self._set_frame(rows)
+        governor.frame_drawn(frame_bytes(rows, self._color_system), now)
+        self.refresh()
+
+    def _set_frame(self, rows):
+        self._rows = rows
+        self._rows_size = self.size
+        self._text = None
 
     def render(self) -> Text:
         """Render the game world."""
-        gs = self.game_state
-        if not gs:
+        if not self.game_state:
             return Text("")
-            
+        if self._rows is None or self._rows_size != self.size:
+            self._set_frame(self.build_frame(self.output_governor.palette))
+        if self._text is None:
+            text = Text()
+            for row in self._rows:
+                for run, style in row:
+                    text.append(run, style)
+                text.append("\n")
+            self._text = text
+        return self._text
+
+    def build_frame(self, palette=None):
+        """Draws the world into rows of (text, style) runs, colours snapped to `palette`."""
+        return canvas_runs(*self.draw_canvas(), palette)
+
+    def draw_canvas(self):
+        """Draws the world into a grid of characters and a grid of styles."""
+        gs = self.game_state
         w, h = self.size
         world_start_x = gs.car_world_x - w / 2
         world_start_y = gs.car_world_y - h / 2
@@ -121,47 +168,7 @@ class GameView(Widget):
                 )
 
         # Render explosions directly on canvas (avoids widget bounding-box artifacts)
-        now = time.time()
-        expired_explosions = []
-        for idx, exp in enumerate(gs.active_explosions):
-            # Advance animation frame
-            if now - exp["last_update"] >= 0.05:
-                exp["step"] += 1
-                exp["last_update"] = now
-                if exp["step"] <= exp["total_steps"]:
-                    progress = exp["step"] / exp["total_steps"]
-                    for r, row in enumerate(exp["original_art"]):
-                        for c, char in enumerate(row):
-                            if char != ' ' and random.random() < progress:
-                                if progress < 0.6:
-                                    ch, st = random.choice(_EXPLOSION_FIRE)
-                                elif progress < 0.85:
-                                    ch, st = random.choice(_EXPLOSION_FIRE + _EXPLOSION_SMOKE)
-                                else:
-                                    ch, st = random.choice(_EXPLOSION_SMOKE + [(" ", Style())])
-                                exp["art"][r][c] = ch
-                                exp["styles"][r][c] = st
-
-            if exp["step"] > exp["total_steps"]:
-                expired_explosions.append(idx)
-                continue
-
-            # Draw explosion chars onto canvas
-            art = exp["art"]
-            art_h = len(art)
-            art_w = max(len(row) for row in art) if art else 0
-            ex = int(exp["x"] - world_start_x - art_w / 2)
-            ey = int(exp["y"] - world_start_y - art_h / 2)
-            for r, row in enumerate(art):
-                for c, char in enumerate(row):
-                    if char != ' ':
-                        dy, dx = ey + r, ex + c
-                        if 0 <= dy < h and 0 <= dx < w:
-                            canvas[dy][dx] = char
-                            styles[dy][dx] = exp["styles"][r][c]
-
-        for idx in reversed(expired_explosions):
-            gs.active_explosions.pop(idx)
+        draw_effects(gs.active_explosions, canvas, styles, world_start_x, world_start_y, w, h, time.time())
 
         # Render player direction arrow
         if time.time() % 0.4 < 0.2:
@@ -194,29 +201,7 @@ class GameView(Widget):
                     existing_style = styles[arrow_y][arrow_x]
                     styles[arrow_y][arrow_x] = Style(color="red", bold=True, bgcolor=existing_style.bgcolor)
 
-        # Convert canvas to Rich Text using optimized run-length encoding
-        text = Text()
-        for y, row in enumerate(canvas):
-            if not row:
-                text.append("\n")
-                continue
-            
-            current_run = ""
-            current_style = styles[y][0]
-            
-            for x, char in enumerate(row):
-                style = styles[y][x]
-                if style == current_style:
-                    current_run += char
-                else:
-                    text.append(current_run, current_style)
-                    current_run = char
-                    current_style = style
-            
-            text.append(current_run, current_style)
-            text.append("\n")
-            
-        return text
+        return canvas, styles
 
     def draw_entity(self, canvas, styles, entity, world_start_x, world_start_y, w, h):
         """Draws a single entity on the canvas."""
@@ -0,0 +1,169 @@
+import math
+
+from ..data.game_constants import CITY_SPACING, CITY_SIZE
+from ..world.generation import get_city_name, get_city_faction, does_city_exist_at
+from .entity_modal import EntityModal
+from .hud_stats import StatsHUD
+from .hud_location import HudLocation
+from .hud_compass import CompassHUD
+from .hud_quest import QuestHUD
+from .hud_weapons import WeaponHUD
+from .game_view import GameView
+from .notifications import Notifications
+from .fps_counter import FPSCounter
+
+# Bearings are only ever drawn as one of 8 arrows, so anything finer is churn.
+BEARING_STEP = 45.0
+
+
+def _quantize_bearing(bearing):
+    return (round(bearing / BEARING_STEP) * BEARING_STEP) % 360
+
+
+class HUDPresenter:
+    """
+    Turns game state into per-HUD state tuples and only pushes values into a
+    widget when its tuple changes. Widget handles are resolved once at mount
+    instead of with a query_one per widget per frame.
+    """
+
+    def __init__(self, screen):
+        self.game_view = screen.query_one("#game_view", GameView)
+        self.stats_hud = screen.query_one("#stats_hud", StatsHUD)
+        self.weapon_hud = screen.query_one("#weapon_hud", WeaponHUD)
+        self.quest_hud = screen.query_one("#quest_hud", QuestHUD)
+        self.location_hud = screen.query_one("#location_hud", HudLocation)
+        self.compass_hud = screen.query_one("#compass_hud", CompassHUD)
+        self.entity_modal = screen.query_one("#entity_modal", EntityModal)
+        self.notifications = screen.query_one("#notifications", Notifications)
+        self.fps_counter = screen.query_one("#fps_counter", FPSCounter)
+        self._last_state = {}
+        self._grid_cell = None
+        self._grid_info = None  # (city_exists, city_name, territory_name) for _grid_cell
+
+    def invalidate(self):
+        """Forces every HUD to be pushed on the next update, e.g. after faction changes."""
+        self._last_state.clear()
+        self._grid_cell = None
+
+    def _changed(self, key, state):
+        if self._last_state.get(key) == state:
+            return False
+        self._last_state[key] = state
+        return True
+
+    def update(self, gs, seed):
+        """Pushes changed HUD state. Returns the current location name."""
+        self._update_stats(gs)
+        self._update_weapons(gs)
+        self._update_quests(gs)
+        location_name, in_city = self._update_location(gs, seed)
+        self._update_compass(gs)
+        self._update_entity_modal(gs)
+        return location_name, in_city
+
+    def _update_stats(self, gs):
+        state = (
+            gs.player_cash,
+            int(gs.current_durability), int(gs.max_durability),
+            int(gs.current_gas), int(gs.gas_capacity),
+            int((gs.car_speed / 10.5) * 100),  # the mph readout
+            gs.player_level, gs.current_xp, gs.xp_to_next_level,
+            int(gs.pedal_position * 5),  # the pedal arrows
+        )
+        if not self._changed("stats", state):
+            return
+        stats_hud = self.stats_hud
+        stats_hud.cash = gs.player_cash
+        stats_hud.durability = state[1]
+        stats_hud.max_durability = state[2]
+        stats_hud.gas = gs.current_gas
+        stats_hud.gas_capacity = state[4]
+        stats_hud.speed = gs.car_speed
+        stats_hud.level = gs.player_level
+        stats_hud.xp = gs.current_xp
+        stats_hud.xp_to_next_level = gs.xp_to_next_level
+        stats_hud.pedal_position = gs.pedal_position
+
+    def _update_weapons(self, gs):
+        rows = []
+        for slot_idx, (point_name, weapon) in enumerate(gs.mounted_weapons.items(), start=1):
+            mount_label = gs.attachment_points.get(point_name, {}).get("name", point_name)
+            enabled = gs.weapon_enabled.get(point_name, True)
+            if weapon:
+                rows.append((slot_idx, mount_label, weapon.name, weapon.ammo_type,
+                             gs.ammo_counts.get(weapon.ammo_type, 0), False, enabled))
+            else:
+                rows.append((slot_idx, mount_label, "", "", 0, True, enabled))
+        rows = tuple(rows)
+        if not self._changed("weapons", rows):
+            return
+        self.weapon_hud.weapons_data = [
+            {
+                "slot": slot, "mount_name": mount_name, "weapon_name": weapon_name,
+                "ammo_type": ammo_type, "ammo": ammo, "empty": empty, "enabled": enabled,
+            }
+            for slot, mount_name, weapon_name, ammo_type, ammo, empty, enabled in rows
+        ]
+
+    def _update_quests(self, gs):
+        state = (tuple(q.name for q in gs.active_quests), gs.selected_quest_index)
+        if not self._changed("quests", state):
+            return
+        self.quest_hud.quest_names = list(state[0])
+        self.quest_hud.selected_index = state[1]
+
+    def _grid_info_for(self, grid_x, grid_y, gs, seed):
+        """City/territory lookups only change when the car crosses into a new grid cell."""
+        if self._grid_cell != (grid_x, grid_y):
+            city_exists = does_city_exist_at(grid_x, grid_y, seed, gs.factions)
+            city_name = get_city_name(grid_x, grid_y, gs.factions, gs.world_details) if city_exists else None
+            faction_id = get_city_faction(grid_x * CITY_SPACING, grid_y * CITY_SPACING, gs.factions)
+            territory_name = gs.factions.get(faction_id, {}).get("name", "The Wasteland")
+            self._grid_cell = (grid_x, grid_y)
+            self._grid_info = (city_exists, city_name, territory_name)
+        return self._grid_info
+
+    def _update_location(self, gs, seed):
+        grid_x = round(gs.car_world_x / CITY_SPACING)
+        grid_y = round(gs.car_world_y / CITY_SPACING)
+        city_exists, city_name, territory_name = self._grid_info_for(grid_x, grid_y, gs, seed)
+
+        # Check if player is actually inside a city
+        half_city = CITY_SIZE / 2
+        in_city = (city_exists
+                   and abs(gs.car_world_x - grid_x * CITY_SPACING) < half_city
+                   and abs(gs.car_world_y - grid_y * CITY_SPACING) < half_city)
+        location_name = city_name if in_city else territory_name
+
+        state = (location_name, int(gs.car_world_x), int(gs.car_world_y))
+        if self._changed("location", state):
+            self.location_hud.update_location(*state)
+        return location_name, in_city
+
+    def _update_compass(self, gs):
+        state = (_quantize_bearing(gs.compass_info["absolute_bearing"]), gs.compass_info["target_name"])
+        if not self._changed("compass", state):
+            return
+        self.compass_hud.absolute_bearing, self.compass_hud.target_name = state
+
+    def _update_entity_modal(self, gs):
+        closest_entity = gs.closest_entity_info
+        if closest_entity:
+            # Compute bearing from player to target entity
+            dx = closest_entity["x"] - gs.car_world_x
+            dy = closest_entity["y"] - gs.car_world_y
+            bearing = _quantize_bearing((math.degrees(math.atan2(dy, dx)) + 90) % 360)
+            state = (
+                closest_entity["name"], closest_entity["hp"], closest_entity["max_hp"],
+                tuple(closest_entity["art"]), closest_entity.get("description", ""), bearing,
+            )
+        else:
+            state = ("No Target", 0, 0, (), "", -1.0)
+        if not self._changed("entity", state):
+            return
+        entity_modal = self.entity_modal
+        entity_modal.entity_name, entity_modal.hp, entity_modal.max_hp = state[0], state[1], state[2]
+        entity_modal.art = list(state[3])
+        entity_modal.description = state[4]
+        entity_modal.bearing = state[5]
@@ -3,7 +3,8 @@ from rich.text import Text
 from rich.style import Style
 from ..data.game_constants import CITY_SPACING, CITY_SIZE
 from ..world.generation import does_city_exist_at, get_buildings_in_city, get_city_name
-from ..data.buildings import BUILDING_DATA
+from ..logic.spawning import despawn_all, spawn_initial_entities
+from ..common.terminal_output import canvas_runs
 import time
 import random
 import math
@@ -24,6 +25,53 @@ _BUILDING_LABELS = {
 _GENERIC_STYLE = Style(color="rgb(160,160,160)")
 _DAMAGED_STYLE = Style(color="rgb(255,165,0)")   # Orange for damaged
 _RUBBLE_STYLE = Style(color="rgb(100,100,90)")    # Grey for destroyed
+_CITY_BACKGROUND_STYLE = Style(bgcolor="rgb(20,20,20)")
+_CITY_GROUND_STYLE = Style(color="rgb(60,60,60)", bgcolor="rgb(20,20,20)")
+_WORLD_BACKGROUND_STYLE = Style(bgcolor="black")
+_TITLE_STYLE = Style(color="white", bold=True)
+_HINT_STYLE = Style(color="rgb(100,100,100)")
+_PLAYER_STYLE = Style(color="red", bold=True)
+_QUEST_TURN_IN_STYLE = Style(color="green", bold=True)
+_QUEST_ACTIVE_STYLE = Style(color="yellow", bold=True)
+_INTERIOR_STYLES = {}
+
+
+def _interior_style(fill_style):
+    """The dimmed style of a building's interior, one per fill style."""
+    style = _INTERIOR_STYLES.get(fill_style)
+    if style is None:
+        style = _INTERIOR_STYLES[fill_style] = Style(color=fill_style.color, dim=True)
+    return style
+
+
+class _MapLayer:
+    """A drawn map, plus the cells drawn over it only while the blink is on."""
+
+    def __init__(self, canvas, styles, blink_cells):
+        self.canvas = canvas
+        self.styles = styles
+        self.blink_cells = blink_cells  # [(x, y, char, style)]
+
+    def compose(self, blink_on):
+        """The finished frame as Rich Text, with or without the blinking cells."""
+        canvas, styles = self.canvas, self.styles
+        saved = []
+        if blink_on:
+            for x, y, char, style in self.blink_cells:
+                saved.append((x, y, canvas[y][x], styles[y][x]))
+                canvas[y][x] = char
+                styles[y][x] = style
+        rows = canvas_runs(canvas, styles)
+        for x, y, char, style in reversed(saved):
+            canvas[y][x] = char
+            styles[y][x] = style
+        text = Text()
+        for y, row in enumerate(rows):
+            for run, style in row:
+                text.append(run, style)
+            if y < len(rows) - 1:
+                text.append("\n")
+        return text
 
 
 class MapView(Widget):
@@ -39,21 +87,19 @@ class MapView(Widget):
         self.camera_y = 0
         self.map_data = {}
         self.blink_state = True
-        self.cached_map = None
-        self.cached_styles = None
         self.city_mode = False
         self.city_grid_x = 0
         self.city_grid_y = 0
         self.world_nodes = []       # List of node dicts with x, y, short_name, long_name, type, grid_x, grid_y
         self.selected_node_index = -1  # -1 = no selection
+        self._layer_key = None      # What the cached layer shows (see render)
+        self._layer = None
+        self._frames = {}           # blink_state -> finished Text of the cached layer
 
     def on_mount(self) -> None:
         """Called when the widget is mounted."""
         self.camera_x = self.game_state.car_world_x
         self.camera_y = self.game_state.car_world_y
-        w, h = self.size
-        self.cached_map = [[' ' for _ in range(w)] for _ in range(h)]
-        self.cached_styles = [[Style() for _ in range(w)] for _ in range(h)]
         self._generate_map_chunk()
         self._build_node_list()
         self.blink_timer = self.set_interval(0.5, self.toggle_blink)
@@ -341,10 +387,10 @@ class MapView(Widget):
         gs.player_car.x = gs.car_world_x
         gs.player_car.y = gs.car_world_y
 
-        # Clear enemies and obstacles (they'd be from the old location)
-        gs.active_enemies.clear()
-        gs.active_obstacles.clear()
-        gs.active_fauna.clear()
+        # Clear enemies and obstacles (they'd be from the old location) and
+        # repopulate around the destination over the next frames
+        despawn_all(gs)
+        spawn_initial_entities(gs, self.world)
 
         city_name = get_city_name(target_gx, target_gy, gs.factions, gs.world_details)
         return True, f"Fast traveled to {city_name}. Used {gas_cost:.0f} gas."
@@ -373,19 +419,56 @@ class MapView(Widget):
 
 
     def render(self) -> Text:
-        """Render the appropriate map mode."""
+        """
+        Render the appropriate map mode. The map is drawn into a layer once
+        per change of what it shows; blinking only swaps between two
+        finished frames.
+        """
+        w, h = self.size
+        gs = self.game_state
         if self.city_mode:
-            return self._render_city()
-        return self._render_world()
+            damage = gs.city_damage.get((self.city_grid_x, self.city_grid_y))
+            key = ("city", w, h, self.city_grid_x, self.city_grid_y,
+                   (damage, damage.version) if damage is not None else None,
+                   self._city_quest_flash(self.city_grid_x, self.city_grid_y)[1],
+                   gs.car_world_x, gs.car_world_y)
+            draw = self._draw_city
+        else:
+            key = ("world", w, h, self.camera_x, self.camera_y, self.selected_node_index,
+                   len(self.world_nodes), len(gs.visited_cities), id(gs.world_details),
+                   tuple(sorted(gs.waypoint.items())) if gs.waypoint else None,
+                   tuple((id(q), q.ready_to_turn_in) for q in gs.active_quests), gs.selected_quest_index,
+                   gs.car_world_x, gs.car_world_y)
+            draw = self._draw_world
+        if key != self._layer_key:
+            self._layer_key = key
+            self._layer = draw(w, h)
+            self._frames = {}
+        if self._layer is None:
+            return Text("Screen too small")
+        frame = self._frames.get(self.blink_state)
+        if frame is None:
+            frame = self._frames[self.blink_state] = self._layer.compose(self.blink_state)
+        return frame
+
+    def _city_quest_flash(self, gx, gy):
+        """(style, marker) for City Hall when an active quest targets this city, else (None, None)."""
+        flash = (None, None)
+        for quest in self.game_state.active_quests:
+            if quest.city_id == (gx, gy):
+                if quest.ready_to_turn_in:
+                    return _QUEST_TURN_IN_STYLE, "?"  # Turn-in takes priority
+                flash = (_QUEST_ACTIVE_STYLE, "!")
+        return flash
 
-    def _render_city(self) -> Text:
-        """Render the city-level map, scaled to fit the screen."""
-        w, h = self.size
+    def _draw_city(self, w, h):
+        """Draws the city-level map, scaled to fit the screen, into a layer."""
         gs = self.game_state
         gx, gy = self.city_grid_x, self.city_grid_y
 
-        canvas = [[' ' for _ in range(w)] for _ in range(h)]
-        styles = [[Style(bgcolor="rgb(20,20,20)") for _ in range(w)] for _ in range(h)]
+        canvas = [[' '] * w for _ in range(h)]
+        styles = [[_CITY_BACKGROUND_STYLE] * w for _ in range(h)]
+        blink = []
 
         # City bounds in world coordinates
         city_center_x = gx * CITY_SPACING
@@ -401,7 +484,7 @@ class MapView(Widget):
         draw_h = h - margin_y * 2
 
         if draw_w <= 0 or draw_h <= 0:
-            return Text("Screen too small")
+            return None
 
         # Scale: world units per screen character
         scale_x = CITY_SIZE / draw_w
@@ -414,41 +497,31 @@ class MapView(Widget):
 
         # Draw city ground
         for sy in range(margin_y, margin_y + draw_h):
-            for sx in range(margin_x, margin_x + draw_w):
-                canvas[sy][sx] = '.'
-                styles[sy][sx] = Style(color="rgb(60,60,60)", bgcolor="rgb(20,20,20)")
+            canvas[sy][margin_x:margin_x + draw_w] = ['.'] * draw_w
+            styles[sy][margin_x:margin_x + draw_w] = [_CITY_GROUND_STYLE] * draw_w
 
         # Draw title
         city_name = get_city_name(gx, gy, gs.factions, gs.world_details)
         title = f"[ {city_name} ({gx * CITY_SPACING},{gy * CITY_SPACING}) ]"
         title_x = max(0, (w - len(title)) // 2)
-        self._draw_text(canvas, styles, title_x, 0, title, Style(color="white", bold=True))
+        self._draw_text(canvas, styles, title_x, 0, title, _TITLE_STYLE)
 
         # Draw mode hint
         hint = "Esc: World Map | Arrows: Scroll | C: Center | Enter: Set Waypoint | F: Fast Travel"
         hint_x = max(0, (w - len(hint)) // 2)
-        self._draw_text(canvas, styles, hint_x, h - 1, hint, Style(color="rgb(100,100,100)"))
+        self._draw_text(canvas, styles, hint_x, h - 1, hint, _HINT_STYLE)
 
         # Get buildings
         buildings = get_buildings_in_city(gx, gy)
 
         # Check if any active quest targets this city (for City Hall flashing)
-        quest_flash_style = None
-        quest_flash_marker = None
-        for quest in gs.active_quests:
-            if quest.city_id == (gx, gy):
-                if quest.ready_to_turn_in:
-                    quest_flash_style = Style(color="green", bold=True)
-                    quest_flash_marker = "?"
-                    break  # Turn-in takes priority
-                else:
-                    quest_flash_style = Style(color="yellow", bold=True)
-                    quest_flash_marker = "!"
+        quest_flash_style, quest_flash_marker = self._city_quest_flash(gx, gy)
+
+        damage = gs.city_damage.get((gx, gy))
 
         for idx, building in enumerate(buildings):
             btype = building.get("type", "GENERIC")
-            bld_key = (gx, gy, idx)
-            is_destroyed = bld_key in gs.destroyed_buildings
+            is_destroyed = damage is not None and damage.is_destroyed(idx)
 
             # Get the label for minimum size calculation
             label = _BUILDING_LABELS.get(btype, building.get("name", "")[:8])
@@ -485,9 +558,8 @@ class MapView(Widget):
             if is_destroyed:
                 # Draw rubble
                 for sy in range(by1, by2):
-                    for sx in range(bx1, bx2):
-                        canvas[sy][sx] = '~'
-                        styles[sy][sx] = _RUBBLE_STYLE
+                    canvas[sy][bx1:bx2] = ['~'] * (bx2 - bx1)
+                    styles[sy][bx1:bx2] = [_RUBBLE_STYLE] * (bx2 - bx1)
                 # Label
                 label = "RUBBLE"
                 lx = bx1 + max(0, (bx2 - bx1 - len(label)) // 2)
@@ -496,13 +568,8 @@ class MapView(Widget):
                 continue
 
             # Check damage state
-            is_damaged = bld_key in gs.damaged_buildings
-            if is_damaged:
-                max_hp = BUILDING_DATA.get(btype, {}).get("base_durability", 200)
-                current_hp = gs.damaged_buildings[bld_key]
-                hp_pct = current_hp / max_hp if max_hp > 0 else 1.0
-            else:
-                hp_pct = 1.0
+            is_damaged = damage is not None and damage.is_damaged(idx)
+            hp_pct = damage.hp_fraction(idx) if is_damaged else 1.0
 
             # Choose style based on type and damage
             if btype in _BUILDING_STYLES and hp_pct > 0.5:
@@ -511,9 +578,10 @@ class MapView(Widget):
                 fill_style = _DAMAGED_STYLE
             else:
                 fill_style = _GENERIC_STYLE
+            interior_style = _interior_style(fill_style)
 
-            # Flash City Hall border when a quest targets this city
-            is_quest_flash = (btype == "city_hall" and quest_flash_style and self.blink_state)
+            # City Hall's border flashes (while blinking) when a quest targets this city
+            is_quest_flash = btype == "city_hall" and quest_flash_style is not None
 
             # Draw building outline
             for sy in range(by1, by2):
@@ -521,35 +589,38 @@ class MapView(Widget):
                     if sy == by1 or sy == by2 - 1 or sx == bx1 or sx == bx2 - 1:
                         # Border
                         if sy == by1 and sx == bx1:
-                            canvas[sy][sx] = '┌'
+                            char = '┌'
                         elif sy == by1 and sx == bx2 - 1:
-                            canvas[sy][sx] = '┐'
+                            char = '┐'
                         elif sy == by2 - 1 and sx == bx1:
-                            canvas[sy][sx] = '└'
+                            char = '└'
                         elif sy == by2 - 1 and sx == bx2 - 1:
-                            canvas[sy][sx] = '┘'
+                            char = '┘'
                         elif sy == by1 or sy == by2 - 1:
-                            canvas[sy][sx] = '─'
+                            char = '─'
                         else:
-                            canvas[sy][sx] = '│'
-                        styles[sy][sx] = quest_flash_style if is_quest_flash else fill_style
+                            char = '│'
+                        canvas[sy][sx] = char
+                        styles[sy][sx] = fill_style
+                        if is_quest_flash:
+                            blink.append((sx, sy, char, quest_flash_style))
                     else:
                         # Interior
                         canvas[sy][sx] = '░'
-                        styles[sy][sx] = Style(color=fill_style.color, dim=True)
+                        styles[sy][sx] = interior_style
 
             # Draw label inside the building
             interior_w = bx2 - bx1 - 2
             if interior_w >= len(label) and by2 - by1 > 2:
                 lx = bx1 + 1 + max(0, (interior_w - len(label)) // 2)
                 ly = by1 + (by2 - by1) // 2
-                self._draw_text(canvas, styles, lx, ly, label, Style(color="white", bold=True))
+                self._draw_text(canvas, styles, lx, ly, label, _TITLE_STYLE)
                 # Draw quest marker next to City Hall label
                 if btype == "city_hall" and quest_flash_marker:
                     marker_x = lx + len(label)
                     if marker_x < bx2 - 1:
                         canvas[ly][marker_x] = quest_flash_marker
-                        styles[ly][marker_x] = quest_flash_style if quest_flash_style else fill_style
+                        styles[ly][marker_x] = quest_flash_style
 
             # Show HP bar for damaged buildings
             if is_damaged and by2 - by1 > 3 and interior_w >= 3:
@@ -562,28 +633,18 @@ class MapView(Widget):
                     bar_color = "green" if hp_pct > 0.5 else "yellow" if hp_pct > 0.25 else "red"
                     self._draw_text(canvas, styles, bar_x, bar_y, bar, Style(color=bar_color))
 
-        # Draw player position
+        # Player position (blinks)
         px, py = world_to_screen(gs.car_world_x, gs.car_world_y)
         if 0 <= py < h and 0 <= px < w:
-            if self.blink_state:
-                canvas[py][px] = '●'
-                styles[py][px] = Style(color="red", bold=True)
+            blink.append((px, py, '●', _PLAYER_STYLE))
 
-        # Convert to Rich Text
-        text = Text()
-        for y, row in enumerate(canvas):
-            for x, char in enumerate(row):
-                text.append(char, styles[y][x])
-            if y < h - 1:
-                text.append("\n")
-        return text
+        return _MapLayer(canvas, styles, blink)
 
-    def _render_world(self) -> Text:
-        """Render the world-level map."""
-        w, h = self.size
-
-        canvas = [[' ' for _ in range(w)] for _ in range(h)]
-        styles = [[Style(bgcolor="black") for _ in range(w)] for _ in range(h)]
+    def _draw_world(self, w, h):
+        """Draws the world-level map into a layer."""
+        canvas = [[' '] * w for _ in range(h)]
+        styles = [[_WORLD_BACKGROUND_STYLE] * w for _ in range(h)]
+        blink = []
 
         gs = self.game_state
         scale = self.WORLD_MAP_SCALE
@@ -710,13 +771,12 @@ class MapView(Widget):
                         if qt_label and is_selected:
                             self._draw_text(canvas, styles, qsx + 2, qsy, qt_label, marker_style)
 
-        # Draw Player
-        player_x = int((self.game_state.car_world_x - map_start_x) / scale)
-        player_y = int((self.game_state.car_world_y - map_start_y) / scale)
-        if 0 <= player_y < h and 0 <= player_x < w:
-            if self.blink_state:
-                canvas[player_y][player_x] = "●"
-                styles[player_y][player_x] = Style(color="red", bold=True)
+
+        # Player position (blinks)
+        player_x = int((gs.car_world_x - map_start_x) / scale)
+        player_y = int((gs.car_world_y - map_start_y) / scale)
+        if 0 <= player_y < h - 1 and 0 <= player_x < w:
+            blink.append((player_x, player_y, "●", _PLAYER_STYLE))
 
         # Bottom bar: selected node info or hint
         if selected_node:
@@ -747,14 +807,7 @@ class MapView(Widget):
             hint_x = max(0, (w - len(hint)) // 2)
             self._draw_text(canvas, styles, hint_x, h - 1, hint, Style(color="rgb(100,100,100)"))
 
-        # Convert to Rich Text
-        text = Text()
-        for y, row in enumerate(canvas):
-            for x, char in enumerate(row):
-                text.append(char, styles[y][x])
-            if y < h - 1:
-                text.append("\n")
-        return text
+        return _MapLayer(canvas, styles, blink)
 
     def _draw_text(self, canvas, styles, x, y, text, style):
         """Draws text onto the canvas."""
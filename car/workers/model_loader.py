@@ -95,7 +95,11 @@ def load_pipeline(model_size: str = "small") -> Any:
             verbose=False,
         )
         logging.info(f"llama.cpp model loaded successfully from {model_path}")
-        return llm
     except Exception as e:
         logging.error(f"Failed to load llama.cpp model: {e}", exc_info=True)
         return None
+
+    # Compile the JSON-schema grammars now rather than on the first call
+    from ..logic.llm_grammars import GRAMMAR_DIR_NAME, precompile_grammars
+    precompile_grammars(os.path.join(os.path.dirname(model_path), GRAMMAR_DIR_NAME))
+    return llm
@@ -3,9 +3,11 @@ from typing import Any, Dict, List
 
 from ..logic.llm_quest_generator import generate_quest_from_llm
 
-def generate_quests_worker(app: Any, city_id: str, city_faction_id: str, theme: dict, faction_data: Dict, story_intro: str) -> List:
+async def generate_quests_worker(app: Any, city_id: str, city_faction_id: str, theme: dict, faction_data: Dict,
+                                 story_intro: str) -> List:
     """
-    A worker that generates a set of quests for a specific city.
+    Generates a set of quests for a specific city. Run it as an async worker;
+    cancelling the worker drops the quest being generated.
     """
     from types import SimpleNamespace
 
@@ -25,7 +27,7 @@ def generate_quests_worker(app: Any, city_id: str, city_faction_id: str, theme:
     generated_quests = []
     for i in range(3):
         logging.info(f"Generating quest {i+1} for {city_id}...")
-        quest = generate_quest_from_llm(
+        quest = await generate_quest_from_llm(
             game_state=mock_game_state,
             quest_giver_faction_id=city_faction_id,
             app=app,
@@ -0,0 +1,447 @@
+import atexit
+import importlib
+import logging
+import multiprocessing
+import pickle
+import queue
+import sys
+import time
+
+from ..logic.world_snapshot import (
+    EntityView, SnapshotReader, SnapshotWriter, SpriteRegistry, apply_snapshot,
+    create_snapshot_block, entity_row,
+)
+
+# The world screen can run its simulation (physics, AI, spawning, quests) in a
+# child process, leaving the UI process free to render. The child owns the
+# GameState while the world screen is up and publishes a WorldSnapshot into
+# shared memory every tick; the UI keeps a mirror of the state for the HUD.
+#
+# Whenever the simulation would open a screen (combat, shops, quest rewards),
+# the game ends, or the UI needs the real state (pause menu, map, saving), the
+# child hands the whole GameState back and pauses. The UI pushes the screens
+# itself and hands the state back to the child when the world screen resumes.
+#
+# UI -> child: ("load", blob), ("controls", input_seq, controls), ("pull", request_id, pause), ("stop",)
+# child -> UI: ("sprite", id, payload), ("text", id, text), ("notify", message), ("sfx", note),
+#              ("destroyed", row), ("info", input_seq, info), ("prefetch",), ("handoff", blob),
+#              ("state", request_id, blob)
+
+SIM_TICK_RATE = 30
+
+# Attributes the UI owns while the child is running. These are never taken
+# from a pulled state, only from a handoff (where the simulation set them).
+_UI_FLAGS = ("menu_open", "pause_menu_open", "menu_nav_cooldown")
+
+# How to rebuild each screen the simulation can push, from the screen object.
+_HANDOFF_SCREENS = {
+    "CombatScreen": lambda screen: ((screen.player, screen.enemy), {}),
+    "QuestCompleteScreen": lambda screen: ((screen.quest,), {}),
+    "NarrativeDialogScreen": lambda screen: ((screen.narrative_data,), {}),
+    "ShopScreen": lambda screen: ((), {"shop_type": screen.shop_type}),
+    "CityHallScreen": lambda screen: ((), {}),
+}
+
+
+def player_controls(gs):
+    """The part of the game state the player drives from the UI."""
+    return {
+        "actions": dict(gs.actions),
+        "pedal_position": gs.pedal_position,
+        "weapon_angle_offset": gs.weapon_angle_offset,
+        "selected_quest_index": gs.selected_quest_index,
+        "waypoint": gs.waypoint,
+        "weapon_enabled": dict(gs.weapon_enabled),
+    }
+
+
+def apply_controls(gs, controls):
+    """Sets controls taken with player_controls (all of them, or only some) on a game state."""
+    for attr, value in controls.items():
+        if attr == "actions":
+            gs.actions.update(value)
+        else:
+            setattr(gs, attr, value)
+
+
+class _EventAudio:
+    """AudioManager stand-in that forwards sound effects to the UI process."""
+
+    def __init__(self, events):
+        self.events = events
+
+    def play_music(self, path):
+        pass
+
+    def stop_music(self):
+        pass
+
+    def play_sfx(self, note):
+        self.events.put(("sfx", note))
+
+
+class _EventNotifications:
+    """Stands in for the world screen's #notifications widget."""
+
+    def __init__(self, events):
+        self.events = events
+
+    def add_notification(self, message, *args, **kwargs):
+        self.events.put(("notify", message))
+
+
+class _HeadlessScreen:
+    def __init__(self, events):
+        self._notifications = _EventNotifications(events)
+
+    def query_one(self, *args, **kwargs):
+        return self._notifications
+
+
+def headless_app_class():
+    """Builds HeadlessApp from the real app's tick methods, so both run the same code."""
+    from ..app import GenesisModuleApp
+
+    class HeadlessApp:
+        """
+        Stands in for GenesisModuleApp inside the simulation process. Anything
+        that would touch the UI (screens, sounds, notifications, quest workers)
+        becomes an event for the UI process instead.
+        """
+        simulate_world_tick = GenesisModuleApp.simulate_world_tick
+        find_closest_entity = GenesisModuleApp.find_closest_entity
+        update_compass_data = GenesisModuleApp.update_compass_data
+        check_building_interaction = GenesisModuleApp.check_building_interaction
+
+        def __init__(self, game_state, world, settings, events):
+            self.game_state = game_state
+            self.world = world
+            self.settings = settings
+            self.events = events
+            self.audio_manager = _EventAudio(events)
+            self.screen = _HeadlessScreen(events)
+            self.frame_count = 0
+            self.last_grid_pos = (None, None)
+            self.pushed_screens = []
+            # Loot generation reads the LLM settings. The local model lives in
+            # the UI process, so local-mode loot falls back to stock items here.
+            self.llm_pipeline = None
+            self.dev_mode = settings.get("dev_mode", False)
+            self.generation_mode = settings.get("generation_mode", "local")
+            self.model_size = settings.get("model_size", "small")
+            self.cli_preset = settings.get("cli_preset", "gemini")
+            self.custom_cli_command = settings.get("custom_cli_command", "")
+            self.custom_cli_args = settings.get("custom_cli_args", "")
+            self.record_llm_responses = settings.get("record_llm_responses", False)
+            self.replay_store = settings.get("replay_store", "recordings/llm_responses.jsonl")
+            self.replay_latency = settings.get("replay_latency", "none")
+
+        def push_screen(self, screen):
+            name = screen.__class__.__name__
+            if name not in _HANDOFF_SCREENS:
+                logging.error(f"Simulation process cannot hand off screen {name}.")
+                return
+            args, kwargs = _HANDOFF_SCREENS[name](screen)
+            self.pushed_screens.append((screen.__class__.__module__, name, args, kwargs))
+
+        def check_and_cache_quests_for_nearby_cities(self):
+            # Quest workers need the UI's LLM pipeline; the UI runs them.
+            self.events.put(("prefetch",))
+
+    return HeadlessApp
+
+
+class _SimulationLoop:
+    """The child side: ticks a loaded game state and publishes snapshots."""
+
+    def __init__(self, shm_name, commands, events, settings):
+        self.commands = commands
+        self.events = events
+        self.settings = settings
+        self.writer = SnapshotWriter(shm_name)
+        self.registry = SpriteRegistry()
+        self.app_class = headless_app_class()
+        self.sim = None
+        self.input_seq = 0
+        self.frame = 0
+        self.last_info = None
+        self.last_tick = time.perf_counter()
+        self.next_tick = self.last_tick
+
+    def run(self):
+        tick = 1 / SIM_TICK_RATE
+        while True:
+            timeout = None if self.sim is None else max(0.0, self.next_tick - time.perf_counter())
+            try:
+                command = self.commands.get(timeout=timeout)
+            except queue.Empty:
+                command = None
+            if command is not None and not self.handle(command):
+                break
+            now = time.perf_counter()
+            if self.sim is not None and now >= self.next_tick:
+                self.step(now)
+                # Don't try to catch up after a stall; just resume the cadence.
+                self.next_tick = max(self.next_tick + tick, now)
+        self.writer.close()
+
+    def handle(self, command):
+        """Applies one command. Returns False when the loop should exit."""
+        kind = command[0]
+        if kind == "stop":
+            return False
+        if kind == "load":
+            from ..world import World
+            game_state, seed = pickle.loads(command[1])
+            world = World(seed=seed)
+            world.game_state = game_state
+            self.sim = self.app_class(game_state, world, self.settings, self.events)
+            self.last_info = None
+            self.last_tick = self.next_tick = time.perf_counter()
+        elif kind == "controls":
+            self.input_seq = command[1]
+            if self.sim is not None:
+                apply_controls(self.sim.game_state, command[2])
+        elif kind == "pull":
+            _, request_id, pause = command
+            blob = pickle.dumps(self.sim.game_state) if self.sim is not None else None
+            self.events.put(("state", request_id, blob))
+            if pause:
+                self.sim = None
+        return True
+
+    def step(self, now):
+        from ..logic.trigger_logic import check_triggers
+        sim = self.sim
+        gs = sim.game_state
+        dt = now - self.last_tick
+        self.last_tick = now
+
+        for notification in sim.simulate_world_tick(dt):
+            self.events.put(("notify", notification))
+        sim.check_building_interaction()
+        check_triggers(sim, gs)
+        sim.frame_count += 1
+        self.frame += 1
+
+        self.writer.publish(gs, self.frame, self.input_seq, self.registry,
+                            self._send_sprite, self._send_text)
+        for destroyed in gs.destroyed_this_frame:
+            sprite_id, payload = self.registry.entity_sprite(destroyed)
+            if payload is not None:
+                self._send_sprite(sprite_id, payload)
+            self.events.put(("destroyed", entity_row(0, sprite_id, destroyed)))
+        gs.destroyed_this_frame.clear()
+        self._send_info(gs)
+
+        if sim.pushed_screens or gs.game_over:
+            self.events.put(("handoff", pickle.dumps((gs, sim.pushed_screens))))
+            self.sim = None
+
+    def _send_info(self, gs):
+        """Sends the slow-changing HUD state whenever it changes."""
+        key = (
+            tuple((id(q), q.name) for q in gs.active_quests), gs.selected_quest_index,
+            str(gs.waypoint), gs.compass_info["target_name"], tuple(gs.ammo_counts.items()),
+            tuple(gs.weapon_enabled.items()), sum(d.version for d in gs.city_damage.values()),
+        )
+        if key == self.last_info:
+            return
+        self.last_info = key
+        self.events.put(("info", self.input_seq, {
+            "active_quests": gs.active_quests,
+            "selected_quest_index": gs.selected_quest_index,
+            "waypoint": gs.waypoint,
+            "target_name": gs.compass_info["target_name"],
+            "ammo_counts": dict(gs.ammo_counts),
+            "weapon_enabled": dict(gs.weapon_enabled),
+            "city_damage": pickle.dumps(gs.city_damage, protocol=pickle.HIGHEST_PROTOCOL),
+        }))
+
+    def _send_sprite(self, sprite_id, payload):
+        self.events.put(("sprite", sprite_id, payload))
+
+    def _send_text(self, text_id, text):
+        self.events.put(("text", text_id, text))
+
+
+def simulation_main(shm_name, commands, events, settings, log_queue):
+    """Entry point of the simulation process."""
+    # Log through the UI's log pipeline if it has one. Never fall back to
+    # stderr, which is the terminal the UI is drawing on.
+    if log_queue is not None:
+        from ..common.log_pipeline import attach_queue
+        attach_queue(log_queue)
+    else:
+        logging.getLogger().addHandler(logging.NullHandler())
+    try:
+        _SimulationLoop(shm_name, commands, events, settings).run()
+    except Exception as e:
+        logging.error(f"Simulation process crashed: {e}", exc_info=True)
+        events.put(("crashed", str(e)))
+
+
+class SimulationHost:
+    """
+    The UI side: starts the simulation process and moves the game state,
+    controls and snapshots between it and the app.
+    """
+
+    def __init__(self, settings):
+        context = multiprocessing.get_context("spawn")
+        from ..common.log_pipeline import forward_queue
+        log_queue = forward_queue(context)
+        # Textual replaces sys.stderr with an object that has no usable file
+        # descriptor, which multiprocessing's helper processes try to inherit.
+        stderr, sys.stderr = sys.stderr, sys.__stderr__
+        try:
+            self.block = create_snapshot_block()
+            self.commands = context.Queue()
+            self.events = context.Queue()
+            self.process = context.Process(
+                target=simulation_main,
+                args=(self.block.name, self.commands, self.events, settings, log_queue),
+                name="Simulation",
+                daemon=True,
+            )
+            self.process.start()
+        finally:
+            sys.stderr = stderr
+        self.reader = SnapshotReader(self.block)
+        self.running = False  # True while the child owns the game state
+        self.sprites = {}
+        self.texts = {}
+        self.input_seq = 0
+        self._last_controls = None
+        self._loaded_quest_cache = {}
+        self._loaded_blob = None
+        self._pull_id = 0
+        self._backlog = []
+        atexit.register(self.stop)
+
+    def load(self, game_state, seed):
+        """Hands the game state to the child, which starts ticking it."""
+        self._loaded_quest_cache = dict(game_state.quest_cache)
+        self._last_controls = player_controls(game_state)
+        self._loaded_blob = pickle.dumps((game_state, seed))
+        self.commands.put(("load", self._loaded_blob))
+        self.running = True
+
+    def loaded_state(self):
+        """A fresh copy of the last state handed to the child, for recovering from a crash."""
+        return pickle.loads(self._loaded_blob)[0]
+
+    def send_controls(self, game_state):
+        """Forwards the player's controls if they changed since the last send."""
+        controls = player_controls(game_state)
+        if controls == self._last_controls:
+            return
+        self._last_controls = controls
+        self.input_seq += 1
+        self.commands.put(("controls", self.input_seq, controls))
+
+    def poll(self):
+        """Returns the events the child sent since the last poll, oldest first."""
+        events, self._backlog = self._backlog, []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                break
+        kept = []
+        for event in events:
+            if event[0] == "sprite":
+                self.sprites[event[1]] = event[2]
+            elif event[0] == "text":
+                self.texts[event[1]] = event[2]
+            elif event[0] == "destroyed":
+                row = event[1]
+                kept.append(("destroyed", EntityView(row, self.sprites[row[1]])))
+            elif event[0] == "state":
+                continue  # A pull that timed out
+            else:
+                if event[0] in ("handoff", "crashed"):
+                    self.running = False
+                kept.append(event)
+        return kept
+
+    def apply_latest_snapshot(self, game_state):
+        """Mirrors the newest frame onto the UI's game state, if there is one."""
+        snapshot = self.reader.read()
+        if snapshot is not None:
+            apply_snapshot(game_state, snapshot, self.sprites, self.texts,
+                           snapshot.input_seq == self.input_seq)
+
+    def pull(self, pause=True, timeout=2.0):
+        """
+        Fetches a copy of the child's game state. With pause, the child stops
+        ticking and the caller owns the state again. Returns None on timeout.
+        """
+        if not self.running:
+            return None
+        self._pull_id += 1
+        self.commands.put(("pull", self._pull_id, pause))
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                event = self.events.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                logging.error("Simulation process did not answer a state pull.")
+                return None
+            if event[0] == "state" and event[1] == self._pull_id:
+                break
+            if event[0] == "handoff":
+                # The child paused on its own first; its handoff is the state.
+                self.running = False
+                self._backlog.append(event)
+                return None
+            self._backlog.append(event)
+        if pause:
+            self.running = False
+        return pickle.loads(event[2]) if event[2] else None
+
+    def adopt(self, new_state, old_state, keep_ui_flags):
+        """
+        Prepares a state from the child to replace the UI's copy: quest
+        results the UI cached while the child ran are merged in, generated
+        dialog and content stamps (only the UI writes them) are kept, and the
+        UI's menu flags are kept unless the simulation set them.
+        """
+        merged = dict(new_state.quest_cache)
+        for city_id, quests in old_state.quest_cache.items():
+            if self._loaded_quest_cache.get(city_id) is not quests:
+                merged[city_id] = quests
+        new_state.quest_cache = merged
+        new_state.dialog_cache = old_state.dialog_cache
+        new_state.content_stamps = old_state.content_stamps
+        new_state.active_explosions = old_state.active_explosions
+        if keep_ui_flags:
+            for attr in _UI_FLAGS:
+                setattr(new_state, attr, getattr(old_state, attr))
+        return new_state
+
+    def take_handoff(self, blob, old_state):
+        """Unpacks a handoff. Returns (game_state, screens to push)."""
+        new_state, specs = pickle.loads(blob)
+        new_state = self.adopt(new_state, old_state, keep_ui_flags=False)
+        screens = []
+        for module_name, class_name, args, kwargs in specs:
+            screen_class = getattr(importlib.import_module(module_name), class_name)
+            screens.append(screen_class(*args, **kwargs))
+        return new_state, screens
+
+    def stop(self):
+        """Shuts the child down and frees the snapshot block."""
+        if self.process is None:
+            return
+        try:
+            self.commands.put(("stop",))
+            self.process.join(timeout=1.0)
+        except (OSError, ValueError):
+            pass
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process = None
+        self.running = False
+        self.block.close()
+        self.block.unlink()
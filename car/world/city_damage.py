@@ -0,0 +1,69 @@
+"""
+Per-city building damage.
+
+A city that has taken damage gets one CityDamage record, sized to its
+generated layout (get_buildings_in_city): a bitset of destroyed building
+indices and an array of current building HP. Checking a building is a bit
+test on its own city's record, and a save stores one short record per
+damaged city. `version` goes up with every change, so anything drawn or
+looked up from a city's buildings can cache on (record, version).
+"""
+
+from array import array
+
+
+class CityDamage:
+    """Destroyed-building bitset and HP array for one city."""
+
+    __slots__ = ("max_hp", "hp", "destroyed", "version")
+
+    def __init__(self, max_hp):
+        self.max_hp = array("d", max_hp)  # Full HP by building index
+        self.hp = array("d", max_hp)      # Current HP by building index
+        self.destroyed = 0                # Bit i set: building i is rubble
+        self.version = 0
+
+    def is_destroyed(self, idx):
+        return (self.destroyed >> idx) & 1 == 1
+
+    def is_damaged(self, idx):
+        return self.hp[idx] < self.max_hp[idx]
+
+    def hp_fraction(self, idx):
+        max_hp = self.max_hp[idx]
+        return self.hp[idx] / max_hp if max_hp > 0 else 1.0
+
+    @property
+    def destroyed_count(self):
+        return bin(self.destroyed).count("1")
+
+    def damage(self, idx, amount):
+        """Takes HP off a building, marking it destroyed at zero. Returns the HP left."""
+        hp = self.hp[idx] - amount
+        self.hp[idx] = hp
+        if hp <= 0:
+            self.destroyed |= 1 << idx
+        self.version += 1
+        return hp
+
+    def to_dict(self, city_key):
+        """A compact save record: the bitset, and HP only for damaged buildings still standing."""
+        return {
+            "city": [city_key[0], city_key[1]],
+            "destroyed": self.destroyed,
+            "hp": [
+                [idx, hp] for idx, hp in enumerate(self.hp)
+                if hp < self.max_hp[idx] and not self.is_destroyed(idx)
+            ],
+        }
+
+    def load(self, record):
+        """Restores the state saved by to_dict into a record built for the same layout."""
+        self.destroyed = record.get("destroyed", 0) & ((1 << len(self.hp)) - 1)
+        for idx, hp in record.get("hp", []):
+            if idx < len(self.hp):
+                self.hp[idx] = hp
+        for idx in range(len(self.hp)):
+            if self.is_destroyed(idx):
+                self.hp[idx] = min(self.hp[idx], 0)
+        self.version += 1
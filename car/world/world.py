@@ -1,10 +1,13 @@
 import random
 import math
+from collections import OrderedDict
 from .generation import get_buildings_in_city
 from ..data.game_constants import CITY_SPACING, ROAD_WIDTH, CITY_SIZE
 from ..data.terrain import TERRAIN_DATA
 from ..data.buildings import BUILDING_DATA
 
+MAX_BUILDING_TERRAIN_CITIES = 64  # Cities whose building terrain is kept, least recently used dropped first
+
 class World:
     def __init__(self, seed):
         self.seed = seed
@@ -13,21 +16,40 @@ class World:
         self.building_data = BUILDING_DATA
         self.city_spacing = CITY_SPACING
         self.game_state = None
+        self._building_terrain = OrderedDict()  # {(gx,gy): (destroyed bitset, [(x1, y1, x2, y2, terrain)])}
+
+    def _city_building_terrain(self, grid_x, grid_y):
+        """Bounds and terrain of each building in a city, rebuilt when one is destroyed."""
+        damage = self.game_state.city_damage.get((grid_x, grid_y)) if self.game_state else None
+        destroyed = damage.destroyed if damage is not None else 0
+        key = (grid_x, grid_y)
+        cached = self._building_terrain.get(key)
+        if cached is not None and cached[0] == destroyed:
+            self._building_terrain.move_to_end(key)
+            return cached[1]
+        entries = []
+        for idx, building in enumerate(get_buildings_in_city(grid_x, grid_y)):
+            if (destroyed >> idx) & 1:
+                terrain = TERRAIN_DATA["RUBBLE"]
+            else:
+                building_data = BUILDING_DATA.get(building["type"], {})
+                terrain = {**TERRAIN_DATA["BUILDING_WALL"], "building": {**building_data, **building}}
+            entries.append((building['x'], building['y'],
+                            building['x'] + building['w'], building['y'] + building['h'], terrain))
+        self._building_terrain[key] = (destroyed, entries)
+        self._building_terrain.move_to_end(key)
+        while len(self._building_terrain) > MAX_BUILDING_TERRAIN_CITIES:
+            self._building_terrain.popitem(last=False)
+        return entries
 
     def get_terrain_at(self, x, y):
         grid_x = round(x / CITY_SPACING)
         grid_y = round(y / CITY_SPACING)
 
-        # Check for buildings first
-        city_buildings = get_buildings_in_city(grid_x, grid_y)
-        for idx, building in enumerate(city_buildings):
-            if building['x'] <= x < building['x'] + building['w'] and \
-               building['y'] <= y < building['y'] + building['h']:
-                # Check if this building has been destroyed
-                if self.game_state and (grid_x, grid_y, idx) in self.game_state.destroyed_buildings:
-                    return TERRAIN_DATA["RUBBLE"]
-                building_data = BUILDING_DATA.get(building["type"], {})
-                return {**TERRAIN_DATA["BUILDING_WALL"], "building": {**building_data, **building}}
+        # Check for buildings first (destroyed ones are rubble)
+        for x1, y1, x2, y2, terrain in self._city_building_terrain(grid_x, grid_y):
+            if x1 <= x < x2 and y1 <= y < y2:
+                return terrain
 
         # Check for cities
         city_center_x = grid_x * CITY_SPACING
@@ -0,0 +1,90 @@
+from ..data.game_constants import CITY_SPACING
+
+# Side length (world units) of one trigger bucket. Triggers whose radius is
+# larger than this can't be found by a 3x3 neighbourhood lookup, so they are
+# kept in a small always-checked list instead.
+TRIGGER_BUCKET_SIZE = CITY_SPACING // 4
+
+
+class WorldIndex:
+    """Lookup tables built once from the generated world details and triggers.
+
+    LLM-generated worlds can carry hundreds of triggers and landmarks, so the
+    per-frame code paths (trigger checks, quest objectives, compass/map
+    markers) query this index instead of scanning the raw lists.
+    """
+
+    def __init__(self, world_details=None, triggers=None, bucket_size=TRIGGER_BUCKET_SIZE):
+        self.bucket_size = bucket_size
+        self.landmarks = {}        # {name: (x, y)}
+        self.cities = {}           # {name: (grid_x, grid_y)}
+        self._trigger_buckets = {} # {(bx, by): [trigger, ...]}
+        self._large_triggers = []
+        self.set_world_details(world_details)
+        self.set_triggers(triggers)
+
+    def set_world_details(self, world_details):
+        """Rebuilds the landmark and city name maps."""
+        self.landmarks = {}
+        self.cities = {}
+        if not world_details:
+            return
+
+        for landmark in world_details.get("landmarks", []) or []:
+            name = landmark.get("name")
+            if name is None or name in self.landmarks:
+                continue
+            try:
+                self.landmarks[name] = (landmark["x"], landmark["y"])
+            except KeyError:
+                continue
+
+        for key, name in (world_details.get("cities", {}) or {}).items():
+            if name in self.cities:
+                continue
+            try:
+                gx_str, gy_str = key.split(",")
+                self.cities[name] = (int(gx_str), int(gy_str))
+            except ValueError:
+                continue
+
+    def set_triggers(self, triggers):
+        """Rebuilds the trigger buckets."""
+        self._trigger_buckets = {}
+        self._large_triggers = []
+        for trigger in triggers or []:
+            try:
+                x, y, radius = trigger["x"], trigger["y"], trigger["radius"]
+            except KeyError:
+                continue
+            if radius > self.bucket_size:
+                self._large_triggers.append(trigger)
+                continue
+            self._trigger_buckets.setdefault(self._bucket_of(x, y), []).append(trigger)
+
+    def _bucket_of(self, x, y):
+        return (int(x // self.bucket_size), int(y // self.bucket_size))
+
+    def triggers_near(self, x, y):
+        """Returns the triggers that could contain (x, y).
+
+        Only the bucket holding the point and its eight neighbours are
+        consulted, plus any oversized triggers.
+        """
+        bx, by = self._bucket_of(x, y)
+        buckets = self._trigger_buckets
+        nearby = list(self._large_triggers)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                bucket = buckets.get((bx + dx, by + dy))
+                if bucket:
+                    nearby.extend(bucket)
+        return nearby
+
+    def get_landmark_coords(self, name):
+        """Returns (x, y) for a landmark name, or None."""
+        return self.landmarks.get(name)
+
+    def get_city_grid(self, name):
+        """Returns (grid_x, grid_y) for a city name, or None."""
+        return self.cities.get(name)
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+benchmark_generation.py — Time the LLM generation pipeline stage by stage.
+
+Runs theme generation, the new-game world builder, a quest prefetch for the
+nine cities around the start, and a batch of loot drops, then reports for
+each stage how long it took, how many prompt tokens it sent, and where the
+time went: building JSON grammars, waiting in the model's queue, inside the
+model, parsing, and everything else (prompt building, validation, the world builder's pauses).
+
+Usage:
+  python3 scripts/benchmark_generation.py                        # replay recorded responses instantly
+  python3 scripts/benchmark_generation.py --latency recorded     # replay at recorded speed
+  python3 scripts/benchmark_generation.py --mode local --record  # run the model and record for replay
+
+Run from the repo root (prompts are read from ./prompts).
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from car.config import load_settings
+from car.data.difficulty import DIFFICULTY_MODIFIERS
+from car.data.game_constants import CITY_SPACING
+from car.data.weapons import WEAPONS_DATA
+from car.logic.data_loader import _normalize_hub_coordinates
+from car.logic.llm_inference import add_call_observer, remove_call_observer
+from car.logic.llm_item_generator import generate_item_from_llm
+from car.logic.llm_replay import DEFAULT_STORE_PATH, LATENCY_MODELS, LATENCY_NONE
+from car.logic.llm_theme_generator import generate_themes_from_llm
+from car.workers.quest_generator import generate_quests_worker
+from car.workers.world_generator import StageUpdate, generate_initial_world_worker
+from car.world.generation import get_city_faction
+
+
+class Stage:
+    """Time spent in one stage of the pipeline."""
+
+    def __init__(self, name):
+        self.name = name
+        self.wall_ms = 0.0
+        self.job_ms = 0.0
+        self.calls = 0
+        self.failures = 0
+        self.prompt_tokens = 0
+        self.grammar_ms = 0.0
+        self.wait_ms = 0.0
+        self.model_ms = 0.0
+        self.parse_ms = 0.0
+        self.replay = {}
+
+    @property
+    def other_ms(self):
+        return max(0.0, self.job_ms - self.grammar_ms - self.wait_ms - self.model_ms - self.parse_ms)
+
+
+class Benchmark:
+    """Collects call stats from llm_inference into the current stage."""
+
+    def __init__(self):
+        self.stages = []
+        self.current = None
+        self._lock = threading.Lock()
+
+    def begin(self, name):
+        self.current = Stage(name)
+        self.stages.append(self.current)
+        return self.current
+
+    def observe(self, stats):
+        with self._lock:
+            stage = self.current
+            stage.calls += 1
+            stage.failures += 0 if stats["ok"] else 1
+            stage.prompt_tokens += stats["prompt_tokens"]
+            stage.grammar_ms += stats["grammar_ms"]
+            stage.wait_ms += stats["wait_ms"]
+            stage.model_ms += stats["model_ms"]
+            stage.parse_ms += stats["parse_ms"]
+            if stats["replay"]:
+                stage.replay[stats["replay"]] = stage.replay.get(stats["replay"], 0) + 1
+
+    def job(self, fn, *args, **kwargs):
+        """Runs one job, counting its time on its own thread toward the stage."""
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self.current.job_ms += elapsed
+
+    async def ajob(self, fn, *args, **kwargs):
+        """job() for a coroutine function; jobs awaited together each count their own time."""
+        start = time.perf_counter()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self.current.job_ms += elapsed
+
+
+class BenchmarkApp:
+    """Just enough of the app for the generation code."""
+
+    def __init__(self, settings, benchmark):
+        self.generation_mode = settings.get("generation_mode", "local")
+        self.model_size = settings.get("model_size", "small")
+        self.cli_preset = settings.get("cli_preset", "gemini")
+        self.custom_cli_command = settings.get("custom_cli_command", "")
+        self.custom_cli_args = settings.get("custom_cli_args", "")
+        self.record_llm_responses = settings.get("record_llm_responses", False)
+        self.replay_store = settings.get("replay_store", DEFAULT_STORE_PATH)
+        self.replay_latency = settings.get("replay_latency", LATENCY_NONE)
+        self.llm_pipeline = None
+        self.benchmark = benchmark
+        self._world_stage_start = None
+
+    def post_message(self, message):
+        """The world builder announces each of its stages; time them separately."""
+        if not isinstance(message, StageUpdate):
+            return
+        self.end_world_stage()
+        self.benchmark.begin(f"world: {message.data[1]}")
+        self._world_stage_start = time.perf_counter()
+
+    def end_world_stage(self):
+        if self._world_stage_start is None:
+            return
+        elapsed = (time.perf_counter() - self._world_stage_start) * 1000
+        self.benchmark.current.wall_ms = elapsed
+        self.benchmark.current.job_ms = elapsed
+        self._world_stage_start = None
+
+
+def _timed_stage(benchmark, name, run):
+    stage = benchmark.begin(name)
+    start = time.perf_counter()
+    result = run()
+    stage.wall_ms = (time.perf_counter() - start) * 1000
+    return result
+
+
+def run_pipeline(app, benchmark, quest_cities, loot_drops):
+    themes, _ = _timed_stage(benchmark, "themes",
+                             lambda: asyncio.run(benchmark.ajob(generate_themes_from_llm, app)))
+    theme = themes[0]
+
+    new_game_settings = {"theme": theme, "difficulty_mods": DIFFICULTY_MODIFIERS["Normal"]}
+    world = asyncio.run(generate_initial_world_worker(app, new_game_settings))
+    app.end_world_stage()
+    if "error" in world:
+        print(f"World generation failed: {world['error']}")
+        return
+    factions = world["factions"]
+    # The game stores hubs as grid tuples once the world is built.
+    _normalize_hub_coordinates(factions)
+
+    cities = [(dx, dy) for dx in range(-1, 2) for dy in range(-1, 2)][:quest_cities]
+
+    async def prefetch():
+        # Awaited together, as the app runs its prefetch workers.
+        return await asyncio.gather(*(
+            benchmark.ajob(
+                generate_quests_worker, app, f"city_{x}_{y}",
+                get_city_faction(x * CITY_SPACING, y * CITY_SPACING, factions),
+                theme, factions, world["story_intro"],
+            )
+            for x, y in cities
+        ))
+
+    _timed_stage(benchmark, f"quest prefetch ({len(cities)} cities)", lambda: asyncio.run(prefetch()))
+
+    base_items = list(WEAPONS_DATA)
+
+    def loot():
+        for index in range(loot_drops):
+            benchmark.job(generate_item_from_llm, app, theme, 1, base_items[index % len(base_items)])
+
+    _timed_stage(benchmark, f"loot ({loot_drops} drops)", loot)
+
+
+def print_report(benchmark, mode):
+    print(f"\nGeneration pipeline ({mode})")
+    header = (f"{'stage':<44}{'wall ms':>10}{'calls':>7}{'tokens':>8}"
+              f"{'grammar':>9}{'wait':>10}{'model':>10}{'parse':>8}{'other':>10}")
+    print(header)
+    print("-" * len(header))
+    for stage in benchmark.stages:
+        calls = f"{stage.calls}" + (f"!{stage.failures}" if stage.failures else "")
+        print(f"{stage.name[:43]:<44}{stage.wall_ms:>10.1f}{calls:>7}{stage.prompt_tokens:>8}"
+              f"{stage.grammar_ms:>9.1f}{stage.wait_ms:>10.1f}"
+              f"{stage.model_ms:>10.1f}{stage.parse_ms:>8.1f}{stage.other_ms:>10.1f}")
+    total = sum(stage.wall_ms for stage in benchmark.stages)
+    print("-" * len(header))
+    print(f"{'total':<44}{total:>10.1f}")
+    replay = {}
+    for stage in benchmark.stages:
+        for outcome, count in stage.replay.items():
+            replay[outcome] = replay.get(outcome, 0) + count
+    if replay:
+        print("Replay lookups: " + ", ".join(f"{outcome} {count}" for outcome, count in sorted(replay.items())))
+    print("tokens are prompt tokens; grammar is JSON-grammar construction; "
+          "grammar/wait/model/parse/other are summed across concurrent jobs; '!n' marks failed calls.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the LLM generation pipeline")
+    parser.add_argument("--mode", default="replay", choices=["replay", "local", "gemini_cli"],
+                        help="Generation backend (default: replay)")
+    parser.add_argument("--latency", choices=LATENCY_MODELS,
+                        help="Replay latency model (default: from settings.json)")
+    parser.add_argument("--store", help="Replay store path (default: from settings.json)")
+    parser.add_argument("--record", action="store_true",
+                        help="Record live responses into the replay store")
+    parser.add_argument("--quest-cities", type=int, default=9,
+                        help="Cities to prefetch quests for, in parallel (default: 9)")
+    parser.add_argument("--loot-drops", type=int, default=5,
+                        help="Loot items to generate (default: 5)")
+    args = parser.parse_args()
+
+    settings = dict(load_settings())
+    settings["generation_mode"] = args.mode
+    if args.latency:
+        settings["replay_latency"] = args.latency
+    if args.store:
+        settings["replay_store"] = args.store
+    if args.record:
+        settings["record_llm_responses"] = True
+
+    benchmark = Benchmark()
+    app = BenchmarkApp(settings, benchmark)
+    if args.mode == "local":
+        from car.workers.model_loader import load_pipeline
+        print(f"Loading local model ({app.model_size})...")
+        app.llm_pipeline = load_pipeline(model_size=app.model_size)
+        if app.llm_pipeline is None:
+            print("Local model failed to load; see the log for details.")
+            sys.exit(1)
+
+    add_call_observer(benchmark.observe)
+    try:
+        run_pipeline(app, benchmark, args.quest_cities, args.loot_drops)
+    finally:
+        remove_call_observer(benchmark.observe)
+    print_report(benchmark, args.mode if args.mode != "replay" else f"replay, latency={app.replay_latency}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+replay_session.py — Re-drive a recorded play session and time every tick.
+
+Sessions are recorded with "record_sessions": true in settings.json (files
+go to recordings/sessions/). The replay runs the same world ticks with the
+same controls and random streams, so a slow session from the field becomes
+a repeatable benchmark: record once, then compare timings before and after
+a change.
+
+Usage:
+  python3 scripts/replay_session.py recordings/sessions/session-....replay.gz
+  python3 scripts/replay_session.py SESSION --render 160x48       # also draw the game view
+  python3 scripts/replay_session.py SESSION --json after.json --baseline before.json
+
+Run from the repo root (generated world data, such as factions, is read from
+the session store, ./temp/session.db).
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from car.logic.session_replay import replay_session
+
+COMPARED = ("mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms", "sim_mean_ms", "render_mean_ms")
+
+
+def parse_size(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def print_summary(summary, baseline=None):
+    print(f"Ticks: {summary['ticks']} in {summary['segments']} segment(s)")
+    for key in COMPARED:
+        value = summary.get(key)
+        if value is None:
+            continue
+        line = f"  {key:<15} {value:>9.3f}"
+        before = (baseline or {}).get(key)
+        if before:
+            line += f"   (was {before:.3f}, {100 * (value - before) / before:+.1f}%)"
+        print(line)
+    print("  slowest ticks:  " + ", ".join(f"#{i} {ms:.1f} ms" for i, ms in summary["slowest_ticks"]))
+    if summary["divergence"]:
+        segment, tick = summary["divergence"]
+        print(f"WARNING: the replay diverged from the recording at segment {segment}, tick {tick}; "
+              "timings after that point are for a different workload.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded session and time each tick.")
+    parser.add_argument("session", help="Replay file written with record_sessions on")
+    parser.add_argument("--render", type=parse_size, metavar="WxH",
+                        help="Also draw the game view at this size every tick")
+    parser.add_argument("--json", metavar="PATH", help="Write the timing summary to PATH")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare with a summary written by --json")
+    args = parser.parse_args()
+
+    report = replay_session(args.session, render_size=args.render)
+    summary = report.summary()
+    if summary["ticks"] == 0:
+        print("The recording has no ticks.")
+        return 1
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_summary(summary, baseline)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
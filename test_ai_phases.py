@@ -0,0 +1,53 @@
+import copy
+import random
+from car.game_state import GameState
+from car.data.factions import FACTION_DATA
+from car.entities.vehicle import UNIVERSAL_FILLER_PHASES
+from car.entities.vehicles.raider_buggy import RaiderBuggy
+from car.logic.ai_phases import phase_graph
+from car.logic.ai_behaviors import run_enemy_ai
+
+def test_ai_phases():
+    print("Testing Compiled AI Phases...")
+    random.seed(7)
+
+    # 1. Phases compile once per class into index-based tables
+    buggy = RaiderBuggy(0, 0)
+    graph = phase_graph(buggy, UNIVERSAL_FILLER_PHASES)
+    assert phase_graph(RaiderBuggy(5, 5), UNIVERSAL_FILLER_PHASES) is graph
+    harass, shoot, ram = graph.index["Harass"], graph.index["Shoot"], graph.index["Ram"]
+    assert graph.costs[ram] == 3 and graph.phase_named("Shoot")["behavior"] == "SHOOT"
+
+    # 2. Transitions follow the weights among phases the budget affords
+    picks = [graph.choose(harass, budget=5) for _ in range(2000)]
+    assert set(picks) == {shoot, ram} and 800 < picks.count(ram) < 1200
+    assert {graph.choose(harass, budget=2) for _ in range(50)} == {shoot}
+    # Nothing affordable: a filler phase
+    assert graph.choose(harass, budget=-1) in graph.filler_indices
+
+    # 3. One AI pass: enemies target the closest hostile in range, else the player
+    gs = GameState(selected_car_index=0, difficulty="Normal", difficulty_mods={"enemy_movement_jitter": 0},
+                   car_color_names=["white"], theme={"name": "t", "description": "d"},
+                   factions=copy.deepcopy(FACTION_DATA))
+    faction_a, faction_b = list(gs.factions)[:2]
+    gs.factions[faction_a]["relationships"] = {faction_b: "Hostile"}
+    gs.car_world_x, gs.car_world_y = 0.0, 500.0
+    hunter, near, far = RaiderBuggy(0, 0), RaiderBuggy(30, 0), RaiderBuggy(-60, 0)
+    loner = RaiderBuggy(300, 0)
+    hunter.faction_id = loner.faction_id = faction_a
+    near.faction_id = far.faction_id = faction_b
+    for enemy in (hunter, near, far, loner):
+        enemy.current_phase = graph.phases[harass]  # STRAFE, batched
+        enemy.phase_timer = 10
+    gs.active_enemies = [hunter, near, far, loner]
+    run_enemy_ai(gs, None, 1 / 30)
+    assert hunter.ai_state["target_entity"] is near
+    assert loner.ai_state["target_entity"] is None
+    # Strafing circles the target: velocity perpendicular to it
+    assert abs(hunter.vx) < 1e-9 and hunter.vy > 0
+    assert abs(loner.vx * (0 - 300) + loner.vy * (500 - 0)) < 1e-6
+    assert hunter.x == 0 and hunter.y > 0  # ...and moved afterwards
+    print("Compiled AI Phases Test Passed!")
+
+if __name__ == "__main__":
+    test_ai_phases()
@@ -0,0 +1,81 @@
+import copy
+import json
+import os
+import tempfile
+from car.game_state import GameState
+from car.data.factions import FACTION_DATA
+from car.logic import data_loader
+from car.world import World
+from car.world.world import MAX_BUILDING_TERRAIN_CITIES
+from car.data.terrain import TERRAIN_DATA
+from car.world.generation import get_buildings_in_city
+from car.logic.building_damage import damage_building, get_city_damage, is_building_destroyed
+
+def _game_state():
+    return GameState(selected_car_index=0, difficulty="Normal", difficulty_mods={},
+                     car_color_names=["white"], theme={"name": "t", "description": "d"},
+                     factions=copy.deepcopy(FACTION_DATA))
+
+def _inside(building):
+    return building["x"] + building["w"] / 2, building["y"] + building["h"] / 2
+
+def test_city_damage():
+    print("Testing City Damage State...")
+    gs = _game_state()
+    world = World(seed=42)
+    world.game_state = gs
+    buildings = get_buildings_in_city(0, 0)
+
+    # 1. Terrain comes from the per-city cache and turns to rubble when a building falls
+    x, y = _inside(buildings[1])
+    wall = world.get_terrain_at(x, y)
+    assert "building" in wall and world.get_terrain_at(x, y) is wall
+    damage_building(gs, (0, 0), 1, buildings[1], 10)
+    damage = gs.city_damage[(0, 0)]
+    assert damage.version == 1 and damage.is_damaged(1) and not damage.is_destroyed(1)
+    assert world.get_terrain_at(x, y) is wall  # Damage alone leaves the terrain as it was
+    damage_building(gs, (0, 0), 1, buildings[1], 10 ** 6)
+    assert is_building_destroyed(gs, (0, 0), 1) and damage.destroyed_count == 1
+    assert world.get_terrain_at(x, y) is TERRAIN_DATA["RUBBLE"]
+    assert damage_building(gs, (0, 0), 1, buildings[1], 5) == [] and damage.version == 2
+
+    # 2. Saves hold one compact record per city and load back to the same state.
+    # Loading reads the session data from temp/, so it runs in a scratch directory.
+    damage_building(gs, (0, 0), 2, buildings[2], 25)
+    data = json.loads(json.dumps(gs.to_dict()))
+    assert data["city_damage"] == [{"city": [0, 0], "destroyed": 2, "hp": [[2, damage.hp[2]]]}]
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        data_loader.reload_data()
+        try:
+            loaded = GameState.from_dict(data)
+            restored = loaded.city_damage[(0, 0)]
+            assert restored.destroyed == damage.destroyed and restored.hp[2] == damage.hp[2]
+            assert not restored.is_damaged(3)
+
+            # 3. Saves from before per-city records still load
+            data.pop("city_damage")
+            data["damaged_buildings"] = {"0,0,1": -50, "0,0,2": 100}
+            data["destroyed_buildings"] = ["0,0,1"]
+            legacy = GameState.from_dict(data).city_damage[(0, 0)]
+            assert legacy.is_destroyed(1) and legacy.hp[2] == 100 and not legacy.is_destroyed(2)
+            assert os.listdir(tmp) == []  # Nothing was written
+        finally:
+            os.chdir(cwd)
+            data_loader.reload_data()
+
+    # 4. A city's record is sized to its layout
+    other = get_city_damage(gs, (1, 0))
+    assert len(other.hp) == len(get_buildings_in_city(1, 0)) and other.destroyed == 0
+
+    # 5. The world keeps building terrain for a bounded number of cities
+    for grid_x in range(MAX_BUILDING_TERRAIN_CITIES + 10):
+        world.get_terrain_at(grid_x * world.city_spacing, 0)
+    world.get_terrain_at(x, y)
+    assert len(world._building_terrain) == MAX_BUILDING_TERRAIN_CITIES
+    assert next(reversed(world._building_terrain)) == (0, 0)
+    print("City Damage State Test Passed!")
+
+if __name__ == "__main__":
+    test_city_damage()
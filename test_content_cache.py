@@ -0,0 +1,41 @@
+from types import SimpleNamespace
+from car.logic.content_cache import (
+    cached_dialog, content_stamp, quest_key, quests_need_refresh, shop_dialog_key, stamp_content, store_dialog,
+)
+
+def _game_state():
+    return SimpleNamespace(faction_control={"rust": 60}, faction_reputation={"rust": 10},
+                           quest_cache={}, dialog_cache={}, content_stamps={})
+
+def test_content_cache():
+    print("Testing Generated Content Cache...")
+    gs = _game_state()
+
+    # 1. Dialog is fresh while the faction state stays in the same bucket
+    key = shop_dialog_key("city_1_0", "gas_station")
+    assert cached_dialog(gs, key, "rust") == (None, False)
+    store_dialog(gs, key, content_stamp(gs, "rust"), {"greeting": "Fill her up?", "no_cash": "No cash, no gas."})
+    gs.faction_reputation["rust"] = 20
+    dialog, fresh = cached_dialog(gs, key, "rust")
+    assert dialog["greeting"] == "Fill her up?" and fresh
+
+    # 2. ...and stale, but still served, once reputation crosses a bucket
+    gs.faction_reputation["rust"] = -30
+    dialog, fresh = cached_dialog(gs, key, "rust")
+    assert dialog is not None and not fresh
+
+    # 3. Quests: stale lists need a refresh; pending, missing and emptied ones don't
+    gs.quest_cache["city_1_0"] = ["quest"]
+    assert quests_need_refresh(gs, "city_1_0", "rust")  # never stamped, e.g. from an older save
+    stamp_content(gs, quest_key("city_1_0"), content_stamp(gs, "rust"))
+    assert not quests_need_refresh(gs, "city_1_0", "rust")
+    gs.faction_control["rust"] = 20
+    assert quests_need_refresh(gs, "city_1_0", "rust")
+    gs.quest_cache["city_2_0"] = "pending"
+    gs.quest_cache["city_3_0"] = []
+    assert not any(quests_need_refresh(gs, city_id, "rust") for city_id in ("city_2_0", "city_3_0", "city_4_0"))
+
+    print("Generated Content Cache Test Passed!")
+
+if __name__ == "__main__":
+    test_content_cache()
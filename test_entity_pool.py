@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+from car.logic.entity_pool import EntityPool
+from car.logic.spawning import despawn_distant_entities
+from car.logic.world_snapshot import SpriteRegistry
+from car.entities.vehicles.raider_buggy import RaiderBuggy
+from car.entities.characters.cow import Cow
+
+def test_entity_pool():
+    print("Testing Entity Pool...")
+    pool = EntityPool()
+
+    # 1. Entities stamped from the pool match a freshly constructed one
+    first = pool.acquire(RaiderBuggy, 10, 20)
+    second = pool.acquire(RaiderBuggy, 30, 40)
+    reference = RaiderBuggy(30, 40)
+    assert (second.x, second.y) == (30, 40)
+    assert (second.width, second.height) == (reference.width, reference.height)
+    assert second.durability == reference.durability and second.name == reference.name
+    assert second.art is first.art and second.phases is first.phases
+    assert second.entity_id != first.entity_id
+
+    # 2. A released entity is reused with its per-entity state reset
+    first.durability = 1
+    first.ai_state["ram_substate"] = "charge"
+    first.faction_id = "rust"
+    first.custom_flag = True
+    pool.release(first)
+    pool.release(first)  # a second release is ignored
+    reused = pool.acquire(RaiderBuggy, 50, 60)
+    assert reused is first and pool.reused == 1
+    assert reused.durability == reference.durability and reused.ai_state == {}
+    assert reused.faction_id is None and not hasattr(reused, "custom_flag")
+    assert reused.current_phase is reused.phases[0]
+    assert reused.ai_state is not second.ai_state
+
+    # 3. Entities the pool didn't hand out are never kept
+    pool.release(reference)
+    assert pool.acquire(RaiderBuggy, 0, 0) is not reference
+
+    # 4. A reused entity gets a fresh sprite in the snapshot registry, with its new name
+    registry = SpriteRegistry()
+    old_sprite, _ = registry.entity_sprite(reused)
+    assert registry.entity_sprite(reused) == (old_sprite, None)
+    pool.release(reused)
+    renamed = pool.acquire(RaiderBuggy, 0, 0)
+    renamed.name = "Rust Wraith"
+    sprite_id, payload = registry.entity_sprite(renamed)
+    assert renamed is reused and sprite_id != old_sprite and payload["name"] == "Rust Wraith"
+
+    # 5. Despawning is in place and budgeted per call
+    fauna = [Cow(1000 + i, 0) for i in range(5)] + [Cow(5, 5)]
+    active_fauna = list(fauna)
+    gs = SimpleNamespace(car_world_x=0.0, car_world_y=0.0, despawn_radius=300, combat_enemy=None,
+                         tracked_entity=None, active_enemies=[], active_fauna=active_fauna,
+                         active_obstacles=[], active_turrets=[])
+    despawn_distant_entities(gs, budget=3)
+    assert gs.active_fauna is active_fauna and len(active_fauna) == 3
+    despawn_distant_entities(gs, budget=3)
+    assert active_fauna == [fauna[-1]]
+    print("Entity Pool Test Passed!")
+
+if __name__ == "__main__":
+    test_entity_pool()
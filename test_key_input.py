@@ -0,0 +1,74 @@
+from car.common.key_input import InputLatency, KeyStateTable, install_release_events
+from car.common.messages import KeyRelease
+from car.screens.world import GAMEPLAY_KEYS
+
+def test_key_input():
+    print("Testing Key State Input...")
+
+    # 1. Without key-up events a key is held while repeats keep arriving
+    keys = KeyStateTable(("a", "space"), repeat_timeout=0.15)
+    assert keys.press("a", 1.0) and not keys.press("x", 1.0)
+    assert keys.sample(1.05) == 1.0 and keys.held("a")
+    keys.press("a", 1.1)  # A repeat: held on, and nothing new to report
+    assert keys.sample(1.2) is None and keys.held("a")
+    keys.sample(1.3)
+    assert not keys.held("a") and not keys.held("space")
+
+    # 2. Once a key reports a release, it stays down until its key-up
+    keys.press("space", 1.9)
+    keys.release("space", 1.95)
+    assert keys.releases_reported
+    keys.press("space", 2.0)
+    keys.sample(5.0)
+    assert keys.held("space")
+    keys.release("space", 5.5)
+    assert keys.sample(5.6) == 5.5 and not keys.held("space")
+    # A release reported with a modifier held still lets go of the base key
+    keys.press("space", 5.7)
+    keys.release("shift+space", 5.8)
+    keys.sample(5.9)
+    assert not keys.held("space")
+    keys.press("a", 6.0)
+    keys.clear()
+    assert not keys.held("a") and keys.sample(6.1) is None
+
+    # 3. Keys that never report a key-up (plain text keys) still time out
+    # after another key (an arrow) has reported one
+    keys = KeyStateTable(GAMEPLAY_KEYS, repeat_timeout=0.15)
+    keys.press("a", 1.0)
+    keys.press("right", 1.0)
+    keys.release("right", 1.05)
+    keys.sample(1.1)
+    assert keys.held("a") and not keys.held("right")
+    keys.sample(1.3)
+    assert not keys.held("a")
+    keys.press("right", 1.4)
+    keys.sample(3.0)
+    assert keys.held("right")
+
+    # 4. The parser turns kitty release reports into KeyRelease; repeats stay key presses
+    assert install_release_events()
+    from textual._xterm_parser import XTermParser
+    parser = XTermParser()
+    released = list(parser.feed("\x1b[32;1:3u"))
+    assert len(released) == 1 and isinstance(released[0], KeyRelease) and released[0].key == "space"
+    repeated = list(parser.feed("\x1b[1;1:2D"))
+    assert [(type(e).__name__, e.key) for e in repeated] == [("Key", "left")]
+    assert [e.key for e in parser.feed("\x1b[97u")] == ["a"]
+    shifted = list(parser.feed("\x1b[97;2:3u"))
+    assert isinstance(shifted[0], KeyRelease)
+    table = KeyStateTable(("a",))
+    table.press("a", 1.0)
+    table.release(shifted[0].key, 1.1)
+    assert not table.held("a")
+
+    # 5. Latency is summarised per report
+    latency = InputLatency()
+    assert latency.summary(False) == "Input -- (repeat)"
+    latency.add(0.010)
+    latency.add(0.030)
+    assert latency.summary(True) == "Input 20ms (max 30ms, key-up)"
+    print("Key State Input Test Passed!")
+
+if __name__ == "__main__":
+    test_key_input()
@@ -0,0 +1,130 @@
+import asyncio
+import sys
+import threading
+import time
+from types import SimpleNamespace
+from car.logic.llm_inference import (
+    add_call_observer, agenerate_json, agenerate_text, generate_json, remove_call_observer, stream_text,
+)
+
+class FakePipeline:
+    """Streams a canned response a token at a time, noting where and how it ran."""
+
+    def __init__(self, tokens, delay=0.0, usage=None):
+        self.tokens = tokens
+        self.delay = delay
+        self.usage = usage
+        self.threads = set()
+        self.running = 0
+        self.max_running = 0
+        self.calls = 0
+        self.tokens_sent = 0
+
+    def create_chat_completion(self, messages, max_tokens, temperature, response_format=None,
+                               grammar=None, stream=False):
+        assert stream
+        self.calls += 1
+        self.threads.add(threading.current_thread().name)
+        return self._chunks()
+
+    def _chunks(self):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            for token in self.tokens:
+                time.sleep(self.delay)
+                self.tokens_sent += 1
+                yield {"choices": [{"delta": {"content": token}}]}
+            if self.usage:
+                yield {"choices": [], "usage": self.usage}
+        finally:
+            self.running -= 1
+
+def _cli_app(code):
+    # The "custom" preset passes the prompt as the last argument; the code has no spaces.
+    return SimpleNamespace(generation_mode="gemini_cli", cli_preset="custom",
+                           custom_cli_command=sys.executable, custom_cli_args=f"-c {code}")
+
+def test_llm_backends():
+    print("Testing LLM Backends...")
+
+    # 1. Local requests stream from one inference thread, one at a time
+    pipeline = FakePipeline(["Hello", ", ", "driver."], delay=0.005)
+    app = SimpleNamespace(generation_mode="local", llm_pipeline=pipeline)
+
+    async def concurrent():
+        return await asyncio.gather(*(agenerate_text(app, f"greet {i}") for i in range(4)))
+
+    assert asyncio.run(concurrent()) == ["Hello, driver."] * 4
+    assert pipeline.threads == {"llm-inference"} and pipeline.max_running == 1
+
+    async def streamed():
+        return [text async for text in stream_text(app, "greet")]
+
+    assert asyncio.run(streamed()) == ["Hello", ", ", "driver."]
+
+    # The prompt token count is the model's own when it reports usage, else an estimate
+    calls = []
+    add_call_observer(calls.append)
+    try:
+        asyncio.run(agenerate_text(app, "greet"))
+        app.llm_pipeline = FakePipeline(["Hi."], usage={"prompt_tokens": 321, "completion_tokens": 2})
+        assert asyncio.run(agenerate_text(app, "greet")) == "Hi."
+    finally:
+        remove_call_observer(calls.append)
+    assert 0 < calls[0]["prompt_tokens"] < 50 and calls[1]["prompt_tokens"] == 321
+
+    # 2. Cancelling stops a running request at its next token and drops a queued one
+    pipeline = FakePipeline(["tok "] * 200, delay=0.01)
+    app.llm_pipeline = pipeline
+
+    async def cancelled():
+        running = asyncio.ensure_future(agenerate_text(app, "long"))
+        queued = asyncio.ensure_future(agenerate_text(app, "queued"))
+        await asyncio.sleep(0.1)
+        running.cancel()
+        queued.cancel()
+        await asyncio.gather(running, queued, return_exceptions=True)
+        await asyncio.sleep(0.1)
+
+    asyncio.run(cancelled())
+    assert pipeline.calls == 1 and pipeline.tokens_sent < 50
+
+    # 3. The blocking wrapper works from a worker thread, and from inside an event loop
+    app.llm_pipeline = FakePipeline(['```json\n{"name": ', '"Rust Bucket"}\n```'])
+    results = []
+    worker = threading.Thread(target=lambda: results.append(generate_json(app, "name a car")))
+    worker.start()
+    worker.join()
+    assert results == [{"name": "Rust Bucket"}]
+
+    async def on_loop():
+        return generate_json(app, "name a car")
+
+    assert asyncio.run(on_loop()) == {"name": "Rust Bucket"}
+    assert asyncio.run(on_loop()) == {"name": "Rust Bucket"}
+    # ...on one long-lived helper thread, not a new one per call
+    assert [t.name for t in threading.enumerate() if t.name.startswith("llm-blocking")] == ["llm-blocking_0"]
+
+    # 4. The CLI tool runs as an asyncio subprocess
+    echo = _cli_app("print(__import__('sys').argv[-1])")
+    assert asyncio.run(agenerate_text(echo, "Welcome to the Junction")) == "Welcome to the Junction"
+    assert asyncio.run(agenerate_json(echo, 'Sure: {"themes": []}')) == {"themes": []}
+    assert asyncio.run(agenerate_text(_cli_app("exit(3)"), "fail")) is None
+
+    # 5. Cancelling a CLI call kills the tool
+    sleeper = _cli_app("__import__('time').sleep(30)")
+
+    async def timed_out():
+        try:
+            await asyncio.wait_for(agenerate_text(sleeper, "wait"), 0.5)
+        except asyncio.TimeoutError:
+            return True
+
+    start = time.perf_counter()
+    assert asyncio.run(timed_out())
+    assert time.perf_counter() - start < 5
+    print("LLM Backends Test Passed!")
+
+if __name__ == "__main__":
+    test_llm_backends()
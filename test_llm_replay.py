@@ -0,0 +1,73 @@
+import asyncio
+import copy
+import os
+import tempfile
+from types import SimpleNamespace
+from car.data.factions import FACTION_DATA
+from car.data.quests import KillCountObjective
+from car.data.weapons import WEAPONS_DATA
+from car.game_state import GameState
+from car.logic.item_validation import validate_generated_item
+from car.logic.llm_inference import add_call_observer, generate_json, remove_call_observer
+from car.logic.llm_item_generator import generate_item_from_llm
+from car.logic.llm_quest_generator import generate_quest_from_llm
+from car.logic.llm_replay import ReplayStore, prompt_key, synthesize_response
+from car.logic.llm_schemas import FACTION_SCHEMA, THEME_SCHEMA
+
+def test_llm_replay():
+    print("Testing LLM Replay...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "responses.jsonl")
+        app = SimpleNamespace(generation_mode="replay", replay_store=path, replay_latency="none")
+        calls = []
+        add_call_observer(calls.append)
+        try:
+            # 1. With nothing recorded, responses are synthesized from the schema
+            factions = generate_json(app, "make factions", json_schema=FACTION_SCHEMA)
+            assert len(factions) == 3
+            assert all(f["hub_city_coordinates"] == [0, 0] for f in factions.values())
+            assert calls[-1]["replay"] == "synthesized"
+            # Synthesized responses are deterministic per prompt
+            assert synthesize_response("json", "p", THEME_SCHEMA) == synthesize_response("json", "p", THEME_SCHEMA)
+
+            # 2. A recorded response is served back for the same prompt
+            store = ReplayStore(path)
+            store.record("json", "make themes", THEME_SCHEMA, '```json\n{"themes": []}\n```', "local", 1200.0)
+            app.replay_store = os.path.join(tmp, "reloaded.jsonl")
+            os.replace(path, app.replay_store)
+            assert generate_json(app, "make themes", json_schema=THEME_SCHEMA) == {"themes": []}
+            assert calls[-1]["replay"] == "hit"
+
+            # 3. An unrecorded prompt gets the latest response with the same schema
+            assert generate_json(app, "other themes", json_schema=THEME_SCHEMA) == {"themes": []}
+            assert calls[-1]["replay"] == "same_schema"
+
+            # 4. The store survives a reload from disk
+            reloaded = ReplayStore(app.replay_store)
+            entry = reloaded.lookup(prompt_key("json", "make themes", THEME_SCHEMA))
+            assert entry["backend"] == "local" and entry["elapsed_ms"] == 1200.0
+            assert entry["raw"].startswith("```json")
+
+            # 5. Synthesized items and quests pass the generators' validation
+            app.replay_store = os.path.join(tmp, "empty.jsonl")
+            theme = {"name": "Rust", "description": "Everything is rusting."}
+            base_item_id = next(iter(WEAPONS_DATA))
+            item = generate_item_from_llm(app, theme, 1, base_item_id)
+            assert calls[-1]["replay"] == "synthesized"
+            assert item is not None and item["base_item_id"] == base_item_id
+            assert validate_generated_item(item)
+
+            factions = copy.deepcopy(FACTION_DATA)
+            gs = GameState(selected_car_index=0, difficulty="Normal", difficulty_mods={},
+                           car_color_names=["white"], theme=theme, factions=factions)
+            quest = asyncio.run(generate_quest_from_llm(gs, next(iter(factions)), app, factions))
+            assert calls[-1]["replay"] == "synthesized"
+            assert not quest.name.startswith("Fallback")
+            assert [type(o) for o in quest.objectives] == [KillCountObjective]
+            assert quest.objectives[0].target_count == 3
+        finally:
+            remove_call_observer(calls.append)
+    print("LLM Replay Test Passed!")
+
+if __name__ == "__main__":
+    test_llm_replay()
@@ -0,0 +1,83 @@
+import gzip
+import json
+import logging
+import os
+import tempfile
+from car.common.log_pipeline import (
+    PayloadStore, RateLimitFilter, log_payload, setup_logging, shutdown_logging,
+)
+
+def _record(name, msg, created, level=logging.INFO, **extra):
+    record = logging.LogRecord(name, level, "game.py", 10, msg, None, None)
+    record.created = created
+    record.__dict__.update(extra)
+    return record
+
+def test_log_pipeline():
+    print("Testing Logging Pipeline...")
+
+    # 1. INFO is rate-limited per logger; warnings always pass
+    limiter = RateLimitFilter(limits={"spam": (1.0, 3)})
+    passed = [limiter.filter(_record("spam", f"m{i}", 0.0)) for i in range(10)]
+    assert passed.count(True) == 3
+    assert limiter.filter(_record("spam", "bad", 0.0, level=logging.WARNING))
+    assert limiter.filter(_record("other", "fine", 0.0))
+    later = _record("spam", "again", 1.0)
+    assert limiter.filter(later) and "[7 earlier messages rate-limited]" in later.msg
+    # A payload is never dropped, even once its logger is over the limit
+    assert not limiter.filter(_record("spam", "m", 1.0))
+    assert limiter.filter(_record("spam", "prompt", 1.0, payload="text", payload_id="1", payload_kind="llm"))
+
+    # 2. Sampling keeps one record in n per call site
+    sampler = RateLimitFilter()
+    kept = [sampler.filter(_record("tick", "t", i * 0.1, sample_every=5)) for i in range(20)]
+    assert kept.count(True) == 4
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 3. The payload store rotates by size and keeps a fixed number of files
+        path = os.path.join(tmp, "p.jsonl.gz")
+        store = PayloadStore(path, segment_bytes=200, segments=2)
+        for i in range(10):
+            store.write({"id": i, "text": "x" * 60})
+        store.close()
+        assert sorted(os.listdir(tmp)) == ["p.1.jsonl.gz", "p.jsonl.gz"]
+        with gzip.open(path, "rt") as f:
+            assert [json.loads(line)["id"] for line in f] == [8, 9]
+
+        # 4. Each session starts a fresh segment, so the store stays bounded across sessions
+        for session in range(3):
+            store = PayloadStore(path, segment_bytes=1000, segments=2)
+            store.write({"id": session, "text": "x" * 60})
+            store.close()
+        assert sorted(os.listdir(tmp)) == ["p.1.jsonl.gz", "p.jsonl.gz"]
+        with gzip.open(path, "rt") as f:
+            assert [json.loads(line)["id"] for line in f] == [2]
+
+        # 5. Payloads go to the store by ID; the log keeps one line, flushed at shutdown
+        log_path = os.path.join(tmp, "game.log")
+        payload_path = os.path.join(tmp, "payloads.jsonl.gz")
+        root = logging.getLogger()
+        old_handlers, old_level = root.handlers[:], root.level
+        root.handlers = []
+        try:
+            setup_logging(log_path, payload_path=payload_path)
+            for i in range(400):  # A hot module logger uses up its own budget only
+                logging.getLogger("car.hot").info("frame %d", i)
+            response = '{"quest": "' + "long " * 2000 + '"}'
+            payload_id = log_payload("RAW LOCAL LLM RESPONSE", response, "llm_response")
+            logging.info("after the payload")
+            shutdown_logging()
+        finally:
+            root.handlers, root.level = old_handlers, old_level
+        with open(log_path) as f:
+            lines = f.read().splitlines()
+        assert 200 <= sum("frame" in line for line in lines) < 400  # The burst, plus any refill meanwhile
+        lines = [line for line in lines if "frame" not in line]
+        assert len(lines) == 2 and payload_id in lines[0] and len(lines[0]) < 300
+        with gzip.open(payload_path, "rt") as f:
+            entry = json.loads(f.readline())
+        assert entry["id"] == payload_id and entry["kind"] == "llm_response" and entry["text"] == response
+    print("Logging Pipeline Test Passed!")
+
+if __name__ == "__main__":
+    test_log_pipeline()
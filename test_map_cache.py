@@ -0,0 +1,64 @@
+import copy
+from textual.geometry import Size
+from car.game_state import GameState
+from car.data.factions import FACTION_DATA
+from car.data.quests import Quest
+from car.world import World
+from car.world.generation import get_buildings_in_city
+from car.logic.building_damage import damage_building
+from car.widgets.map_view import MapView
+
+class _FixedMapView(MapView):
+    @property
+    def size(self):
+        return Size(100, 36)
+
+def test_map_cache():
+    print("Testing Map Layer Cache...")
+    gs = GameState(selected_car_index=0, difficulty="Normal", difficulty_mods={},
+                   car_color_names=["white"], theme={"name": "t", "description": "d"},
+                   factions=copy.deepcopy(FACTION_DATA))
+    gs.car_world_x, gs.car_world_y = 10.0, 5.0
+    world = World(seed=42)
+    world.game_state = gs
+    view = _FixedMapView(gs, world)
+    view._generate_map_chunk()
+    view._build_node_list()
+
+    # 1. City map: blinking swaps between two finished frames, without redrawing
+    view.city_mode = True
+    first = view.render()
+    layer = view._layer
+    view.blink_state = False
+    blink_off = view.render()
+    view.blink_state = True
+    assert view.render() is first and view._layer is layer
+    assert "●" in first.plain and "●" not in blink_off.plain
+
+    # 2. Damage bumps the city's damage version and redraws the layer
+    buildings = get_buildings_in_city(0, 0)
+    damage_building(gs, (0, 0), 0, buildings[0], 10 ** 6)
+    assert gs.city_damage[(0, 0)].version == 1
+    assert view.render() is not first and view._layer is not layer
+    assert "RUBBLE" in view.render().plain
+
+    # 3. A quest for the city flashes City Hall's border only while blinking
+    hall = next(i for i, b in enumerate(buildings) if b.get("type") == "city_hall")
+    assert hall != 0
+    gs.active_quests = [Quest("q", "d", [], {}, city_id=(0, 0))]
+    view.render()
+    flashing = [(x, y) for x, y, _, style in view._layer.blink_cells if style.color.name == "yellow"]
+    assert flashing and "!" in view.render().plain
+
+    # 4. World map: the layer follows the waypoint and selection
+    view.city_mode = False
+    view.render()
+    layer = view._layer
+    view.render()
+    assert view._layer is layer
+    gs.waypoint = {"x": 400, "y": 400, "name": "Depot"}
+    assert "Depot" in view.render().plain and view._layer is not layer
+    print("Map Layer Cache Test Passed!")
+
+if __name__ == "__main__":
+    test_map_cache()
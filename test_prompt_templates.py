@@ -0,0 +1,45 @@
+import os
+import tempfile
+from car.logic.prompt_templates import PromptTemplate, SectionCache, estimate_tokens
+from car.logic.session_store import SECTION_FACTIONS, SessionStore
+
+def test_prompt_templates():
+    print("Testing Prompt Templates...")
+    # 1. Placeholders are filled in one pass; unknown ones are left as written
+    template = PromptTemplate("Theme: {{ theme }}. Again: {{theme}}. Later: {{ later }}")
+    assert template.fields == {"theme", "later"}
+    assert template.render({"theme": "Dust"}) == "Theme: Dust. Again: Dust. Later: {{ later }}"
+
+    # 2. Callable values are only built when used, and only once per render
+    built = []
+    def section():
+        built.append(1)
+        return "Ash"
+    assert template.render({"theme": section, "unused": lambda: built.append("unused")}).startswith("Theme: Ash. Again: Ash.")
+    assert built == [1]
+
+    # 3. Values are not re-scanned for placeholders
+    assert PromptTemplate("{{ a }}").render({"a": "{{ b }}", "b": "x"}) == "{{ b }}"
+
+    # 4. Sections are reused until the store version changes
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SessionStore(os.path.join(tmp, "session.db"))
+        cache = SectionCache()
+        factions = {}
+        builds = []
+        def get():
+            return cache.get("world_state", (factions,), store.version(SECTION_FACTIONS), lambda: builds.append(1) or "report")
+        get(); get()
+        assert builds == [1] and cache.hits == 1
+        store.set_factions({})
+        get()
+        assert builds == [1, 1]
+        store.clear_cache()
+        get()
+        assert builds == [1, 1, 1]
+
+    assert estimate_tokens("") == 0 and estimate_tokens("a" * 400) == 100
+    print("Prompt Templates Test Passed!")
+
+if __name__ == "__main__":
+    test_prompt_templates()
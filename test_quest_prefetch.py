@@ -0,0 +1,45 @@
+import copy
+from types import SimpleNamespace
+from car.data.factions import FACTION_DATA
+from car.data.game_constants import CITY_SPACING
+from car.logic.data_loader import _normalize_hub_coordinates
+from car.logic.quest_prefetch import city_id_for, plan_prefetch
+from car.world.generation import does_city_exist_at
+
+def _game_state(**overrides):
+    factions = copy.deepcopy(FACTION_DATA)
+    _normalize_hub_coordinates(factions)
+    values = dict(car_world_x=0.0, car_world_y=0.0, car_angle=0.0, car_speed=0.0, waypoint=None,
+                  active_quests=[], selected_quest_index=0, factions=factions, visited_cities={(0, 0)})
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+def test_quest_prefetch():
+    print("Testing Quest Prefetch Planner...")
+    seed = 1234
+    gs = _game_state()
+
+    # 1. Only cities that exist are planned, the current city first, and at most `limit`
+    plan = plan_prefetch(gs, seed, limit=4)
+    assert plan[0] == (city_id_for(0, 0), 0, 0)
+    assert 1 < len(plan) <= 4
+    assert all(does_city_exist_at(x, y, seed, gs.factions) for _, x, y in plan)
+
+    # 2. Driving east ranks the nearest eastern city above the nearest western one
+    def ranking(game_state):
+        return [(x, y) for _, x, y in plan_prefetch(game_state, seed, limit=25)]
+    standing = ranking(gs)
+    east = [c for c in standing if c[0] > 0]
+    west = [c for c in standing if c[0] < 0]
+    assert east and west
+    driving_east = ranking(_game_state(car_speed=10.0, car_angle=0.0))
+    assert min(driving_east.index(c) for c in east) < min(driving_east.index(c) for c in west)
+
+    # 3. A waypoint in the west brings the western cities forward
+    waypoint = {"x": -3 * CITY_SPACING, "y": 0, "name": "Far West"}
+    toward_waypoint = ranking(_game_state(waypoint=waypoint))
+    assert min(toward_waypoint.index(c) for c in west) < min(toward_waypoint.index(c) for c in east)
+    print("Quest Prefetch Planner Test Passed!")
+
+if __name__ == "__main__":
+    test_quest_prefetch()
@@ -0,0 +1,55 @@
+import json
+import os
+import tempfile
+from car.logic import data_loader
+from car.logic.session_store import SessionStore, SESSION_STORE_FILE, migrate_legacy_files
+
+FACTION = {
+    "name": "Desert Rats",
+    "hub_city_coordinates": (40, -20),
+    "relationships": {"the_junction": "Neutral"},
+    "units": ["RaiderBuggy"],
+}
+
+def test_session_store():
+    print("Testing Session Store...")
+    directory = tempfile.mkdtemp()
+
+    # 1. Legacy slot files are migrated without executing them
+    with open(os.path.join(directory, "factions.py"), "w") as f:
+        f.write("FACTION_DATA = " + repr({"desert_rats": FACTION}))
+    with open(os.path.join(directory, "quest_log.json"), "w") as f:
+        json.dump([{"name": "First Blood"}], f)
+    assert migrate_legacy_files(directory)
+
+    # 2. A fresh store instance reads the migrated data from disk
+    store = SessionStore(os.path.join(directory, SESSION_STORE_FILE))
+    factions = store.get_factions()
+    assert factions["desert_rats"]["name"] == "Desert Rats"
+    assert store.get_quest_log() == [{"name": "First Blood"}]
+
+    # 3. Single-faction writes are validated and leave other records alone
+    assert not store.put_faction("broken", {"name": "No Hub"})
+    assert store.put_faction("convoy", {**FACTION, "name": "The Convoy"})
+    store.append_quest_log({"name": "Second Run"})
+
+    reopened = SessionStore(store.path)
+    assert set(reopened.get_factions()) == {"desert_rats", "convoy"}
+    assert [q["name"] for q in reopened.get_quest_log()] == ["First Blood", "Second Run"]
+
+    # 4. Saving a new session reports records that failed validation
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        assert data_loader.save_session_data({"desert_rats": FACTION}, {"cities": {}})
+        assert not data_loader.save_session_data({"desert_rats": FACTION}, {"cities": []})
+        assert not data_loader.save_session_data({"broken": {"name": "No Hub"}}, {"cities": {}})
+        assert set(data_loader.get_faction_data()) == {"desert_rats"}
+    finally:
+        os.chdir(cwd)
+        data_loader.reload_data()
+
+    print("Session Store Test Passed!")
+
+if __name__ == "__main__":
+    test_session_store()
@@ -0,0 +1,112 @@
+import copy
+import math
+import random
+import time
+from car.game_state import GameState
+from car.data.factions import FACTION_DATA
+from car.data.game_constants import CITY_SPACING, DESPAWN_RADIUS, SAFE_ZONE_RADIUS
+from car.world import World
+from car.world.generation import get_buildings_in_city
+from car.logic.building_damage import damage_building
+from car.logic.spawning import AliasTable, SpawnCells, SpawnRegion, spawn_fauna, _terrain_class
+
+def _game_state():
+    return GameState(selected_car_index=0, difficulty="Normal", difficulty_mods={},
+                     car_color_names=["white"], theme={"name": "t", "description": "d"},
+                     factions=copy.deepcopy(FACTION_DATA))
+
+def test_spawn_region():
+    print("Testing Spawn Region...")
+    random.seed(5)
+
+    # 1. The alias table draws in proportion to the weights
+    table = AliasTable([1, 0, 3])
+    counts = [0, 0, 0]
+    for _ in range(8000):
+        counts[table.sample()] += 1
+    assert counts[1] == 0 and 2.5 < counts[2] / counts[0] < 3.5
+
+    # 2. Every pick, wherever the player is, is on open ground inside the spawn ring
+    gs = _game_state()
+    world = World(seed=7)
+    world.game_state = gs
+    region = SpawnRegion(SpawnCells())
+    gs.car_world_x, gs.car_world_y = CITY_SPACING + 30.0, 60.0  # At the edge of a city
+    start = time.perf_counter()
+    region.update(gs, world)
+    build_ms = (time.perf_counter() - start) * 1000
+    center = (gs.car_world_x, gs.car_world_y)
+    for step in range(400):
+        angle = step * 0.7
+        gs.car_world_x = center[0] + 45 * math.cos(angle)
+        gs.car_world_y = center[1] + 45 * math.sin(angle)
+        region.update(gs, world)
+        x, y = region.sample()
+        assert world.get_terrain_at(x, y).get("passable", True)
+        dist = math.hypot(x - gs.car_world_x, y - gs.car_world_y)
+        assert SAFE_ZONE_RADIUS < dist < DESPAWN_RADIUS
+    gs.car_world_x, gs.car_world_y = center
+    region.update(gs, world)
+
+    # 3. Partitions: picks keep to the terrain class and faction asked for
+    for _ in range(100):
+        x, y = region.sample(terrain_class="city")
+        assert _terrain_class(x, y) == "city"
+    faction_id = region.faction_at(gs, CITY_SPACING, 0)
+    x, y = region.sample(faction_id=faction_id)
+    assert region.faction_at(gs, x, y) == faction_id
+    assert region.sample(faction_id="no_such_faction") == (None, None)
+
+    # 4. Crossing into the next tile builds only the tiles coming into reach
+    tiles = dict(region._tiles)
+    tile_size = region.spawn_cells.tile_size
+    gs.car_world_x += tile_size
+    start = time.perf_counter()
+    region.update(gs, world)
+    move_ms = (time.perf_counter() - start) * 1000
+    kept = [key for key in region._tiles if key in tiles]
+    assert all(region._tiles[key] is tiles[key] for key in kept)
+    assert 0 < len(region._tiles) - len(kept) < len(kept) / 4
+
+    # 5. The same seed draws the same points however the player got there
+    def draws(path):
+        fresh = SpawnRegion(SpawnCells())
+        for px, py in path:
+            gs.car_world_x, gs.car_world_y = px, py
+            fresh.update(gs, world)
+        random.seed(11)
+        return [fresh.sample() for _ in range(20)]
+
+    here = (gs.car_world_x, gs.car_world_y)
+    assert draws([here]) == draws([(here[0] - 3 * tile_size, here[1]), here])
+
+    # 6. Cells free up when a building is destroyed
+    cells = SpawnCells()
+    buildings = get_buildings_in_city(0, 0)
+    b = buildings[0]
+    inside = (b["x"] + b["w"] / 2, b["y"] + b["h"] / 2)
+    assert cells.point_at(world, *inside) is None
+    gs.car_world_x, gs.car_world_y = inside[0] + 100, inside[1]
+    size = region.spawn_cells.cell_size
+    cell_center = ((inside[0] // size + 0.5) * size, (inside[1] // size + 0.5) * size)
+
+    def region_cells():
+        region.update(gs, world)
+        return {(cx, cy) for partitions in region._tiles.values()
+                for cell_list in partitions.values() for cx, cy, _ in cell_list}
+
+    assert cell_center not in region_cells()
+    damage_building(gs, (0, 0), 0, b, 10 ** 6)
+    assert cells.point_at(world, *inside) is not None
+    assert cell_center in region_cells()  # The region rebuilt that city's tiles
+
+    # 7. Fauna keep to the wilds
+    gs.car_world_x, gs.car_world_y = 400.0, 400.0
+    for _ in range(10):
+        spawn_fauna(gs, world, is_initial_spawn=True)
+    assert len(gs.active_fauna) == 10
+    assert all(_terrain_class(f.x, f.y) != "city" for f in gs.active_fauna)
+    print(f"Spawn Region Test Passed! (region built in {build_ms:.1f} ms, tile crossing {move_ms:.1f} ms)")
+
+if __name__ == "__main__":
+    test_spawn_region()
@@ -0,0 +1,68 @@
+import copy
+import math
+from car.game_state import GameState
+from car.data.factions import FACTION_DATA
+from car.entities.weapon import Weapon
+from car.entities.equipment import Equipment
+from car.logic.weapon_systems import update_weapon_systems
+
+class _Silent:
+    def play_sfx(self, name):
+        pass
+
+def _game_state():
+    return GameState(selected_car_index=0, difficulty="Normal", difficulty_mods={},
+                     car_color_names=["white"], theme={"name": "t", "description": "d"},
+                     factions=copy.deepcopy(FACTION_DATA))
+
+def test_stat_blocks():
+    print("Testing Resolved Stat Blocks...")
+
+    # 1. A weapon resolves its stats once, and again only when its modifiers are replaced
+    shotgun = Weapon("wep_shotgun", modifiers={"damage_boost": 1.5, "special_effect": "explosive_rounds"})
+    stats = shotgun.stats
+    assert shotgun.stats is stats and shotgun.damage == shotgun.base_stats["power"] * 1.5
+    assert len(stats.pellet_offsets) == 5 and stats.pellet_offsets[2] == 0
+    assert math.isclose(stats.pellet_offsets[-1], shotgun.base_stats["spread_angle"] / 2)
+    assert stats.projectile_char == "*"
+    shotgun.modifiers = {}
+    assert shotgun.stats is not stats and shotgun.damage == shotgun.base_stats["power"]
+
+    # 2. Equipment bonuses are cached the same way
+    tank = Equipment("eq_fuel_tank", modifiers={"fuel_capacity_boost": 1.2})
+    assert tank.stat_bonuses is tank.stat_bonuses
+
+    # 3. Player stats resolve from the base stats, so repeated calls don't compound
+    gs = _game_state()
+    base_rate = gs.gas_consumption_rate
+    turbo = Equipment("eq_turbo_charger")
+    gs.equipped_equipment["engine"] = turbo
+    gs.apply_level_bonuses()
+    block = gs.player_stats
+    speed, rate = gs.max_speed, gs.gas_consumption_rate
+    assert math.isclose(rate, base_rate * 1.10)
+    gs.player_stats = gs.player_stats._replace(key=())  # Force a second resolution
+    gs.apply_level_bonuses()
+    assert gs.max_speed == speed and gs.gas_consumption_rate == rate
+    gs.apply_level_bonuses()
+    assert gs.player_stats.key == block.key
+
+    # 4. Levelling up raises the caps and keeps the damage already taken
+    gs.current_durability -= 10
+    gs.player_level = 3
+    gs.apply_level_bonuses()
+    assert gs.max_speed > speed and gs.current_durability == gs.max_durability - 10
+
+    # 5. Firing reads the stat block: one projectile per pellet, at the weapon's speed
+    point = next(iter(gs.mounted_weapons))
+    gs.mounted_weapons = {point: Weapon("wep_shotgun")}
+    gs.weapon_enabled[point] = True
+    gs.ammo_counts[gs.mounted_weapons[point].ammo_type] = 10
+    gs.actions["fire"] = True
+    update_weapon_systems(gs, _Silent())
+    fired = [p for p in gs.active_particles if p[9] == "player"]
+    assert len(fired) == 5 and all(p[3] == gs.mounted_weapons[point].stats.projectile_speed for p in fired)
+    print("Resolved Stat Blocks Test Passed!")
+
+if __name__ == "__main__":
+    test_stat_blocks()
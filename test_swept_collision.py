@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+from car.logic.swept_collision import traverse_cells, first_terrain_hit, first_entity_hit, sweep_box
+
+WALL = {"passable": False}
+GROUND = {"passable": True}
+
+class ThinWallWorld:
+    """A single one-cell-thick wall at x in [10, 11)."""
+    def get_terrain_at(self, x, y):
+        return WALL if 10 <= x < 11 else GROUND
+
+def test_swept_collision():
+    print("Testing Swept Collision...")
+    world = ThinWallWorld()
+
+    # 1. The DDA visits every cell along the segment, in order
+    cells = [(cx, cy) for cx, cy, _ in traverse_cells(0.5, 0.5, 3.5, 1.5)]
+    assert cells[0] == (0, 0) and cells[-1] == (3, 1)
+    assert len(cells) == 5
+
+    # 2. A projectile jumping clean over the wall in one tick still hits it
+    hit = first_terrain_hit(world, 2.0, 5.0, 30.0, 5.0)
+    assert hit is not None
+    t, x, y, terrain = hit
+    assert terrain is WALL and abs(x - 10.0) < 1e-9
+    assert first_terrain_hit(world, 2.0, 5.0, 9.0, 5.0) is None
+
+    # 3. A small target between the start and the end point is hit
+    small = SimpleNamespace(x=5.0, y=4.5, width=1, height=1)
+    behind_wall = SimpleNamespace(x=20.0, y=4.5, width=1, height=1)
+    t, entity = first_entity_hit(2.0, 5.0, 30.0, 5.0, [behind_wall, small])
+    assert entity is small and 0 < t < 1
+    # ...but nothing behind the wall is
+    assert first_entity_hit(2.0, 5.0, 30.0, 5.0, [behind_wall], limit=hit[0]) is None
+
+    # 4. A fast box stops at the wall instead of tunnelling through it
+    blocks = lambda terrain: not terrain["passable"]
+    t, x, y, terrain = sweep_box(world, 2.0, 5.0, 30.0, 5.0, 4, 2, blocks)
+    assert t < 1.0 and terrain is WALL
+    assert x + 2 < 10.0
+
+    print("Swept Collision Test Passed!")
+
+if __name__ == "__main__":
+    test_swept_collision()
@@ -0,0 +1,52 @@
+from rich.color import ColorSystem
+from rich.style import Style
+from car.common.terminal_output import (
+    ADAPTIVE_LEVELS, STEP_UP_WINDOWS, OutputGovernor, canvas_runs, frame_bytes, quantize,
+)
+
+def test_terminal_output():
+    print("Testing Terminal Output Governor...")
+
+    # 1. Snapping merges near colours; named colours are left to the theme
+    grass = Style.parse("green on rgb(0,50,0)")
+    tall_grass = Style.parse("green on rgb(0,40,0)")
+    assert quantize(grass, None) is grass
+    assert quantize(grass, ColorSystem.STANDARD) == quantize(tall_grass, ColorSystem.STANDARD)
+    assert quantize(grass, ColorSystem.STANDARD).color == grass.color
+
+    # 2. Runs: blank cells join any run with the same background
+    road = Style.parse("white on rgb(40,40,40)")
+    ground = Style.parse("red on rgb(40,40,40)")
+    rows = canvas_runs([list("ab  c")], [[road, road, ground, ground, ground]])
+    assert rows == ((("ab  ", road), ("c", ground)),)
+    assert canvas_runs([list("⁘∴")], [[grass, tall_grass]], ColorSystem.STANDARD)[0][0][0] == "⁘∴"
+    # Multi-byte glyphs and escapes are both counted
+    assert frame_bytes(rows, ColorSystem.TRUECOLOR) > frame_bytes(rows, ColorSystem.STANDARD) > len("ab  c")
+
+    # 3. Adaptive: over budget steps down, a calm link steps back up
+    governor = OutputGovernor("adaptive", budget_kb=1)
+    now = 0.0
+    for _ in range(len(ADAPTIVE_LEVELS) + 1):
+        for _ in range(30):
+            now += 1 / 30
+            if governor.ready(now):
+                governor.frame_drawn(4096, now)
+    assert governor.level == len(ADAPTIVE_LEVELS) - 1 and governor.fps_cap
+    assert governor.palette is ColorSystem.STANDARD
+    assert not governor.ready(governor._last_draw + 0.01)
+    for _ in range(STEP_UP_WINDOWS + 1):
+        now += 1.0
+        governor.frame_skipped(now)
+    assert governor.level == len(ADAPTIVE_LEVELS) - 2
+    assert "skip 100%" in governor.summary()
+
+    # 4. Fixed modes never adapt
+    fixed = OutputGovernor("256", budget_kb=1)
+    for i in range(1, 90):
+        fixed.frame_drawn(100000, i / 30)
+    assert fixed.palette is ColorSystem.EIGHT_BIT and fixed.fps_cap is None
+    assert OutputGovernor("bogus").mode == "truecolor"
+    print("Terminal Output Governor Test Passed!")
+
+if __name__ == "__main__":
+    test_terminal_output()
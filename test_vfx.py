@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+from car.logic.vfx import (
+    LOD_THRESHOLD, MAX_EFFECTS, TOTAL_STEPS, LIGHT_STEPS, FIRE, SMOKE,
+    draw_effects, explosion_sequence, spawn_explosion,
+)
+
+def _sprite(x, y, art):
+    return SimpleNamespace(x=x, y=y, get_static_art=lambda: art)
+
+def test_vfx():
+    print("Testing Explosion VFX...")
+    art = ["/--\\", "|##|", "\\--/"]
+
+    # 1. Sequences are precomputed per shape and their styles interned
+    sequence = explosion_sequence(art)
+    assert any(explosion_sequence(list(art)) is sequence for _ in range(50))
+    assert len(sequence.frames) == TOTAL_STEPS + 1
+    assert {(r, c, ch) for r, c, ch, _ in sequence.frames[0]} == {
+        (r, c, ch) for r, row in enumerate(art) for c, ch in enumerate(row)}
+    interned = {id(style) for _, style in FIRE + SMOKE}
+    assert all(id(style) in interned for _, _, _, style in sequence.frames[TOTAL_STEPS // 2]
+               if style is not sequence.frames[0][0][3])
+
+    # 2. One pass draws every live effect and retires finished ones in place
+    gs = SimpleNamespace(active_explosions=[])
+    effects = gs.active_explosions
+    spawn_explosion(gs, _sprite(10, 5, art), now=0.0)
+    canvas = [[" "] * 20 for _ in range(10)]
+    styles = [[None] * 20 for _ in range(10)]
+    draw_effects(effects, canvas, styles, 0, 0, 20, 10, now=0.0)
+    assert "".join(canvas[3][8:12]) == "/--\\" and "".join(canvas[4][8:12]) == "|##|"
+    draw_effects(effects, canvas, styles, 0, 0, 20, 10, now=10.0)
+    assert gs.active_explosions is effects and effects == []
+
+    # 3. Under load effects go light, and the oldest make way past the cap
+    for i in range(MAX_EFFECTS + 5):
+        spawn_explosion(gs, _sprite(i, 0, art), now=float(i))
+    assert len(effects) == MAX_EFFECTS
+    assert effects[0].started == 5.0
+    assert len(effects[LOD_THRESHOLD - 5 - 1].sequence.frames) == TOTAL_STEPS + 1
+    assert len(effects[LOD_THRESHOLD - 5].sequence.frames) == LIGHT_STEPS + 1
+    print("Explosion VFX Test Passed!")
+
+if __name__ == "__main__":
+    test_vfx()
@@ -0,0 +1,37 @@
+from car.world.world_index import WorldIndex, TRIGGER_BUCKET_SIZE
+
+def test_world_index():
+    print("Testing World Index...")
+
+    world_details = {
+        "cities": {"0,0": "The Junction", "2,-1": "Rustwater", "bad": "Nowhere"},
+        "landmarks": [
+            {"name": "Old Dam", "x": 120, "y": -40},
+            {"name": "Broken Tower", "x": 5000, "y": 5000},
+        ],
+    }
+    triggers = [
+        {"id": "near", "x": 10, "y": 10, "radius": 20, "type": "dialog", "data": "Hi"},
+        {"id": "far", "x": 10 * TRIGGER_BUCKET_SIZE, "y": 0, "radius": 20, "type": "dialog", "data": "Far"},
+        {"id": "huge", "x": 50 * TRIGGER_BUCKET_SIZE, "y": 0, "radius": TRIGGER_BUCKET_SIZE * 3, "type": "dialog", "data": "Big"},
+    ]
+    index = WorldIndex(world_details, triggers)
+
+    # 1. Name lookups
+    assert index.get_landmark_coords("Old Dam") == (120, -40)
+    assert index.get_landmark_coords("Missing") is None
+    assert index.get_city_grid("Rustwater") == (2, -1)
+    assert index.get_city_grid("Nowhere") is None
+
+    # 2. Only nearby and oversized triggers are returned
+    nearby_ids = {t["id"] for t in index.triggers_near(0, 0)}
+    assert nearby_ids == {"near", "huge"}
+
+    # 3. A trigger sitting just across a bucket edge is still found
+    nearby_ids = {t["id"] for t in index.triggers_near(TRIGGER_BUCKET_SIZE + 1, 0)}
+    assert "near" in nearby_ids
+
+    print("World Index Test Passed!")
+
+if __name__ == "__main__":
+    test_world_index()
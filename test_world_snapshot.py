@@ -0,0 +1,60 @@
+import copy
+from car.game_state import GameState
+from car.data.factions import FACTION_DATA
+from car.logic.world_snapshot import (
+    SnapshotReader, SnapshotWriter, SpriteRegistry, apply_snapshot, create_snapshot_block,
+)
+
+def _new_game_state():
+    return GameState(selected_car_index=0, difficulty="Normal", difficulty_mods={},
+                     car_color_names=["white"], theme={"name": "t", "description": "d"},
+                     factions=copy.deepcopy(FACTION_DATA))
+
+def test_world_snapshot():
+    print("Testing World Snapshot...")
+    block = create_snapshot_block()
+    try:
+        writer = SnapshotWriter(block.name)
+        reader = SnapshotReader(block)
+        registry = SpriteRegistry()
+        sprites, texts = {}, {}
+
+        # 1. Nothing has been published yet
+        assert reader.read() is None
+
+        # 2. A published frame round-trips through shared memory
+        sim = _new_game_state()
+        sim.car_world_x, sim.car_world_y, sim.car_speed = 12.5, -40.0, 3.0
+        sim.active_obstacles = [copy.copy(sim.player_car)]
+        sim.active_obstacles[0].x, sim.active_obstacles[0].y = 20.0, -35.0
+        sim.active_particles = [[1.0, 2.0, 0, 0, 0, 0, "*"]]
+        sim.active_pickups = {7: {"x": 5.0, "y": 6.0, "char": "$", "type": "cash"}}
+        writer.publish(sim, 1, 3, registry, sprites.__setitem__, texts.__setitem__)
+
+        snapshot = reader.read()
+        assert snapshot.frame == 1 and snapshot.input_seq == 3
+        assert len(snapshot.entities) == 2  # Player + obstacle
+        # Unchanged frames are not decoded twice
+        assert reader.read() is None
+
+        # 3. The UI's mirror picks up positions, entities, particles and pickups
+        ui = _new_game_state()
+        ui.pedal_position = 0.5
+        apply_snapshot(ui, snapshot, sprites, texts, adopt_controls=False)
+        assert (ui.car_world_x, ui.car_world_y, ui.car_speed) == (12.5, -40.0, 3.0)
+        assert ui.player_car.x == 12.5
+        assert [(o.x, o.y) for o in ui.active_obstacles] == [(20.0, -35.0)]
+        assert ui.active_obstacles[0].get_static_art()
+        assert ui.active_particles[0][6] == "*"
+        assert list(ui.active_pickups.values())[0]["char"] == "$"
+        # Controls the UI changed since its last send are not overwritten
+        assert ui.pedal_position == 0.5
+
+        writer.close()
+    finally:
+        block.close()
+        block.unlink()
+    print("World Snapshot Test Passed!")
+
+if __name__ == "__main__":
+    test_world_snapshot()